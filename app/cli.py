@@ -0,0 +1,359 @@
+"""
+Headless command line for GeoEvent survey folders
+Scans, validates, enriches, merges and exports FileIDs without the GUI (no Qt import),
+running FileIDs in a process pool so nightly jobs scale to thousands of FileIDs.
+
+Usage:
+    python -m app.cli scan     SURVEY_ROOT
+    python -m app.cli validate SURVEY_ROOT --jobs 8         # exit code 1 when a FileID has errors
+    python -m app.cli enrich   SURVEY_ROOT --write          # persist GPS chainage into each .driveevt
+    python -m app.cli merge    SURVEY_ROOT                  # merged.driveevt + laneFixes-<date>.csv
+    python -m app.cli export   SURVEY_ROOT --output DIR     # per-FileID event and lane fix CSVs
+    python -m app.cli lanes    SURVEY_ROOT --report R.html  # survey-wide lane fix report (CSV or HTML)
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.backup_store import BackupStore
+from app.models.gps_model import GPSData
+from app.models.lane_model import LaneManager
+from app.utils.data_loader import DataLoader
+from app.utils.export_manager import ExportManager
+from app.utils.file_parser import (enrich_events_with_gps, parse_driveevt, parse_driveiri, read_non_span_rows,
+                                   save_driveevt)
+from app.utils.fileid_manager import FileIDFolder, FileIDManager
+from app.utils.lane_fix_report import DEFAULT_GAP_TOLERANCE_S, check_fileid_lanes, write_report
+
+MERGED_EVENTS_FILE = "merged.driveevt"
+LANE_REPORT_FILE = "lane_fix_report.html"
+
+
+def merged_lane_fixes_file(now: Optional[datetime] = None) -> str:
+    """Name of the merged lane fix file the GUI writes: laneFixes-<dd-mm-YYYY>.csv"""
+    return f"laneFixes-{(now or datetime.now()).strftime('%d-%m-%Y')}.csv"
+
+
+def scan_survey(root: str, only: Optional[List[str]] = None) -> List[FileIDFolder]:
+    """FileID folders of a survey root, sorted; the GUI's remembered FileID and missing files are left untouched"""
+    folders = FileIDManager(persist_state=False, create_missing=False).scan_parent_folder(root)
+    if only:
+        wanted = set(only)
+        folders = [folder for folder in folders if folder.fileid in wanted]
+    return folders
+
+
+# ---- per-FileID workers (top level so the process pool can pickle them) ----
+
+def _new_report(folder: FileIDFolder) -> Dict:
+    return {'fileid': folder.fileid, 'errors': [], 'warnings': [], 'counts': {}}
+
+
+def _driveevt_path(folder: FileIDFolder) -> str:
+    return os.path.join(folder.path, f"{folder.fileid}.driveevt")
+
+
+def _load_enriched_events(folder: FileIDFolder, report: Dict, point_events: Optional[List] = None) -> List:
+    """Events of a FileID enriched with its GPS track (as the GUI loads them)"""
+    driveiri_path = os.path.join(folder.path, f"{folder.fileid}.driveiri")
+    gps_data = parse_driveiri(driveiri_path) if os.path.exists(driveiri_path) else GPSData()
+    driveevt_path = _driveevt_path(folder)
+    events = parse_driveevt(driveevt_path, point_events) if os.path.exists(driveevt_path) else []
+    if gps_data.points:
+        enrich_events_with_gps(events, gps_data)
+    report['counts']['gps_points'] = len(gps_data.points)
+    report['counts']['events'] = len(events)
+    return events
+
+
+def _load_lane_fixes(folder: FileIDFolder) -> List:
+    lane_manager = LaneManager()
+    lane_manager.set_fileid_folder(folder.path, create_if_missing=False)
+    return lane_manager.get_lane_fixes()
+
+
+def validate_fileid(folder: FileIDFolder) -> Dict:
+    """Load a FileID the way the GUI does and report missing data and lane fix errors"""
+    report = _new_report(folder)
+    if not folder.has_driveiri:
+        report['errors'].append("missing .driveiri (no GPS track)")
+    if folder.image_count == 0:
+        report['warnings'].append("no Cam1 images")
+    try:
+        data = DataLoader().load_fileid_data(folder, create_missing=False)
+    except Exception as e:
+        report['errors'].append(str(e))
+        return report
+
+    gps_data = data['gps_data']
+    events = data['events']
+    report['counts'] = {
+        'images': len(data['image_paths']),
+        'gps_points': len(gps_data.points) if gps_data else 0,
+        'events': len(events),
+        'point_events': len(data['point_events']),
+        'lane_fixes': len(data['lane_manager'].lane_fixes),
+    }
+    report['errors'].extend(data['lane_validation_errors'])
+    unlocated = sum(1 for event in events if event.start_lat is None)
+    if unlocated and report['counts']['gps_points']:
+        report['warnings'].append(f"{unlocated} event(s) outside the GPS track")
+    return report
+
+
+def enrich_fileid(folder: FileIDFolder, write: bool = False) -> Dict:
+    """
+    Enrich events with GPS position and chainage; with write, save them back to the .driveevt
+    (non-span rows such as lane checks are written back unchanged)
+    """
+    report = _new_report(folder)
+    try:
+        events = _load_enriched_events(folder, report)
+    except Exception as e:
+        report['errors'].append(str(e))
+        return report
+    report['counts']['enriched'] = sum(1 for event in events if event.start_lat is not None)
+    if report['counts']['enriched'] < len(events):
+        report['warnings'].append(f"{len(events) - report['counts']['enriched']} event(s) not enriched")
+    if write and events:
+        driveevt_path = _driveevt_path(folder)
+        try:
+            non_span_rows = read_non_span_rows(driveevt_path)
+        except (OSError, csv.Error) as e:
+            report['errors'].append(f"not rewritten, cannot read its non-span rows: {e}")
+            return report
+        if save_driveevt(events, driveevt_path, folder.fileid, non_span_rows):
+            report['counts']['written'] = len(events)
+            report['counts']['non_span_kept'] = len(non_span_rows)
+        else:
+            report['errors'].append(f"failed to save {driveevt_path}")
+    return report
+
+
+def collect_fileid(folder: FileIDFolder) -> Dict:
+    """Enriched events and lane fixes of a FileID for the survey merge"""
+    report = _new_report(folder)
+    try:
+        report['events'] = _load_enriched_events(folder, report)
+        report['lane_fixes'] = _load_lane_fixes(folder)
+    except Exception as e:
+        report['errors'].append(str(e))
+        report['events'], report['lane_fixes'] = [], []
+    report['counts']['lane_fixes'] = len(report['lane_fixes'])
+    return report
+
+
+def export_fileid(folder: FileIDFolder, output_dir: str) -> Dict:
+    """Write <FileID>_events.csv and <FileID>_lane_fixes.csv (with FileID column) to output_dir"""
+    report = _new_report(folder)
+    exporter = ExportManager()
+    try:
+        events = _load_enriched_events(folder, report)
+        lane_fixes = _load_lane_fixes(folder)
+    except Exception as e:
+        report['errors'].append(str(e))
+        return report
+    report['counts']['lane_fixes'] = len(lane_fixes)
+
+    exports = ((events, f"{folder.fileid}_events.csv", exporter.export_events),
+               (lane_fixes, f"{folder.fileid}_lane_fixes.csv", exporter.export_lane_fixes))
+    for items, name, export in exports:
+        if items and not export(items, os.path.join(output_dir, name)):
+            report['errors'].append(f"failed to export {name}")
+    return report
+
+
+# ---- running -----------------------------------------------------------
+
+def _init_worker(log_level: int):
+    logging.basicConfig(level=log_level, format='%(levelname)s %(processName)s: %(message)s')
+
+
+def run_fileids(worker: Callable[[FileIDFolder], Dict], folders: List[FileIDFolder], jobs: int = 1,
+                log_level: int = logging.WARNING) -> List[Dict]:
+    """Reports of worker over folders, in folder order; jobs > 1 runs FileIDs in a process pool"""
+    if jobs <= 1 or len(folders) <= 1:
+        return [worker(folder) for folder in folders]
+    jobs = min(jobs, len(folders))
+    chunksize = max(1, len(folders) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(log_level,)) as pool:
+        return list(pool.map(worker, folders, chunksize=chunksize))
+
+
+def backup_files(root: str, paths: List[str]):
+    """Snapshot files into the survey's backup store before they are rewritten (main process only)"""
+    existing = [path for path in paths if os.path.exists(path)]
+    if existing:
+        store = BackupStore.for_survey(root)
+        for path in existing:
+            store.backup_file(path)
+
+
+def merge_survey(root: str, reports: List[Dict]) -> Dict:
+    """Write merged.driveevt and laneFixes-<date>.csv to the survey root like the GUI merge"""
+    all_events = [event for report in reports for event in report.pop('events', [])]
+    all_lane_fixes = [fix for report in reports for fix in report.pop('lane_fixes', [])]
+    events_path = os.path.join(root, MERGED_EVENTS_FILE)
+    lane_path = os.path.join(root, merged_lane_fixes_file())
+    backup_files(root, [path for path, items in ((events_path, all_events), (lane_path, all_lane_fixes)) if items])
+
+    merged = {'events': len(all_events), 'lane_fixes': len(all_lane_fixes), 'files': [], 'errors': []}
+    if all_events:
+        if save_driveevt(all_events, events_path, os.path.splitext(MERGED_EVENTS_FILE)[0]):
+            merged['files'].append(events_path)
+        else:
+            merged['errors'].append(f"failed to save {events_path}")
+    if all_lane_fixes:
+        if ExportManager().export_merged_lane_fixes(all_lane_fixes, lane_path):
+            merged['files'].append(lane_path)
+        else:
+            merged['errors'].append(f"failed to save {lane_path}")
+    return merged
+
+
+# ---- output ------------------------------------------------------------
+
+def format_scan(folders: List[FileIDFolder]) -> str:
+    lines = [f"{'FileID':<20} {'Images':>7}  driveiri  driveevt  lane fixes", "-" * 62]
+    for folder in folders:
+        flags = ['yes' if present else 'NO' for present in
+                 (folder.has_driveiri, folder.has_driveevt, folder.has_lane_fixes)]
+        lines.append(f"{folder.fileid:<20} {folder.image_count:>7}  {flags[0]:<8}  {flags[1]:<8}  {flags[2]}")
+    lines.append(f"\n{len(folders)} FileID(s), {sum(folder.image_count for folder in folders)} images")
+    return "\n".join(lines)
+
+
+def format_summary(command: str, reports: List[Dict], elapsed: float) -> str:
+    """Totals over all FileIDs, then the FileIDs with errors or warnings"""
+    totals: Dict[str, int] = {}
+    for report in reports:
+        for name, value in report['counts'].items():
+            totals[name] = totals.get(name, 0) + value
+    failed = [report for report in reports if report['errors']]
+    warned = [report for report in reports if report['warnings'] and not report['errors']]
+
+    lines = [f"{command}: {len(reports)} FileID(s) in {elapsed:.1f}s"]
+    if totals:
+        lines.append("  " + ", ".join(f"{name.replace('_', ' ')}: {value}" for name, value in totals.items()))
+    for label, group, key in (("ERROR", failed, 'errors'), ("warning", warned, 'warnings')):
+        for report in group:
+            for message in report[key]:
+                lines.append(f"  {label} {report['fileid']}: {message}")
+    lines.append(f"{len(failed)} FileID(s) with errors, {len(warned)} with warnings only")
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli",
+                                     description="Headless GeoEvent survey processing (no GUI)")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('root', help="Survey root folder containing FileID folders")
+    common.add_argument('--only', nargs='+', metavar='FILEID', help="Process only these FileIDs")
+    common.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: CPU count; 1 runs in this process)")
+    common.add_argument('--json', action='store_true', help="Print the reports as JSON")
+    common.add_argument('--verbose', '-v', action='store_true', help="Log INFO messages to stderr")
+
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('scan', parents=[common], help="List FileID folders and their data files")
+    commands.add_parser('validate', parents=[common],
+                        help="Load every FileID and check GPS, events and lane fix time bounds")
+    enrich = commands.add_parser('enrich', parents=[common], help="Enrich events with GPS position and chainage")
+    enrich.add_argument('--write', action='store_true',
+                        help="Save enriched events back to each .driveevt (backed up first)")
+    commands.add_parser('merge', parents=[common],
+                        help=f"Write {MERGED_EVENTS_FILE} and laneFixes-<date>.csv to the survey root")
+    export = commands.add_parser('export', parents=[common], help="Export per-FileID event and lane fix CSVs")
+    export.add_argument('--output', '-o', required=True, help="Output folder (created if missing)")
+    lanes = commands.add_parser('lanes', parents=[common],
+                                help="Check lane fixes for bound violations, overlaps, gaps and unassigned time")
+    lanes.add_argument('--report', '-o', help="Report file, .csv or .html (default: <root>/lane_fix_report.html)")
+    lanes.add_argument('--gap-tolerance', type=float, default=DEFAULT_GAP_TOLERANCE_S,
+                       help=f"Ignore holes shorter than this many seconds (default: {DEFAULT_GAP_TOLERANCE_S:g})")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    log_level = logging.INFO if args.verbose else logging.WARNING
+    logging.basicConfig(level=log_level, format='%(levelname)s: %(message)s')
+
+    root = os.path.abspath(args.root)
+    if not os.path.isdir(root):
+        print(f"Survey root not found: {root}", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    folders = scan_survey(root, args.only)
+    if args.command == 'scan':
+        if args.json:
+            print(json.dumps([dict(vars(folder), last_modified=folder.last_modified.isoformat())
+                              for folder in folders], indent=2))
+        else:
+            print(format_scan(folders))
+        return 0
+
+    if args.command == 'validate':
+        worker = validate_fileid
+    elif args.command == 'enrich':
+        worker = partial(enrich_fileid, write=args.write)
+        if args.write:
+            backup_files(root, [_driveevt_path(folder) for folder in folders])
+    elif args.command == 'merge':
+        worker = collect_fileid
+    elif args.command == 'lanes':
+        worker = partial(check_fileid_lanes, gap_tolerance_s=args.gap_tolerance)
+    else:
+        os.makedirs(args.output, exist_ok=True)
+        worker = partial(export_fileid, output_dir=os.path.abspath(args.output))
+
+    reports = run_fileids(worker, folders, args.jobs, log_level)
+    merged = merge_survey(root, reports) if args.command == 'merge' else None
+    issues = [issue for report in reports for issue in report.pop('issues', [])]
+    report_path = None
+    if args.command == 'lanes':
+        report_path = os.path.abspath(args.report or os.path.join(root, LANE_REPORT_FILE))
+        if not write_report(issues, report_path, f"Lane fix report - {root}"):
+            print(f"Failed to write {report_path}", file=sys.stderr)
+            return 2
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        document = {'command': args.command, 'root': root, 'elapsed_s': round(elapsed, 3), 'fileids': reports}
+        if merged is not None:
+            document['merged'] = merged
+        if report_path:
+            document['report'] = report_path
+            document['issues'] = [issue.to_dict() for issue in issues]
+        print(json.dumps(document, indent=2, default=str))
+    else:
+        print(format_summary(args.command, reports, elapsed))
+        if merged is not None:
+            print(f"Merged {merged['events']} events and {merged['lane_fixes']} lane fixes")
+            for path in merged['files']:
+                print(f"  wrote {path}")
+            for message in merged['errors']:
+                print(f"  ERROR {message}")
+        if report_path:
+            errors = sum(1 for issue in issues if issue.severity == 'error')
+            print(f"{len(issues)} lane fix issue(s), {errors} error(s); report written to {report_path}")
+
+    failed = (any(report['errors'] for report in reports) or bool(merged and merged['errors'])
+              or any(issue.severity == 'error' for issue in issues))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
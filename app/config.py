@@ -32,6 +32,10 @@ class MemoryConfig:
     CRITICAL_THRESHOLD_PERCENT: int = 85
     CHECK_INTERVAL_MS: int = 5000  # milliseconds
     RETRY_INTERVAL_SEC: int = 10
+    PROCESS_BUDGET_MB: int = 2048  # process RSS above which governed caches are trimmed (0 = none)
+    WARNING_RELEASE_PERCENT: int = 25  # share of governed cache memory released at the warning threshold
+    CRITICAL_RELEASE_PERCENT: int = 50  # ... and at the critical threshold
+    RELEASE_COOLDOWN_SEC: int = 30  # after a pressure release, wait this long unless pressure escalates
 
 
 @dataclass
@@ -41,6 +45,37 @@ class CacheConfig:
     MAX_AGE_SECONDS: int = 300
     EMERGENCY_CLEANUP_PERCENT: int = 50
     PRELOAD_BATCH_SIZE: int = 50
+    FILEID_PRELOAD_ENTRIES: int = 2  # adjacent FileIDs kept preloaded
+    FILEID_PRELOAD_WARM_IMAGES: int = 5  # images decoded per preloaded FileID
+    SESSION_HOT_FILEIDS: int = 5  # visited FileIDs kept in memory before spilling to disk
+
+
+@dataclass
+class SaveConfig:
+    """Background save (write-behind queue) configuration"""
+    DEBOUNCE_MS: int = 500  # quiet time before a FileID's queued save is written
+    MAX_ATTEMPTS: int = 4  # attempts per save when the target file is locked
+    RETRY_BASE_DELAY_MS: int = 250  # doubled after every failed attempt
+    JOURNAL_COMPACT_BYTES: int = 4 * 1024 * 1024  # autosave journal size that triggers compaction
+
+
+@dataclass
+class LoggingConfig:
+    """Logging pipeline configuration"""
+    ASYNC_WRITER: bool = True  # format and write log records on a background thread
+    QUEUE_SIZE: int = 10000  # records waiting for the writer; further records are dropped, never waited on
+    HOT_PATH_MODULES: tuple = ('timeline_widget', 'photo_preview_tab', 'lane_model')
+    HOT_PATH_RATE_PER_SEC: float = 5.0  # DEBUG/INFO records per second per call site in hot-path modules
+    HOT_PATH_BURST: int = 20  # records a call site may emit at once before the rate applies
+
+
+@dataclass
+class BackupConfig:
+    """Versioned backup store configuration"""
+    STORE_LOCATION: str = 'local'  # 'local' (~/.geoevent/backups) or 'survey' (<survey root>/.geoevent_backups)
+    KEEP_VERSIONS: int = 20  # versions kept per file
+    MAX_AGE_DAYS: float = 30  # older versions are dropped (the newest is always kept)
+    COMPRESSION_LEVEL: int = 6  # zlib level for stored versions
 
 
 @dataclass
@@ -100,6 +135,9 @@ class AppConfig:
     timeline: TimelineConfig = field(default_factory=TimelineConfig)
     memory: MemoryConfig = field(default_factory=MemoryConfig)
     cache: CacheConfig = field(default_factory=CacheConfig)
+    save: SaveConfig = field(default_factory=SaveConfig)
+    backup: BackupConfig = field(default_factory=BackupConfig)
+    logging: LoggingConfig = field(default_factory=LoggingConfig)
     validation: ValidationConfig = field(default_factory=ValidationConfig)
     file: FileConfig = field(default_factory=FileConfig)
     image: ImageConfig = field(default_factory=ImageConfig)
@@ -143,6 +181,27 @@ class AppConfig:
                     if hasattr(config.cache, key):
                         setattr(config.cache, key, value)
             
+            # Update save config
+            if 'save' in data:
+                for key, value in data['save'].items():
+                    if hasattr(config.save, key):
+                        setattr(config.save, key, value)
+            
+            # Update backup config
+            if 'backup' in data:
+                for key, value in data['backup'].items():
+                    if hasattr(config.backup, key):
+                        setattr(config.backup, key, value)
+            
+            # Update logging config
+            if 'logging' in data:
+                for key, value in data['logging'].items():
+                    if hasattr(config.logging, key):
+                        if key == 'HOT_PATH_MODULES':
+                            setattr(config.logging, key, tuple(value))
+                        else:
+                            setattr(config.logging, key, value)
+
             # Update validation config
             if 'validation' in data:
                 for key, value in data['validation'].items():
@@ -183,12 +242,34 @@ class AppConfig:
                     'WARNING_THRESHOLD_PERCENT': self.memory.WARNING_THRESHOLD_PERCENT,
                     'CRITICAL_THRESHOLD_PERCENT': self.memory.CRITICAL_THRESHOLD_PERCENT,
                     'CHECK_INTERVAL_MS': self.memory.CHECK_INTERVAL_MS,
+                    'PROCESS_BUDGET_MB': self.memory.PROCESS_BUDGET_MB,
+                    'WARNING_RELEASE_PERCENT': self.memory.WARNING_RELEASE_PERCENT,
+                    'CRITICAL_RELEASE_PERCENT': self.memory.CRITICAL_RELEASE_PERCENT,
                 },
                 'cache': {
                     'DEFAULT_SIZE_MB': self.cache.DEFAULT_SIZE_MB,
                     'MAX_AGE_SECONDS': self.cache.MAX_AGE_SECONDS,
                     'EMERGENCY_CLEANUP_PERCENT': self.cache.EMERGENCY_CLEANUP_PERCENT,
                 },
+                'save': {
+                    'DEBOUNCE_MS': self.save.DEBOUNCE_MS,
+                    'MAX_ATTEMPTS': self.save.MAX_ATTEMPTS,
+                    'RETRY_BASE_DELAY_MS': self.save.RETRY_BASE_DELAY_MS,
+                    'JOURNAL_COMPACT_BYTES': self.save.JOURNAL_COMPACT_BYTES,
+                },
+                'backup': {
+                    'STORE_LOCATION': self.backup.STORE_LOCATION,
+                    'KEEP_VERSIONS': self.backup.KEEP_VERSIONS,
+                    'MAX_AGE_DAYS': self.backup.MAX_AGE_DAYS,
+                    'COMPRESSION_LEVEL': self.backup.COMPRESSION_LEVEL,
+                },
+                'logging': {
+                    'ASYNC_WRITER': self.logging.ASYNC_WRITER,
+                    'QUEUE_SIZE': self.logging.QUEUE_SIZE,
+                    'HOT_PATH_MODULES': list(self.logging.HOT_PATH_MODULES),
+                    'HOT_PATH_RATE_PER_SEC': self.logging.HOT_PATH_RATE_PER_SEC,
+                    'HOT_PATH_BURST': self.logging.HOT_PATH_BURST,
+                },
                 'validation': {
                     'MAX_STRING_LENGTH': self.validation.MAX_STRING_LENGTH,
                     'MAX_FILENAME_LENGTH': self.validation.MAX_FILENAME_LENGTH,
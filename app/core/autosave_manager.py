@@ -1,69 +1,396 @@
 """
 AutoSave Manager for GeoEvent application
-Handles automatic saving of application state
+Crash-recovery journal of unsaved edits (append-only JSON lines, compacted in the background),
+one journal per running session so concurrent instances never share a file
 """
 
-import os
+import hashlib
 import json
+import logging
+import os
+import threading
 from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
 from PyQt6.QtCore import QThread, pyqtSignal
 
+from app.config import get_config
+from app.core.session_store import is_stale_session, session_name
+from app.utils.atomic_file import file_lock
+
+JOURNAL_SUFFIX = ".jsonl"
+JOURNAL_LOCK_FILE = "journal.lock"  # serializes adopting the journals of crashed sessions
+
+
+def journal_root() -> str:
+    """Per-user folder holding one autosave journal per GeoEvent session"""
+    return os.path.join(os.path.expanduser("~/.geoevent"), "journal")
+
+
+def session_journal_path(root: Optional[str] = None) -> str:
+    """Autosave journal of this process (session-<pid>-<start>.jsonl)"""
+    return os.path.join(root or journal_root(), session_name() + JOURNAL_SUFFIX)
+
+
+def journal_key(fileid_path: str) -> str:
+    """Journal key of a FileID folder: its normalized path (the same FileID can appear in several surveys)"""
+    return os.path.normcase(os.path.abspath(fileid_path))
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=str, separators=(',', ':'))
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
 class AutoSaveManager(QThread):
     """
     Manages automatic saving of application data
+    RESPONSIBILITIES:
+    - Append per-FileID deltas (only records that changed) to a JSON-lines journal
+    - Number each FileID's journal entries with an increasing revision
+    - Compact the journal to one snapshot line per FileID once it exceeds a size threshold
+      (the larger of compact_bytes and twice its size after the last compaction)
+    - Replay the journal at startup, adopting the journals of sessions that crashed,
+      to recover edits lost in a crash
+
+    Data passed to update_data is a dict of fields; list fields are diffed
+    record by record (as multisets of JSON records), other fields are
+    replaced when their value changes.
     """
 
     autosave_triggered = pyqtSignal(datetime)  # timestamp of save
 
-    def __init__(self, interval_seconds: int = 300):  # 5 minutes default
+    def __init__(self, interval_seconds: int = 300, compact_bytes: int = None):  # 5 minutes default
         super().__init__()
         self.interval_seconds = interval_seconds
+        self.compact_bytes = (compact_bytes if compact_bytes is not None
+                              else get_config().save.JOURNAL_COMPACT_BYTES)
         self.running = True
-        self.data_to_save = {}
+        self.data_to_save = {}  # key -> latest data not yet journaled
         self.save_path = None
 
+        self._compact_threshold = self.compact_bytes
+        self._cond = threading.Condition()
+        self._pending_clears: Dict[str, Optional[int]] = {}  # key -> journal revision its saved data covers
+        self._write_lock = threading.Lock()
+        # Journaled state per key: field -> {'list': {digest: [record, count]}} or {'value': v, 'text': t}
+        self._journaled: Dict[str, Dict[str, Dict]] = {}
+        self._revisions: Dict[str, int] = {}
+
+        self.entries_written = 0
+        self.bytes_written = 0
+        self.compactions = 0
+
     def set_save_path(self, path: str):
-        """Set the path for autosave file"""
+        """Set the path for the autosave journal"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
         self.save_path = path
 
-    def update_data(self, key: str, data):
-        """Update data to be autosaved"""
-        self.data_to_save[key] = data
+    def update_data(self, key: str, data: Dict[str, Any]):
+        """Update data to be autosaved (replaces any not yet journaled data for key)"""
+        with self._cond:
+            self.data_to_save[key] = data
+            self._pending_clears.pop(key, None)
+            self._cond.notify_all()
+
+    def mark_saved(self, key: str, revision: Optional[int] = None):
+        """
+        key's data is safely in its own files; drop it from the journal.
+        revision is the journal revision when the saved snapshot was taken: if edits
+        were journaled since, the journal is kept (any revision if None).
+        """
+        with self._cond:
+            if key in self.data_to_save:
+                return  # newer edits are waiting to be journaled
+            self._pending_clears[key] = revision
+            self._cond.notify_all()
+
+    def revision(self, key: str) -> int:
+        """Latest journaled revision of key (0 if none)"""
+        # No lock: a single dict read, and the GUI thread must not wait on a journal fsync
+        return self._revisions.get(key, 0)
 
     def schedule_save(self):
         """Schedule an immediate save"""
         if self.save_path:
             self._perform_save()
 
+    def get_stats(self) -> Dict:
+        """Get journal statistics"""
+        size = 0
+        if self.save_path and os.path.exists(self.save_path):
+            size = os.path.getsize(self.save_path)
+        with self._write_lock:
+            keys = len(self._journaled)
+        return {
+            'journal_bytes': size,
+            'keys': keys,
+            'entries_written': self.entries_written,
+            'bytes_written': self.bytes_written,
+            'compactions': self.compactions,
+        }
+
+    # ---- journal writing --------------------------------------------------
+
     def _perform_save(self):
-        """Perform the actual save operation"""
-        if not self.save_path or not self.data_to_save:
+        """Append deltas for all pending keys, compacting the journal if it grew too large"""
+        if not self.save_path:
             return
 
-        try:
-            # Atomic write
-            temp_path = self.save_path + ".tmp"
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                json.dump(self.data_to_save, f, indent=2, default=str)
+        with self._cond:
+            pending, self.data_to_save = self.data_to_save, {}
+            clears, self._pending_clears = self._pending_clears, {}
+        if not pending and not clears:
+            return
 
-            os.replace(temp_path, self.save_path)
+        with self._write_lock:
+            lines = []
+            for key, data in pending.items():
+                entry = self._delta_entry(key, data)
+                if entry is not None:
+                    lines.append(_canonical(entry))
+            for key, revision in clears.items():
+                if key in self._journaled and revision in (None, self._revisions.get(key, 0)):
+                    lines.append(_canonical(self._apply_clear(key)))
+            if not lines:
+                return
+
+            text = "\n".join(lines) + "\n"
+            try:
+                with open(self.save_path, 'a', encoding='utf-8') as f:
+                    f.write(text)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                logging.error(f"AutoSaveManager: Failed to write journal {self.save_path}: {e}")
+                return
+            self.entries_written += len(lines)
+            self.bytes_written += len(text)
+
+            if os.path.getsize(self.save_path) > self._compact_threshold:
+                self._compact_locked()
+
+        self.autosave_triggered.emit(datetime.now())
+
+    def _delta_entry(self, key: str, data: Dict[str, Any]) -> Optional[Dict]:
+        """Diff data against the journaled state of key, update the state, return the entry (None if unchanged)"""
+        state = self._journaled.setdefault(key, {})
+        entry = {'key': key}
+        sets, adds, removes = {}, {}, {}
+
+        for field, value in data.items():
+            if isinstance(value, list):
+                old = state.get(field, {}).get('list', {})
+                new = {}
+                for record in value:
+                    text = _canonical(record)
+                    slot = new.setdefault(_digest(text), [record, 0])
+                    slot[1] += 1
+                added = [record for digest, (record, count) in new.items()
+                         for _ in range(count - old.get(digest, (None, 0))[1])]
+                removed = [digest for digest, (record, count) in old.items()
+                           for _ in range(count - new.get(digest, (None, 0))[1])]
+                if added:
+                    adds[field] = added
+                if removed:
+                    removes[field] = removed
+                state[field] = {'list': new}
+            else:
+                text = _canonical(value)
+                if state.get(field, {}).get('text') != text:
+                    sets[field] = value
+                    state[field] = {'value': value, 'text': text}
 
-            timestamp = datetime.now()
-            self.autosave_triggered.emit(timestamp)
+        dropped = [field for field in state if field not in data]
+        for field in dropped:
+            del state[field]
 
-        except Exception as e:
-            print(f"Autosave error: {e}")
+        if not (sets or adds or removes or dropped):
+            return None
+        for name, part in (('set', sets), ('add', adds), ('remove', removes), ('drop', dropped)):
+            if part:
+                entry[name] = part
+        return self._stamp(key, entry)
+
+    def _apply_clear(self, key: str) -> Dict:
+        self._journaled.pop(key, None)
+        return self._stamp(key, {'key': key, 'clear': True})
+
+    def _stamp(self, key: str, entry: Dict) -> Dict:
+        revision = self._revisions.get(key, 0) + 1
+        self._revisions[key] = revision
+        entry['rev'] = revision
+        entry['time'] = datetime.now().isoformat(timespec='seconds')
+        return entry
+
+    def compact(self):
+        """Rewrite the journal as one snapshot line per key"""
+        with self._write_lock:
+            self._compact_locked()
+
+    def _compact_locked(self) -> bool:
+        if not self.save_path:
+            return False
+        temp_path = self.save_path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                for key, state in self._journaled.items():
+                    snapshot = {field: self._materialize(field_state) for field, field_state in state.items()}
+                    entry = {'key': key, 'rev': self._revisions.get(key, 0),
+                             'time': datetime.now().isoformat(timespec='seconds'), 'snapshot': snapshot}
+                    f.write(_canonical(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.save_path)
+            # Snapshots alone may exceed compact_bytes; wait for the deltas to double the file
+            self._compact_threshold = max(self.compact_bytes, 2 * os.path.getsize(self.save_path))
+            self.compactions += 1
+            logging.debug(f"AutoSaveManager: Compacted journal to {len(self._journaled)} snapshot(s)")
+            return True
+        except OSError as e:
+            logging.error(f"AutoSaveManager: Journal compaction failed: {e}")
             if os.path.exists(temp_path):
                 os.remove(temp_path)
+            return False
+
+    @staticmethod
+    def _materialize(field_state: Dict) -> Any:
+        if 'list' in field_state:
+            return [record for record, count in field_state['list'].values() for _ in range(count)]
+        return field_state['value']
+
+    # ---- crash recovery -----------------------------------------------------
+
+    def replay(self) -> Dict[str, Dict]:
+        """
+        Rebuild journaled state from the journal file (startup crash recovery).
+        Journals of sessions no longer running in the same folder are adopted: their
+        edits are merged (the most recent entry per key wins), written to this journal
+        and their files removed.
+        Returns {key: {'revision': int, 'time': str, 'data': {field: value}}} for keys
+        whose edits were never marked saved. A torn last line is ignored.
+        """
+        if not self.save_path:
+            return {}
+        directory = os.path.dirname(self.save_path) or '.'
+
+        journaled: Dict[str, Dict[str, Dict]] = {}
+        revisions: Dict[str, int] = {}
+        times: Dict[str, str] = {}
+        with file_lock(os.path.join(directory, JOURNAL_LOCK_FILE)):
+            stale = [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+                     if name.endswith(JOURNAL_SUFFIX) and is_stale_session(name[:-len(JOURNAL_SUFFIX)])
+                     and os.path.join(directory, name) != self.save_path]
+            for path in [self.save_path] + stale:
+                if not os.path.exists(path):
+                    continue
+                path_journaled, path_revisions, path_times = self._read_journal(path)
+                for key, revision in path_revisions.items():
+                    revisions[key] = max(revision, revisions.get(key, 0))
+                for key, state in path_journaled.items():
+                    if key not in journaled or path_times[key] > times[key]:
+                        journaled[key], times[key] = state, path_times[key]
+
+            with self._write_lock:
+                self._journaled = journaled
+                self._revisions = revisions
+                if stale and self._compact_locked():
+                    for path in stale:
+                        try:
+                            os.remove(path)
+                        except OSError as e:
+                            logging.warning(f"AutoSaveManager: Could not remove adopted journal {path}: {e}")
+                    logging.info(f"AutoSaveManager: Adopted {len(stale)} journal(s) of earlier sessions")
+
+        recovered = {
+            key: {'revision': revisions[key], 'time': times[key],
+                  'data': {field: self._materialize(field_state) for field, field_state in state.items()}}
+            for key, state in journaled.items()
+        }
+        if recovered:
+            logging.info(f"AutoSaveManager: Recovered unsaved edits for {len(recovered)} key(s) from journal")
+        return recovered
+
+    def _read_journal(self, path: str) -> Tuple[Dict[str, Dict[str, Dict]], Dict[str, int], Dict[str, str]]:
+        """Journaled state, revision and last entry time per key of one journal file"""
+        journaled: Dict[str, Dict[str, Dict]] = {}
+        revisions: Dict[str, int] = {}
+        times: Dict[str, str] = {}
+        bad_lines = 0
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    key = entry['key']
+                except (ValueError, KeyError, TypeError):
+                    bad_lines += 1
+                    continue
+                revisions[key] = entry.get('rev', revisions.get(key, 0))
+                times[key] = entry.get('time', '')
+                if entry.get('clear'):
+                    journaled.pop(key, None)
+                    continue
+                state = journaled.setdefault(key, {})
+                if 'snapshot' in entry:
+                    state.clear()
+                    for field, value in entry['snapshot'].items():
+                        self._replay_set(state, field, value)
+                for field, value in entry.get('set', {}).items():
+                    self._replay_set(state, field, value)
+                for field, records in entry.get('add', {}).items():
+                    slots = state.setdefault(field, {'list': {}})['list']
+                    for record in records:
+                        slot = slots.setdefault(_digest(_canonical(record)), [record, 0])
+                        slot[1] += 1
+                for field, digests in entry.get('remove', {}).items():
+                    slots = state.setdefault(field, {'list': {}})['list']
+                    for digest in digests:
+                        if digest in slots:
+                            slots[digest][1] -= 1
+                            if slots[digest][1] <= 0:
+                                del slots[digest]
+                for field in entry.get('drop', []):
+                    state.pop(field, None)
+
+        if bad_lines:
+            logging.warning(f"AutoSaveManager: Skipped {bad_lines} unreadable journal line(s) in {path}")
+        return journaled, revisions, times
+
+    @staticmethod
+    def _replay_set(state: Dict, field: str, value: Any):
+        if isinstance(value, list):
+            slots = {}
+            for record in value:
+                slot = slots.setdefault(_digest(_canonical(record)), [record, 0])
+                slot[1] += 1
+            state[field] = {'list': slots}
+        else:
+            state[field] = {'value': value, 'text': _canonical(value)}
+
+    # ---- thread -------------------------------------------------------------
 
     def run(self):
-        """Run periodic autosave in background (sleep-based; QTimer needs event loop)."""
+        """Journal pending data in background as soon as it arrives"""
         while self.running:
-            self.msleep(self.interval_seconds * 1000)  # milliseconds
-            if self.running:
-                self._perform_save()
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: not self.running or self.data_to_save or self._pending_clears)
+            self._perform_save()
 
     def stop(self):
-        """Stop autosave"""
-        self.running = False
-        self.wait()
\ No newline at end of file
+        """Stop autosave, journaling anything still pending"""
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+        self.wait()
+        self._perform_save()
+        with self._write_lock:
+            if self.save_path and not self._journaled and os.path.exists(self.save_path):
+                try:
+                    os.remove(self.save_path)  # everything saved; nothing for the next session to adopt
+                except OSError as e:
+                    logging.warning(f"AutoSaveManager: Could not remove journal {self.save_path}: {e}")
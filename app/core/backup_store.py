@@ -0,0 +1,307 @@
+"""
+Backup Store for GeoEvent application
+Content-addressed, deduplicated, compressed file versions with retention and restore
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from app.config import get_config
+from app.utils.atomic_file import atomic_write, file_lock
+
+INDEX_FILE = "index.json"
+LOCK_FILE = "index.lock"
+OBJECTS_DIR = "objects"
+SURVEY_STORE_DIR = ".geoevent_backups"
+
+
+@dataclass
+class BackupVersion:
+    """One stored version of a data file"""
+    digest: str  # sha256 of the uncompressed content
+    size: int  # uncompressed bytes
+    created: float  # epoch seconds
+    source_path: str
+
+
+def backup_key(path: str) -> str:
+    """Store key of a data file: its full normalized path (unique across surveys in a shared store)"""
+    return os.path.normcase(os.path.normpath(os.path.abspath(path)))
+
+
+_shared_stores: Dict[str, 'BackupStore'] = {}
+_shared_stores_lock = threading.Lock()
+
+
+class BackupStore:
+    """
+    Versioned backups of .driveevt and lane fix files
+    RESPONSIBILITIES:
+    - Hash file content (sha256) and skip snapshots identical to the latest version
+    - Store each distinct content once, zlib-compressed, under objects/<aa>/<digest>
+    - Keep an index of versions per file key, newest last
+    - Apply the retention policy (max versions per file, max age) and drop unreferenced objects
+    - Restore any version to its original or a given path
+    Thread-safe; used by the save service thread and the GUI thread. Several processes
+    (the GUI, the headless CLI) may share one store folder: every change re-reads the
+    on-disk index under an inter-process file lock before writing it back.
+    """
+
+    def __init__(self, root: str, keep_versions: int = None, max_age_days: float = None,
+                 compression_level: int = None):
+        config = get_config()
+        self.root = root
+        self.keep_versions = keep_versions if keep_versions is not None else config.backup.KEEP_VERSIONS
+        self.max_age_days = max_age_days if max_age_days is not None else config.backup.MAX_AGE_DAYS
+        self.compression_level = (compression_level if compression_level is not None
+                                  else config.backup.COMPRESSION_LEVEL)
+
+        self._lock = threading.Lock()
+        self._index: Dict[str, List[BackupVersion]] = {}
+        self.skipped_identical = 0
+        self.stored_objects = 0
+        self.deduplicated = 0
+
+        os.makedirs(os.path.join(self.root, OBJECTS_DIR), exist_ok=True)
+        self._load_index()
+
+    @classmethod
+    def for_survey(cls, survey_root: Optional[str] = None) -> 'BackupStore':
+        """Store selected by config: one local store, or one per survey root folder"""
+        config = get_config()
+        if config.backup.STORE_LOCATION == 'survey' and survey_root:
+            return cls.shared(os.path.join(survey_root, SURVEY_STORE_DIR))
+        return cls.shared(os.path.join(os.path.expanduser("~/.geoevent"), "backups"))
+
+    @classmethod
+    def shared(cls, root: str) -> 'BackupStore':
+        """The process-wide instance for a store folder (one per folder, whichever survey uses it)"""
+        key = os.path.normcase(os.path.normpath(os.path.abspath(root)))
+        with _shared_stores_lock:
+            store = _shared_stores.get(key)
+            if store is None:
+                store = _shared_stores[key] = cls(root)
+            return store
+
+    # ---- backup / restore -----------------------------------------------
+
+    def backup_file(self, path: str) -> Optional[str]:
+        """
+        Record the current content of path as a new version.
+        Returns the content digest, or None if the file doesn't exist or can't be read.
+        Identical content to the latest version is not recorded again.
+        """
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logging.error(f"BackupStore: Cannot read {path} for backup: {e}")
+            return None
+
+        digest = hashlib.sha256(content).hexdigest()
+        key = backup_key(path)
+
+        with self._locked():
+            versions = self._index.setdefault(key, [])
+            if versions and versions[-1].digest == digest:
+                self.skipped_identical += 1
+                return digest
+
+            try:
+                if self._write_object(digest, content):
+                    self.stored_objects += 1
+                else:
+                    self.deduplicated += 1
+            except OSError as e:
+                logging.error(f"BackupStore: Failed to store backup of {path}: {e}")
+                return None
+
+            versions.append(BackupVersion(digest, len(content), time.time(), os.path.abspath(path)))
+            if self._apply_retention_locked(key):
+                self._collect_garbage_locked()
+            self._save_index_locked()
+
+        logging.debug(f"BackupStore: Backed up {key} ({digest[:12]})")
+        return digest
+
+    def list_versions(self, path_or_key: str) -> List[BackupVersion]:
+        """Versions of a file (by path or key), newest first"""
+        with self._lock:
+            self._load_index()
+            key = path_or_key if path_or_key in self._index else backup_key(path_or_key)
+            return list(reversed(self._index.get(key, [])))
+
+    def read_version(self, digest: str) -> Optional[bytes]:
+        """Uncompressed content of a stored version"""
+        try:
+            with open(self._object_path(digest), 'rb') as f:
+                return zlib.decompress(f.read())
+        except (OSError, zlib.error) as e:
+            logging.error(f"BackupStore: Cannot read backup object {digest}: {e}")
+            return None
+
+    def restore(self, path_or_key: str, digest: Optional[str] = None, target_path: Optional[str] = None) -> bool:
+        """
+        Restore a version (default: newest) to target_path (default: its original path).
+        The file being replaced is backed up first, so a restore can itself be undone.
+        """
+        versions = self.list_versions(path_or_key)
+        if digest is not None:
+            versions = [v for v in versions if v.digest == digest]
+        if not versions:
+            logging.warning(f"BackupStore: No backup version found for {path_or_key}")
+            return False
+
+        version = versions[0]
+        target_path = target_path or version.source_path
+        content = self.read_version(version.digest)
+        if content is None:
+            return False
+        if hashlib.sha256(content).hexdigest() != version.digest:
+            logging.error(f"BackupStore: Backup object {version.digest} is corrupted")
+            return False
+
+        self.backup_file(target_path)
+        temp_path = target_path + '.restore_tmp'
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(content)
+            os.replace(temp_path, target_path)
+        except OSError as e:
+            logging.error(f"BackupStore: Failed to restore {target_path}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+
+        logging.info(f"BackupStore: Restored {target_path} from version {version.digest[:12]}")
+        return True
+
+    # ---- retention ------------------------------------------------------
+
+    def apply_retention(self):
+        """Apply the retention policy to every file and drop unreferenced objects"""
+        with self._locked():
+            for key in list(self._index):
+                self._apply_retention_locked(key)
+            self._collect_garbage_locked()
+            self._save_index_locked()
+
+    def _apply_retention_locked(self, key: str) -> bool:
+        """Trim one file's versions; returns True if any were dropped"""
+        versions = self._index.get(key, [])
+        before = len(versions)
+        kept = versions[-self.keep_versions:] if self.keep_versions > 0 else versions[-1:]
+        if self.max_age_days:
+            cutoff = time.time() - self.max_age_days * 86400
+            # The newest version is always kept, however old
+            kept = [v for v in kept[:-1] if v.created >= cutoff] + kept[-1:]
+        if kept:
+            self._index[key] = kept
+        else:
+            self._index.pop(key, None)
+        return len(kept) != before
+
+    def _collect_garbage_locked(self):
+        """Remove objects no version references (the index was just re-read under the file lock)"""
+        referenced = {v.digest for versions in self._index.values() for v in versions}
+        objects_root = os.path.join(self.root, OBJECTS_DIR)
+        for prefix in os.listdir(objects_root):
+            prefix_dir = os.path.join(objects_root, prefix)
+            if not os.path.isdir(prefix_dir):
+                continue
+            for name in os.listdir(prefix_dir):
+                if name not in referenced:
+                    try:
+                        os.remove(os.path.join(prefix_dir, name))
+                    except OSError as e:
+                        logging.warning(f"BackupStore: Could not remove unreferenced object {name}: {e}")
+
+    # ---- stats ----------------------------------------------------------
+
+    def get_stats(self) -> Dict:
+        """Get backup store statistics"""
+        with self._lock:
+            self._load_index()
+            digests = {v.digest for versions in self._index.values() for v in versions}
+            stored_bytes = 0
+            for digest in digests:
+                try:
+                    stored_bytes += os.path.getsize(self._object_path(digest))
+                except OSError:
+                    pass
+            return {
+                'root': self.root,
+                'files': len(self._index),
+                'versions': sum(len(versions) for versions in self._index.values()),
+                'objects': len(digests),
+                'stored_bytes': stored_bytes,
+                'original_bytes': sum(v.size for versions in self._index.values() for v in versions),
+                'skipped_identical': self.skipped_identical,
+                'deduplicated': self.deduplicated,
+            }
+
+    # ---- storage --------------------------------------------------------
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, OBJECTS_DIR, digest[:2], digest)
+
+    def _write_object(self, digest: str, content: bytes) -> bool:
+        """Store content under its digest; returns False if it was already stored"""
+        object_path = self._object_path(digest)
+        if os.path.exists(object_path):
+            return False
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        temp_path = object_path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(zlib.compress(content, self.compression_level))
+        os.replace(temp_path, object_path)
+        return True
+
+    @contextmanager
+    def _locked(self):
+        """Thread and inter-process lock, with the index freshly read from disk"""
+        with self._lock, file_lock(os.path.join(self.root, LOCK_FILE)):
+            self._load_index()
+            yield
+
+    def _load_index(self):
+        """Read the on-disk index (other processes and instances may have changed it)"""
+        index_path = os.path.join(self.root, INDEX_FILE)
+        if not os.path.exists(index_path):
+            self._index = {}
+            return
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            index: Dict[str, List[BackupVersion]] = {}
+            for key, versions in data.get('files', {}).items():
+                versions = [BackupVersion(**version) for version in versions]
+                if versions and not os.path.isabs(key):
+                    # Index written with '<parent>/<file>' keys; re-key by the full source path
+                    key = backup_key(versions[-1].source_path)
+                index.setdefault(key, []).extend(versions)
+            for versions in index.values():
+                versions.sort(key=lambda v: v.created)
+            self._index = index
+        except (OSError, ValueError, TypeError) as e:
+            logging.error(f"BackupStore: Could not read index {index_path}, starting empty: {e}")
+            self._index = {}
+
+    def _save_index_locked(self):
+        index_path = os.path.join(self.root, INDEX_FILE)
+        data = {'files': {key: [asdict(v) for v in versions] for key, versions in self._index.items()}}
+        try:
+            with atomic_write(index_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        except OSError as e:
+            logging.error(f"BackupStore: Could not write index {index_path}: {e}")
@@ -0,0 +1,63 @@
+"""
+FileID Load Worker for GeoEvent application
+Runs the staged DataLoader pipeline off the GUI thread
+"""
+
+import logging
+import threading
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from ..utils.data_loader import DataLoader, FileIDLoadCancelled
+
+
+class FileIDLoadWorker(QThread):
+    """
+    Worker thread for one FileID load
+    RESPONSIBILITIES:
+    - Run DataLoader.load_fileid_data stage by stage
+    - Publish each stage result to the GUI as soon as it is ready
+    - Stop at the next stage boundary when cancelled (superseded by a newer load)
+
+    Every signal carries the load generation so the receiver can ignore
+    results from loads it has already superseded.
+    """
+
+    stage_ready = pyqtSignal(int, str, object)  # (generation, stage, partial result dict)
+    load_finished = pyqtSignal(int, object)  # (generation, result dict)
+    load_failed = pyqtSignal(int, str)  # (generation, error message)
+    load_cancelled = pyqtSignal(int)  # generation
+
+    def __init__(self, fileid_folder, generation: int):
+        super().__init__()
+        self.fileid_folder = fileid_folder
+        self.generation = generation
+        self._cancel_event = threading.Event()
+        # Own DataLoader so concurrent (superseded) loads never share state
+        self.data_loader = DataLoader()
+
+    def cancel(self):
+        """Request cancellation; takes effect at the next stage boundary"""
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        """Check whether cancellation was requested"""
+        return self._cancel_event.is_set()
+
+    def run(self):
+        """Execute the staged load in background thread"""
+        try:
+            result = self.data_loader.load_fileid_data(
+                self.fileid_folder,
+                on_stage=self._publish_stage,
+                is_cancelled=self.is_cancelled
+            )
+            self.load_finished.emit(self.generation, result)
+        except FileIDLoadCancelled:
+            self.load_cancelled.emit(self.generation)
+        except Exception as e:
+            logging.error(f"FileIDLoadWorker: Load of {self.fileid_folder.fileid} failed: {e}")
+            self.load_failed.emit(self.generation, str(e))
+
+    def _publish_stage(self, stage: str, result: dict):
+        """Emit a shallow snapshot so later stages don't mutate what the GUI received"""
+        self.stage_ready.emit(self.generation, stage, dict(result))
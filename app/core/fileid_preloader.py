@@ -0,0 +1,207 @@
+"""
+FileID Preloader for GeoEvent application
+Pre-parses adjacent FileIDs in a background thread so next/prev switching is instant
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any
+from PyQt6.QtCore import QThread, pyqtSignal, Qt
+from PyQt6.QtGui import QImage
+
+from app.config import get_config
+from ..utils.data_loader import DataLoader
+from ..utils.latency import measure_latency
+from .session_store import estimate_object_size
+
+
+class FileIDPreloader(QThread):
+    """
+    Background loader for adjacent FileIDs
+    RESPONSIBILITIES:
+    - Run DataLoader.load_fileid_data for queued FileIDs off the GUI thread
+    - Keep results in a bounded LRU cache until the UI takes them
+    - Decode the first few images of each preloaded FileID (QImage is thread-safe)
+    - Drop queued/in-flight work when the user jumps to an unrelated FileID
+    """
+
+    fileid_preloaded = pyqtSignal(str)  # fileid
+
+    def __init__(self, max_entries: int = None, warm_image_count: int = None):
+        super().__init__()
+        config = get_config()
+        self.max_entries = max_entries if max_entries is not None else config.cache.FILEID_PRELOAD_ENTRIES
+        self.warm_image_count = warm_image_count if warm_image_count is not None else config.cache.FILEID_PRELOAD_WARM_IMAGES
+
+        # Own DataLoader: the GUI's loader keeps per-call state and is not thread-safe
+        self.data_loader = DataLoader()
+
+        self._cond = threading.Condition()
+        self._pending: List[Any] = []  # FileIDFolder objects in priority order
+        self._wanted = set()  # FileIDs whose results should be kept
+        self._in_flight: Optional[str] = None
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}  # estimated bytes per cached FileID
+        self._running = True
+
+        self.hits = 0
+        self.misses = 0
+
+    def request(self, fileid_folders: List[Any]):
+        """
+        Replace the preload queue with fileid_folders (highest priority first).
+        Anything queued or in flight for other FileIDs is cancelled.
+        """
+        with self._cond:
+            self._wanted = {f.fileid for f in fileid_folders if f is not None}
+            self._pending = [
+                f for f in fileid_folders
+                if f is not None and f.fileid not in self._cache
+            ]
+            self._cond.notify()
+
+        if not self.isRunning() and self._running:
+            self.start(QThread.Priority.LowPriority)
+
+    def cancel(self):
+        """Drop all queued work; an in-flight load is discarded when it finishes"""
+        with self._cond:
+            self._pending = []
+            self._wanted = set()
+
+    def take(self, fileid: str) -> Optional[Dict[str, Any]]:
+        """
+        Remove and return preloaded data for fileid, or None if not ready.
+        Data is handed over (not copied) because the UI mutates it.
+        """
+        with self._cond:
+            data = self._cache.pop(fileid, None)
+            self._sizes.pop(fileid, None)
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            logging.debug(f"FileIDPreloader: Cache hit for {fileid}")
+        return data
+
+    def invalidate(self, fileid: str):
+        """Forget cached data for fileid (e.g. its files are being rewritten)"""
+        with self._cond:
+            self._cache.pop(fileid, None)
+            self._sizes.pop(fileid, None)
+            self._pending = [f for f in self._pending if f.fileid != fileid]
+            if self._in_flight == fileid:
+                self._wanted.discard(fileid)
+
+    def clear(self):
+        """Drop all cached results"""
+        with self._cond:
+            self._cache.clear()
+            self._sizes.clear()
+
+    def get_memory_usage(self) -> int:
+        """Estimated bytes held by preloaded FileIDs"""
+        with self._cond:
+            return sum(self._sizes.values())
+
+    def release(self, nbytes: int) -> int:
+        """Drop least recently preloaded FileIDs until nbytes are freed (MemoryGovernor callback)"""
+        released = 0
+        with self._cond:
+            while released < nbytes and self._cache:
+                fileid, _ = self._cache.popitem(last=False)
+                released += self._sizes.pop(fileid, 0)
+        return released
+
+    @staticmethod
+    def _estimate_size(data: Dict[str, Any]) -> int:
+        """Decoded warm images plus the parsed events and GPS points"""
+        size = sum(image.sizeInBytes() for image in data.get('warm_images', {}).values())
+        size += estimate_object_size(data.get('events', []))
+        gps_data = data.get('gps_data')
+        if gps_data is not None:
+            size += gps_data.estimate_memory_usage()
+        return size
+
+    def get_stats(self) -> Dict:
+        """Get preloader statistics"""
+        with self._cond:
+            return {
+                'cached_fileids': list(self._cache.keys()),
+                'pending': [f.fileid for f in self._pending],
+                'in_flight': self._in_flight,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def run(self):
+        """Process the preload queue in background thread"""
+        logging.debug("FileIDPreloader thread started")
+
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._running:
+                    break
+                fileid_folder = self._pending.pop(0)
+                self._in_flight = fileid_folder.fileid
+
+            try:
+                data = self.data_loader.load_fileid_data(fileid_folder)
+                data['warm_images'] = self._warm_images(fileid_folder.fileid, data.get('image_paths', []))
+            except Exception as e:
+                logging.warning(f"FileIDPreloader: Failed to preload {fileid_folder.fileid}: {e}")
+                data = None
+
+            size = self._estimate_size(data) if data is not None else 0
+            stored = False
+            with self._cond:
+                self._in_flight = None
+                if data is not None and fileid_folder.fileid in self._wanted:
+                    self._cache[fileid_folder.fileid] = data
+                    self._cache.move_to_end(fileid_folder.fileid)
+                    self._sizes[fileid_folder.fileid] = size
+                    while len(self._cache) > self.max_entries:
+                        evicted, _ = self._cache.popitem(last=False)
+                        self._sizes.pop(evicted, None)
+                        logging.debug(f"FileIDPreloader: Evicted {evicted}")
+                    stored = True
+
+            if stored:
+                logging.debug(f"FileIDPreloader: Preloaded {fileid_folder.fileid}")
+                self.fileid_preloaded.emit(fileid_folder.fileid)
+
+        logging.debug("FileIDPreloader thread stopped")
+
+    def _warm_images(self, fileid: str, image_paths: List[str]) -> Dict[str, QImage]:
+        """Decode the first images of a FileID, stopping early if it is no longer wanted"""
+        warm_images = {}
+        for image_path in image_paths[:self.warm_image_count]:
+            with self._cond:
+                if fileid not in self._wanted or not self._running:
+                    break
+            with measure_latency('image_decode.preload'):
+                image = QImage(image_path)
+                # Same display scaling as PhotoPreviewTab.load_current_image
+                if image.width() > 1920:
+                    image = image.scaledToWidth(1920, Qt.TransformationMode.FastTransformation)
+            if image.isNull():
+                continue
+            warm_images[image_path] = image
+        return warm_images
+
+    def stop(self):
+        """Stop the preload thread"""
+        with self._cond:
+            self._running = False
+            self._pending = []
+            self._wanted = set()
+            self._cache.clear()
+            self._cond.notify_all()
+
+        if self.isRunning() and not self.wait(5000):
+            logging.warning("FileIDPreloader thread did not stop gracefully, forcing termination")
+            self.terminate()
+            self.wait()
@@ -0,0 +1,124 @@
+"""
+Frame Dispatcher for GeoEvent application
+Coalesces high-rate UI intents (drags) into frame-paced, latest-wins callbacks
+"""
+
+import time
+import logging
+from typing import Callable, Optional
+from PyQt6.QtCore import QObject, QTimer
+
+from ..utils.latency import record_latency
+
+
+class FramePacedDispatcher(QObject):
+    """
+    Latest-wins dispatcher for pointer-driven updates
+    RESPONSIBILITIES:
+    - Accept any number of submit() calls per frame, keeping only the latest arguments
+    - Run the cheap on_frame callback at most once per frame interval
+    - Run the expensive on_settle callback once the submissions stop for settle_ms
+    - Track how many intents were coalesced away
+
+    Both callbacks run on the GUI thread (QTimer driven). With a name, their
+    durations are recorded as '<name>.frame' and '<name>.settle' latencies.
+    """
+
+    def __init__(self, on_frame: Optional[Callable] = None, on_settle: Optional[Callable] = None,
+                 frame_ms: int = 16, settle_ms: int = 120, parent: QObject = None, name: str = None):
+        super().__init__(parent)
+        self.on_frame = on_frame
+        self.on_settle = on_settle
+        self.name = name
+
+        self._pending_args: Optional[tuple] = None
+        self._latest_args: Optional[tuple] = None
+        self._last_frame_time = 0.0
+        self.frame_ms = frame_ms
+
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.timeout.connect(self._run_frame)
+
+        self._settle_timer = QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.setInterval(settle_ms)
+        self._settle_timer.timeout.connect(self._run_settle)
+
+        self.submitted_count = 0
+        self.frame_count = 0
+        self.settle_count = 0
+
+    def submit(self, *args):
+        """Record the latest intent; schedules a frame and (re)arms the settle timer"""
+        self.submitted_count += 1
+        self._pending_args = args
+        self._latest_args = args
+
+        if not self._frame_timer.isActive():
+            # Keep at least frame_ms between dispatches, but don't delay an idle pointer
+            elapsed_ms = (time.perf_counter() - self._last_frame_time) * 1000
+            self._frame_timer.start(int(max(0, self.frame_ms - elapsed_ms)))
+
+        if self.on_settle is not None:
+            self._settle_timer.start()
+
+    def flush(self):
+        """Run any pending frame and settle work immediately"""
+        if self._frame_timer.isActive():
+            self._frame_timer.stop()
+            self._run_frame()
+        if self._settle_timer.isActive():
+            self._settle_timer.stop()
+            self._run_settle()
+
+    def cancel(self):
+        """Drop pending work (e.g. the target data was unloaded)"""
+        self._frame_timer.stop()
+        self._settle_timer.stop()
+        self._pending_args = None
+        self._latest_args = None
+
+    def is_settling(self) -> bool:
+        """True while intents are still arriving (settle work not yet run)"""
+        return self._settle_timer.isActive()
+
+    def get_stats(self) -> dict:
+        """Get dispatcher statistics"""
+        return {
+            'submitted': self.submitted_count,
+            'frames': self.frame_count,
+            'settles': self.settle_count,
+            'coalesced': self.submitted_count - self.frame_count
+        }
+
+    def _run_frame(self):
+        args, self._pending_args = self._pending_args, None
+        if args is None:
+            return
+        self._last_frame_time = time.perf_counter()
+        self.frame_count += 1
+        if self.on_frame is not None:
+            try:
+                self.on_frame(*args)
+            except Exception as e:
+                logging.error(f"FramePacedDispatcher: frame callback failed: {e}", exc_info=True)
+            if self.name:
+                record_latency(f'{self.name}.frame', time.perf_counter() - self._last_frame_time)
+
+    def _run_settle(self):
+        args, self._latest_args = self._latest_args, None
+        if args is None:
+            return
+        # The settled state supersedes any frame still queued
+        self._frame_timer.stop()
+        self._pending_args = None
+        self.settle_count += 1
+        if self.on_settle is not None:
+            started = time.perf_counter()
+            try:
+                self.on_settle(*args)
+            except Exception as e:
+                logging.error(f"FramePacedDispatcher: settle callback failed: {e}", exc_info=True)
+            if self.name:
+                record_latency(f'{self.name}.settle', time.perf_counter() - started)
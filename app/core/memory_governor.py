@@ -0,0 +1,202 @@
+"""
+Memory Governor for GeoEvent application
+Central memory budget: per-component byte accounting and priority-ordered eviction
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import psutil
+
+from app.config import get_config
+
+MB = 1024 * 1024
+
+
+@dataclass
+class MemoryComponent:
+    """One registered memory consumer"""
+    name: str
+    usage: Callable[[], int]  # bytes currently held
+    release: Optional[Callable[[int], int]]  # free at least n bytes if possible; returns bytes freed (None = accounting only)
+    priority: int = 50  # lower is evicted first (cheapest to rebuild)
+    budget_bytes: int = 0  # own budget; 0 = only governed by the process budget
+    evictions: int = 0
+    released_bytes: int = 0
+
+
+class MemoryGovernor:
+    """
+    Central memory budget across caches
+    RESPONSIBILITIES:
+    - Keep a registry of components (image cache, preloaded FileIDs, session stores, GPS indexes)
+      that report their byte cost and expose a release callback
+    - Track process RSS and system memory percent
+    - Enforce per-component budgets
+    - Under process-budget or system pressure, release memory from components
+      in priority order (cheapest to rebuild first) until the target is met
+    - After a pressure release, wait a cooldown before releasing again at the same
+      or a lower pressure level (RSS lags behind what the caches freed)
+    Call enforce() on the thread that owns the components (the GUI thread).
+    """
+
+    def __init__(self, process_budget_mb: int = None):
+        config = get_config()
+        self.process_budget_bytes = (process_budget_mb if process_budget_mb is not None
+                                     else config.memory.PROCESS_BUDGET_MB) * MB
+        self.warning_percent = config.memory.WARNING_THRESHOLD_PERCENT
+        self.critical_percent = config.memory.CRITICAL_THRESHOLD_PERCENT
+        self.warning_release_percent = config.memory.WARNING_RELEASE_PERCENT
+        self.critical_release_percent = config.memory.CRITICAL_RELEASE_PERCENT
+        self.release_cooldown_sec = config.memory.RELEASE_COOLDOWN_SEC
+
+        self._lock = threading.Lock()
+        self._components: Dict[str, MemoryComponent] = {}
+        self._process = psutil.Process(os.getpid())
+
+        self.last_rss = 0
+        self.last_system_percent = 0.0
+        self.enforcements = 0
+        self._last_pressure_release = None  # (monotonic time, pressure level) of the last pressure release
+
+    def register(self, name: str, usage: Callable[[], int], release: Optional[Callable[[int], int]],
+                 priority: int = 50, budget_bytes: int = 0) -> MemoryComponent:
+        """Register (or replace) a component; release=None reports usage without ever being released"""
+        component = MemoryComponent(name, usage, release, priority, budget_bytes)
+        with self._lock:
+            self._components[name] = component
+        return component
+
+    def unregister(self, name: str):
+        """Remove a component"""
+        with self._lock:
+            self._components.pop(name, None)
+
+    def set_budget(self, name: str, budget_bytes: int):
+        """Change a component's own budget (0 = none)"""
+        with self._lock:
+            if name in self._components:
+                self._components[name].budget_bytes = budget_bytes
+
+    def process_rss(self) -> int:
+        """Resident set size of this process in bytes"""
+        try:
+            return self._process.memory_info().rss
+        except psutil.Error as e:
+            logging.debug(f"MemoryGovernor: Could not read process RSS: {e}")
+            return 0
+
+    def usage_by_component(self) -> Dict[str, int]:
+        """Bytes reported by each component"""
+        return {component.name: self._usage(component) for component in self._ordered()}
+
+    def enforce(self, rss: Optional[int] = None, system_percent: Optional[float] = None,
+                now: Optional[float] = None) -> int:
+        """
+        Apply component budgets, then relieve process/system pressure in priority order.
+        rss, system_percent and now (monotonic seconds) default to current readings.
+        Returns bytes released.
+        """
+        if rss is None:
+            rss = self.process_rss()
+        if system_percent is None:
+            system_percent = psutil.virtual_memory().percent
+        self.last_rss = rss
+        self.last_system_percent = system_percent
+
+        if now is None:
+            now = time.monotonic()
+        components = [component for component in self._ordered() if component.release is not None]
+        released = 0
+
+        # Per-component budgets
+        for component in components:
+            if component.budget_bytes:
+                over = self._usage(component) - component.budget_bytes
+                if over > 0:
+                    released += self._release(component, over)
+
+        # Process budget and system pressure
+        tracked = sum(self._usage(component) for component in components)
+        needed = rss - released - self.process_budget_bytes if self.process_budget_bytes else 0
+        level = 1 if needed > 0 else 0
+        if system_percent >= self.critical_percent:
+            needed = max(needed, tracked * self.critical_release_percent // 100)
+            level = 3
+        elif system_percent >= self.warning_percent:
+            needed = max(needed, tracked * self.warning_release_percent // 100)
+            level = 2
+
+        if needed > 0 and self._cooling_down(level, now):
+            logging.debug(f"MemoryGovernor: Pressure release skipped during cooldown "
+                          f"(RSS {rss / MB:.0f}MB, system {system_percent:.0f}%)")
+        elif needed > 0:
+            self._last_pressure_release = (now, level)
+            for component in components:
+                if needed <= 0:
+                    break
+                if not self._usage(component):
+                    continue
+                freed = self._release(component, needed)
+                released += freed
+                needed -= freed
+            logging.info(f"MemoryGovernor: Released {released / MB:.1f}MB "
+                         f"(RSS {rss / MB:.0f}MB, system {system_percent:.0f}%)")
+
+        self.enforcements += 1
+        return released
+
+    def _cooling_down(self, level: int, now: float) -> bool:
+        """Within the cooldown of the last pressure release, and pressure has not escalated"""
+        if self._last_pressure_release is None:
+            return False
+        last_time, last_level = self._last_pressure_release
+        return now - last_time < self.release_cooldown_sec and level <= last_level
+
+    def get_stats(self) -> Dict:
+        """Get governor statistics"""
+        components = self._ordered()
+        return {
+            'rss_mb': self.last_rss / MB,
+            'system_percent': self.last_system_percent,
+            'process_budget_mb': self.process_budget_bytes / MB,
+            'enforcements': self.enforcements,
+            'components': [
+                {
+                    'name': component.name,
+                    'priority': component.priority,
+                    'usage_mb': self._usage(component) / MB,
+                    'budget_mb': component.budget_bytes / MB,
+                    'evictions': component.evictions,
+                    'released_mb': component.released_bytes / MB,
+                }
+                for component in components
+            ],
+        }
+
+    def _ordered(self) -> List[MemoryComponent]:
+        with self._lock:
+            return sorted(self._components.values(), key=lambda component: component.priority)
+
+    def _usage(self, component: MemoryComponent) -> int:
+        try:
+            return max(0, int(component.usage()))
+        except Exception as e:
+            logging.error(f"MemoryGovernor: Usage of {component.name} failed: {e}")
+            return 0
+
+    def _release(self, component: MemoryComponent, nbytes: int) -> int:
+        try:
+            freed = max(0, int(component.release(nbytes)))
+        except Exception as e:
+            logging.error(f"MemoryGovernor: Release from {component.name} failed: {e}", exc_info=True)
+            return 0
+        if freed:
+            component.evictions += 1
+            component.released_bytes += freed
+            logging.debug(f"MemoryGovernor: {component.name} released {freed / MB:.1f}MB")
+        return freed
@@ -13,11 +13,13 @@ from app.config import get_config
 
 class MemoryManager(QThread):
     """
-    Monitors system memory usage and emits warnings
+    Monitors system and process memory usage and emits warnings
     Thread-safe implementation with proper cleanup
+    Samples are handed to the MemoryGovernor (memory_sampled) on the GUI thread.
     """
 
     memory_warning = pyqtSignal(int)  # percentage
+    memory_sampled = pyqtSignal(object, float)  # (process RSS bytes, system percent)
 
     def __init__(self, check_interval: int = None):
         super().__init__()
@@ -31,6 +33,7 @@ class MemoryManager(QThread):
         self._running_lock = QMutex()
         self._running = True
         self._stop_event = threading.Event()
+        self._process = psutil.Process(os.getpid())
         
         logging.info(f"MemoryManager initialized with warning={self.warning_threshold}%, critical={self.critical_threshold}%")
 
@@ -58,10 +61,14 @@ class MemoryManager(QThread):
 
                 memory = psutil.virtual_memory()
                 usage_percent = memory.percent
+                rss = self._process.memory_info().rss
                 
                 # Log memory usage if enabled
                 if self.log_memory_usage:
-                    logging.debug(f"Memory usage: {usage_percent:.1f}% ({memory.used / (1024**3):.2f}GB / {memory.total / (1024**3):.2f}GB)")
+                    logging.debug(f"Memory usage: {usage_percent:.1f}% ({memory.used / (1024**3):.2f}GB / {memory.total / (1024**3):.2f}GB), "
+                                  f"process RSS {rss / (1024**2):.0f}MB")
+
+                self.memory_sampled.emit(rss, usage_percent)
 
                 # Emit warning if threshold exceeded
                 if usage_percent > self.warning_threshold:
@@ -0,0 +1,250 @@
+"""
+Save Service for GeoEvent application
+One long-lived write-behind thread with a per-FileID coalescing queue
+"""
+
+import errno
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from app.config import get_config
+from ..utils.latency import measure_latency, record_latency
+from ..utils.tracing import trace_span
+
+# Windows "file in use by another process" / "lock violation"
+_WINDOWS_SHARE_ERRORS = (32, 33)
+
+
+class TransientSaveError(OSError):
+    """The target file is temporarily locked (e.g. open in Excel); the save is retried"""
+
+
+def ensure_writable(path: str):
+    """
+    Raise TransientSaveError if an existing file can't be opened for writing right now.
+    Checked before any file of a save is touched, so a retry never leaves a half-written set.
+    """
+    if not os.path.exists(path):
+        return
+    try:
+        with open(path, 'a'):
+            pass
+    except PermissionError as e:
+        raise TransientSaveError(e.errno, f"File is locked: {path}") from e
+    except OSError as e:
+        if e.errno in (errno.EBUSY, errno.EAGAIN) or getattr(e, 'winerror', None) in _WINDOWS_SHARE_ERRORS:
+            raise TransientSaveError(e.errno, f"File is busy: {path}") from e
+        raise
+
+
+@dataclass
+class SaveJob:
+    """Snapshot of one FileID's data, taken on the GUI thread under the data lock"""
+    fileid: str
+    fileid_folder: Any
+    events: List[Any] = field(default_factory=list)
+    lane_fixes: List[Any] = field(default_factory=list)
+    save_events: bool = False
+    save_lanes: bool = False
+    journal_revision: Optional[int] = None  # autosave journal revision of the FileID when the snapshot was taken
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    due_at: float = 0.0
+    attempts: int = 0
+
+    def absorb(self, older: 'SaveJob'):
+        """Coalesce an older queued job for the same FileID into this (newer) snapshot"""
+        self.save_events = self.save_events or older.save_events
+        self.save_lanes = self.save_lanes or older.save_lanes
+        self.enqueued_at = min(self.enqueued_at, older.enqueued_at)
+
+
+class SaveService(QThread):
+    """
+    Write-behind save queue
+    RESPONSIBILITIES:
+    - Accept snapshots from the GUI thread without blocking it on disk I/O
+    - Keep at most one queued job per FileID, newer snapshots replacing older ones
+    - Debounce bursts of edits: a job is written once no newer snapshot arrived for debounce_ms
+    - Write jobs one at a time (saves never race each other), retrying locked files with backoff
+    - Expose queue depth and enqueue-to-written latency
+    """
+
+    save_completed = pyqtSignal(str, bool)  # (fileid, success)
+    job_finished = pyqtSignal(object, bool)  # (SaveJob, success), emitted just before save_completed
+
+    def __init__(self, writer: Callable[[SaveJob], bool], debounce_ms: int = None,
+                 max_attempts: int = None, retry_base_delay_ms: int = None):
+        super().__init__()
+        config = get_config()
+        self.writer = writer
+        self.debounce_ms = debounce_ms if debounce_ms is not None else config.save.DEBOUNCE_MS
+        self.max_attempts = max_attempts if max_attempts is not None else config.save.MAX_ATTEMPTS
+        self.retry_base_delay_ms = (retry_base_delay_ms if retry_base_delay_ms is not None
+                                    else config.save.RETRY_BASE_DELAY_MS)
+
+        self._cond = threading.Condition()
+        self._pending: Dict[str, SaveJob] = {}
+        self._in_flight: Optional[str] = None
+        self._running = True
+
+        self.submitted = 0
+        self.coalesced = 0
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+        self._latency_total_ms = 0.0
+        self._latency_max_ms = 0.0
+        self._latency_last_ms = 0.0
+
+    def submit(self, job: SaveJob, immediate: bool = False) -> bool:
+        """
+        Queue a snapshot; replaces any queued job for the same FileID.
+        immediate=True skips the debounce (explicit saves, merge).
+        Returns True if an older queued job was coalesced into this one.
+        """
+        with self._cond:
+            job.due_at = time.perf_counter() + (0 if immediate else self.debounce_ms / 1000.0)
+            older = self._pending.pop(job.fileid, None)
+            if older is not None:
+                job.absorb(older)
+                if immediate:
+                    job.due_at = min(job.due_at, older.due_at)
+                self.coalesced += 1
+            self._pending[job.fileid] = job
+            self.submitted += 1
+            self._cond.notify_all()
+
+        if not self.isRunning() and self._running:
+            self.start(QThread.Priority.LowPriority)
+        return older is not None
+
+    def is_pending(self, fileid: str) -> bool:
+        """True while a save for fileid is queued or being written"""
+        with self._cond:
+            return fileid in self._pending or self._in_flight == fileid
+
+    def queue_depth(self) -> int:
+        """Queued plus in-flight jobs"""
+        with self._cond:
+            return len(self._pending) + (1 if self._in_flight else 0)
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Make every queued job due now and wait until all are written. Returns False on timeout."""
+        deadline = time.perf_counter() + timeout
+        with self._cond:
+            now = time.perf_counter()
+            for job in self._pending.values():
+                job.due_at = min(job.due_at, now)
+            self._cond.notify_all()
+            if (self._pending or self._in_flight) and not self.isRunning() and self._running:
+                self.start(QThread.Priority.LowPriority)
+            while self._pending or self._in_flight:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0 or not self._running:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def get_stats(self) -> Dict:
+        """Get save queue statistics"""
+        with self._cond:
+            return {
+                'queue_depth': len(self._pending) + (1 if self._in_flight else 0),
+                'pending': list(self._pending.keys()),
+                'in_flight': self._in_flight,
+                'submitted': self.submitted,
+                'coalesced': self.coalesced,
+                'completed': self.completed,
+                'failed': self.failed,
+                'retries': self.retries,
+                'latency_last_ms': self._latency_last_ms,
+                'latency_avg_ms': self._latency_total_ms / self.completed if self.completed else 0.0,
+                'latency_max_ms': self._latency_max_ms,
+            }
+
+    def run(self):
+        """Write due jobs in background thread"""
+        logging.debug("SaveService thread started")
+
+        while True:
+            with self._cond:
+                job = self._next_due_job()
+                if job is None:
+                    break
+                del self._pending[job.fileid]
+                self._in_flight = job.fileid
+
+            with measure_latency('save.write'), trace_span('save.write', 'save', fileid=job.fileid):
+                success = self._write_with_retry(job)
+            latency_ms = (time.perf_counter() - job.enqueued_at) * 1000
+            if success:
+                record_latency('save.edit_to_disk', latency_ms / 1000)
+
+            with self._cond:
+                self._in_flight = None
+                if success:
+                    self.completed += 1
+                    self._latency_total_ms += latency_ms
+                    self._latency_max_ms = max(self._latency_max_ms, latency_ms)
+                    self._latency_last_ms = latency_ms
+                else:
+                    self.failed += 1
+                self._cond.notify_all()
+
+            logging.debug(f"SaveService: Saved {job.fileid} success={success} "
+                          f"({latency_ms:.0f} ms after first edit, {job.attempts} attempt(s))")
+            self.job_finished.emit(job, success)
+            self.save_completed.emit(job.fileid, success)
+
+        logging.debug("SaveService thread stopped")
+
+    def _next_due_job(self) -> Optional[SaveJob]:
+        # Called with _cond held; blocks until the earliest job is due or the service stops
+        while self._running:
+            if not self._pending:
+                self._cond.wait()
+                continue
+            job = min(self._pending.values(), key=lambda j: j.due_at)
+            wait = job.due_at - time.perf_counter()
+            if wait <= 0:
+                return job
+            self._cond.wait(wait)
+        return None
+
+    def _write_with_retry(self, job: SaveJob) -> bool:
+        delay = self.retry_base_delay_ms / 1000.0
+        while True:
+            job.attempts += 1
+            try:
+                return bool(self.writer(job))
+            except TransientSaveError as e:
+                if job.attempts >= self.max_attempts or not self._running:
+                    logging.error(f"SaveService: Giving up on {job.fileid} after {job.attempts} attempts: {e}")
+                    return False
+                self.retries += 1
+                logging.warning(f"SaveService: {e}; retrying {job.fileid} in {delay:.2f}s")
+                with self._cond:
+                    self._cond.wait_for(lambda: not self._running, timeout=delay)
+                delay *= 2
+            except Exception as e:
+                logging.error(f"SaveService: Save of {job.fileid} failed: {e}", exc_info=True)
+                return False
+
+    def stop(self, timeout: float = 30.0):
+        """Write everything still queued, then stop the thread"""
+        if not self.flush(timeout):
+            logging.warning(f"SaveService: Stopping with unsaved jobs: {self.get_stats()['pending']}")
+        with self._cond:
+            self._running = False
+            self._pending.clear()
+            self._cond.notify_all()
+
+        if self.isRunning() and not self.wait(5000):
+            logging.warning("SaveService thread did not stop gracefully, forcing termination")
+            self.terminate()
+            self.wait()
@@ -0,0 +1,376 @@
+"""
+Session Store for GeoEvent application
+LRU-bounded per-FileID cache that spills cold entries to disk
+"""
+
+import os
+import sys
+import pickle
+import shutil
+import logging
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Optional, Set
+
+import psutil
+
+from app.config import get_config
+from app.utils.slots import instance_values
+from ..models.record_tables import EventTable, LaneFixTable, compact_records, expand_records
+
+
+def estimate_object_size(value: Any) -> int:
+    """
+    Estimate memory footprint in bytes of a value held in the store.
+    Lists of dataclass objects (Event, LaneFix) are measured per object,
+    including their attribute values; compacted tables report their own size.
+    """
+    if isinstance(value, (EventTable, LaneFixTable)):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        size = sys.getsizeof(value)
+        for item in value:
+            size += estimate_object_size(item)
+        return size
+
+    size = sys.getsizeof(value)
+    attrs = getattr(value, '__dict__', None)
+    if attrs is not None:
+        size += sys.getsizeof(attrs)
+    for attr_value in instance_values(value):
+        size += sys.getsizeof(attr_value)
+    return size
+
+
+def spill_root() -> str:
+    """Per-user folder holding one spill folder per running GeoEvent session"""
+    return os.path.join(os.path.expanduser("~/.geoevent"), "spill")
+
+
+def session_name() -> str:
+    """Name of this process's per-session files: session-<pid>-<start>, so a reused pid is not mistaken for it"""
+    return f"session-{os.getpid()}-{int(psutil.Process().create_time())}"
+
+
+def is_stale_session(name: str) -> bool:
+    """True for a session-<pid>-<start> name whose process is no longer running"""
+    parts = name.split('-')
+    if len(parts) != 3 or parts[0] != 'session' or not (parts[1].isdigit() and parts[2].isdigit()):
+        return False
+    try:
+        return int(psutil.Process(int(parts[1])).create_time()) != int(parts[2])
+    except psutil.Error:
+        return True
+
+
+def session_spill_dir(root: Optional[str] = None) -> str:
+    """Spill folder of this process"""
+    return os.path.join(root or spill_root(), session_name())
+
+
+def sweep_stale_spill_dirs(root: Optional[str] = None) -> int:
+    """Remove spill folders of sessions that are no longer running (left behind by a crash); returns folders removed"""
+    root = root or spill_root()
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return 0
+    removed = 0
+    for name in names:
+        if is_stale_session(name):
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+            removed += 1
+    if removed:
+        logging.info(f"FileIDSessionStore: Removed {removed} spill folder(s) left by earlier sessions")
+    return removed
+
+
+class FileIDSessionStore(MutableMapping):
+    """
+    Dict-like store of per-FileID session data (events, lane fixes)
+    RESPONSIBILITIES:
+    - Keep the N most recently used FileIDs in memory
+    - Compact Event/LaneFix lists of FileIDs no longer on screen into column tables
+    - Spill colder entries to zlib-compressed pickles in a private folder under
+      this session's spill folder (~/.geoevent/spill/session-<pid>-<start>)
+    - Reload spilled entries transparently on access
+    - Account estimated memory per hot entry
+
+    Drop-in replacement for the plain dicts PhotoPreviewTab used before:
+    membership, get/set/del, iteration and clear() behave the same.
+    Compacted and spilled entries come back as new lists of new objects on access.
+    """
+
+    def __init__(self, name: str, max_hot_entries: int = None, spill_dir: Optional[str] = None):
+        config = get_config()
+        self.name = name
+        self.max_hot_entries = max_hot_entries if max_hot_entries is not None else config.cache.SESSION_HOT_FILEIDS
+        self._spill_dir = spill_dir
+        self._owns_spill_dir = spill_dir is None
+
+        self._lock = threading.RLock()
+        self._hot: "OrderedDict[str, Any]" = OrderedDict()
+        self._hot_sizes: Dict[str, int] = {}
+        self._stale_sizes: Set[str] = set()  # hot entries re-assigned in place, measured on next read
+        self._spilled: Dict[str, str] = {}  # key -> spill file path
+        self._pinned: Optional[str] = None
+
+        self.spill_count = 0
+        self.reload_count = 0
+        self.compact_count = 0
+
+    # MutableMapping interface
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            if key in self._hot:
+                self._hot.move_to_end(key)
+                value = self._hot[key]
+                if isinstance(value, (EventTable, LaneFixTable)):
+                    value = expand_records(value)
+                    self._store_hot(key, value)
+                return value
+            if key in self._spilled:
+                value = expand_records(self._reload(key))
+                self._store_hot(key, value)
+                return value
+            raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        with self._lock:
+            self._discard_spill_file(key)
+            self._store_hot(key, value)
+
+    def __delitem__(self, key: str):
+        with self._lock:
+            if key in self._hot:
+                del self._hot[key]
+                self._hot_sizes.pop(key, None)
+                self._stale_sizes.discard(key)
+            elif key in self._spilled:
+                self._discard_spill_file(key)
+            else:
+                raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self._hot or key in self._spilled
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._hot.keys()) + list(self._spilled.keys()))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._hot) + len(self._spilled)
+
+    def clear(self):
+        """Drop all entries, hot and spilled"""
+        with self._lock:
+            self._hot.clear()
+            self._hot_sizes.clear()
+            self._stale_sizes.clear()
+            for key in list(self._spilled.keys()):
+                self._discard_spill_file(key)
+
+    # Store-specific API
+
+    def pin(self, key: Optional[str]):
+        """Keep key in memory regardless of LRU order (the FileID on screen); the previous one is compacted"""
+        with self._lock:
+            previous, self._pinned = self._pinned, key
+            if previous is not None and previous != key and previous in self._hot:
+                self._compact(previous)
+
+    def touch(self, key: str):
+        """Mark key as recently used without reloading it"""
+        with self._lock:
+            if key in self._hot:
+                self._hot.move_to_end(key)
+
+    def refresh_size(self, key: str):
+        """Re-measure a hot entry after its value was mutated in place"""
+        with self._lock:
+            if key in self._hot:
+                self._hot_sizes[key] = estimate_object_size(self._hot[key])
+                self._stale_sizes.discard(key)
+
+    def spill_all(self) -> int:
+        """Spill every unpinned hot entry to disk; returns estimated bytes released"""
+        with self._lock:
+            released = 0
+            for key in [k for k in self._hot if k != self._pinned]:
+                released += self._spill(key)
+            return released
+
+    def compact_all(self) -> int:
+        """Compact every unpinned hot entry into a column table; returns estimated bytes released"""
+        with self._lock:
+            return sum(self._compact(key) for key in [k for k in self._hot if k != self._pinned])
+
+    def release(self, nbytes: int) -> int:
+        """
+        Release nbytes (MemoryGovernor callback): compact unpinned entries in memory first,
+        then spill least recently used ones to disk
+        """
+        with self._lock:
+            self._refresh_stale_sizes()
+            released = 0
+            for key in [k for k in self._hot if k != self._pinned]:
+                if released >= nbytes:
+                    break
+                released += self._compact(key)
+            for key in [k for k in self._hot if k != self._pinned]:
+                if released >= nbytes:
+                    break
+                released += self._spill(key)
+            return released
+
+    def get_memory_usage(self) -> int:
+        """Estimated bytes held by hot entries"""
+        with self._lock:
+            self._refresh_stale_sizes()
+            return sum(self._hot_sizes.values())
+
+    def get_entry_sizes(self) -> Dict[str, int]:
+        """Estimated bytes per hot entry"""
+        with self._lock:
+            self._refresh_stale_sizes()
+            return dict(self._hot_sizes)
+
+    def get_stats(self) -> Dict:
+        """Get store statistics"""
+        with self._lock:
+            self._refresh_stale_sizes()
+            return {
+                'name': self.name,
+                'hot_entries': len(self._hot),
+                'spilled_entries': len(self._spilled),
+                'memory_bytes': sum(self._hot_sizes.values()),
+                'spill_bytes': sum(
+                    os.path.getsize(p) for p in self._spilled.values() if os.path.exists(p)
+                ),
+                'compacted_entries': sum(
+                    isinstance(v, (EventTable, LaneFixTable)) for v in self._hot.values()
+                ),
+                'compactions': self.compact_count,
+                'spills': self.spill_count,
+                'reloads': self.reload_count
+            }
+
+    def close(self):
+        """Drop all entries and remove the spill folder"""
+        with self._lock:
+            self.clear()
+            if self._owns_spill_dir and self._spill_dir and os.path.isdir(self._spill_dir):
+                shutil.rmtree(self._spill_dir, ignore_errors=True)
+                try:
+                    os.rmdir(os.path.dirname(self._spill_dir))  # the session folder, once its last store closed
+                except OSError:
+                    pass
+                self._spill_dir = None
+
+    # Internals
+
+    def _store_hot(self, key: str, value: Any):
+        if self._hot.get(key) is value:
+            # Same list re-assigned after an in-place edit (every drag move); measuring
+            # thousands of events here would cost a frame, so re-measure on the next read
+            self._hot.move_to_end(key)
+            self._stale_sizes.add(key)
+            return
+        self._hot[key] = value
+        self._hot.move_to_end(key)
+        self._hot_sizes[key] = estimate_object_size(value)
+        self._stale_sizes.discard(key)
+        self._evict_if_needed()
+
+    def _refresh_stale_sizes(self):
+        """Measure entries re-assigned in place since the last read (governor tick)"""
+        for key in self._stale_sizes:
+            if key in self._hot:
+                self._hot_sizes[key] = estimate_object_size(self._hot[key])
+        self._stale_sizes.clear()
+
+    def _evict_if_needed(self):
+        while len(self._hot) > self.max_hot_entries:
+            victim = next((k for k in self._hot if k != self._pinned), None)
+            if victim is None:
+                break
+            self._spill(victim)
+
+    def _compact(self, key: str) -> int:
+        """Replace a hot Event/LaneFix list with its column table; returns bytes released"""
+        value = self._hot[key]
+        table = compact_records(value)
+        if table is value:
+            return 0
+        self._refresh_stale_sizes()
+        before = self._hot_sizes.get(key, 0)
+        self._hot[key] = table
+        self._hot_sizes[key] = table.nbytes
+        self.compact_count += 1
+        logging.debug(f"FileIDSessionStore[{self.name}]: Compacted {key} ({len(table)} records, "
+                      f"{before} -> {table.nbytes} bytes)")
+        return max(0, before - table.nbytes)
+
+    def _get_spill_dir(self) -> str:
+        if self._spill_dir is None:
+            session_dir = session_spill_dir()
+            os.makedirs(session_dir, exist_ok=True)
+            self._spill_dir = tempfile.mkdtemp(prefix=f"{self.name}_", dir=session_dir)
+        os.makedirs(self._spill_dir, exist_ok=True)
+        return self._spill_dir
+
+    def _spill(self, key: str) -> int:
+        """Write a hot entry to disk and drop it from memory; returns bytes released"""
+        value = self._hot[key]
+        path = os.path.join(self._get_spill_dir(), f"{key}.bin")
+        try:
+            payload = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), 1)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            # Keep the entry in memory rather than lose modifications
+            logging.error(f"FileIDSessionStore[{self.name}]: Failed to spill {key}: {e}")
+            return 0
+
+        self._refresh_stale_sizes()
+        del self._hot[key]
+        released = self._hot_sizes.pop(key, 0)
+        self._spilled[key] = path
+        self.spill_count += 1
+        logging.debug(f"FileIDSessionStore[{self.name}]: Spilled {key} ({len(payload)} bytes on disk)")
+        return released
+
+    def _reload(self, key: str) -> Any:
+        """Read a spilled entry back from disk"""
+        path = self._spilled.pop(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.loads(zlib.decompress(f.read()))
+        except Exception as e:
+            self._spilled[key] = path
+            logging.error(f"FileIDSessionStore[{self.name}]: Failed to reload {key}: {e}")
+            raise KeyError(key)
+
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        self.reload_count += 1
+        logging.debug(f"FileIDSessionStore[{self.name}]: Reloaded {key}")
+        return value
+
+    def _discard_spill_file(self, key: str):
+        path = self._spilled.pop(key, None)
+        if path and os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError as e:
+                logging.warning(f"FileIDSessionStore[{self.name}]: Could not remove spill file {path}: {e}")
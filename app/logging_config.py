@@ -6,6 +6,13 @@ This module provides a standardized logging setup with:
 - Rotating file handler for DEBUG and above (10MB, 5 backups)
 - Separate error log for ERROR and CRITICAL
 - Formatted messages with timestamp, file, line number, function name
+- A background writer thread (QueueHandler/QueueListener): the calling thread only
+  enqueues the record; formatting and disk writes happen on the writer thread
+- Per-call-site rate limiting of DEBUG/INFO records from hot-path modules
+  (timeline painting, image navigation, lane assignment)
+
+Hot paths should log with lazy %-style arguments, not f-strings:
+    logging.debug("Navigating to image %d", index)
 
 Usage:
     from app.logging_config import setup_logging
@@ -16,10 +23,100 @@ Usage:
     logger = logging.getLogger(__name__)
 """
 
+import atexit
 import logging
 import logging.handlers
+import queue
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
+
+from app.config import get_config
+
+_listener: Optional['_QueueListener'] = None
+_queue_handler: Optional['DeferredQueueHandler'] = None
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves all formatting to the writer thread
+    The stock handler formats the message on the calling thread so records can be pickled;
+    the queue here is in-process, so the record is passed through untouched.
+    A full queue drops DEBUG/INFO records (counted) instead of blocking the caller;
+    warnings and errors wait for space.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno >= logging.WARNING:
+                self.queue.put(record)
+            else:
+                self.dropped += 1
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    """QueueListener whose stop sentinel waits for space in a bounded queue"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class HotPathRateLimiter(logging.Filter):
+    """
+    Token-bucket rate limit per call site for hot-path modules
+    DEBUG/INFO records from the listed modules (file stem or logger name) pass at most
+    rate_per_sec per call site after an initial burst; WARNING and above always pass.
+    The next record that passes from a throttled call site reports how many were suppressed.
+    When attached to several handlers, a record is decided once (by the first handler)
+    and the other handlers reuse that decision.
+    """
+
+    def __init__(self, modules: Iterable[str], rate_per_sec: float, burst: int):
+        super().__init__()
+        self.modules = frozenset(modules)
+        self.rate_per_sec = rate_per_sec
+        self.burst = max(1, burst)
+        self.suppressed = 0
+        self._buckets: Dict[tuple, List[float]] = {}  # (pathname, lineno) -> [tokens, last time, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or (record.module not in self.modules
+                                                 and record.name not in self.modules):
+            return True
+        decision = getattr(record, '_hot_path_pass', None)
+        if decision is None:
+            decision = record._hot_path_pass = self._take_token(record)
+        return decision
+
+    def _take_token(self, record: logging.LogRecord) -> bool:
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self.burst), record.created, 0]
+            tokens = min(self.burst, bucket[0] + (record.created - bucket[1]) * self.rate_per_sec)
+            bucket[1] = record.created
+            if tokens < 1:
+                bucket[0] = tokens
+                bucket[2] += 1
+                self.suppressed += 1
+                return False
+            bucket[0] = tokens - 1
+            suppressed, bucket[2] = bucket[2], 0
+
+        if suppressed:
+            record.msg = f"{record.msg} [{suppressed} similar messages suppressed]"
+        return True
 
 
 def setup_logging(
@@ -27,7 +124,8 @@ def setup_logging(
     level: int = logging.INFO,
     console_level: int = logging.INFO,
     file_level: int = logging.DEBUG,
-    error_level: int = logging.ERROR
+    error_level: int = logging.ERROR,
+    async_writer: Optional[bool] = None
 ) -> logging.Logger:
     """
     Setup centralized logging configuration.
@@ -38,6 +136,7 @@ def setup_logging(
         console_level: Console handler level (default: INFO)
         file_level: Main file handler level (default: DEBUG)
         error_level: Error file handler level (default: ERROR)
+        async_writer: Write on a background thread (default: LoggingConfig.ASYNC_WRITER)
         
     Returns:
         logging.Logger: Configured root logger
@@ -47,7 +146,8 @@ def setup_logging(
         >>> logger.info("Application started")
         >>> logging.getLogger(__name__).debug("Debug message")
     """
-    
+    global _listener, _queue_handler
+
     # Create logs directory
     log_path = Path(log_dir)
     log_path.mkdir(exist_ok=True)
@@ -93,13 +193,27 @@ def setup_logging(
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
     
-    # Remove existing handlers to avoid duplicates
+    # Remove existing handlers (and a previous writer thread) to avoid duplicates
+    shutdown_logging()
     root_logger.handlers.clear()
     
-    # Add handlers
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(error_handler)
+    config = get_config().logging
+    rate_limiter = HotPathRateLimiter(config.HOT_PATH_MODULES, config.HOT_PATH_RATE_PER_SEC,
+                                      config.HOT_PATH_BURST)
+    handlers = [console_handler, file_handler, error_handler]
+    if async_writer is None:
+        async_writer = config.ASYNC_WRITER
+    if async_writer:
+        # The caller only enqueues; the listener thread formats and writes to every handler
+        _queue_handler = DeferredQueueHandler(queue.Queue(maxsize=config.QUEUE_SIZE))
+        _queue_handler.addFilter(rate_limiter)
+        _listener = _QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        root_logger.addHandler(_queue_handler)
+    else:
+        for handler in handlers:
+            handler.addFilter(rate_limiter)
+            root_logger.addHandler(handler)
     
     # Suppress verbose third-party loggers
     logging.getLogger('PIL').setLevel(logging.WARNING)
@@ -113,11 +227,31 @@ def setup_logging(
     root_logger.info(f"Console level: {logging.getLevelName(console_level)}")
     root_logger.info(f"File level: {logging.getLevelName(file_level)}")
     root_logger.info(f"Error level: {logging.getLevelName(error_level)}")
+    root_logger.info(f"Writer: {'background thread' if _listener else 'calling thread'}")
     root_logger.info("="*60)
     
     return root_logger
 
 
+def shutdown_logging():
+    """Stop the background writer after it has written every queued record"""
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    if _queue_handler is not None and _queue_handler.dropped:
+        record = logging.makeLogRecord({
+            'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+            'msg': f"{_queue_handler.dropped} DEBUG/INFO log records dropped while the writer was behind"})
+        listener.handle(record)
+    for handler in listener.handlers:
+        handler.close()
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """
     Get a logger instance for a specific module.
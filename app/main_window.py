@@ -2,11 +2,12 @@
 Main Window for GeoEvent Application
 """
 
+import copy
+import json
 import logging
 import os
-import csv
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Tuple
 
 from PyQt6.QtWidgets import (
     QMainWindow, QVBoxLayout, QWidget, QHBoxLayout,
@@ -14,40 +15,26 @@ from PyQt6.QtWidgets import (
     QFileDialog, QMessageBox, QLabel, QApplication
 )
 from PyQt6.QtGui import QAction, QActionGroup
-from PyQt6.QtCore import QThread, pyqtSignal, Qt, QTimer, QMutexLocker
+from PyQt6.QtCore import Qt, QThread, QTimer, QMutexLocker
 from .ui.photo_preview_tab import PhotoPreviewTab
 from .utils.settings_manager import SettingsManager
 from .utils.fileid_manager import FileIDManager
+from .utils.export_manager import ExportManager
 from .utils.user_guide import show_user_guide
 from .core.memory_manager import MemoryManager
-from .core.autosave_manager import AutoSaveManager
+from .core.memory_governor import MemoryGovernor
+from .core.autosave_manager import AutoSaveManager, journal_key, session_journal_path
+from .core.fileid_preloader import FileIDPreloader
+from .core.save_service import SaveService, SaveJob, ensure_writable
+from .core.backup_store import BackupStore
+from .core.session_store import sweep_stale_spill_dirs
 from .ui.settings_dialog import SettingsDialog
 from .ui.shortcuts_dialog import ShortcutsDialog
 from .utils.metrics_tracker import MetricsTracker
+from .utils.latency import measure_latency
+from .utils.tracing import trace_span, traced, start_tracing, stop_tracing, tracing_enabled
 from .utils.resource_path import get_resource_path
 
-class BackgroundSaveWorker(QThread):
-    """
-    Worker thread for background save operations
-    """
-    save_completed = pyqtSignal(str, bool)  # (operation_name, success)
-
-    def __init__(self, save_func, *args, **kwargs):
-        super().__init__()
-        self.save_func = save_func
-        self.args = args
-        self.kwargs = kwargs
-
-    def run(self):
-        """Execute save operation in background thread"""
-        try:
-            result = self.save_func(*self.args, **self.kwargs)
-            self.save_completed.emit("save_operation", result)
-        except Exception as e:
-            logging.error(f"Background save failed: {e}")
-            self.save_completed.emit("save_operation", False)
-
-
 class MainWindow(QMainWindow):
     """
     Main application window
@@ -64,10 +51,15 @@ class MainWindow(QMainWindow):
         self.settings_manager = SettingsManager()
         self.fileid_manager = FileIDManager()
         self.memory_manager = MemoryManager()
+        self.memory_governor = MemoryGovernor()
         self.autosave_manager = AutoSaveManager()
+        self.fileid_preloader = FileIDPreloader()
+        self.save_service = SaveService(self._write_save_job)
         self.metrics_tracker = MetricsTracker()
         self.root_folder_path = None  # Parent folder containing FileID folders
         self._merge_after_save_pending = False
+        # FileIDs whose last background save failed -> (folder, save_events, save_lanes); the next save pass retries
+        self._failed_saves: Dict[str, Tuple[object, bool, bool]] = {}
 
         # Ensure settings file is initialized without clearing user preferences
         self._ensure_settings_migration()
@@ -80,6 +72,10 @@ class MainWindow(QMainWindow):
         self.setup_ui()
         self.load_settings()
         self.connect_signals()
+        self._start_autosave_journal()
+        # Session data spilled by a crashed run is covered by the autosave journal
+        sweep_stale_spill_dirs()
+        self._register_memory_components()
 
     def setup_ui(self):
         """Create menu, toolbar, status bar"""
@@ -220,6 +216,13 @@ class MainWindow(QMainWindow):
         reset_settings_action.triggered.connect(self._confirm_reset_settings)
         tools_menu.addAction(reset_settings_action)
 
+        tools_menu.addSeparator()
+        self.trace_action = QAction("Record Performance Trace", self)
+        self.trace_action.setCheckable(True)
+        self.trace_action.setChecked(tracing_enabled())
+        self.trace_action.toggled.connect(self._toggle_tracing)
+        tools_menu.addAction(self.trace_action)
+
         # Help menu
         help_menu = menubar.addMenu("Help")
         
@@ -240,7 +243,122 @@ class MainWindow(QMainWindow):
     def connect_signals(self):
         """Connect signal handlers"""
         self.memory_manager.memory_warning.connect(self.handle_memory_warning)
+        self.memory_manager.memory_sampled.connect(self._on_memory_sampled)
         self.autosave_manager.autosave_triggered.connect(self.handle_autosave)
+        self.save_service.job_finished.connect(self._on_save_completed)
+        # Runs on the save thread (also while the GUI thread is blocked in closeEvent)
+        self.save_service.job_finished.connect(self._on_save_completed_journal,
+                                               Qt.ConnectionType.DirectConnection)
+
+    def _register_memory_components(self):
+        """Put the caches under the MemoryGovernor and start memory sampling"""
+        # Speculative preloads are the cheapest to drop
+        self.memory_governor.register('fileid_preload', self.fileid_preloader.get_memory_usage,
+                                      self.fileid_preloader.release, priority=10)
+        self.photo_tab.register_memory_components(self.memory_governor)
+        self.memory_manager.start(QThread.Priority.LowPriority)
+
+    def _start_autosave_journal(self):
+        """Replay the crash-recovery journal, then journal unsaved edits periodically"""
+        # One journal per session; replay adopts the journals of sessions that crashed
+        journal_path = session_journal_path()
+        self.recovered_edits = {}
+        try:
+            self.autosave_manager.set_save_path(journal_path)
+            self.recovered_edits = self.autosave_manager.replay()
+        except OSError as e:
+            logging.error(f"Autosave journal unavailable: {e}")
+            return
+        if self.recovered_edits:
+            logging.warning(f"Unsaved edits from a previous session found for FileID folders: "
+                            f"{', '.join(sorted(self.recovered_edits))}")
+        self.autosave_manager.start(QThread.Priority.LowPriority)
+
+        self.autosave_manager.interval_seconds = int(
+            self.settings_manager.get_setting('autosave_interval', self.autosave_manager.interval_seconds))
+        self.journal_timer = QTimer(self)
+        self.journal_timer.timeout.connect(self._journal_current_edits)
+        self.journal_timer.start(self.autosave_manager.interval_seconds * 1000)
+
+    def _journal_current_edits(self):
+        """Hand the current FileID's unsaved edits to the autosave journal"""
+        photo_tab = self.photo_tab
+        if photo_tab is None:
+            return
+        with QMutexLocker(photo_tab._data_mutex):
+            fileid_folder = photo_tab.current_fileid
+            lane_manager = getattr(photo_tab, 'lane_manager', None)
+            lanes_modified = lane_manager is not None and lane_manager.has_changes
+            if not fileid_folder or not (photo_tab.events_modified or lanes_modified):
+                return
+            data = {
+                'events': [event.to_dict() for event in photo_tab.events],
+                'lane_fixes': [fix.to_dict() for fix in lane_manager.lane_fixes] if lane_manager else [],
+            }
+        self.autosave_manager.update_data(journal_key(fileid_folder.path), data)
+
+    @staticmethod
+    def _same_records(a: List[dict], b: List[dict]) -> bool:
+        """Same records regardless of order (journal replay does not keep list order)"""
+        def key(record):
+            return json.dumps(record, sort_keys=True, default=str)
+        return sorted(map(key, a)) == sorted(map(key, b))
+
+    def offer_autosave_recovery(self):
+        """Offer to restore journaled edits of the FileID that just finished loading"""
+        photo_tab = self.photo_tab
+        current = photo_tab.current_fileid if photo_tab else None
+        recovered = self.recovered_edits.pop(journal_key(current.path), None) if current else None
+        if not recovered:
+            return
+
+        with QMutexLocker(photo_tab._data_mutex):
+            lane_manager = photo_tab.lane_manager
+            on_disk = (
+                self._same_records([event.to_dict() for event in photo_tab.events],
+                                   recovered['data'].get('events', [])) and
+                self._same_records([fix.to_dict() for fix in (lane_manager.lane_fixes if lane_manager else [])],
+                                   recovered['data'].get('lane_fixes', []))
+            )
+        if on_disk:
+            # Saved after all (e.g. by the close-time save); nothing to recover
+            self.autosave_manager.mark_saved(journal_key(current.path))
+            return
+
+        reply = QMessageBox.question(
+            self, "Recover Unsaved Edits",
+            f"FileID {current.fileid} has edits from {recovered['time']} that were not saved "
+            f"before the application closed.\n\nRestore them?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            self.autosave_manager.mark_saved(journal_key(current.path))
+            return
+
+        from .models.event_model import Event
+        from .models.lane_model import LaneFix
+        try:
+            events = sorted((Event.from_dict(item) for item in recovered['data'].get('events', [])),
+                            key=lambda event: event.start_time)
+            lane_fixes = [LaneFix.from_dict(item) for item in recovered['data'].get('lane_fixes', [])]
+        except (KeyError, ValueError, TypeError) as e:
+            logging.error(f"Could not restore journaled edits for {current.fileid}: {e}")
+            return
+
+        with QMutexLocker(photo_tab._data_mutex):
+            photo_tab.events = events
+            photo_tab.events_per_fileid[current.fileid] = events
+            photo_tab.events_modified = True
+            if photo_tab.lane_manager:
+                photo_tab.lane_manager.lane_fixes = lane_fixes
+                photo_tab.lane_fixes_per_fileid[current.fileid] = photo_tab.lane_manager.lane_fixes
+                photo_tab.lane_manager.has_changes = True
+        photo_tab.warnings_view.reset(photo_tab.events, photo_tab.point_events)
+        photo_tab.timeline.set_events(photo_tab.events, update_view_range=False)
+        photo_tab.timeline.set_lane_manager(photo_tab.lane_manager)
+        photo_tab.update_folder_info_display()
+        logging.info(f"Restored {len(events)} events and {len(lane_fixes)} lane fixes for "
+                     f"{current.fileid} from the autosave journal")
 
     def load_settings(self):
         """Restore window state"""
@@ -275,6 +393,7 @@ class MainWindow(QMainWindow):
 
                 # Scan for FileIDs
                 fileid_folders = self.fileid_manager.scan_parent_folder(folder_path)
+                self.fileid_preloader.clear()
 
                 if not fileid_folders:
                     QMessageBox.warning(
@@ -306,8 +425,8 @@ class MainWindow(QMainWindow):
             # Update the FileIDManager's current index to match the loaded FileID
             self.fileid_manager.set_current_fileid(fileid_folder.fileid)
             self.update_fileid_navigation()
-            self.status_label.setText("Ready")
             self._update_window_title()
+            # Status and neighbour preloading follow once the photo tab finishes loading
         except Exception as e:
             QMessageBox.critical(
                 self, "Error",
@@ -334,90 +453,163 @@ class MainWindow(QMainWindow):
             self.load_fileid(next_fileid)
             self.update_fileid_navigation()
 
+    def schedule_adjacent_preload(self):
+        """Queue next/prev FileIDs for background preloading"""
+        current = self.fileid_manager.get_current_fileid()
+        if current is None:
+            self.fileid_preloader.cancel()
+            return
+        adjacent = self.fileid_manager.get_adjacent_fileids()
+        # Files of a FileID with a queued save are about to change; reload after save completes
+        self.fileid_preloader.request([
+            f for f in adjacent if not self.save_service.is_pending(f.fileid)
+        ])
+
     def auto_save_current_data_silent(self):
         """Auto-save current data silently in background thread"""
         if hasattr(self.photo_tab, 'current_fileid') and self.photo_tab.current_fileid:
             # Start background save operations
             self._start_background_save()
 
-    def _start_background_save(self):
-        """Start background save operations for current FileID"""
-        def save_operations():
-            """Perform all save operations and return overall success"""
-            overall_success = True
-
-            # Thread-safe access to shared data
-            with QMutexLocker(self.photo_tab._data_mutex):
-                # Save events if modified
-                if self.photo_tab.events_modified:
-                    # Backup existing .driveevt file before overwriting
-                    driveevt_path = os.path.join(self.photo_tab.current_fileid.path, f"{self.photo_tab.current_fileid.fileid}.driveevt")
-                    if os.path.exists(driveevt_path):
-                        import datetime
-                        backup_path = os.path.join(self.photo_tab.current_fileid.path, f"{self.photo_tab.current_fileid.fileid}_driveevt_backup_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.driveevt")
-                        try:
-                            import shutil
-                            shutil.copy2(driveevt_path, backup_path)
-                            # logging.info(f"Backed up existing .driveevt file to {backup_path}")
-                        except Exception as e:
-                            logging.error(f"Failed to backup .driveevt file: {str(e)}")
-                    success = self.photo_tab.save_all_events_internal()
-                    if success:
-                        # logging.info(f"Auto-saved {len(self.photo_tab.events)} modified events for {self.photo_tab.current_fileid.fileid}")
-                        pass
-                    else:
-                        logging.error("Failed to auto-save modified events")
-                        overall_success = False
+    def _start_background_save(self, immediate: bool = False):
+        """Queue a background save of the current FileID (coalesced per FileID)"""
+        photo_tab = self.photo_tab
 
+        # Snapshot under the data lock; the disk write happens later on the save thread
+        with QMutexLocker(photo_tab._data_mutex):
+            fileid_folder = photo_tab.current_fileid
+            if not fileid_folder:
+                return
+            lane_manager = getattr(photo_tab, 'lane_manager', None)
+            job = SaveJob(
+                fileid=fileid_folder.fileid,
+                fileid_folder=fileid_folder,
+                events=[copy.copy(event) for event in photo_tab.events],
+                lane_fixes=[copy.copy(fix) for fix in lane_manager.lane_fixes] if lane_manager else [],
+                save_events=photo_tab.events_modified,
                 # Save lane fixes (always save when switching FileID to ensure data integrity)
-                if hasattr(self.photo_tab, 'lane_manager') and self.photo_tab.lane_manager:
-                    output_path = os.path.join(self.photo_tab.current_fileid.path, f"{self.photo_tab.current_fileid.fileid}_lane_fixes.csv")
-                    # Backup existing file before overwriting
-                    if os.path.exists(output_path):
-                        import datetime
-                        backup_path = os.path.join(self.photo_tab.current_fileid.path, f"{self.photo_tab.current_fileid.fileid}_lane_fixes_backup_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
-                        try:
-                            import shutil
-                            shutil.copy2(output_path, backup_path)
-                            # logging.info(f"Backed up existing lane fixes file to {backup_path}")
-                        except Exception as e:
-                            logging.error(f"Failed to backup lane fixes file: {str(e)}")
-                    success = self.photo_tab.export_manager.export_lane_fixes(self.photo_tab.lane_manager.lane_fixes, output_path, include_file_id=False)
-                    if success:
-                        # logging.info(f"Auto-saved {len(self.photo_tab.lane_manager.lane_fixes)} lane fixes to {output_path}")
-                        self.photo_tab.lane_manager.has_changes = False  # Reset after successful save
-                    else:
-                        logging.error("Failed to auto-save lane fixes")
-                        overall_success = False
-                #     self._merge_and_save_multi_fileid_data()
-                #     # logging.info("Updated merged files after auto-save")
-                # except Exception as e:
-                #     logging.error(f"Failed to update merged files: {e}")
-                #     overall_success = False
-
-            return overall_success
-
-        # Create and start background worker
-        self.save_worker = BackgroundSaveWorker(save_operations)
-        self.save_worker.save_completed.connect(self._on_save_completed)
-        self.save_worker.start()
-
-    def _on_save_completed(self, operation_name, success):
-        """Handle save completion signal"""
-        if operation_name == "save_operation":
-            if success:
-                logging.debug("Background save completed successfully")
-            else:
-                logging.warning("Background save completed with errors")
+                save_lanes=lane_manager is not None,
+                journal_revision=self.autosave_manager.revision(journal_key(fileid_folder.path))
+            )
+            photo_tab.events_modified = False
+            if lane_manager:
+                lane_manager.has_changes = False
+            failed = self._failed_saves.pop(job.fileid, None)
+            if failed:
+                job.save_events = job.save_events or failed[1]
+                job.save_lanes = job.save_lanes or failed[2]
+
+        # Any preloaded copy of this FileID would be stale after the save
+        self.fileid_preloader.invalidate(job.fileid)
+        self.save_service.submit(job, immediate=immediate)
+        self._resubmit_failed_saves(immediate)
+
+    def _resubmit_failed_saves(self, immediate: bool = False):
+        """Queue FileIDs whose last save failed again, snapshotted from the session stores"""
+        photo_tab = self.photo_tab
+        if not self._failed_saves or photo_tab is None:
+            return
+        jobs = []
+        with QMutexLocker(photo_tab._data_mutex):
+            current = photo_tab.current_fileid.fileid if photo_tab.current_fileid else None
+            for fileid in [fileid for fileid in self._failed_saves if fileid != current]:
+                fileid_folder, save_events, save_lanes = self._failed_saves.pop(fileid)
+                events = photo_tab.events_per_fileid.get(fileid) if save_events else None
+                lane_fixes = photo_tab.lane_fixes_per_fileid.get(fileid) if save_lanes else None
+                if events is None and lane_fixes is None:
+                    logging.warning(f"No session data left to retry the failed save of {fileid}")
+                    continue
+                jobs.append(SaveJob(
+                    fileid=fileid,
+                    fileid_folder=fileid_folder,
+                    events=[copy.copy(event) for event in events or []],
+                    lane_fixes=[copy.copy(fix) for fix in lane_fixes or []],
+                    save_events=events is not None,
+                    save_lanes=lane_fixes is not None,
+                    journal_revision=self.autosave_manager.revision(journal_key(fileid_folder.path))
+                ))
+        for job in jobs:
+            logging.info(f"Retrying the failed save of {job.fileid}")
+            self.fileid_preloader.invalidate(job.fileid)
+            self.save_service.submit(job, immediate=immediate)
+
+    def get_backup_store(self, survey_root: str) -> BackupStore:
+        """Backup store of a survey root folder (one shared instance per store folder)"""
+        return BackupStore.for_survey(survey_root)
+
+    def _backup_before_overwrite(self, path: str, survey_root: str = None):
+        """
+        Record the current content of a data file in the backup store before it is rewritten.
+        survey_root defaults to the parent of the file's FileID folder.
+        """
+        if os.path.exists(path):
+            if survey_root is None:
+                survey_root = os.path.dirname(os.path.dirname(os.path.abspath(path)))
+            self.get_backup_store(survey_root).backup_file(path)
+
+    def _write_save_job(self, job: SaveJob) -> bool:
+        """Write one save snapshot (runs on the save service thread; no GUI access)"""
+        folder = job.fileid_folder
+        driveevt_path = os.path.join(folder.path, f"{folder.fileid}.driveevt")
+        lane_fixes_path = os.path.join(folder.path, f"{folder.fileid}_lane_fixes.csv")
+
+        # Fail fast (and get retried) before touching anything if a target is locked
+        if job.save_events:
+            ensure_writable(driveevt_path)
+        if job.save_lanes:
+            ensure_writable(lane_fixes_path)
+
+        overall_success = True
+
+        # Save events if modified
+        if job.save_events:
+            with trace_span('save.backup', 'save', path=driveevt_path):
+                self._backup_before_overwrite(driveevt_path)
+            with trace_span('save.events', 'save', events=len(job.events)):
+                saved = self.photo_tab.data_loader.save_events(job.events, folder)
+            if not saved:
+                logging.error("Failed to auto-save modified events")
+                overall_success = False
+
+        if job.save_lanes:
+            with trace_span('save.backup', 'save', path=lane_fixes_path):
+                self._backup_before_overwrite(lane_fixes_path)
+            with trace_span('save.lane_fixes', 'save', fixes=len(job.lane_fixes)):
+                saved = self.photo_tab.export_manager.export_lane_fixes(job.lane_fixes, lane_fixes_path, include_file_id=False)
+            if not saved:
+                logging.error("Failed to auto-save lane fixes")
+                overall_success = False
+
+        return overall_success
+
+    def _on_save_completed_journal(self, job, success):
+        """A saved snapshot is on disk; the crash-recovery journal no longer needs the edits it covers"""
+        if success:
+            self.autosave_manager.mark_saved(journal_key(job.fileid_folder.path), job.journal_revision)
 
-        # Clean up worker
-        if hasattr(self, 'save_worker') and self.save_worker is not None:
-            self.save_worker.quit()
-            self.save_worker.wait()
-            self.save_worker = None
+    def _on_save_completed(self, job, success):
+        """Handle save completion signal"""
+        fileid = job.fileid
+        if success:
+            logging.debug(f"Background save of {fileid} completed successfully")
+        else:
+            logging.warning(f"Background save of {fileid} completed with errors")
+            # Remembered whether or not the FileID is on screen; the next save pass retries it
+            _, save_events, save_lanes = self._failed_saves.get(fileid, (None, False, False))
+            self._failed_saves[fileid] = (job.fileid_folder, save_events or job.save_events,
+                                          save_lanes or job.save_lanes)
+            # The snapshot cleared the change flags; restore them so close-time saves see the edits
+            current = self.photo_tab.current_fileid
+            if current and current.fileid == fileid:
+                self.photo_tab.events_modified = True
+                if self.photo_tab.lane_manager:
+                    self.photo_tab.lane_manager.has_changes = True
+
+        # The saved FileID may be adjacent; preload it now that its files are final
+        self.schedule_adjacent_preload()
 
         # Deferred merge after save (avoids main-thread sleep)
-        if getattr(self, '_merge_after_save_pending', False):
+        if getattr(self, '_merge_after_save_pending', False) and self.save_service.queue_depth() == 0:
             self._merge_after_save_pending = False
             QTimer.singleShot(0, self._do_merge_and_show_message)
 
@@ -427,6 +619,22 @@ class MainWindow(QMainWindow):
         if not self.settings_manager.get_setting(migration_flag, False):
             self.settings_manager.save_setting(migration_flag, True)
 
+    def _toggle_tracing(self, enabled: bool):
+        """Start recording spans, or stop and write the Chrome trace (open it in Perfetto)"""
+        if enabled:
+            start_tracing()
+            self.status_label.setText("Recording performance trace...")
+            return
+        path = stop_tracing()
+        if path:
+            self.status_label.setText(f"Performance trace saved: {path}")
+            QMessageBox.information(
+                self, "Performance Trace",
+                f"Trace saved to:\n{path}\n\nOpen it at https://ui.perfetto.dev or chrome://tracing."
+            )
+        else:
+            self.status_label.setText("Performance trace: nothing recorded")
+
     def _confirm_reset_settings(self):
         """Prompt user before resetting settings to defaults"""
         reply = QMessageBox.question(
@@ -458,6 +666,8 @@ class MainWindow(QMainWindow):
                 if fileid_folder.fileid in self.photo_tab.events_per_fileid:
                     events = self.photo_tab.events_per_fileid[fileid_folder.fileid]
                     try:
+                        self._backup_before_overwrite(
+                            os.path.join(fileid_folder.path, f"{fileid_folder.fileid}.driveevt"))
                         success = self.photo_tab.data_loader.save_events(events, fileid_folder)
                         if success:
                             logging.info(f"Auto-saved {len(events)} events for FileID {fileid_folder.fileid}")
@@ -478,16 +688,7 @@ class MainWindow(QMainWindow):
                         original_fixes = temp_manager.get_lane_fixes()
                         if len(lane_fixes) != len(original_fixes) or any(f1 != f2 for f1, f2 in zip(lane_fixes, original_fixes)):
                             output_path = os.path.join(fileid_folder.path, f"{fileid_folder.fileid}_lane_fixes.csv")
-                            # Backup existing file before overwriting
-                            if os.path.exists(output_path):
-                                import datetime
-                                backup_path = os.path.join(fileid_folder.path, f"{fileid_folder.fileid}_lane_fixes_backup_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
-                                try:
-                                    import shutil
-                                    shutil.copy2(output_path, backup_path)
-                                    logging.info(f"Backed up existing lane fixes file to {backup_path}")
-                                except Exception as e:
-                                    logging.error(f"Failed to backup lane fixes file: {str(e)}")
+                            self._backup_before_overwrite(output_path)
                             success = self.photo_tab.export_manager.export_lane_fixes(lane_fixes, output_path, include_file_id=False)
                             if success:
                                 logging.info(f"Auto-saved {len(lane_fixes)} modified lane fixes for FileID {fileid_folder.fileid}")
@@ -502,6 +703,8 @@ class MainWindow(QMainWindow):
                 try:
                     # Save events
                     if self.photo_tab.events:
+                        current = self.photo_tab.current_fileid
+                        self._backup_before_overwrite(os.path.join(current.path, f"{current.fileid}.driveevt"))
                         success = self.photo_tab.data_loader.save_events(self.photo_tab.events, self.photo_tab.current_fileid)
                         if success:
                             logging.info(f"Auto-saved {len(self.photo_tab.events)} current events for FileID {self.photo_tab.current_fileid.fileid}")
@@ -512,6 +715,7 @@ class MainWindow(QMainWindow):
                     if self.photo_tab.lane_manager and self.photo_tab.lane_manager.has_changes:
                         lane_fixes = self.photo_tab.lane_manager.get_lane_fixes()
                         output_path = os.path.join(self.photo_tab.current_fileid.path, f"{self.photo_tab.current_fileid.fileid}_lane_fixes.csv")
+                        self._backup_before_overwrite(output_path)
                         success = self.photo_tab.export_manager.export_lane_fixes(lane_fixes, output_path, include_file_id=False)
                         if success:
                             logging.info(f"Auto-saved {len(lane_fixes)} current lane fixes for FileID {self.photo_tab.current_fileid.fileid}")
@@ -521,7 +725,8 @@ class MainWindow(QMainWindow):
                     logging.error(f"Error saving current FileID data: {str(e)}")
 
             # Also merge and save all data to root folder
-            self._merge_and_save_multi_fileid_data()
+            with measure_latency('merge'):
+                self._merge_and_save_multi_fileid_data()
 
         except Exception as e:
             logging.error(f"Error during auto-save on close: {str(e)}")
@@ -557,7 +762,11 @@ class MainWindow(QMainWindow):
         try:
             if hasattr(self.photo_tab, 'current_fileid') and self.photo_tab.current_fileid:
                 self._merge_after_save_pending = True
-                self._start_background_save()
+                self._start_background_save(immediate=True)
+                if self.save_service.queue_depth() == 0:
+                    # Nothing to save (FileID still loading); merge right away
+                    self._merge_after_save_pending = False
+                    self._do_merge_and_show_message()
             else:
                 self._do_merge_and_show_message()
         except Exception as e:
@@ -566,7 +775,8 @@ class MainWindow(QMainWindow):
     def _do_merge_and_show_message(self):
         """Run merge and show completion message (called after save or when no save needed)."""
         try:
-            self._merge_and_save_multi_fileid_data()
+            with measure_latency('merge'):
+                self._merge_and_save_multi_fileid_data()
             QMessageBox.information(
                 self, "Merge Complete",
                 "All FileID data has been merged into root folder files."
@@ -574,6 +784,7 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.warning(self, "Merge Error", f"Failed to merge data: {str(e)}")
 
+    @traced('merge', 'save')
     def _merge_and_save_multi_fileid_data(self):
         """Merge data from all FileID folders and save to root folder"""
         if not self.fileid_manager.fileid_list:
@@ -719,16 +930,14 @@ class MainWindow(QMainWindow):
             if callable(apply_theme):
                 apply_theme(theme_name)
 
+    def _on_memory_sampled(self, rss, system_percent):
+        """Enforce memory budgets on the GUI thread, which owns the governed caches"""
+        self.memory_governor.enforce(rss, system_percent)
+
     def handle_memory_warning(self, usage_percent):
         """Handle memory warning from MemoryManager"""
         self.memory_label.setText(f"{usage_percent}%")
-
-        if usage_percent > 90:
-            self.photo_tab.clear_caches()
-            # QMessageBox.warning(
-            #     self, "Memory Warning",
-            #     f"High memory usage ({usage_percent}%). Cleared caches."
-            # )
+        # Relief is applied by the MemoryGovernor in priority order (see memory_sampled)
 
     def handle_autosave(self, timestamp):
         """Handle autosave completion"""
@@ -761,8 +970,12 @@ class MainWindow(QMainWindow):
         QApplication.processEvents()
 
         try:
+            # Land queued background saves (and retries of failed ones) before the synchronous close-time saves
+            self._resubmit_failed_saves(immediate=True)
+            self.save_service.stop()
             # Auto-save all data before closing
             self.auto_save_all_data_on_close()
+            self.photo_tab.close_session_stores()
         finally:
             # Close the dialog after a short delay to show completion
             QTimer.singleShot(2000, save_dialog.close)  # 2 second delay
@@ -779,6 +992,12 @@ class MainWindow(QMainWindow):
         # Stop managers
         self.memory_manager.stop()
         self.autosave_manager.stop()
+        self.fileid_preloader.stop()
+        self.photo_tab.stop_loading()
+
+        # Write the trace of this run if one is being recorded
+        if tracing_enabled():
+            stop_tracing()
 
         event.accept()
 
@@ -814,6 +1033,7 @@ class MainWindow(QMainWindow):
             logging.error(f"Failed to load lane fixes for {fileid_folder.fileid}: {str(e)}")
             return []
 
+    @traced('merge.save_events', 'save')
     def _save_merged_events(self, events: List, output_path: str) -> bool:
         """Save merged events to file"""
         from .utils.file_parser import save_driveevt
@@ -826,6 +1046,8 @@ class MainWindow(QMainWindow):
             # Extract fileid from output_path (filename without extension)
             fileid = os.path.splitext(os.path.basename(output_path))[0]
 
+            self._backup_before_overwrite(output_path, survey_root=os.path.dirname(os.path.abspath(output_path)))
+
             # Save all events - each will use its own file_id for session token, fallback to fileid from path
             success = save_driveevt(sorted_events, output_path, fileid)
             return success
@@ -833,50 +1055,13 @@ class MainWindow(QMainWindow):
             logging.error(f"Failed to save merged events: {str(e)}")
             return False
 
+    @traced('merge.save_lane_fixes', 'save')
     def _save_merged_lane_fixes(self, lane_fixes: List, output_path: str) -> bool:
         """Save merged lane fixes to file"""
         try:
-            # Backup existing file before overwriting
-            if os.path.exists(output_path):
-                import datetime
-                backup_path = output_path + f".backup_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                try:
-                    import shutil
-                    shutil.copy2(output_path, backup_path)
-                    logging.info(f"Backed up existing merged lane fixes file to {backup_path}")
-                except Exception as e:
-                    logging.error(f"Failed to backup merged lane fixes file: {str(e)}")
-
-            # Sort lane fixes by timestamp
-            sorted_fixes = sorted(lane_fixes, key=lambda f: f.from_time)
+            self._backup_before_overwrite(output_path, survey_root=os.path.dirname(os.path.abspath(output_path)))
 
-            with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                # Write header
-                writer.writerow(['Plate', 'From', 'To', 'Lane', 'Ignore', 'RegionID', 'RoadID', 'Travel'])
-
-                # Write data - format times as DD/MM/YY HH:MM:SS.mmm (same as individual files)
-                for fix in sorted_fixes:
-                    # Convert times to DD/MM/YY HH:MM:SS.mmm format (day/month/year hour:minute:second.millisecond)
-                    from_milliseconds = fix.from_time.microsecond // 1000
-                    from_time_str = fix.from_time.strftime('%d/%m/%y %H:%M:%S') + f'.{from_milliseconds:03d}'
-                    
-                    to_milliseconds = fix.to_time.microsecond // 1000
-                    to_time_str = fix.to_time.strftime('%d/%m/%y %H:%M:%S') + f'.{to_milliseconds:03d}'
-                    
-                    writer.writerow([
-                        fix.plate,
-                        from_time_str,
-                        to_time_str,
-                        fix.lane,
-                        '1' if fix.ignore else '',  # Ignore
-                        '',  # RegionID
-                        '',  # RoadID
-                        'N'  # Travel direction
-                    ])
-
-            logging.info(f"Saved {len(sorted_fixes)} merged lane fixes to {output_path}")
-            return True
+            return ExportManager().export_merged_lane_fixes(lane_fixes, output_path)
 
         except Exception as e:
             logging.error(f"Failed to save merged lane fixes: {str(e)}")
@@ -2,15 +2,20 @@
 Event data model for GeoEvent application
 """
 
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Iterator, List, Optional
 import logging
 
 from .event_config import is_event_length_exceeded
+from app.utils.slots import add_slots
+from app.utils.time_axis import cached_epoch_seconds, epoch_cached
 from app.security.sanitizer import InputSanitizer
 from app.security.validator import InputValidator
 
+@epoch_cached('start_time', 'end_time')
+@add_slots('_epoch_start_time', '_epoch_end_time')
 @dataclass
 class Event:
     """
@@ -30,6 +35,16 @@ class Event:
     color: str = "#95A5A6"  # Default gray
     layer: int = 0
 
+    @property
+    def start_ts(self) -> float:
+        """Start time as cached float epoch seconds (timeline axis)"""
+        return cached_epoch_seconds(self, 'start_time')
+
+    @property
+    def end_ts(self) -> float:
+        """End time as cached float epoch seconds (timeline axis)"""
+        return cached_epoch_seconds(self, 'end_time')
+
     @property
     def duration_seconds(self) -> float:
         """Calculate event duration in seconds"""
@@ -141,4 +156,46 @@ class Event:
             file_id=data.get('file_id', ''),
             color=data.get('color', '#95A5A6'),
             layer=data.get('layer', 0)
-        )
\ No newline at end of file
+        )
+
+
+@epoch_cached('timestamp')
+@add_slots('_epoch_timestamp')
+@dataclass
+class PointEvent:
+    """
+    Non-span (instantaneous) event row from a .driveevt file, e.g. a lane check marker
+    """
+    event_name: str
+    time_utc_text: str  # TimeUtc exactly as written in the file
+    timestamp: Optional[datetime] = None  # parsed TimeUtc, None if unparseable
+    chainage: float = 0.0
+
+    @property
+    def ts(self) -> Optional[float]:
+        """Timestamp as cached float epoch seconds"""
+        return cached_epoch_seconds(self, 'timestamp')
+
+
+class PointEventIndex:
+    """
+    Time-ordered index of a FileID's non-span events, held with the FileID data
+    so views never have to re-read the .driveevt file
+    """
+
+    def __init__(self, point_events: Optional[List[PointEvent]] = None):
+        # Keep file order for display; a separate sorted key list answers range queries
+        self._events: List[PointEvent] = list(point_events or [])
+        timed = sorted((e for e in self._events if e.timestamp is not None), key=lambda e: e.ts)
+        self._timed = timed
+        self._keys = [e.ts for e in timed]
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __iter__(self) -> Iterator[PointEvent]:
+        return iter(self._events)
+
+    def in_range(self, start_ts: float, end_ts: float) -> List[PointEvent]:
+        """Point events with start_ts <= timestamp <= end_ts, in time order"""
+        return self._timed[bisect_left(self._keys, start_ts):bisect_right(self._keys, end_ts)]
@@ -4,11 +4,16 @@ Optimized with binary search for O(log n) interpolation
 """
 
 import bisect
+import sys
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import List, Optional, Tuple
 
+from app.utils.slots import add_slots, instance_values
+from app.utils.time_axis import to_epoch_seconds
+
+@add_slots()
 @dataclass
 class GPSPoint:
     """
@@ -57,12 +62,16 @@ class GPSData:
         self.points: List[GPSPoint] = []
         self._sorted = False
         self._timestamp_index: List[datetime] = []  # Cached timestamp index for binary search
+        self._epoch_index: List[float] = []  # Same index as float epoch seconds (timeline axis)
+        self._chainage_prefix_max: List[float] = []  # Running max of chainage, for chainage -> index lookup
 
     def add_point(self, point: GPSPoint):
         """Add a GPS point to the collection"""
         self.points.append(point)
         self._sorted = False
         self._timestamp_index = []  # Invalidate cache
+        self._epoch_index = []
+        self._chainage_prefix_max = []
 
     def sort_by_time(self):
         """Sort points by timestamp and build index for binary search"""
@@ -71,8 +80,50 @@ class GPSData:
             self._sorted = True
             # Build timestamp index for O(log n) binary search
             self._timestamp_index = [p.timestamp for p in self.points]
+            self._epoch_index = [to_epoch_seconds(p.timestamp) for p in self.points]
+            self._chainage_prefix_max = []
             logging.debug(f"GPS data sorted: {len(self.points)} points indexed")
 
+    def estimate_memory_usage(self) -> int:
+        """Estimated bytes held by the points and the lookup indexes"""
+        if not self.points:
+            return 0
+        sample = self.points[0]
+        point_size = sys.getsizeof(sample) + sum(sys.getsizeof(v) for v in instance_values(sample))
+        return (sys.getsizeof(self.points) + len(self.points) * point_size) + self.index_memory_usage()
+
+    def index_memory_usage(self) -> int:
+        """Estimated bytes held by the lookup indexes alone"""
+        # Index lists hold references; the timestamps are shared with the points, floats are not
+        return (sys.getsizeof(self._timestamp_index) + sys.getsizeof(self._epoch_index)
+                + len(self._epoch_index) * sys.getsizeof(0.0) + sys.getsizeof(self._chainage_prefix_max)
+                + len(self._chainage_prefix_max) * sys.getsizeof(0.0))
+
+    def get_epoch_index(self) -> List[float]:
+        """Sorted point timestamps as float epoch seconds"""
+        self.sort_by_time()
+        return self._epoch_index
+
+    def get_index_range(self, start_ts: float, end_ts: float) -> Tuple[int, int]:
+        """Half-open index range [lo, hi) of points with start_ts <= timestamp <= end_ts"""
+        epochs = self.get_epoch_index()
+        return bisect.bisect_left(epochs, start_ts), bisect.bisect_right(epochs, end_ts)
+
+    def find_first_index_at_chainage(self, chainage: float) -> int:
+        """
+        Index of the first point (in time order) whose chainage is >= the given
+        chainage, or len(points) if none. O(log n) via a running-max index.
+        """
+        self.sort_by_time()
+        if len(self._chainage_prefix_max) != len(self.points):
+            running = float('-inf')
+            prefix = []
+            for p in self.points:
+                running = max(running, p.chainage)
+                prefix.append(running)
+            self._chainage_prefix_max = prefix
+        return bisect.bisect_left(self._chainage_prefix_max, chainage)
+
     def get_points_in_range(self, start_time: datetime, end_time: datetime) -> List[GPSPoint]:
         """Get GPS points within time range"""
         self.sort_by_time()
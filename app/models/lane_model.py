@@ -4,7 +4,7 @@ Lane assignment data model for GeoEvent application
 
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from pathlib import Path
 import csv
 import os
@@ -12,7 +12,12 @@ import logging
 
 from app.security.sanitizer import InputSanitizer
 from app.security.validator import InputValidator
+from app.utils.slots import add_slots
+from app.utils.time_axis import cached_epoch_seconds, epoch_cached, to_epoch_seconds
+from app.utils.interval_index import IntervalStore
 
+@epoch_cached('from_time', 'to_time')
+@add_slots('_epoch_from_time', '_epoch_to_time')
 @dataclass
 class LaneFix:
     """
@@ -25,6 +30,16 @@ class LaneFix:
     file_id: str
     ignore: bool = False  # Whether this period should be ignored
 
+    @property
+    def from_ts(self) -> float:
+        """From time as cached float epoch seconds (timeline axis)"""
+        return cached_epoch_seconds(self, 'from_time')
+
+    @property
+    def to_ts(self) -> float:
+        """To time as cached float epoch seconds (timeline axis)"""
+        return cached_epoch_seconds(self, 'to_time')
+
     def to_dict(self) -> dict:
         """Convert to dictionary for serialization"""
         return {
@@ -51,10 +66,12 @@ class LaneFix:
 class LaneManager:
     """
     Manages lane assignments and turn periods
+    Lane fixes live in an IntervalStore sorted by from_time, so point lookups
+    and next-boundary queries are O(log n) and `revision` changes on every edit.
     """
 
     def __init__(self):
-        self.lane_fixes: List[LaneFix] = []
+        self._store = IntervalStore(key=lambda fix: (fix.from_ts, fix.to_ts))
         self.current_lane: Optional[str] = None
         self.fileid_folder: Optional[Path] = None
         self.plate: Optional[str] = None
@@ -66,6 +83,25 @@ class LaneManager:
         self.last_image_timestamp: Optional[datetime] = None
         self.gps_min_timestamp: Optional[datetime] = None
         self.gps_max_timestamp: Optional[datetime] = None
+        self.last_load_report = None  # LaneFixLoadReport of the last CSV load
+
+    @property
+    def lane_fixes(self) -> List[LaneFix]:
+        """Lane fixes sorted by from_time (the store's live list; assign to replace)"""
+        return self._store.items
+
+    @lane_fixes.setter
+    def lane_fixes(self, fixes: List[LaneFix]):
+        self._store.replace(fixes or [])
+
+    @property
+    def revision(self) -> int:
+        """Incremented on every change to the lane fixes"""
+        return self._store.revision
+
+    def reindex(self):
+        """Re-index after lane fixes were edited in place (times, lane or ignore flag)"""
+        self._store.reindex()
 
     def assign_lane(self, lane_code: str, timestamp: datetime) -> bool:
         """
@@ -103,16 +139,16 @@ class LaneManager:
 
         # Check if we have existing lane data at this timestamp
         current_lane_at_time = self.get_lane_at_timestamp(timestamp)
-        logging.debug(f"Current lane at {timestamp}: {current_lane_at_time}")
+        logging.debug("Current lane at %s: %s", timestamp, current_lane_at_time)
         
         # If changing from one lane to another, use smart change logic
         if current_lane_at_time and current_lane_at_time != lane_code:
-            logging.debug(f"Changing lane from {current_lane_at_time} to {lane_code}")
+            logging.debug("Changing lane from %s to %s", current_lane_at_time, lane_code)
             return self.change_lane_smart(lane_code, timestamp)
         
         # If same lane as current at this timestamp, no need to do anything
         if current_lane_at_time == lane_code:
-            logging.debug(f"Same lane {lane_code} already at {timestamp}")
+            logging.debug("Same lane %s already at %s", lane_code, timestamp)
             return True
         
         # Standard assignment logic for new assignments
@@ -121,61 +157,69 @@ class LaneManager:
             logging.warning(f"Overlap detected at {timestamp} for lane {lane_code}")
             return False
 
+        # The period being recorded is the one that started before this timestamp
+        previous_fix = self._store.last_starting_before(to_epoch_seconds(timestamp))
+
         # If same lane as current, extend period
-        if self.current_lane == lane_code and self.lane_fixes:
+        if self.current_lane == lane_code and previous_fix:
             # Extend the last lane fix
-            self.lane_fixes[-1].to_time = timestamp
+            previous_fix.to_time = timestamp
+            self._store.reindex()
         else:
             # End current period if exists
-            if self.current_lane and self.lane_fixes:
-                self.lane_fixes[-1].to_time = timestamp
+            if self.current_lane and previous_fix:
+                previous_fix.to_time = timestamp
 
             # Start new period
             # Handle special lane codes
             actual_lane_code = self._resolve_lane_code(lane_code, self.current_lane)
-            
+
+            # Extend new period: fill gap until next period start, or to folder end if none
+            to_time = timestamp
+            next_start = self._get_next_period_start(timestamp)
+            if next_start is not None:
+                to_time = next_start
+                logging.info("Extended lane %s to next period start: %s", actual_lane_code, next_start)
+            elif self.end_time and not self._has_lane_after(timestamp):
+                to_time = self.end_time
+                logging.info("Extended lane %s to folder end time: %s", lane_code, self.end_time)
+
             lane_fix = LaneFix(
                 plate=self.plate,
                 from_time=timestamp,
-                to_time=timestamp,  # Will be extended later
+                to_time=to_time,
                 lane=actual_lane_code,
                 ignore=(lane_code == ''),  # Mark as ignore if lane_code is empty
                 file_id=self.fileid_folder.name
             )
-            self.lane_fixes.append(lane_fix)
+            self._store.add(lane_fix)
             self.current_lane = actual_lane_code
 
-            # Extend new period: fill gap until next period start, or to folder end if none
-            next_start = self._get_next_period_start(timestamp)
-            if next_start is not None:
-                lane_fix.to_time = next_start
-                logging.info(f"Extended lane {actual_lane_code} to next period start: {next_start}")
-            elif self.end_time and not self._has_lane_after(timestamp):
-                lane_fix.to_time = self.end_time
-                logging.info(f"Extended lane {lane_code} to folder end time: {self.end_time}")
-
         self.has_changes = True
         return True
 
-    def _is_timestamp_valid(self, timestamp: datetime) -> bool:
-        """
-        Check if timestamp is within valid time bounds for lane assignment
-        """
-        # Determine valid time range (union of image and GPS ranges)
+    def get_valid_time_range(self) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """Valid lane fix time range: union of image and GPS ranges, (None, None) if unknown"""
         valid_min_time = None
         valid_max_time = None
         
         if self.first_image_timestamp and self.last_image_timestamp:
-            if valid_min_time is None or self.first_image_timestamp < valid_min_time:
-                valid_min_time = self.first_image_timestamp
-            if valid_max_time is None or self.last_image_timestamp > valid_max_time:
-                valid_max_time = self.last_image_timestamp
+            valid_min_time = self.first_image_timestamp
+            valid_max_time = self.last_image_timestamp
         
         if self.gps_min_timestamp and self.gps_max_timestamp:
             if valid_min_time is None or self.gps_min_timestamp < valid_min_time:
                 valid_min_time = self.gps_min_timestamp
             if valid_max_time is None or self.gps_max_timestamp > valid_max_time:
                 valid_max_time = self.gps_max_timestamp
+
+        return valid_min_time, valid_max_time
+
+    def _is_timestamp_valid(self, timestamp: datetime) -> bool:
+        """
+        Check if timestamp is within valid time bounds for lane assignment
+        """
+        valid_min_time, valid_max_time = self.get_valid_time_range()
         
         if valid_min_time is None or valid_max_time is None:
             # No time range available, allow assignment
@@ -222,21 +266,11 @@ class LaneManager:
             return False
 
         # Find the current lane period at this timestamp
-        current_lane_at_time = self.get_lane_at_timestamp(timestamp)
-        if not current_lane_at_time:
+        target_fix = self.get_fix_at_timestamp(timestamp)
+        if not target_fix or not target_fix.lane:
             logging.warning(f"No lane found at timestamp {timestamp}")
             return False
-
-        # Find the lane fix record for this period
-        target_fix = None
-        for fix in self.lane_fixes:
-            if fix.from_time <= timestamp <= fix.to_time and fix.lane == current_lane_at_time:
-                target_fix = fix
-                break
-
-        if not target_fix:
-            logging.error(f"Could not find lane fix record for timestamp {timestamp}")
-            return False
+        current_lane_at_time = target_fix.lane
 
         if current_lane_at_time == new_lane_code:
             if custom_end_time and custom_end_time != target_fix.to_time:
@@ -253,7 +287,7 @@ class LaneManager:
                     ignore=target_fix.ignore,
                     file_id=self.fileid_folder.name
                 )
-                self.lane_fixes.append(new_period)
+                self._store.add(new_period)
                 # Do not merge for same lane splits to preserve the split
                 return True
             else:
@@ -320,7 +354,7 @@ class LaneManager:
             ignore=(new_lane_code == ''),
             file_id=self.fileid_folder.name
         )
-        self.lane_fixes.append(new_fix)
+        self._store.add(new_fix)
         
         # Merge adjacent periods with the same lane
         self._merge_adjacent_same_lane_periods()
@@ -350,7 +384,7 @@ class LaneManager:
             lane=original_lane,
             file_id=self.fileid_folder.name
         )
-        self.lane_fixes.append(new_fix)
+        self._store.add(new_fix)
         
         # Merge adjacent periods with the same lane
         self._merge_adjacent_same_lane_periods()
@@ -359,6 +393,7 @@ class LaneManager:
         """Change entire period to new lane"""
         target_fix.lane = new_lane_code
         target_fix.ignore = (new_lane_code == '')
+        self._store.reindex()
         
         # Update current_lane if this period is current
         now = datetime.now(timezone.utc)
@@ -384,7 +419,7 @@ class LaneManager:
             ignore=(new_lane_code == ''),
             file_id=self.fileid_folder.name
         )
-        self.lane_fixes.append(new_fix)
+        self._store.add(new_fix)
         
         # If there's remaining time after custom_end_time, create continuation with original lane
         if custom_end_time < original_end:
@@ -406,16 +441,13 @@ class LaneManager:
 
     def _has_lane_after(self, timestamp: datetime) -> bool:
         """Check if there are any lane assignments after the given timestamp"""
-        for fix in self.lane_fixes:
-            if fix.from_time > timestamp:
-                return True
-        return False
+        return self._store.first_starting_after(to_epoch_seconds(timestamp)) is not None
 
     def _get_next_period_start(self, after_timestamp: datetime) -> Optional[datetime]:
         """Return the start time of the next period after the given timestamp, or None.
         Used to extend a new lane assignment so it fills the gap until the next period (e.g. 0–500 as L2 when 500–1000 is L1)."""
-        candidates = [f.from_time for f in self.lane_fixes if f.from_time is not None and f.from_time > after_timestamp]
-        return min(candidates) if candidates else None
+        next_fix = self._store.first_starting_after(to_epoch_seconds(after_timestamp))
+        return next_fix.from_time if next_fix else None
 
     def check_overlap(self, timestamp: datetime, exclude_ignore: bool = False, exclude_special: bool = False) -> bool:
         """
@@ -423,42 +455,47 @@ class LaneManager:
         exclude_ignore: if True, ignore periods are not considered as overlaps
         exclude_special: if True, special lanes (SK*, IGNORE) are not considered as overlaps
         """
-        for fix in self.lane_fixes:
-            if fix.from_time is not None and fix.to_time is not None:
-                # Skip ignore periods if exclude_ignore is True
-                if exclude_ignore and fix.ignore:
-                    continue
-                # Skip special lanes (SK*, or ignore entries) if exclude_special is True
-                if exclude_special and (fix.lane.startswith('SK') or fix.ignore):
-                    continue
-                if fix.from_time <= timestamp <= fix.to_time:
-                    return True
+        for fix in self._store.covering(to_epoch_seconds(timestamp)):
+            # Skip ignore periods if exclude_ignore is True
+            if exclude_ignore and fix.ignore:
+                continue
+            # Skip special lanes (SK*, or ignore entries) if exclude_special is True
+            if exclude_special and (fix.lane.startswith('SK') or fix.ignore):
+                continue
+            return True
         return False
 
     def get_lane_fixes(self) -> List[LaneFix]:
         """Get all lane fixes sorted by time"""
-        return sorted(self.lane_fixes, key=lambda x: x.from_time)
+        return list(self._store.items)
+
+    def get_lane_fixes_in_range(self, start_ts: float, end_ts: float) -> List[LaneFix]:
+        """Lane fixes overlapping [start_ts, end_ts] (epoch seconds), sorted by time"""
+        return self._store.overlapping(start_ts, end_ts)
+
+    def get_fix_at_timestamp(self, timestamp: datetime) -> Optional[LaneFix]:
+        """Get the lane fix active at the given timestamp (latest period first)"""
+        return self._store.at(to_epoch_seconds(timestamp))
 
     def get_lane_at_timestamp(self, timestamp: datetime) -> str:
         """Get the lane code active at the given timestamp"""
-        # Sort by from_time descending to check latest periods first
-        for fix in sorted(self.lane_fixes, key=lambda x: x.from_time, reverse=True):
-            if fix.from_time is not None and fix.to_time is not None:
-                if fix.from_time <= timestamp <= fix.to_time:
-                    return fix.lane
-        return None
+        fix = self.get_fix_at_timestamp(timestamp)
+        return fix.lane if fix else None
 
     def clear(self):
         """Clear all lane assignments"""
-        self.lane_fixes.clear()
+        self._store.clear()
         self.current_lane = None
 
-    def set_fileid_folder(self, fileid_folder_path: str, plate: str = None):
-        """Set the current FileID folder and load lane fixes"""
+    def set_fileid_folder(self, fileid_folder_path: str, plate: str = None, create_if_missing: bool = True):
+        """
+        Set the current FileID folder and load lane fixes
+        create_if_missing=False leaves the survey untouched when the lane fix file is absent (read-only tools)
+        """
         from pathlib import Path
         self.fileid_folder = Path(fileid_folder_path)
         self.plate = plate
-        self._load_lane_fixes()
+        self._load_lane_fixes(create_if_missing)
 
     def set_end_time(self, end_time: datetime):
         """Set the end time of the folder for extending lanes"""
@@ -484,21 +521,7 @@ class LaneManager:
         if not self.lane_fixes:
             return errors  # No fixes to validate
         
-        # Determine valid time range (union of image and GPS ranges)
-        valid_min_time = None
-        valid_max_time = None
-        
-        if self.first_image_timestamp and self.last_image_timestamp:
-            if valid_min_time is None or self.first_image_timestamp < valid_min_time:
-                valid_min_time = self.first_image_timestamp
-            if valid_max_time is None or self.last_image_timestamp > valid_max_time:
-                valid_max_time = self.last_image_timestamp
-        
-        if self.gps_min_timestamp and self.gps_max_timestamp:
-            if valid_min_time is None or self.gps_min_timestamp < valid_min_time:
-                valid_min_time = self.gps_min_timestamp
-            if valid_max_time is None or self.gps_max_timestamp > valid_max_time:
-                valid_max_time = self.gps_max_timestamp
+        valid_min_time, valid_max_time = self.get_valid_time_range()
         
         if valid_min_time is None or valid_max_time is None:
             # No time range available for validation
@@ -528,113 +551,29 @@ class LaneManager:
             return None
         return self.fileid_folder / f"{self.fileid_folder.name}_lane_fixes.csv"
 
-    def _load_lane_fixes(self):
-        """Load lane fixes from CSV file, create empty file if not exists"""
+    def _load_lane_fixes(self, create_if_missing: bool = True):
+        """Load lane fixes from CSV file, create empty file if not exists (unless create_if_missing is False)"""
         if not self.fileid_folder:
             return
 
         lane_fix_path = self._get_lane_fix_path()
 
-        # Always ensure the file exists
         if not lane_fix_path.exists():
-            self._create_empty_lane_fix_file()
             self.lane_fixes = []
-            logging.info(f"Created empty lane fix file: {lane_fix_path}")
+            if create_if_missing:
+                self._create_empty_lane_fix_file()
+                logging.info(f"Created empty lane fix file: {lane_fix_path}")
             return
 
+        from app.utils.lane_fix_loader import load_lane_fix_csv, log_load_report
+
         try:
-            self.lane_fixes = []
-            with open(lane_fix_path, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    # Parse timestamps - handle different formats
-                    try:
-                        from_time_str = row['From']
-                        to_time_str = row['To']
-                        
-                        # Try different time formats
-                        # Format 1: DD/MM/YY HH:MM:SS.sss (saved by export_manager)
-                        if '/' in from_time_str and len(from_time_str.split()) == 2:
-                            try:
-                                from_time = datetime.strptime(from_time_str, '%d/%m/%y %H:%M:%S.%f').replace(tzinfo=timezone.utc)
-                                to_time = datetime.strptime(to_time_str, '%d/%m/%y %H:%M:%S.%f').replace(tzinfo=timezone.utc)
-                            except ValueError:
-                                # Try without microseconds
-                                from_time = datetime.strptime(from_time_str, '%d/%m/%y %H:%M:%S').replace(tzinfo=timezone.utc)
-                                to_time = datetime.strptime(to_time_str, '%d/%m/%y %H:%M:%S').replace(tzinfo=timezone.utc)
-                        # Format 2: MM:SS.s (total minutes:seconds.tenth from start of day)
-                        elif ':' in from_time_str and from_time_str.count(':') == 1:
-                            try:
-                                from_parts = from_time_str.split(':')
-                                to_parts = to_time_str.split(':')
-                                
-                                from_total_minutes = int(from_parts[0])
-                                from_seconds = float(from_parts[1])
-                                to_total_minutes = int(to_parts[0])
-                                to_seconds = float(to_parts[1])
-                                
-                                # Convert to hours/minutes/seconds
-                                from_hour = from_total_minutes // 60
-                                from_minute = from_total_minutes % 60
-                                to_hour = to_total_minutes // 60
-                                to_minute = to_total_minutes % 60
-                                
-                                # Create datetime
-                                today = datetime.now(timezone.utc).date()
-                                from_time = datetime(today.year, today.month, today.day, 
-                                                   from_hour, from_minute, int(from_seconds), 
-                                                   int((from_seconds % 1) * 1000000), timezone.utc)
-                                to_time = datetime(today.year, today.month, today.day,
-                                                 to_hour, to_minute, int(to_seconds),
-                                                 int((to_seconds % 1) * 1000000), timezone.utc)
-                            except (ValueError, IndexError):
-                                # Fall back to assuming HH:MM:SS.s format
-                                from_time_str = f"00:{from_time_str}"
-                                to_time_str = f"00:{to_time_str}"
-                                today = datetime.now(timezone.utc).date()
-                                from_time_full = f"{today} {from_time_str}"
-                                to_time_full = f"{today} {to_time_str}"
-                                from_time = datetime.strptime(from_time_full, '%Y-%m-%d %H:%M:%S.%f').replace(tzinfo=timezone.utc)
-                                to_time = datetime.strptime(to_time_full, '%Y-%m-%d %H:%M:%S.%f').replace(tzinfo=timezone.utc)
-                        else:
-                            # Assume HH:MM:SS.s format
-                            today = datetime.now(timezone.utc).date()
-                            from_time_full = f"{today} {from_time_str}"
-                            to_time_full = f"{today} {to_time_str}"
-                            from_time = datetime.strptime(from_time_full, '%Y-%m-%d %H:%M:%S.%f').replace(tzinfo=timezone.utc)
-                            to_time = datetime.strptime(to_time_full, '%Y-%m-%d %H:%M:%S.%f').replace(tzinfo=timezone.utc)
-                    except ValueError:
-                        try:
-                            # Try without microseconds
-                            from_time = datetime.strptime(from_time_full, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
-                            to_time = datetime.strptime(to_time_full, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
-                        except ValueError:
-                            logging.error(f"Could not parse time format: {from_time_str} or {to_time_str}")
-                            continue
-
-                    lane_fix = LaneFix(
-                        plate=row.get('Plate', '') or self.plate or '',
-                        from_time=from_time,
-                        to_time=to_time,
-                        lane=row.get('Lane', ''),
-                        file_id=self.fileid_folder.name,
-                        ignore=row.get('Ignore', '').strip() == '1'
-                    )
-                    
-                    # Validate the loaded lane fix before adding
-                    temp_manager = LaneManager()
-                    temp_manager.lane_fixes = [lane_fix]
-                    temp_manager.first_image_timestamp = self.first_image_timestamp
-                    temp_manager.last_image_timestamp = self.last_image_timestamp
-                    temp_manager.gps_min_timestamp = self.gps_min_timestamp
-                    temp_manager.gps_max_timestamp = self.gps_max_timestamp
-                    
-                    if not temp_manager.validate_lane_fixes_time_bounds():
-                        self.lane_fixes.append(lane_fix)
-                    else:
-                        logging.warning(f"Skipped invalid lane fix from file: {lane_fix.from_time} to {lane_fix.to_time}, lane={lane_fix.lane}")
-
-            logging.info(f"Loaded {len(self.lane_fixes)} lane fixes from {lane_fix_path}")
+            self.lane_fixes, self.last_load_report = load_lane_fix_csv(
+                lane_fix_path, self.fileid_folder.name,
+                default_plate=self.plate or '',
+                valid_range=self.get_valid_time_range()
+            )
+            log_load_report(self.last_load_report)
 
         except Exception as e:
             logging.error(f"Error loading lane fixes from {lane_fix_path}: {e}")
@@ -726,10 +665,6 @@ class LaneManager:
             'current_lane': self.current_lane
         }
 
-    def get_lane_fixes(self):
-        """Get all lane fixes for timeline display, sorted by time"""
-        return sorted(self.lane_fixes, key=lambda x: x.from_time)
-
     def get_lane_color(self, lane_code: str) -> str:
         """Get color for lane display"""
         color_map = {
@@ -746,13 +681,9 @@ class LaneManager:
     def apply_lane_change_range(self, new_lane_code: str, start_time: datetime, end_time: datetime):
         """Apply lane change for a time range, splitting periods as needed"""
         # Find all periods that overlap with [start_time, end_time]
-        overlapping_fixes = []
-        for fix in self.lane_fixes:
-            if fix.from_time < end_time and fix.to_time > start_time:
-                overlapping_fixes.append(fix)
-        
-        # Sort by from_time
-        overlapping_fixes.sort(key=lambda x: x.from_time)
+        overlapping_fixes = self._store.overlapping(
+            to_epoch_seconds(start_time), to_epoch_seconds(end_time), strict=True
+        )
         
         # Clamp end_time to not exceed the last overlapping period's end time
         if overlapping_fixes:
@@ -831,7 +762,7 @@ class LaneManager:
                 new_fixes.append(remaining_part)
         
         # Replace overlapping fixes with new fixes
-        self.lane_fixes = [fix for fix in self.lane_fixes if fix not in overlapping_fixes] + new_fixes
+        self._store.splice(overlapping_fixes, new_fixes)
         
         self.has_changes = True
         return True
@@ -841,9 +772,6 @@ class LaneManager:
         if not self.lane_fixes:
             return
         
-        # Sort by from_time
-        self.lane_fixes.sort(key=lambda x: x.from_time)
-        
         merged = []
         current = self.lane_fixes[0]
         
@@ -865,11 +793,7 @@ class LaneManager:
         Get the timestamp of the next lane change after the given timestamp
         Returns None if no lane change found
         """
-        future_fixes = [fix for fix in self.lane_fixes if fix.from_time > timestamp]
-        if not future_fixes:
-            return None
-        # Return the earliest future lane change time
-        return min(fix.from_time for fix in future_fixes)
+        return self._get_next_period_start(timestamp)
 
     @classmethod
     def from_dict(cls, data: dict) -> 'LaneManager':
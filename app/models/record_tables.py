@@ -0,0 +1,329 @@
+"""
+Struct-of-arrays tables for GeoEvent records
+Compact column storage for Event and LaneFix lists that are cached but not being edited
+"""
+
+import sys
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .event_model import Event
+from .lane_model import LaneFix
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+
+
+class _Categories:
+    """Categorical column: int codes into a list of distinct values (names, lanes, FileIDs, timezones)"""
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+
+    def code(self, value: Any) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+    def encode(self, values: Iterable[Any], dtype=np.int32) -> np.ndarray:
+        return np.fromiter((self.code(v) for v in values), dtype=dtype)
+
+    def __getstate__(self):
+        return self.values
+
+    def __setstate__(self, values):
+        self.values = values
+        self._codes = {v: i for i, v in enumerate(values)}
+
+
+def _encode_times(values: List[datetime], zones: _Categories) -> Tuple[np.ndarray, np.ndarray]:
+    """Datetimes -> (epoch microseconds int64, timezone code int16); tz-aware and naive both round-trip"""
+    micros = np.empty(len(values), dtype=np.int64)
+    tz_codes = np.empty(len(values), dtype=np.int16)
+    for i, value in enumerate(values):
+        tz_codes[i] = zones.code(value.tzinfo)
+        delta = value - (_NAIVE_EPOCH if value.tzinfo is None else _EPOCH)
+        micros[i] = (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+    return micros, tz_codes
+
+
+def _decode_time(micros: int, tz: Any) -> datetime:
+    if tz is None:
+        return _NAIVE_EPOCH + timedelta(microseconds=int(micros))
+    value = _EPOCH + timedelta(microseconds=int(micros))
+    return value if tz is timezone.utc else value.astimezone(tz)
+
+
+def _optional_floats(values: Iterable[Optional[float]]) -> np.ndarray:
+    return np.fromiter((np.nan if v is None else v for v in values), dtype=np.float64)
+
+
+def _optional_float(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+class _RecordTable(Sequence):
+    """Common table behaviour: length, row proxies, byte accounting"""
+
+    ROW_CLASS = None
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int):
+        if isinstance(index, slice):
+            return [self.ROW_CLASS(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.ROW_CLASS(self, index)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the arrays and categorical values (strings counted once)"""
+        size = sys.getsizeof(self)
+        for value in vars(self).values():
+            if isinstance(value, np.ndarray):
+                size += value.nbytes
+                if value.dtype == object:
+                    size += sum(sys.getsizeof(item) for item in value)
+            elif isinstance(value, _Categories):
+                size += sum(sys.getsizeof(item) for item in value.values)
+        return size
+
+
+class EventTable(_RecordTable):
+    """
+    Column storage for Event lists
+    - times as int64 epoch microseconds plus a timezone code (lossless round trip)
+    - event names, FileIDs and colours as categorical codes
+    - coordinates as float64 with NaN for missing values
+    Rows are read and written through EventRow proxies; to_records() rebuilds Event objects.
+    """
+
+    def __init__(self, events: List[Event] = ()):
+        events = list(events)
+        self._length = len(events)
+        self._names = _Categories()
+        self._file_ids = _Categories()
+        self._colors = _Categories()
+        self._zones = _Categories()
+
+        self._ids = np.array([e.event_id for e in events], dtype=object)
+        self.name_codes = self._names.encode((e.event_name for e in events), np.int32)
+        self.start_us, self.start_tz = _encode_times([e.start_time for e in events], self._zones)
+        self.end_us, self.end_tz = _encode_times([e.end_time for e in events], self._zones)
+        self.start_chainage = np.fromiter((e.start_chainage for e in events), dtype=np.float64)
+        self.end_chainage = np.fromiter((e.end_chainage for e in events), dtype=np.float64)
+        self.start_lat = _optional_floats(e.start_lat for e in events)
+        self.start_lon = _optional_floats(e.start_lon for e in events)
+        self.end_lat = _optional_floats(e.end_lat for e in events)
+        self.end_lon = _optional_floats(e.end_lon for e in events)
+        self.file_id_codes = self._file_ids.encode((e.file_id for e in events), np.int32)
+        self.color_codes = self._colors.encode((e.color for e in events), np.int16)
+        self.layers = np.fromiter((e.layer for e in events), dtype=np.int32)
+
+    @classmethod
+    def from_records(cls, events: List[Event]) -> 'EventTable':
+        return cls(events)
+
+    def to_records(self) -> List[Event]:
+        """Materialize Event objects (the inverse of from_records)"""
+        return [row.to_record() for row in self]
+
+    @property
+    def start_ts(self) -> np.ndarray:
+        """Start times as float epoch seconds (timeline axis), vectorized"""
+        return self.start_us / 1e6
+
+    @property
+    def end_ts(self) -> np.ndarray:
+        """End times as float epoch seconds (timeline axis), vectorized"""
+        return self.end_us / 1e6
+
+
+class LaneFixTable(_RecordTable):
+    """
+    Column storage for LaneFix lists
+    - from/to as int64 epoch microseconds plus a timezone code
+    - plates, lanes and FileIDs as categorical codes
+    Rows are read and written through LaneFixRow proxies; to_records() rebuilds LaneFix objects.
+    """
+
+    def __init__(self, fixes: List[LaneFix] = ()):
+        fixes = list(fixes)
+        self._length = len(fixes)
+        self._plates = _Categories()
+        self._lanes = _Categories()
+        self._file_ids = _Categories()
+        self._zones = _Categories()
+
+        self.plate_codes = self._plates.encode((f.plate for f in fixes), np.int32)
+        self.from_us, self.from_tz = _encode_times([f.from_time for f in fixes], self._zones)
+        self.to_us, self.to_tz = _encode_times([f.to_time for f in fixes], self._zones)
+        self.lane_codes = self._lanes.encode((f.lane for f in fixes), np.int16)
+        self.file_id_codes = self._file_ids.encode((f.file_id for f in fixes), np.int32)
+        self.ignore = np.fromiter((bool(f.ignore) for f in fixes), dtype=bool)
+
+    @classmethod
+    def from_records(cls, fixes: List[LaneFix]) -> 'LaneFixTable':
+        return cls(fixes)
+
+    def to_records(self) -> List[LaneFix]:
+        """Materialize LaneFix objects (the inverse of from_records)"""
+        return [row.to_record() for row in self]
+
+    @property
+    def from_ts(self) -> np.ndarray:
+        return self.from_us / 1e6
+
+    @property
+    def to_ts(self) -> np.ndarray:
+        return self.to_us / 1e6
+
+
+# ---- row proxies ------------------------------------------------------------
+
+def _time_property(us_column: str, tz_column: str):
+    def getter(row):
+        table = row._table
+        return _decode_time(getattr(table, us_column)[row._index],
+                            table._zones.values[getattr(table, tz_column)[row._index]])
+
+    def setter(row, value: datetime):
+        table = row._table
+        micros, tz_codes = _encode_times([value], table._zones)
+        getattr(table, us_column)[row._index] = micros[0]
+        getattr(table, tz_column)[row._index] = tz_codes[0]
+    return property(getter, setter)
+
+
+def _epoch_property(us_column: str):
+    return property(lambda row: int(getattr(row._table, us_column)[row._index]) / 1e6)
+
+
+def _category_property(codes_column: str, categories: str):
+    def getter(row):
+        table = row._table
+        return getattr(table, categories).values[getattr(table, codes_column)[row._index]]
+
+    def setter(row, value):
+        table = row._table
+        getattr(table, codes_column)[row._index] = getattr(table, categories).code(value)
+    return property(getter, setter)
+
+
+def _scalar_property(column: str, convert, optional: bool = False):
+    def getter(row):
+        value = getattr(row._table, column)[row._index]
+        return _optional_float(value) if optional else convert(value)
+
+    def setter(row, value):
+        getattr(row._table, column)[row._index] = np.nan if (optional and value is None) else value
+    return property(getter, setter)
+
+
+class _RecordRow:
+    """Thin proxy for one table row; attributes the proxy lacks are served by the materialized record"""
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index: int):
+        self._table = table
+        self._index = index
+
+    def __getattr__(self, name: str):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.to_record(), name)
+
+    def __eq__(self, other):
+        if isinstance(other, _RecordRow):
+            other = other.to_record()
+        return self.to_record() == other
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_record()!r})"
+
+
+class EventRow(_RecordRow):
+    """Row proxy with the Event attribute interface"""
+
+    __slots__ = ()
+
+    event_id = property(lambda row: row._table._ids[row._index],
+                        lambda row, value: row._table._ids.__setitem__(row._index, value))
+    event_name = _category_property('name_codes', '_names')
+    start_time = _time_property('start_us', 'start_tz')
+    end_time = _time_property('end_us', 'end_tz')
+    start_ts = _epoch_property('start_us')
+    end_ts = _epoch_property('end_us')
+    start_chainage = _scalar_property('start_chainage', float)
+    end_chainage = _scalar_property('end_chainage', float)
+    start_lat = _scalar_property('start_lat', float, optional=True)
+    start_lon = _scalar_property('start_lon', float, optional=True)
+    end_lat = _scalar_property('end_lat', float, optional=True)
+    end_lon = _scalar_property('end_lon', float, optional=True)
+    file_id = _category_property('file_id_codes', '_file_ids')
+    color = _category_property('color_codes', '_colors')
+    layer = _scalar_property('layers', int)
+
+    def to_record(self) -> Event:
+        return Event(
+            event_id=self.event_id, event_name=self.event_name,
+            start_time=self.start_time, end_time=self.end_time,
+            start_chainage=self.start_chainage, end_chainage=self.end_chainage,
+            start_lat=self.start_lat, start_lon=self.start_lon,
+            end_lat=self.end_lat, end_lon=self.end_lon,
+            file_id=self.file_id, color=self.color, layer=self.layer
+        )
+
+
+class LaneFixRow(_RecordRow):
+    """Row proxy with the LaneFix attribute interface"""
+
+    __slots__ = ()
+
+    plate = _category_property('plate_codes', '_plates')
+    from_time = _time_property('from_us', 'from_tz')
+    to_time = _time_property('to_us', 'to_tz')
+    from_ts = _epoch_property('from_us')
+    to_ts = _epoch_property('to_us')
+    lane = _category_property('lane_codes', '_lanes')
+    file_id = _category_property('file_id_codes', '_file_ids')
+    ignore = _scalar_property('ignore', bool)
+
+    def to_record(self) -> LaneFix:
+        return LaneFix(
+            plate=self.plate, from_time=self.from_time, to_time=self.to_time,
+            lane=self.lane, file_id=self.file_id, ignore=self.ignore
+        )
+
+
+EventTable.ROW_CLASS = EventRow
+LaneFixTable.ROW_CLASS = LaneFixRow
+
+
+def compact_records(value: Any) -> Any:
+    """EventTable/LaneFixTable for a non-empty list of Event/LaneFix objects, else value unchanged"""
+    if isinstance(value, list) and value:
+        if all(type(item) is Event for item in value):
+            return EventTable(value)
+        if all(type(item) is LaneFix for item in value):
+            return LaneFixTable(value)
+    return value
+
+
+def expand_records(value: Any) -> Any:
+    """Inverse of compact_records"""
+    if isinstance(value, (EventTable, LaneFixTable)):
+        return value.to_records()
+    return value
@@ -0,0 +1,77 @@
+"""
+Folder Warnings View for GeoEvent application
+Incrementally maintained warnings shown in the photo tab's folder info panel
+"""
+
+from typing import Dict, Iterable, Optional
+
+from ..models.event_model import Event, PointEventIndex
+
+
+class FolderWarningsView:
+    """
+    In-memory view of the folder info warnings
+    RESPONSIBILITIES:
+    - Hold one warning line per length-exceeded event and per Check Lane event
+    - Update only the affected lines when an event is created, modified or deleted
+    - Render non-span (point) event warnings from the index captured at load time
+    - Cache the rendered HTML until something changes (no file I/O, no full rescans)
+    """
+
+    def __init__(self):
+        self._length_warnings: Dict[int, str] = {}  # id(event) -> html line, in event order
+        self._check_lane_warnings: Dict[int, str] = {}
+        self._point_lines = ""
+        self._html: Optional[str] = None
+
+    def reset(self, events: Iterable[Event], point_events: Optional[PointEventIndex] = None):
+        """Rebuild the view for a newly loaded FileID"""
+        self._length_warnings.clear()
+        self._check_lane_warnings.clear()
+        for event in events:
+            self._apply(event)
+        self._point_lines = "".join(
+            f"<br><font color='red'><b>Check lane at {point.time_utc_text}</b></font>"
+            for point in (point_events or [])
+        )
+        self._html = None
+
+    def update_event(self, event: Event):
+        """Refresh the lines of one created or modified event"""
+        self._apply(event)
+        self._html = None
+
+    def remove_event(self, event: Event):
+        """Drop the lines of a deleted event"""
+        self._length_warnings.pop(id(event), None)
+        self._check_lane_warnings.pop(id(event), None)
+        self._html = None
+
+    def render(self) -> str:
+        """HTML for all warnings (length-exceeded, Check Lane, non-span), cached"""
+        if self._html is None:
+            self._html = (
+                "".join(self._length_warnings.values())
+                + "".join(self._check_lane_warnings.values())
+                + self._point_lines
+            )
+        return self._html
+
+    def _apply(self, event: Event):
+        key = id(event)
+        chainage_info = f" at chainage {event.start_chainage:.1f}" if event.start_chainage else ""
+
+        if event.is_length_exceeded:
+            self._length_warnings[key] = (
+                f"<br><font color='red'><b>WARNING:</b> {event.event_name} too long "
+                f"({event.length_meters:.1f}m){chainage_info}</font>"
+            )
+        else:
+            self._length_warnings.pop(key, None)
+
+        if event.event_name == "Check Lane":
+            self._check_lane_warnings[key] = (
+                f"<br><font color='red'><b>WARNING:</b> Check Lane event detected{chainage_info}</font>"
+            )
+        else:
+            self._check_lane_warnings.pop(key, None)
@@ -4,13 +4,14 @@ Photo Preview Tab - Main UI component for GeoEvent application
 
 import os
 import logging
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Optional
-import csv
+from bisect import bisect_left
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QSlider, QFrame, QScrollArea, QGroupBox, QButtonGroup, QSplitter, QSizePolicy, QMessageBox, QComboBox, QDialog, QRadioButton, QDialogButtonBox, QProgressDialog
+    QSlider, QFrame, QScrollArea, QGroupBox, QButtonGroup, QSplitter, QSizePolicy, QMessageBox, QComboBox, QDialog, QRadioButton, QDialogButtonBox
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QSize, QMutex, QMutexLocker
 from PyQt6.QtGui import QPixmap, QImage, QPainter, QPen, QBrush, QShortcut, QKeySequence
@@ -25,7 +26,14 @@ from ..utils.image_utils import extract_image_metadata
 from ..utils.export_manager import ExportManager
 from ..utils.smart_image_cache import SmartImageCache
 from ..utils.minimap_overlay import MinimapOverlay
+from ..core.fileid_load_worker import FileIDLoadWorker
+from ..core.session_store import FileIDSessionStore
+from ..core.frame_dispatcher import FramePacedDispatcher
+from ..utils.time_axis import to_epoch_seconds
+from ..utils.latency import measure_latency
+from ..utils.tracing import trace_span, traced, trace_async_begin, trace_async_end
 from .timeline_widget import TimelineWidget
+from .folder_warnings import FolderWarningsView
 
 class PhotoPreviewTab(QWidget):
     """
@@ -58,19 +66,42 @@ class PhotoPreviewTab(QWidget):
         settings = self.main_window.settings_manager.get_setting('image_cache_size', 500)
         self.image_cache = SmartImageCache(max_cache_size_mb=settings)
         self.image_cache.cache_cleared.connect(self._on_cache_cleared)
-        self.image_cache.memory_warning.connect(self._on_memory_warning)
         self.events_modified = False  # Track if events have been modified
-        self.events_per_fileid = {}  # Store events per FileID to preserve changes across switches
+        # Store events / lane_fixes per FileID to preserve changes across switches
+        # (LRU-bounded; colder FileIDs are spilled to disk and reloaded on access)
+        self.events_per_fileid = FileIDSessionStore("events")
         self.lane_managers_per_fileid = {}  # Store lane managers per FileID to preserve changes across switches
-        self.lane_fixes_per_fileid = {}  # Store lane_fixes lists per FileID to preserve changes
+        self.lane_fixes_per_fileid = FileIDSessionStore("lane_fixes")
         self.current_fileid = None  # Current FileID being displayed
 
+        # Asynchronous FileID loading (see load_fileid)
+        self._load_generation = 0
+        self._load_workers = []  # FileIDLoadWorker instances still running
+        self._load_started = 0.0  # perf_counter() when the current load was requested
+        self._loading_fileid = None  # FileID whose load has not reached the lanes stage
+
         # Current metadata for the currently displayed image
         self.current_metadata = {}
 
         # Current position for warnings
         self.current_timestamp = None
 
+        # Folder info warnings, maintained incrementally on edits (no file I/O on refresh)
+        self.warnings_view = FolderWarningsView()
+        self.point_events = None  # current FileID's non-span events (PointEventIndex), for warnings_view resets
+
+        # Timeline drag -> image sync: cheap cached preview once per frame,
+        # full decode / folder info / minimap only once the pointer settles
+        self.timeline_sync = FramePacedDispatcher(
+            on_frame=self._preview_timeline_position,
+            on_settle=self.sync_to_timeline_position,
+            parent=self,
+            name='timeline_sync'
+        )
+        self.folder_info_refresh = FramePacedDispatcher(on_settle=self.update_folder_info_display, parent=self)
+        self._preview_index = None  # image shown as a drag preview (not yet current_index)
+        self._image_time_index = None  # (sorted (epoch, index) pairs, image_paths they were built from)
+
         # Lane change mode using current position marker
         self.lane_change_mode_active = False
         self.lane_change_new_lane = None
@@ -650,7 +681,9 @@ class PhotoPreviewTab(QWidget):
 
     def connect_signals(self):
         """Connect signal handlers"""
-        self.timeline.position_clicked.connect(self.sync_to_timeline_position)
+        self.timeline.position_clicked.connect(self.request_timeline_sync)
+        self.timeline.pointer_released.connect(self.timeline_sync.flush)
+        self.timeline.pointer_released.connect(self.folder_info_refresh.flush)
         self.timeline.lane_change_position_changed.connect(self.on_lane_change_position_changed)
         self.timeline.event_modified.connect(self.on_event_modified)
         self.timeline.event_deleted.connect(self.on_event_deleted)
@@ -682,13 +715,18 @@ class PhotoPreviewTab(QWidget):
                     setattr(event, key, value)
                 # Update chainage and GPS coordinates after time changes
                 self._update_event_gps_data(event)
+                self.warnings_view.update_event(event)
                 break
         self.events_modified = True
         # Cache modified events for this FileID
         if self.current_fileid:
             self.events_per_fileid[self.current_fileid.fileid] = self.events
-        # Update folder info to refresh warnings
-        self.update_folder_info_display()
+        # Update folder info to refresh warnings (once the drag settles)
+        self.folder_info_refresh.submit()
+        if not self.timeline.is_pointer_dragging():
+            self.folder_info_refresh.flush()
+        # GPS refresh can change chainage-derived flags drawn in the cached layers
+        self.timeline.invalidate_cache()
         # Use timeline_area.update() instead of timeline.update()
         if hasattr(self.timeline, 'timeline_area'):
             self.timeline.timeline_area.update()
@@ -696,6 +734,9 @@ class PhotoPreviewTab(QWidget):
     def on_event_deleted(self, event_id: str):
         """Handle event deletion"""
         # logging.info(f"PhotoPreviewTab: Deleting event {event_id}")
+        for event in self.events:
+            if event.event_id == event_id:
+                self.warnings_view.remove_event(event)
         self.events = [event for event in self.events if event.event_id != event_id]
         self.events_modified = True
         # Cache modified events for this FileID
@@ -712,6 +753,7 @@ class PhotoPreviewTab(QWidget):
         """Handle event creation"""
         # logging.info(f"PhotoPreviewTab: Adding new event {event.event_id}")
         self.events.append(event)
+        self.warnings_view.update_event(event)
         self.events_modified = True
         # Cache modified events for this FileID
         if self.current_fileid:
@@ -727,186 +769,267 @@ class PhotoPreviewTab(QWidget):
         logging.debug(f"PhotoPreviewTab: Lane change position changed to {timestamp}")
         # Update current timestamp for warnings
         self.current_timestamp = timestamp
-        # Update folder info to show warnings
-        self.update_folder_info_display()
         # Update the lane change end timestamp
         if hasattr(self, 'lane_change_start_timestamp') and self.lane_change_start_timestamp:
             # Store the dragged timestamp for later use in lane change application
             self.lane_change_end_timestamp = timestamp
             logging.debug(f"PhotoPreviewTab: Lane change range: {self.lane_change_start_timestamp} to {timestamp}")
 
-        # Sync image preview to the marker position
-        self.sync_to_timeline_position(timestamp, (None, None))
+        # Sync image preview to the marker position (folder info refreshes when the drag settles)
+        self.request_timeline_sync(timestamp, (None, None))
 
+    @traced('PhotoPreviewTab.load_fileid', 'ui')
     def load_fileid(self, fileid_folder):
-        """Load data for a specific FileID  with progress dialog"""
-        # logging.info(f"PhotoPreviewTab: Loading FileID {fileid_folder.fileid} from {fileid_folder.path}")
-        
-        # Create progress dialog
-        progress = QProgressDialog(
-            f"Loading FileID {fileid_folder.fileid}...",
-            "Cancel",
-            0, 100,
-            self
-        )
-        progress.setWindowTitle("Loading FileID Data")
-        progress.setWindowModality(Qt.WindowModality.WindowModal)
-        progress.setMinimumDuration(500)  # Show after 500ms if not complete
-        progress.setValue(0)
-        
-        try:
+        """
+        Start loading a FileID without blocking the GUI.
+        Stages (images, gps, events, lanes) are applied as they arrive from a
+        FileIDLoadWorker; a newer call supersedes and cancels any load in progress.
+        """
+        # Supersede any load still running
+        if self._loading_fileid is not None:
+            trace_async_end('FileID switch', self._load_generation, 'ui', superseded=True)
+        self._load_generation += 1
+        generation = self._load_generation
+        trace_async_begin('FileID switch', generation, 'ui', fileid=fileid_folder.fileid)
+        self._cancel_active_load()
+        self.timeline_sync.cancel()
+        self._preview_index = None
+        self._load_started = time.perf_counter()
+
+        # Wait for a background save of the current FileID to release its data
+        with QMutexLocker(self._data_mutex):
             # Save current events and lane_fixes to cache before switching FileID
-            progress.setLabelText("Saving current FileID data...")
-            progress.setValue(5)
             if self.current_fileid:
                 self.events_per_fileid[self.current_fileid.fileid] = self.events
                 self.lane_fixes_per_fileid[self.current_fileid.fileid] = self.lane_manager.lane_fixes if self.lane_manager else []
-            
-            # Use DataLoader to load all data
-            progress.setLabelText("Loading events and GPS data...")
-            progress.setValue(15)
-            data = self.data_loader.load_fileid_data(fileid_folder)
-
-            # Store loaded data
-            progress.setLabelText("Processing loaded data...")
-            progress.setValue(40)
-            # Use cached events if available (preserves modifications), otherwise use loaded events
-            self.events = self.events_per_fileid.get(fileid_folder.fileid, data['events'])
-            self.gps_data = data['gps_data']
-            self.image_paths = data['image_paths']
-            self.fileid_metadata = data['metadata']
-            
-            # Reset minimap when switching FileID to clear old path overlay
-            # Keep zoom level set by user
-            # self._minimap_initialized = False
-            
-            # Always use a fresh lane manager from data
-            progress.setLabelText("Setting up lane manager...")
-            progress.setValue(55)
+
+            # current_fileid stays None until the lanes stage so nothing saves half-loaded data
+            self.current_fileid = None
+            self._loading_fileid = fileid_folder
+            self.events = []
+            self.gps_data = None
+            self.lane_manager = None
+            self.image_paths = []
+            self.current_index = -1
+            self.point_events = None
+            self.warnings_view.reset([])
+
+        self.timeline.set_events([], update_view_range=False)
+        self.timeline.set_lane_manager(None)
+        self._set_load_status(f"Loading FileID {fileid_folder.fileid}...")
+
+        # Data from the background preloader is complete; apply every stage at once
+        data = self._take_preloaded_data(fileid_folder)
+        if data is not None:
+            for stage in DataLoader.LOAD_STAGES:
+                self._on_load_stage_ready(generation, stage, data)
+            self._on_load_finished(generation, data)
+            return
+
+        worker = FileIDLoadWorker(fileid_folder, generation)
+        worker.stage_ready.connect(self._on_load_stage_ready)
+        worker.load_finished.connect(self._on_load_finished)
+        worker.load_failed.connect(self._on_load_failed)
+        worker.finished.connect(lambda w=worker: self._on_load_worker_finished(w))
+        self._load_workers.append(worker)
+        worker.start()
+
+    def is_loading(self) -> bool:
+        """True while a FileID load has not yet reached its lanes stage"""
+        return self._loading_fileid is not None
+
+    def _cancel_active_load(self):
+        """Cancel all running load workers; they exit at their next stage boundary"""
+        for worker in self._load_workers:
+            worker.cancel()
+
+    def stop_loading(self):
+        """Cancel loads in progress and wait for their threads (used on close)"""
+        self._load_generation += 1
+        self._cancel_active_load()
+        for worker in list(self._load_workers):
+            worker.wait(5000)
+
+    def _on_load_worker_finished(self, worker):
+        """Release a finished (or cancelled) worker"""
+        if worker in self._load_workers:
+            self._load_workers.remove(worker)
+        worker.deleteLater()
+
+    def _set_load_status(self, text: str):
+        """Show load progress in the main window status bar"""
+        status_label = getattr(self.main_window, 'status_label', None)
+        if status_label is not None:
+            status_label.setText(text)
+
+    def _on_load_stage_ready(self, generation: int, stage: str, data: dict):
+        """Apply one stage of a FileID load (ignored if superseded)"""
+        if generation != self._load_generation or self._loading_fileid is None:
+            return
+
+        fileid_folder = self._loading_fileid
+        with trace_span(f'apply.{stage}', 'ui', fileid=fileid_folder.fileid):
+            try:
+                if stage == 'images':
+                    self.image_paths = data['image_paths']
+                    self.fileid_metadata = data['metadata']
+                    if self.image_paths:
+                        # Show the first image while GPS and events are still loading
+                        self.navigate_to_image(0)
+                        self.slider.setMaximum(len(self.image_paths) - 1)
+                        self.update_navigation_state()
+                    else:
+                        logging.warning("PhotoPreviewTab: No images found in FileID")
+                    self.update_folder_info_display()
+                    self._set_load_status(f"Loading FileID {fileid_folder.fileid}: GPS...")
+
+                elif stage == 'gps':
+                    self.gps_data = data['gps_data']
+                    if self.gps_data:
+                        self.timeline.set_gps_data(self.gps_data)
+                    self._set_load_status(f"Loading FileID {fileid_folder.fileid}: events...")
+
+                elif stage == 'events':
+                    # Use cached events if available (preserves modifications), otherwise use loaded events
+                    self.events = self.events_per_fileid.get(fileid_folder.fileid, data['events'])
+                    self.point_events = data.get('point_events')
+                    self.warnings_view.reset(self.events, self.point_events)
+                    self.timeline.set_events(self.events, update_view_range=False)
+                    self.update_folder_info_display()
+                    self._set_load_status(f"Loading FileID {fileid_folder.fileid}: lanes...")
+
+                elif stage == 'lanes':
+                    self._apply_lane_stage(fileid_folder, data)
+
+            except Exception as e:
+                logging.error(f"PhotoPreviewTab: Failed to apply {stage} stage for {fileid_folder.fileid}: {str(e)}", exc_info=True)
+
+    def _apply_lane_stage(self, fileid_folder, data: dict):
+        """Final stage: install the lane manager and make the FileID current"""
+        with QMutexLocker(self._data_mutex):
             self.lane_manager = data['lane_manager']
-            plate = data['metadata'].get('plate', 'Unknown')
-            self.lane_manager.plate = plate
+            self.lane_manager.plate = data['metadata'].get('plate', 'Unknown')
             self.lane_manager.fileid_folder = Path(fileid_folder.path)
             if data['metadata'].get('last_image_timestamp') is not None:
                 self.lane_manager.set_end_time(data['metadata']['last_image_timestamp'])
-            
+
             # Store current FileID for saving (set after lane_manager is ready)
             self.current_fileid = fileid_folder
-            
-            # Check for lane fixes validation errors and notify user immediately
-            progress.setLabelText("Validating lane data...")
-            progress.setValue(70)
-            validation_errors = self.lane_manager.validate_lane_fixes_time_bounds()
-            if validation_errors:
-                error_msg = f"Found {len(validation_errors)} lane data validation errors for FileID {fileid_folder.fileid}:\n\n"
-                for i, error in enumerate(validation_errors[:5]):  # Show first 5 errors
-                    error_msg += f"• {error}\n"
-                if len(validation_errors) > 5:
-                    error_msg += f"... and {len(validation_errors) - 5} more errors\n\n"
-                error_msg += "These lane fixes may not display correctly on the timeline."
-                
-                QMessageBox.warning(
-                    self, 
-                    "Lane Data Warning", 
-                    error_msg
-                )
-            
+            self._loading_fileid = None
+
+            # The FileID on screen is edited in place; never spill it
+            self.events_per_fileid.pin(fileid_folder.fileid)
+            self.lane_fixes_per_fileid.pin(fileid_folder.fileid)
+
             # Restore cached lane_fixes if available, not empty, and valid for this FileID
-            if fileid_folder.fileid in self.lane_fixes_per_fileid:
-                cached_lane_fixes = self.lane_fixes_per_fileid[fileid_folder.fileid]
-                if cached_lane_fixes:  # Only use cache if not empty
-                    # Validate cached lane fixes against current FileID metadata
-                    temp_lane_manager = LaneManager()
-                    temp_lane_manager.lane_fixes = cached_lane_fixes
-                    temp_lane_manager.first_image_timestamp = self.lane_manager.first_image_timestamp
-                    temp_lane_manager.last_image_timestamp = self.lane_manager.last_image_timestamp
-                    temp_lane_manager.gps_min_timestamp = self.lane_manager.gps_min_timestamp
-                    temp_lane_manager.gps_max_timestamp = self.lane_manager.gps_max_timestamp
-                    
-                    cached_validation_errors = temp_lane_manager.validate_lane_fixes_time_bounds()
-                    if not cached_validation_errors:
-                        # Cached lane fixes are valid for this FileID, restore them
-                        self.lane_manager.lane_fixes = cached_lane_fixes
-                        # logging.info(f"PhotoPreviewTab: Restored {len(cached_lane_fixes)} cached lane fixes for {fileid_folder.fileid}")
-                    else:
-                        # Cached lane fixes are invalid for this FileID, discard them
-                        logging.warning(f"PhotoPreviewTab: Discarded {len(cached_lane_fixes)} invalid cached lane fixes for {fileid_folder.fileid}")
-                        # Remove invalid cache entry
-                        del self.lane_fixes_per_fileid[fileid_folder.fileid]
+            cached_lane_fixes = self.lane_fixes_per_fileid.get(fileid_folder.fileid)
+            if cached_lane_fixes:
+                # Validate cached lane fixes against current FileID metadata
+                temp_lane_manager = LaneManager()
+                temp_lane_manager.lane_fixes = cached_lane_fixes
+                temp_lane_manager.first_image_timestamp = self.lane_manager.first_image_timestamp
+                temp_lane_manager.last_image_timestamp = self.lane_manager.last_image_timestamp
+                temp_lane_manager.gps_min_timestamp = self.lane_manager.gps_min_timestamp
+                temp_lane_manager.gps_max_timestamp = self.lane_manager.gps_max_timestamp
+
+                if not temp_lane_manager.validate_lane_fixes_time_bounds():
+                    # Cached lane fixes are valid for this FileID, restore them
+                    self.lane_manager.lane_fixes = cached_lane_fixes
                 else:
-                    # Cached lane fixes are empty, use loaded data from file
-                    # logging.info(f"PhotoPreviewTab: Cached lane fixes empty, using loaded data from file for {fileid_folder.fileid}")
-                    pass
-            
+                    # Cached lane fixes are invalid for this FileID, discard them
+                    logging.warning(f"PhotoPreviewTab: Discarded {len(cached_lane_fixes)} invalid cached lane fixes for {fileid_folder.fileid}")
+
             # Cache the current lane_fixes for this FileID
-            progress.setLabelText("Caching lane data...")
-            progress.setValue(85)
             self.lane_fixes_per_fileid[fileid_folder.fileid] = self.lane_manager.lane_fixes
-            
-            # Sync timeline to current FileID immediately so view only shows this FileID's events
-            self.timeline.set_events(self.events, update_view_range=False)
-            self.timeline.set_lane_manager(self.lane_manager)
-            if self.gps_data:
-                self.timeline.set_gps_data(self.gps_data)
 
-            # logging.info(f"PhotoPreviewTab: Stored {len(self.events)} events, {len(self.image_paths)} images")
+        self.timeline.set_lane_manager(self.lane_manager)
+
+        # Reset lane button states when switching FileID
+        for button in self.lane_buttons.buttons():
+            button.setChecked(False)
+            button.setProperty("current", False)
+            button.style().unpolish(button)
+            button.style().polish(button)
+
+        # Reset all buttons in lane_button_map
+        for button in self.lane_button_map.values():
+            button.setProperty("current", False)
+            button.style().unpolish(button)
+            button.style().polish(button)
+
+        self.update_lane_display()
 
-            # Load first image if available BEFORE setting timeline events
-            progress.setLabelText("Loading first image...")
-            progress.setValue(92)
-            if self.image_paths:
-                # logging.info(f"Loading first image: {os.path.basename(self.image_paths[0])}")
-                self.navigate_to_image(0)
+        # Notify user of lane fixes loaded from file that fall outside this FileID
+        validation_errors = data.get('lane_validation_errors') or []
+        if validation_errors:
+            error_msg = f"Found {len(validation_errors)} lane data validation errors for FileID {fileid_folder.fileid}:\n\n"
+            for i, error in enumerate(validation_errors[:5]):  # Show first 5 errors
+                error_msg += f"• {error}\n"
+            if len(validation_errors) > 5:
+                error_msg += f"... and {len(validation_errors) - 5} more errors\n\n"
+            error_msg += "These lane fixes may not display correctly on the timeline."
 
-                # Update UI components
-                self.slider.setMaximum(len(self.image_paths) - 1)
-                self.update_navigation_state()
+            QMessageBox.warning(
+                self,
+                "Lane Data Warning",
+                error_msg
+            )
 
-                # Set GPS data immediately for timeline functionality
-                if self.gps_data:
-                    self.timeline.set_gps_data(self.gps_data)
+    def _on_load_finished(self, generation: int, data: dict):
+        """All stages applied: finish timeline setup"""
+        if generation != self._load_generation or self.current_fileid is None:
+            return
 
-                # Defer other timeline operations to avoid blocking GUI thread
-                QTimer.singleShot(10, self._setup_timeline_data)
+        trace_async_end('FileID switch', generation, 'ui')
 
-                # Update folder info display
-                self.update_folder_info_display()
+        # Load latency as the user sees it: request to all stages applied
+        if hasattr(self.main_window, 'metrics_tracker'):
+            self.main_window.metrics_tracker.track_fileid_load(time.perf_counter() - self._load_started)
 
-                # Force update minimap with new GPS data (defer to ensure UI is ready)
-                # Keep zoom level set by user
-                # QTimer.singleShot(100, lambda: self._force_minimap_update())
-            else:
-                logging.warning("PhotoPreviewTab: No images found in FileID")
-                # Still set timeline view for current FileID (events already set above)
-                QTimer.singleShot(10, self._setup_timeline_data)
-            
-            # logging.info(f"PhotoPreviewTab: Successfully loaded FileID {fileid_folder.fileid}")
-            if hasattr(self.main_window, 'update_fileid_navigation'):
-                self.main_window.update_fileid_navigation()
+        # Defer other timeline operations to avoid blocking GUI thread
+        QTimer.singleShot(10, self._setup_timeline_data)
 
-            # Reset lane button states when switching FileID
-            for button in self.lane_buttons.buttons():
-                button.setChecked(False)
-                button.setProperty("current", False)
-                button.style().unpolish(button)
-                button.style().polish(button)
-            
-            # Reset all buttons in lane_button_map
-            for button in self.lane_button_map.values():
-                button.setProperty("current", False)
-                button.style().unpolish(button)
-                button.style().polish(button)
-                
-            self.update_lane_display()
-            
-            # Complete progress
-            progress.setValue(100)
+        if hasattr(self.main_window, 'update_fileid_navigation'):
+            self.main_window.update_fileid_navigation()
+        self._set_load_status("Ready")
 
-        except Exception as e:
-            progress.close()
-            logging.error(f"PhotoPreviewTab: Failed to load FileID {fileid_folder.fileid}: {str(e)}", exc_info=True)
-            raise Exception(f"Failed to load FileID data: {str(e)}")
+        # Preload neighbours now that the current FileID is on screen
+        if hasattr(self.main_window, 'schedule_adjacent_preload'):
+            self.main_window.schedule_adjacent_preload()
+
+        # Edits journaled before a crash are offered once the timeline is set up
+        if hasattr(self.main_window, 'offer_autosave_recovery'):
+            QTimer.singleShot(50, self.main_window.offer_autosave_recovery)
 
+    def _on_load_failed(self, generation: int, error: str):
+        """Report a failed load (ignored if superseded)"""
+        if generation != self._load_generation:
+            return
+
+        trace_async_end('FileID switch', generation, 'ui', error=error)
+        fileid = self._loading_fileid.fileid if self._loading_fileid else ""
+        self._loading_fileid = None
+        self._set_load_status("Load failed")
+        QMessageBox.critical(
+            self, "Error",
+            f"Failed to load FileID {fileid}: {error}"
+        )
+
+    def _take_preloaded_data(self, fileid_folder):
+        """Use data prepared by the main window's FileIDPreloader, warming the image cache"""
+        preloader = getattr(self.main_window, 'fileid_preloader', None)
+        if preloader is None:
+            return None
+
+        data = preloader.take(fileid_folder.fileid)
+        if data is None:
+            return None
+
+        for image_path, image in data.pop('warm_images', {}).items():
+            self.image_cache.put(image_path, QPixmap.fromImage(image))
+        return data
+
+    @traced('timeline.rebuild', 'ui')
     def _setup_timeline_data(self):
         """Set up timeline data after initial loading (deferred to avoid blocking GUI)"""
         try:
@@ -916,24 +1039,8 @@ class PhotoPreviewTab(QWidget):
             self.timeline.set_events(self.events, update_view_range=False)
 
             # Set lane manager for lane period display
+            # (validation errors were already reported by the lanes load stage)
             self.timeline.set_lane_manager(self.lane_manager)
-            
-            # Check for lane fixes validation errors and notify user
-            if self.lane_manager:
-                validation_errors = self.lane_manager.validate_lane_fixes_time_bounds()
-                if validation_errors:
-                    error_msg = f"Found {len(validation_errors)} lane data validation errors:\n\n"
-                    for i, error in enumerate(validation_errors[:5]):  # Show first 5 errors
-                        error_msg += f"• {error}\n"
-                    if len(validation_errors) > 5:
-                        error_msg += f"... and {len(validation_errors) - 5} more errors\n\n"
-                    error_msg += "These lane fixes may not display correctly on the timeline."
-                    
-                    QMessageBox.warning(
-                        self, 
-                        "Lane Data Warning", 
-                        error_msg
-                    )
 
             # Set timeline view range: prefer image time range, fallback to events range so view always exists
             if self.fileid_metadata.get('first_image_timestamp') and self.fileid_metadata.get('last_image_timestamp'):
@@ -977,35 +1084,8 @@ class PhotoPreviewTab(QWidget):
                 last_time = metadata['last_image_timestamp'].strftime('%Y-%m-%d %H:%M:%S')
                 info_text += f"<b>Last:</b> {last_time}"
 
-            # Check for event length warnings
-            exceeded_events = [event for event in self.events if event.is_length_exceeded]
-            if exceeded_events:
-                for event in exceeded_events:
-                    max_length = self._get_max_length_for_event(event.event_name)
-                    chainage_info = f" at chainage {event.start_chainage:.1f}" if event.start_chainage else ""
-                    info_text += f"<br><font color='red'><b>WARNING:</b> {event.event_name} too long ({event.length_meters:.1f}m){chainage_info}</font>"
-
-            # Check for Check Lane events
-            check_lane_events = [event for event in self.events if event.event_name == "Check Lane"]
-            if check_lane_events:
-                for event in check_lane_events:
-                    chainage_info = f" at chainage {event.start_chainage:.1f}" if event.start_chainage else ""
-                    info_text += f"<br><font color='red'><b>WARNING:</b> Check Lane event detected{chainage_info}</font>"
-
-            # Check for non-span Lane 2 events in .driveevt file
-            driveevt_path = os.path.join(metadata['path'], f"{metadata['fileid']}.driveevt")
-            if os.path.exists(driveevt_path):
-                try:
-                    with open(driveevt_path, 'r', encoding='utf-8', errors='replace') as f:
-                        reader = csv.DictReader(f)
-                        for row in reader:
-                            event_name = row.get('Event', '').strip()
-                            is_span = row.get('IsSpanEvent', '').lower() == 'true'
-                            time_utc = row.get('TimeUtc', '').strip()
-                            if not is_span and time_utc:
-                                info_text += f"<br><font color='red'><b>Check lane at {time_utc}</b></font>"
-                except Exception as e:
-                    logging.warning(f"Error checking non-span events in {driveevt_path}: {e}")
+            # Length-exceeded, Check Lane and non-span warnings (kept up to date on edits)
+            info_text += self.warnings_view.render()
 
             self.folder_info_label.setText(info_text)
 
@@ -1103,18 +1183,18 @@ class PhotoPreviewTab(QWidget):
         if cached_pixmap is not None:
             pixmap = cached_pixmap
         else:
-            logging.info(f"Loading image: {os.path.basename(image_path)}")
-            pixmap = QPixmap(image_path)
+            logging.debug("Loading image: %s", image_path)
+            with measure_latency('image_decode'):
+                pixmap = QPixmap(image_path)
+                # Scale down large images for display (limit initial size to prevent UI freeze)
+                if pixmap.width() > 1920:
+                    logging.debug(f"Scaling large image from {pixmap.width()}x{pixmap.height()} to width 1920")
+                    pixmap = pixmap.scaledToWidth(1920, Qt.TransformationMode.FastTransformation)  # Use Fast instead of Smooth for speed
             if pixmap.isNull():
                 self.image_label.setText(f"Failed to load image: {os.path.basename(image_path)}")
                 logging.error(f"Failed to load pixmap for {image_path}")
                 return
 
-            # Scale down large images for display (limit initial size to prevent UI freeze)
-            if pixmap.width() > 1920:
-                logging.debug(f"Scaling large image from {pixmap.width()}x{pixmap.height()} to width 1920")
-                pixmap = pixmap.scaledToWidth(1920, Qt.TransformationMode.FastTransformation)  # Use Fast instead of Smooth for speed
-
             # Add to smart cache (guard against extremely large frames)
             approx_bytes = pixmap.width() * pixmap.height() * 4  # RGBA size estimate
             if approx_bytes <= 10 * 1024 * 1024:  # ~10MB cap per entry
@@ -1149,7 +1229,10 @@ class PhotoPreviewTab(QWidget):
         pixmap = self.image_cache.get(image_path)
         if pixmap is None:
             return
-        
+        self._show_pixmap_scaled(pixmap)
+
+    def _show_pixmap_scaled(self, pixmap: QPixmap):
+        """Show a pixmap scaled to the available space"""
         # Get available size from scroll area
         if self.scroll_area and hasattr(self.scroll_area, 'viewport'):
             available_size = self.scroll_area.viewport().size()
@@ -1291,7 +1374,7 @@ class PhotoPreviewTab(QWidget):
 
     def assign_lane(self, lane_code: str) -> bool:
         """Assign lane at current position with smart change logic"""
-        logging.info(f"PhotoPreviewTab: assign_lane called with lane_code='{lane_code}'")
+        logging.info("PhotoPreviewTab: assign_lane called with lane_code='%s'", lane_code)
         if not self.current_metadata or 'timestamp' not in self.current_metadata:
             logging.warning("PhotoPreviewTab: assign_lane failed - no current metadata")
             return False
@@ -1316,12 +1399,12 @@ class PhotoPreviewTab(QWidget):
                 self.main_window.metrics_tracker.track_lane_change()
         elif current_lane_at_time and current_lane_at_time == stored_lane_code:
             # Đang ở cùng lane rồi, không cần làm gì
-            logging.info(f"PhotoPreviewTab: Already in lane {stored_lane_code}, no change needed")
+            logging.info("PhotoPreviewTab: Already in lane %s, no change needed", stored_lane_code)
             success = True
         else:
             # Nếu chưa có lane, thì gán trực tiếp
             success = self.lane_manager.assign_lane(stored_lane_code, timestamp)
-            logging.info(f"PhotoPreviewTab: standard lane_manager.assign_lane returned success={success}")
+            logging.info("PhotoPreviewTab: standard lane_manager.assign_lane returned success=%s", success)
             if success:
                 self.sync_lane_fixes_cache()  # Sync cache after direct lane assignment
                 
@@ -1352,11 +1435,9 @@ class PhotoPreviewTab(QWidget):
         current_lane = self.lane_manager.get_lane_at_timestamp(timestamp)
         
         # Find the lane fix record
-        target_fix = None
-        for fix in self.lane_manager.lane_fixes:
-            if fix.from_time <= timestamp <= fix.to_time and fix.lane == current_lane:
-                target_fix = fix
-                break
+        target_fix = self.lane_manager.get_fix_at_timestamp(timestamp)
+        if target_fix and target_fix.lane != current_lane:
+            target_fix = None
         
         if not target_fix:
             logging.error("Could not find target lane fix for smart change")
@@ -1521,6 +1602,7 @@ class PhotoPreviewTab(QWidget):
                     if fix.from_time == end_time and fix.to_time == self.lane_change_auto_end_timestamp:
                         fix.lane = self.lane_change_original_lane
                         fix.ignore = (self.lane_change_original_lane == '')
+                        self.lane_manager.reindex()
                         logging.info(f"PhotoPreviewTab: Fixed remaining period {end_time} to {self.lane_change_auto_end_timestamp} to original lane {self.lane_change_original_lane}")
                         break
         else:
@@ -1581,7 +1663,7 @@ class PhotoPreviewTab(QWidget):
                 current_lane = lane_at_time
         
         self.current_lane_label.setText(f"Current: {current_lane}")
-        logging.info(f"PhotoPreviewTab: update_lane_display - current_lane='{current_lane}'")
+        logging.debug("PhotoPreviewTab: update_lane_display - current_lane='%s'", current_lane)
 
         # Update button states to match lane_manager state
         self._update_button_states(current_lane)
@@ -1614,9 +1696,62 @@ class PhotoPreviewTab(QWidget):
                 if current_lane in ['1', '2', '3', '4']:
                     button.setChecked(True)
 
+    def request_timeline_sync(self, timestamp: datetime, gps_coords: tuple):
+        """
+        Queue a timeline -> image sync. While the pointer is dragging, intents are
+        coalesced to one preview per frame (latest wins) and the full sync runs
+        once the pointer settles; a plain click syncs immediately.
+        """
+        self.timeline_sync.submit(timestamp, gps_coords)
+        if not self.timeline.is_pointer_dragging():
+            self.timeline_sync.flush()
+
+    def _preview_timeline_position(self, timestamp: datetime, gps_coords: tuple):
+        """Per-frame drag feedback: show the closest image only if it is already decoded"""
+        self.current_timestamp = timestamp
+        closest_index = self._find_closest_image_index(timestamp)
+        if closest_index is None or closest_index == (self._preview_index if self._preview_index is not None else self.current_index):
+            return
+
+        pixmap = self.image_cache.get(self.image_paths[closest_index])
+        if pixmap is None:
+            return  # not decoded yet; the settled sync will load it
+        self._show_pixmap_scaled(pixmap)
+        self._preview_index = closest_index
+
+    def _find_closest_image_index(self, timestamp: datetime) -> Optional[int]:
+        """Index of the image closest in time (timestamps compared as naive), O(log n)"""
+        if not self.image_paths:
+            return None
+
+        if self._image_time_index is None or self._image_time_index[1] is not self.image_paths:
+            entries = []
+            for i, path in enumerate(self.image_paths):
+                img_timestamp = extract_image_metadata(path).get('timestamp')
+                if img_timestamp:
+                    entries.append((to_epoch_seconds(img_timestamp.replace(tzinfo=None)), i))
+            entries.sort()
+            self._image_time_index = (entries, self.image_paths)
+
+        entries = self._image_time_index[0]
+        if not entries:
+            return 0
+
+        target = to_epoch_seconds(timestamp.replace(tzinfo=None))
+        pos = bisect_left(entries, (target, -1))
+        candidates = []
+        if pos < len(entries):
+            candidates.append(entries[pos])
+        if pos > 0:
+            # First (lowest index) image sharing the preceding timestamp
+            candidates.append(entries[bisect_left(entries, (entries[pos - 1][0], -1))])
+        # Same rule as a linear scan: smallest difference, lowest index on ties
+        ts, index = min(candidates, key=lambda entry: (abs(entry[0] - target), entry[1]))
+        return index
+
     def sync_to_timeline_position(self, timestamp: datetime, gps_coords: tuple):
         """Sync to timeline position - find closest image"""
-        logging.info(f"PhotoPreviewTab: sync_to_timeline_position called with timestamp={timestamp}")
+        logging.debug("PhotoPreviewTab: sync_to_timeline_position called with timestamp=%s", timestamp)
         # Update current timestamp for warnings
         self.current_timestamp = timestamp
         # Update folder info display
@@ -1626,38 +1761,44 @@ class PhotoPreviewTab(QWidget):
             return
 
         # Find image closest to timestamp
-        closest_index = 0
-        min_diff = float('inf')
-
-        # Convert timestamp to naive for comparison
-        timestamp_naive = timestamp.replace(tzinfo=None) if timestamp.tzinfo else timestamp
-        logging.debug(f"PhotoPreviewTab: Looking for image closest to {timestamp_naive}")
-
-        for i, path in enumerate(self.image_paths):
-            metadata = extract_image_metadata(path)
-            img_timestamp = metadata.get('timestamp')
-            if img_timestamp:
-                # Convert to naive datetime for comparison
-                img_timestamp_naive = img_timestamp.replace(tzinfo=None)
-                diff = abs((img_timestamp_naive - timestamp_naive).total_seconds())
-                logging.debug(f"PhotoPreviewTab: Image {i}: {img_timestamp_naive}, diff={diff}")
-                if diff < min_diff:
-                    min_diff = diff
-                    closest_index = i
-
-        logging.info(f"PhotoPreviewTab: Closest image is index {closest_index}, current is {self.current_index}, diff={min_diff}")
+        closest_index = self._find_closest_image_index(timestamp)
+        preview_index, self._preview_index = self._preview_index, None
+
+        logging.debug("PhotoPreviewTab: Closest image is index %d, current is %d", closest_index, self.current_index)
         if closest_index != self.current_index:
-            logging.info(f"PhotoPreviewTab: Navigating to image {closest_index}")
+            logging.debug("PhotoPreviewTab: Navigating to image %d", closest_index)
             self.navigate_to_image(closest_index)
+        elif preview_index is not None and preview_index != self.current_index:
+            # Drag ended where it started: put the current image back over the preview
+            self.scale_image_to_fit()
 
     def clear_caches(self):
         """Clear image and GPS caches"""
         self.image_cache.clear()
         if self.gps_data:
             self.gps_data = None
-        self.events_per_fileid.clear()
-        self.lane_fixes_per_fileid.clear()
-    
+        # Spill instead of clearing so unsaved edits of other FileIDs survive
+        self.events_per_fileid.spill_all()
+        self.lane_fixes_per_fileid.spill_all()
+
+    def register_memory_components(self, governor):
+        """Register this tab's caches with the MemoryGovernor (lower priority is released first)"""
+        governor.register('image_cache', lambda: self.image_cache.total_memory_used,
+                          self.image_cache.release, priority=20,
+                          budget_bytes=self.image_cache.max_cache_size_bytes)
+        governor.register('session_events', self.events_per_fileid.get_memory_usage,
+                          self.events_per_fileid.release, priority=30)
+        governor.register('session_lane_fixes', self.lane_fixes_per_fileid.get_memory_usage,
+                          self.lane_fixes_per_fileid.release, priority=30)
+        # Accounting only: these are the indexes of the FileID on screen, rebuilt in O(n) on the next paint
+        governor.register('gps_indexes',
+                          lambda: self.gps_data.index_memory_usage() if self.gps_data else 0,
+                          None, priority=40)
+
+    def close_session_stores(self):
+        """Remove spilled per-FileID data (after everything has been saved on close)"""
+        self.events_per_fileid.close()
+        self.lane_fixes_per_fileid.close()
 
     def save_all_events(self):
         """Save all current events to the .driveevt file with backup"""
@@ -1949,19 +2090,13 @@ class PhotoPreviewTab(QWidget):
         logging.info(f"Image cache cleared, freed {mb_freed:.1f}MB")
         # Could show user notification here if needed
 
-    def _on_memory_warning(self, usage_percent: int):
-        """Handle memory warning from cache"""
-        logging.warning(f"High memory usage detected: {usage_percent}%")
-        # Show warning to user
-        # QMessageBox.warning(
-        #     self, "Memory Warning",
-        #     f"High system memory usage ({usage_percent}%). Image cache has been optimized."
-        # )
-
     def update_cache_settings(self, new_size_mb: int):
         """Update cache size limit"""
         old_stats = self.image_cache.get_stats()
         self.image_cache.max_cache_size_bytes = new_size_mb * 1024 * 1024
+        governor = getattr(self.main_window, 'memory_governor', None)
+        if governor is not None:
+            governor.set_budget('image_cache', self.image_cache.max_cache_size_bytes)
         # Force cleanup if current usage exceeds new limit
         self.image_cache._ensure_capacity(0)
         new_stats = self.image_cache.get_stats()
@@ -10,11 +10,14 @@ from PyQt6.QtWidgets import (
     QComboBox, QSlider, QMenu, QInputDialog, QMessageBox, QLineEdit, QDialog
 )
 from PyQt6.QtCore import Qt, QRect, QPoint, pyqtSignal, QTimer, QMutex, QMutexLocker
-from PyQt6.QtGui import QPainter, QPen, QColor, QBrush, QFont, QAction, QFontMetrics
+from PyQt6.QtGui import QPainter, QPen, QColor, QBrush, QFont, QAction, QFontMetrics, QPixmap
 from PyQt6.QtCore import QRectF
 
 from ..models.event_model import Event
 from ..models.gps_model import GPSData
+from ..utils.interval_index import IntervalIndex, layer_lookup
+from ..utils.time_axis import to_epoch_seconds, from_epoch_seconds
+from ..utils.latency import measure_latency
 from .event_editor import EventEditor
 
 import logging
@@ -27,6 +30,8 @@ CHAINAGE_SCALE_HEIGHT = 30  # Height for chainage scale at bottom
 HANDLE_SNAP_DISTANCE = 20
 DEFAULT_EVENT_DURATION = 30  # seconds
 GRID_SNAP_SECONDS = 1
+LOD_MIN_EVENT_PIXELS = 4  # below this mean on-screen width, events are drawn as density bins
+LOD_MIN_ROW_HEIGHT = 4
 INT32_MIN = -2147483648
 INT32_MAX = 2147483647
 MAX_TIMEDELTA_SECONDS = 999999999  # Safe limit for timedelta
@@ -34,6 +39,10 @@ MAX_TIMEDELTA_SECONDS = 999999999  # Safe limit for timedelta
 class TimelineArea(QWidget):
     """
     Widget for painting the timeline and chainage
+    RESPONSIBILITIES:
+    - Keep static layers (background, grid, events, lanes, chainage) in a cached pixmap
+    - Re-render that pixmap only when size, view range or timeline data change
+    - Composite the dynamic overlays (marker, event being created) on every paint
     """
 
     def __init__(self, parent_widget):
@@ -41,29 +50,70 @@ class TimelineArea(QWidget):
         self.parent_widget = parent_widget
         self.setMouseTracking(True)
 
+        self._static_pixmap: Optional[QPixmap] = None
+        self._static_key = None
+        self.static_render_count = 0
+
     def paintEvent(self, event):
         """Paint the timeline"""
+        with measure_latency('timeline_paint'):
+            self._paint(event)
+
+    def _paint(self, event):
+        rect = self.rect()
+        timeline_rect, chainage_rect = self._layout_rects(rect)
+
+        key = self.parent_widget.get_static_layer_key(rect.size(), self.devicePixelRatioF())
+        if self._static_pixmap is None or key != self._static_key:
+            self._render_static_layers(rect, timeline_rect, chainage_rect)
+            self._static_key = key
+
         painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._static_pixmap)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-        rect = self.rect()
+        if self.parent_widget.view_start_time and self.parent_widget.view_end_time:
+            self.parent_widget.paint_timeline_overlays(painter, timeline_rect)
+
+    def invalidate_static_layers(self):
+        """Drop the cached static layers so the next paint re-renders them"""
+        self._static_key = None
+
+    def _layout_rects(self, rect: QRect):
         timeline_height = rect.height() - CHAINAGE_SCALE_HEIGHT
+        timeline_rect = QRect(0, TIMELINE_TOP_MARGIN, rect.width(), timeline_height - TIMELINE_TOP_MARGIN)
+        chainage_rect = QRect(0, timeline_height, rect.width(), CHAINAGE_SCALE_HEIGHT)
+        return timeline_rect, chainage_rect
+
+    def _render_static_layers(self, rect: QRect, timeline_rect: QRect, chainage_rect: QRect):
+        """Render background, grid, events, lane periods and chainage scale into the pixmap"""
+        dpr = self.devicePixelRatioF()
+        width = max(1, int(rect.width() * dpr))
+        height = max(1, int(rect.height() * dpr))
+        if self._static_pixmap is None or self._static_pixmap.width() != width or self._static_pixmap.height() != height:
+            self._static_pixmap = QPixmap(width, height)
+        self._static_pixmap.setDevicePixelRatio(dpr)
+
+        painter = QPainter(self._static_pixmap)
+        painter.setFont(self.font())
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
         # Draw background
         painter.fillRect(rect, QColor('#1E2A38'))
 
         # Draw timeline area
-        timeline_rect = QRect(0, TIMELINE_TOP_MARGIN, rect.width(), timeline_height - TIMELINE_TOP_MARGIN)
         painter.fillRect(timeline_rect, QColor('#2C3E50'))
 
         # Draw chainage scale area
-        chainage_rect = QRect(0, timeline_height, rect.width(), CHAINAGE_SCALE_HEIGHT)
         painter.fillRect(chainage_rect, QColor('#34495E'))
 
         if self.parent_widget.view_start_time and self.parent_widget.view_end_time:
             self.parent_widget.paint_timeline(painter, timeline_rect)
             self.parent_widget.paint_chainage_scale(painter, chainage_rect)
 
+        painter.end()
+        self.static_render_count += 1
+
     def mousePressEvent(self, event):
         self.parent_widget.mousePressEvent(event)
 
@@ -96,12 +146,18 @@ class TimelineWidget(QWidget):
     event_modified = pyqtSignal(str, dict)  # event_id, changes
     event_deleted = pyqtSignal(str)  # event_id
     event_created = pyqtSignal(object)  # Event object
+    pointer_released = pyqtSignal()  # a marker/event drag ended
 
     def __init__(self, photo_tab=None):
         super().__init__()
         self.photo_tab = photo_tab
         self.setMinimumHeight(200)
 
+        # Numeric (float epoch seconds) mirrors of the view range, kept in sync by the
+        # view_start_time / view_end_time setters; all painting math uses these
+        self.view_start_ts: Optional[float] = None
+        self.view_end_ts: Optional[float] = None
+
         # Data
         self.events: List[Event] = []
         self.gps_data: Optional[GPSData] = None
@@ -142,9 +198,19 @@ class TimelineWidget(QWidget):
         self.event_coords: Optional[tuple] = None  # Store coordinates for event creation
 
         # Layer cache for performance
+        self.event_index = IntervalIndex()  # rebuilt when events change
+        self.event_index_dirty = True
         self.layer_cache: Optional[List[List[Event]]] = None
+        self.layer_cache_layers = {}  # id(event) -> layer, for hit-testing
+        self.layer_cache_key = None  # (view start, view end, max layers) the layers were built for
         self.layer_cache_dirty = True
         self.cache_mutex = QMutex()  # Thread safety for cache
+        self.data_revision = 0  # bumped on any change that affects the static layers
+
+        # Level-of-detail state for zoomed-out views
+        self.lod_active = False
+        self.lod_bins = {}  # event name -> coverage count per pixel column
+        self.lod_key = None  # (view start, view end, width, data revision) the bins were built for
 
         # Colors
         self.event_colors = {
@@ -170,13 +236,38 @@ class TimelineWidget(QWidget):
         # Enable mouse tracking
         self.setMouseTracking(True)
 
+    @property
+    def view_start_time(self) -> Optional[datetime]:
+        return self._view_start_time
+
+    @view_start_time.setter
+    def view_start_time(self, value: Optional[datetime]):
+        self._view_start_time = value
+        self.view_start_ts = to_epoch_seconds(value)
+
+    @property
+    def view_end_time(self) -> Optional[datetime]:
+        return self._view_end_time
+
+    @view_end_time.setter
+    def view_end_time(self, value: Optional[datetime]):
+        self._view_end_time = value
+        self.view_end_ts = to_epoch_seconds(value)
+
+    def ts_to_datetime(self, ts: float) -> datetime:
+        """Convert an axis value back to a datetime in the view's timezone (labels, signals)"""
+        tz = self._view_start_time.tzinfo if self._view_start_time is not None else None
+        return from_epoch_seconds(ts, tz)
+
     def set_gps_data(self, gps_data: GPSData):
         """Set GPS data for chainage calculations."""
         self.gps_data = gps_data
+        self.data_revision += 1
 
     def set_lane_manager(self, lane_manager):
         """Set lane manager for displaying lane periods."""
         self.lane_manager = lane_manager
+        self.data_revision += 1
         
         # Validate lane fixes time bounds
         if lane_manager:
@@ -288,13 +379,27 @@ class TimelineWidget(QWidget):
         """Thread-safe cache invalidation"""
         with QMutexLocker(self.cache_mutex):
             self.layer_cache_dirty = True
+            self.event_index_dirty = True
+        self.data_revision += 1
+
+    def get_static_layer_key(self, size, device_pixel_ratio: float) -> tuple:
+        """
+        Key identifying the cached static timeline layers. Event edits bump
+        data_revision; every lane fix edit bumps the lane manager's revision.
+        """
+        lane_revision = self.lane_manager.revision if self.lane_manager else None
+        return (
+            size.width(), size.height(), device_pixel_ratio,
+            self.view_start_ts, self.view_end_ts,
+            self.data_revision, lane_revision
+        )
 
     def set_current_position(self, timestamp: datetime):
         """Set current position marker"""
         # Ensure timezone
         timestamp = self.ensure_timezone(timestamp)
         
-        logging.info(f"TimelineWidget: set_current_position called with timestamp={timestamp}")
+        logging.debug("TimelineWidget: set_current_position called with timestamp=%s", timestamp)
 
         # When user is dragging the marker, keep the view static to avoid jumping/label glitches
         if self.dragging_marker:
@@ -306,7 +411,7 @@ class TimelineWidget(QWidget):
         old_view_end = self.view_end_time
 
         self.current_position = timestamp
-        logging.info(f"TimelineWidget: current_position set to {self.current_position}")
+        logging.debug("TimelineWidget: current_position set to %s", self.current_position)
 
         # Skip all view range changes during slideshow to maintain zoom level
         # But allow repositioning when marker goes off-screen
@@ -354,10 +459,8 @@ class TimelineWidget(QWidget):
 
                 # Ensure ALL events are still visible after panning
                 if self.events:
-                    start_times = [e.start_time for e in self.events]
-                    end_times = [e.end_time for e in self.events]
-                    min_event_time = min(start_times) - timedelta(seconds=30)
-                    max_event_time = max(end_times) + timedelta(seconds=30)
+                    min_event_time = self.ts_to_datetime(min(e.start_ts for e in self.events) - 30)
+                    max_event_time = self.ts_to_datetime(max(e.end_ts for e in self.events) + 30)
 
                     # Adjust view if it would hide events
                     if self.view_start_time > min_event_time:
@@ -423,39 +526,30 @@ class TimelineWidget(QWidget):
 
         # If we have events, expand the view range to include them
         if self.events:
-            event_times = []
-            for event in self.events:
-                event.start_time = self.ensure_timezone(event.start_time)
-                event.end_time = self.ensure_timezone(event.end_time)
-                event_times.extend([event.start_time, event.end_time])
-
-            if event_times:
-                min_event_time = min(event_times)
-                max_event_time = max(event_times)
+            # Numeric bounds: events are read, never rewritten
+            min_event_ts = min(min(e.start_ts, e.end_ts) for e in self.events)
+            max_event_ts = max(max(e.start_ts, e.end_ts) for e in self.events)
 
-                # Expand image range to include events
-                start_time = min(start_time, min_event_time)
-                end_time = max(end_time, max_event_time)
+            # Expand image range to include events
+            if min_event_ts < to_epoch_seconds(start_time):
+                start_time = from_epoch_seconds(min_event_ts, start_time.tzinfo)
+            if max_event_ts > to_epoch_seconds(end_time):
+                end_time = from_epoch_seconds(max_event_ts, end_time.tzinfo)
 
                 logging.info(f"TimelineWidget: Expanded time range to include events: {start_time} to {end_time}")
 
         # If we have lane fixes, expand the view range to include them
         if hasattr(self, 'lane_manager') and self.lane_manager:
-            lane_fixes = self.lane_manager.get_lane_fixes()
+            lane_fixes = self.lane_manager.lane_fixes
             if lane_fixes:
-                lane_times = []
-                for fix in lane_fixes:
-                    fix.from_time = self.ensure_timezone(fix.from_time)
-                    fix.to_time = self.ensure_timezone(fix.to_time)
-                    lane_times.extend([fix.from_time, fix.to_time])
-
-                if lane_times:
-                    min_lane_time = min(lane_times)
-                    max_lane_time = max(lane_times)
+                min_lane_ts = min(min(fix.from_ts, fix.to_ts) for fix in lane_fixes)
+                max_lane_ts = max(max(fix.from_ts, fix.to_ts) for fix in lane_fixes)
 
-                    # Expand image range to include lane fixes
-                    start_time = min(start_time, min_lane_time)
-                    end_time = max(end_time, max_lane_time)
+                # Expand image range to include lane fixes
+                if min_lane_ts < to_epoch_seconds(start_time):
+                    start_time = from_epoch_seconds(min_lane_ts, start_time.tzinfo)
+                if max_lane_ts > to_epoch_seconds(end_time):
+                    end_time = from_epoch_seconds(max_lane_ts, end_time.tzinfo)
 
                     logging.info(f"TimelineWidget: Expanded time range to include lane fixes: {start_time} to {end_time}")
 
@@ -472,7 +566,7 @@ class TimelineWidget(QWidget):
         logging.debug(f"TimelineWidget: Base range set to {self.base_view_start_time} - {self.base_view_end_time}")
 
         # Auto-adjust zoom level to fit the time range in the widget width
-        time_range_seconds = (self.view_end_time - self.view_start_time).total_seconds()
+        time_range_seconds = self.view_end_ts - self.view_start_ts
         if time_range_seconds > 0:
             self.zoom_level = 1.0
 
@@ -524,38 +618,44 @@ class TimelineWidget(QWidget):
         # Zoom level: 0.01 (zoom out) to 100.0 (zoom in), default 1.0
         self.zoom_level = value / 100.0  # slider value 1-10000 -> zoom 0.01-100.0
 
-        # Calculate base range duration
-        base_duration = (self.base_view_end_time - self.base_view_start_time).total_seconds()
+        # Calculate base range duration (numeric axis)
+        base_start = to_epoch_seconds(self.base_view_start_time)
+        base_end = to_epoch_seconds(self.base_view_end_time)
+        base_duration = base_end - base_start
 
         # Calculate new view duration (smaller when zoom in)
         new_duration = base_duration / self.zoom_level
 
         # Calculate center for zoom (use current position if available, otherwise current view center)
-        if self.current_position and self.base_view_start_time <= self.current_position <= self.base_view_end_time:
-            zoom_center = self.current_position
-        elif self.view_start_time and self.view_end_time:
-            zoom_center = self.view_start_time + (self.view_end_time - self.view_start_time) / 2
+        current_ts = to_epoch_seconds(self.current_position)
+        if current_ts is not None and base_start <= current_ts <= base_end:
+            zoom_center = current_ts
+        elif self.view_start_ts is not None and self.view_end_ts is not None:
+            zoom_center = (self.view_start_ts + self.view_end_ts) / 2
         else:
-            zoom_center = self.base_view_start_time + timedelta(seconds=base_duration / 2)
+            zoom_center = base_start + base_duration / 2
 
         # Ensure center is within base range
-        base_center = self.base_view_start_time + timedelta(seconds=base_duration / 2)
+        base_center = base_start + base_duration / 2
         max_offset = (base_duration - new_duration) / 2
-        center_offset = (zoom_center - base_center).total_seconds()
-        center_offset = max(-max_offset, min(max_offset, center_offset))
+        center_offset = max(-max_offset, min(max_offset, zoom_center - base_center))
 
         # Calculate new view range
-        new_center = base_center + timedelta(seconds=center_offset)
-        self.view_start_time = new_center - timedelta(seconds=new_duration / 2)
-        self.view_end_time = new_center + timedelta(seconds=new_duration / 2)
+        new_center = base_center + center_offset
+        view_start = new_center - new_duration / 2
+        view_end = new_center + new_duration / 2
 
         # Ensure view range stays within base range
-        if self.view_start_time < self.base_view_start_time:
-            self.view_start_time = self.base_view_start_time
-            self.view_end_time = self.view_start_time + timedelta(seconds=new_duration)
-        if self.view_end_time > self.base_view_end_time:
-            self.view_end_time = self.base_view_end_time
-            self.view_start_time = self.view_end_time - timedelta(seconds=new_duration)
+        if view_start < base_start:
+            view_start = base_start
+            view_end = view_start + new_duration
+        if view_end > base_end:
+            view_end = base_end
+            view_start = view_end - new_duration
+
+        tz = self.base_view_start_time.tzinfo
+        self.view_start_time = from_epoch_seconds(view_start, tz)
+        self.view_end_time = from_epoch_seconds(view_end, tz)
 
         logging.debug(f"Zoom level: {self.zoom_level}, View range: {self.view_start_time} - {self.view_end_time}")
         self.timeline_area.update()
@@ -655,22 +755,28 @@ class TimelineWidget(QWidget):
             self.event_coords = None  # Clear coordinates
 
 
-    def paint_timeline(self, painter: QPainter, rect: QRect):
-        """Paint timeline content"""
-        # Calculate time range
-        time_range = (self.view_end_time - self.view_start_time).total_seconds()
+    def get_view_pixels_per_second(self, rect: QRect) -> Optional[float]:
+        """Pixels per second for the current view, or None if nothing can be drawn"""
+        time_range = self.view_end_ts - self.view_start_ts
         if time_range <= 0:
-            return
+            return None
 
         # Check for zero width
         if rect.width() <= 0:
-            return
+            return None
 
         pixels_per_second = rect.width() / time_range
 
         # Prevent division by zero
         if pixels_per_second <= 0:
             pixels_per_second = 0.001
+        return pixels_per_second
+
+    def paint_timeline(self, painter: QPainter, rect: QRect):
+        """Paint static timeline content (cached by TimelineArea)"""
+        pixels_per_second = self.get_view_pixels_per_second(rect)
+        if pixels_per_second is None:
+            return
 
         # Draw time grid
         self.paint_time_grid(painter, rect, pixels_per_second)
@@ -681,6 +787,16 @@ class TimelineWidget(QWidget):
         # Draw lane periods
         self.paint_lane_periods(painter, rect, pixels_per_second)
 
+    def paint_timeline_overlays(self, painter: QPainter, rect: QRect):
+        """Paint dynamic content composited over the cached layers on every frame"""
+        pixels_per_second = self.get_view_pixels_per_second(rect)
+        if pixels_per_second is None:
+            return
+
+        # Paint new event being created
+        if self.creating_event and self.new_event_start and self.new_event_end:
+            self.paint_new_event(painter, rect, pixels_per_second)
+
         # Draw current position
         if self.current_position:
             self.paint_current_position(painter, rect, pixels_per_second)
@@ -709,20 +825,20 @@ class TimelineWidget(QWidget):
         last_label_right = -float("inf")
         label_y = max(12, rect.top() - 8)  # draw in the top margin, above events
 
-        current_time = self.view_start_time.replace(second=0, microsecond=0)
-        if interval >= 60:
-            # Align to minute boundaries
-            current_time = current_time.replace(second=0)
+        # Align to minute boundaries of the view's wall clock
+        utc_offset = self.view_start_time.utcoffset()
+        offset_seconds = utc_offset.total_seconds() if utc_offset else 0.0
+        current_ts = ((self.view_start_ts + offset_seconds) // 60) * 60 - offset_seconds
 
-        while current_time <= self.view_end_time:
-            x = self.time_to_pixel(current_time, pixels_per_second, rect.left())
+        while current_ts <= self.view_end_ts:
+            x = self.ts_to_pixel(current_ts, pixels_per_second, rect.left())
 
             if 0 <= x <= rect.right():
                 # Draw grid line
                 painter.drawLine(int(x), rect.top(), int(x), rect.bottom())
 
-                # Draw time label
-                time_str = current_time.strftime("%H:%M:%S")
+                # Draw time label (only place the axis value becomes a datetime)
+                time_str = self.ts_to_datetime(current_ts).strftime("%H:%M:%S")
                 label_x = int(x) + 2
                 label_width = fm.horizontalAdvance(time_str)
                 if label_x - last_label_right >= min_label_spacing:
@@ -731,7 +847,7 @@ class TimelineWidget(QWidget):
                     painter.setPen(QColor('#34495E'))
                     last_label_right = label_x + label_width
 
-            current_time += timedelta(seconds=interval)
+            current_ts += interval
 
     def paint_chainage_scale(self, painter: QPainter, rect: QRect):
         """Paint chainage scale at bottom of timeline"""
@@ -742,25 +858,19 @@ class TimelineWidget(QWidget):
             return
 
         # Use same time range and pixels_per_second as timeline for alignment
-        time_range = (self.view_end_time - self.view_start_time).total_seconds()
-        if time_range <= 0:
-            return
-
-        # Check for zero width before division
-        if rect.width() <= 0:
+        pixels_per_second = self.get_view_pixels_per_second(rect)
+        if pixels_per_second is None:
             return
 
-        pixels_per_second = rect.width() / time_range
-        if pixels_per_second <= 0:
-            pixels_per_second = 0.001
-
         # Calculate chainage range for visible time period
-        visible_points = [p for p in self.gps_data.points 
-                         if self.view_start_time <= p.timestamp <= self.view_end_time]
+        points = self.gps_data.points
+        epochs = self.gps_data.get_epoch_index()
+        lo, hi = self.gps_data.get_index_range(self.view_start_ts, self.view_end_ts)
+        visible_points = points[lo:hi]
         if not visible_points:
             # Fallback to full range if no points in view
-            min_chainage = min(p.chainage for p in self.gps_data.points)
-            max_chainage = max(p.chainage for p in self.gps_data.points)
+            min_chainage = min(p.chainage for p in points)
+            max_chainage = max(p.chainage for p in points)
         else:
             min_chainage = min(p.chainage for p in visible_points)
             max_chainage = max(p.chainage for p in visible_points)
@@ -805,34 +915,34 @@ class TimelineWidget(QWidget):
 
         current_chainage = round(min_chainage / interval) * interval
         while current_chainage <= max_chainage:
-            # Find the timestamp that corresponds to this chainage
-            corresponding_time = None
+            # Find the axis time that corresponds to this chainage
+            corresponding_ts = None
             try:
-                for i, point in enumerate(self.gps_data.points):
-                    if point.chainage >= current_chainage:
-                        if point.chainage == current_chainage:
-                            corresponding_time = point.timestamp
-                        elif i > 0:
-                            # Interpolate between this point and the previous one
-                            prev_point = self.gps_data.points[i-1]
-                            chainage_diff = point.chainage - prev_point.chainage
-                            if chainage_diff > 0:
-                                time_diff = (point.timestamp - prev_point.timestamp).total_seconds()
-                                # Validate time_diff is reasonable (not too large or NaN)
-                                if abs(time_diff) > 86400:  # More than 1 day difference
-                                    logging.warning(f"TimelineWidget: Suspicious time difference at chainage {current_chainage}: {time_diff} seconds")
-                                    break
+                i = self.gps_data.find_first_index_at_chainage(current_chainage)
+                if i < len(points):
+                    point = points[i]
+                    if point.chainage == current_chainage:
+                        corresponding_ts = epochs[i]
+                    elif i > 0:
+                        # Interpolate between this point and the previous one
+                        prev_point = points[i - 1]
+                        chainage_diff = point.chainage - prev_point.chainage
+                        if chainage_diff > 0:
+                            time_diff = epochs[i] - epochs[i - 1]
+                            # Validate time_diff is reasonable (not too large or NaN)
+                            if abs(time_diff) > 86400:  # More than 1 day difference
+                                logging.warning(f"TimelineWidget: Suspicious time difference at chainage {current_chainage}: {time_diff} seconds")
+                            else:
                                 ratio = (current_chainage - prev_point.chainage) / chainage_diff
                                 if 0 <= ratio <= 1:  # Valid ratio
-                                    corresponding_time = prev_point.timestamp + timedelta(seconds=time_diff * ratio)
-                        break
+                                    corresponding_ts = epochs[i - 1] + time_diff * ratio
             except (ValueError, OverflowError, TypeError) as e:
                 logging.error(f"TimelineWidget: Error interpolating chainage {current_chainage}: {e}")
-                corresponding_time = None
+                corresponding_ts = None
 
-            if corresponding_time and corresponding_time == corresponding_time:  # Check for NaN
+            if corresponding_ts is not None and corresponding_ts == corresponding_ts:  # Check for NaN
                 try:
-                    x = self.time_to_pixel(corresponding_time, pixels_per_second, rect.left())
+                    x = self.ts_to_pixel(corresponding_ts, pixels_per_second, rect.left())
 
                     if rect.left() <= x <= rect.right():
                         # Draw grid line
@@ -850,41 +960,50 @@ class TimelineWidget(QWidget):
             current_chainage += interval
 
     def rebuild_layer_cache(self, rect: QRect):
-        """Rebuild layer cache for events"""
+        """Rebuild layer cache for events visible in the current view"""
         if not self.view_start_time or not self.view_end_time:
             with QMutexLocker(self.cache_mutex):
                 self.layer_cache = [[]]
+                self.layer_cache_layers = {}
+                self.layer_cache_key = None
                 self.layer_cache_dirty = False
             return
         with QMutexLocker(self.cache_mutex):
+            self._ensure_event_index_locked()
+
             max_layers = max(1, rect.height() // LAYER_HEIGHT)
-            self.layer_cache = [[] for _ in range(max_layers)]
+            view_start = self.view_start_ts
+            view_end = self.view_end_ts
+            self.layer_cache = self.event_index.assign_layers(view_start, view_end, max_layers)
+            self.layer_cache_layers = layer_lookup(self.layer_cache)
+            self.layer_cache_key = (view_start, view_end, max_layers)
+            self.layer_cache_dirty = False
 
-            for event in self.events:
-                # Check if event is visible in current view
-                event_visible = (event.start_time <= self.view_end_time and event.end_time >= self.view_start_time)
-                
-                if not event_visible:
-                    continue
-
-                # Find available layer
-                layer = 0
-                while layer < max_layers:
-                    if not self.event_overlaps_layer(event, self.layer_cache[layer]):
-                        self.layer_cache[layer].append(event)
-                        break
-                    layer += 1
-                else:
-                    # All layers full, use first layer
-                    self.layer_cache[0].append(event)
+    def _ensure_event_index_locked(self):
+        """Rebuild the event interval index after events changed (cache_mutex held)"""
+        if self.event_index_dirty:
+            self.event_index.build(self.events)
+            self.event_index_dirty = False
 
-            self.layer_cache_dirty = False
+    def _ensure_layer_cache(self, rect: QRect):
+        """Rebuild layers if events changed or the view moved since the last build"""
+        if self.layer_cache_dirty or self.layer_cache is None:
+            self.rebuild_layer_cache(rect)
+            return
+        if self.view_start_time and self.view_end_time:
+            key = (self.view_start_ts, self.view_end_ts, max(1, rect.height() // LAYER_HEIGHT))
+            if key != self.layer_cache_key:
+                self.rebuild_layer_cache(rect)
 
     def paint_events(self, painter: QPainter, rect: QRect, pixels_per_second: float):
         """Paint events on timeline"""
-        # Rebuild cache if dirty
-        if self.layer_cache_dirty or self.layer_cache is None:
-            self.rebuild_layer_cache(rect)
+        # Rebuild cache if dirty or the view moved
+        self._ensure_layer_cache(rect)
+
+        # Zoomed out too far for individual rectangles: draw per-type density strips
+        if self._update_lod(rect, pixels_per_second):
+            self.paint_event_density(painter, rect)
+            return
 
         # Paint events by layer
         if self.layer_cache:
@@ -892,23 +1011,64 @@ class TimelineWidget(QWidget):
                 for event in layer_events:
                     self.paint_event(painter, rect, event, layer_idx, LAYER_HEIGHT, pixels_per_second)
 
-        # Paint new event being created
-        if self.creating_event and self.new_event_start and self.new_event_end:
-            self.paint_new_event(painter, rect, pixels_per_second)
+    def _update_lod(self, rect: QRect, pixels_per_second: float) -> bool:
+        """Decide whether the view needs LOD rendering and (re)build the density bins"""
+        key = (self.view_start_ts, self.view_end_ts, rect.width(), self.data_revision)
+        if key == self.lod_key:
+            return self.lod_active
+
+        mean_span = self.event_index.mean_visible_span(self.view_start_ts, self.view_end_ts)
+        self.lod_active = mean_span is not None and mean_span * pixels_per_second < LOD_MIN_EVENT_PIXELS
+        if self.lod_active:
+            self.lod_bins = self.event_index.density_bins(
+                self.view_start_ts, self.view_end_ts, rect.width(), lambda e: e.event_name
+            )
+        else:
+            self.lod_bins = {}
+        self.lod_key = key
+        return self.lod_active
+
+    def paint_event_density(self, painter: QPainter, rect: QRect):
+        """Paint density bins as one heat strip per event type (O(width) per type)"""
+        if not self.lod_bins:
+            return
 
-    def event_overlaps_layer(self, event: Event, layer_events: List[Event]) -> bool:
-        """Check if event overlaps with events in layer"""
-        for existing in layer_events:
-            if (event.start_time < existing.end_time and
-                event.end_time > existing.start_time):
-                return True
-        return False
+        names = [name for name in self.event_colors if name in self.lod_bins]
+        names += sorted(name for name in self.lod_bins if name not in self.event_colors)
+        row_height = min(LAYER_HEIGHT, max(LOD_MIN_ROW_HEIGHT, rect.height() // len(names)))
+        peak = max(max(counts) for counts in self.lod_bins.values()) or 1
+
+        for row, name in enumerate(names):
+            y = rect.top() + row * row_height
+            if y + row_height > rect.bottom():
+                break
+            base_color = self.event_colors.get(name, self.default_color)
+            counts = self.lod_bins[name]
+
+            # Merge runs of columns with the same intensity into one fill
+            run_start, run_level = 0, None
+            for x in range(len(counts) + 1):
+                count = counts[x] if x < len(counts) else 0
+                level = 0 if count == 0 else 1 + (4 * count) // (peak + 1)
+                if level != run_level:
+                    if run_level:
+                        color = QColor(base_color)
+                        color.setAlpha(min(255, 60 + 48 * run_level))
+                        painter.fillRect(rect.left() + run_start, y, x - run_start, row_height - 1, color)
+                    run_start, run_level = x, level
+
+            if row_height >= 12:
+                painter.setPen(QColor('#FFFFFF'))
+                font = painter.font()
+                font.setPointSize(8)
+                painter.setFont(font)
+                painter.drawText(rect.left() + 2, y + min(12, row_height - 2), name)
 
     def paint_event(self, painter: QPainter, rect: QRect, event: Event,
                    layer: int, layer_height: int, pixels_per_second: float):
         """Paint individual event"""
-        start_x = self.time_to_pixel(event.start_time, pixels_per_second, rect.left())
-        end_x = self.time_to_pixel(event.end_time, pixels_per_second, rect.left())
+        start_x = self.ts_to_pixel(event.start_ts, pixels_per_second, rect.left())
+        end_x = self.ts_to_pixel(event.end_ts, pixels_per_second, rect.left())
 
         if end_x <= rect.left() or start_x >= rect.right():
             return  # Not visible
@@ -959,21 +1119,21 @@ class TimelineWidget(QWidget):
         if not hasattr(self, 'lane_manager') or not self.lane_manager:
             return
 
-        lane_fixes = self.lane_manager.get_lane_fixes()
-        if not lane_fixes:
+        all_fixes = self.lane_manager.lane_fixes
+        if not all_fixes:
             return
+        last_fix = all_fixes[-1]
+        lane_fixes = self.lane_manager.get_lane_fixes_in_range(self.view_start_ts, self.view_end_ts)
 
-        logging.info(f"TimelineWidget: Painting {len(lane_fixes)} lane periods")
-        for fix in lane_fixes:
-            logging.info(f"  Period: {fix.from_time.strftime('%H:%M:%S')} - {fix.to_time.strftime('%H:%M:%S')}: Lane {fix.lane}")
+        logging.debug("TimelineWidget: Painting %d lane periods", len(lane_fixes))
 
         # Draw lane periods as thicker horizontal bars below the marker
         lane_bar_y = rect.bottom() + 2  # Position below timeline
         lane_bar_height = 6  # Double thickness
 
-        for i, fix in enumerate(lane_fixes):
-            start_x = self.time_to_pixel(fix.from_time, pixels_per_second, rect.left())
-            end_x = self.time_to_pixel(fix.to_time, pixels_per_second, rect.left())
+        for fix in lane_fixes:
+            start_x = self.ts_to_pixel(fix.from_ts, pixels_per_second, rect.left())
+            end_x = self.ts_to_pixel(fix.to_ts, pixels_per_second, rect.left())
 
             if end_x <= rect.left() or start_x >= rect.right():
                 continue  # Not visible
@@ -1002,7 +1162,7 @@ class TimelineWidget(QWidget):
                 painter.fillRect(int(visible_start), lane_bar_y, int(width), lane_bar_height, color)
 
             # Draw white separator line at the end of each period (except the last one)
-            if i < len(lane_fixes) - 1:  # Not the last period
+            if fix is not last_fix:  # Not the last period
                 separator_x = int(end_x)
                 if rect.left() <= separator_x <= rect.right():
                     painter.setPen(QPen(QColor('#FFFFFF'), 2))  # White line, 2 pixels wide
@@ -1012,9 +1172,10 @@ class TimelineWidget(QWidget):
         """Return events that contain the current position (marker) time. Used for pop-up label."""
         if not self.current_position or not self.events:
             return []
-        t = self.current_position
-        return [e for e in self.events
-                if e.start_time <= t <= e.end_time]
+        # O(log n + k) on the numeric axis; runs every overlay frame while the popup is enabled
+        with QMutexLocker(self.cache_mutex):
+            self._ensure_event_index_locked()
+            return self.event_index.query_point(to_epoch_seconds(self.current_position))
 
     def _should_show_event_popup(self) -> bool:
         """Whether to show event name pop-up when marker passes through event (user setting)."""
@@ -1166,7 +1327,7 @@ class TimelineWidget(QWidget):
             return None
 
         rect = self.timeline_area.rect()
-        time_range = (self.view_end_time - self.view_start_time).total_seconds()
+        time_range = self.view_end_ts - self.view_start_ts
         if time_range <= 0:
             return None
         pixels_per_second = rect.width() / time_range
@@ -1301,14 +1462,17 @@ class TimelineWidget(QWidget):
 
     def time_to_pixel(self, time: datetime, pixels_per_second: float, offset: int = 0) -> float:
         """Convert timestamp to pixel position with overflow protection"""
-        if not self.view_start_time:
+        if self.view_start_ts is None:
+            return 0
+        return self.ts_to_pixel(to_epoch_seconds(time), pixels_per_second, offset)
+
+    def ts_to_pixel(self, ts: float, pixels_per_second: float, offset: int = 0) -> float:
+        """Convert an axis value (epoch seconds) to pixel position with overflow protection"""
+        if self.view_start_ts is None:
             return 0
 
-        # Ensure timezone
-        time = self.ensure_timezone(time)
-        
         # Calculate seconds difference
-        seconds = (time - self.view_start_time).total_seconds()
+        seconds = ts - self.view_start_ts
         
         # Clamp seconds to safe range before multiplication
         seconds = max(-MAX_TIMEDELTA_SECONDS, min(MAX_TIMEDELTA_SECONDS, seconds))
@@ -1319,19 +1483,21 @@ class TimelineWidget(QWidget):
         # Clamp to prevent INT32 overflow
         return max(INT32_MIN, min(INT32_MAX, pixel_pos))
 
+    def pixel_to_ts(self, x: float, pixels_per_second: float, offset: int = 0) -> float:
+        """Convert pixel position to an axis value (epoch seconds)"""
+        # Clamp x để tránh lỗi overflow
+        x = max(INT32_MIN, min(INT32_MAX, x))
+        seconds = (x - offset) / pixels_per_second
+        seconds = max(-MAX_TIMEDELTA_SECONDS, min(MAX_TIMEDELTA_SECONDS, seconds))
+        return self.view_start_ts + seconds
+
     def pixel_to_time(self, x: float, pixelspersecond: float, offset: int = 0) -> datetime:
         if not self.view_start_time or pixelspersecond == 0:
             logging.warning("pixeltotime: invalid input, using current UTC time.")
             return datetime.now(timezone.utc)
-        # Clamp x để tránh lỗi overflow
-        x = max(-2147483648, min(2147483647, x))
-        seconds = (x - offset) / pixelspersecond
-        seconds = max(-999999999, min(999999999, seconds))
         try:
-            result = self.view_start_time + timedelta(seconds=seconds)
             # Luôn đảm bảo có timezone info
-            if result.tzinfo is None:
-                result = result.replace(tzinfo=timezone.utc)
+            result = self.ts_to_datetime(self.pixel_to_ts(x, pixelspersecond, offset))
             return result
         except (OverflowError, ValueError) as e:
             logging.error(f"Error converting pixel to time {e}")
@@ -1415,8 +1581,8 @@ class TimelineWidget(QWidget):
             self.drag_start_pos = event.position().toPoint()
 
             # Determine drag handle with adaptive snap distance
-            start_x = self.time_to_pixel(clicked_event.start_time, pixels_per_second, timeline_rect.left())
-            end_x = self.time_to_pixel(clicked_event.end_time, pixels_per_second, timeline_rect.left())
+            start_x = self.ts_to_pixel(clicked_event.start_ts, pixels_per_second, timeline_rect.left())
+            end_x = self.ts_to_pixel(clicked_event.end_ts, pixels_per_second, timeline_rect.left())
 
             mouse_x = event.position().x()
             event_width = end_x - start_x
@@ -1604,6 +1770,7 @@ class TimelineWidget(QWidget):
 
     def mouseReleaseEvent(self, event):
         """Handle mouse release"""
+        was_dragging = self.dragging or self.dragging_marker
         if self.dragging:
             self.dragging = False
             self.selected_event = None
@@ -1615,6 +1782,9 @@ class TimelineWidget(QWidget):
             # Reset cursor after dragging
             self.update_cursor(event)
 
+        if was_dragging:
+            self.pointer_released.emit()
+
         super().mouseReleaseEvent(event)
 
     def update_cursor(self, event):
@@ -1630,8 +1800,8 @@ class TimelineWidget(QWidget):
         event_at_pos = self.get_event_at_position(event.position().toPoint(), timeline_rect, pixels_per_second)
 
         if event_at_pos:
-            start_x = self.time_to_pixel(event_at_pos.start_time, pixels_per_second, timeline_rect.left())
-            end_x = self.time_to_pixel(event_at_pos.end_time, pixels_per_second, timeline_rect.left())
+            start_x = self.ts_to_pixel(event_at_pos.start_ts, pixels_per_second, timeline_rect.left())
+            end_x = self.ts_to_pixel(event_at_pos.end_ts, pixels_per_second, timeline_rect.left())
 
             mouse_x = event.position().x()
             event_width = end_x - start_x
@@ -1727,12 +1897,16 @@ class TimelineWidget(QWidget):
         logging.debug(f"TimelineWidget: Lane change marker rect {arrow_rect}, click at ({px}, {py}), inside={result}")
         return result
 
+    def is_pointer_dragging(self) -> bool:
+        """True while a pointer gesture is streaming positions (marker/event drag, event creation)"""
+        return self.dragging or self.dragging_marker or self.creating_event
+
     def calculate_pixels_per_second(self, timeline_rect: QRect) -> float:
         """Calculate pixels per second for current view"""
         if not self.view_start_time or not self.view_end_time:
             return 1.0
 
-        time_range = (self.view_end_time - self.view_start_time).total_seconds()
+        time_range = self.view_end_ts - self.view_start_ts
         if time_range <= 0:
             return 1.0
             
@@ -1744,40 +1918,50 @@ class TimelineWidget(QWidget):
     def get_event_at_position(self, pos: QPoint, timeline_rect: QRect, pixels_per_second: float) -> Optional[Event]:
         """Get event at mouse position (returns the topmost event in layers)"""
         # Rebuild cache if needed
-        if self.layer_cache_dirty or self.layer_cache is None:
-            self.rebuild_layer_cache(timeline_rect)
+        self._ensure_layer_cache(timeline_rect)
+        if not self.view_start_time or not self.view_end_time:
+            return None
 
-        # Check layers from top to bottom (higher layers are drawn on top)
-        for layer_idx in range(len(self.layer_cache) - 1, -1, -1):
-            layer_events = self.layer_cache[layer_idx]
-            for event in layer_events:
-                # Check if event is visible in current view
-                if not (event.start_time <= self.view_end_time and event.end_time >= self.view_start_time):
-                    continue
+        # Density strips have no per-event geometry to hit
+        if self.lod_active:
+            return None
 
-                start_x = self.time_to_pixel(event.start_time, pixels_per_second, timeline_rect.left())
-                end_x = self.time_to_pixel(event.end_time, pixels_per_second, timeline_rect.left())
+        # Add hover tolerance for short events (expand rect by 5 pixels on each side)
+        HOVER_TOLERANCE = 5
 
-                # Safety check for invalid coordinates
-                if not (INT32_MIN <= start_x <= INT32_MAX and INT32_MIN <= end_x <= INT32_MAX):
-                    continue
+        # Only events whose time span is under the cursor (plus tolerance) can be hit
+        cursor_time = self.pixel_to_ts(pos.x(), pixels_per_second, timeline_rect.left())
+        candidates = self.event_index.query_point(cursor_time, HOVER_TOLERANCE / pixels_per_second)
 
-                # Check if event is on screen
-                if end_x <= timeline_rect.left() or start_x >= timeline_rect.right():
-                    continue
+        best_event = None
+        best_layer = -1
+        for event in candidates:
+            layer_idx = self.layer_cache_layers.get(id(event))
+            if layer_idx is None or layer_idx <= best_layer:
+                continue
 
-                # Check event rect at this layer with hover tolerance
-                y = timeline_rect.top() + layer_idx * LAYER_HEIGHT
-                event_rect = QRect(int(start_x), y, int(end_x - start_x), LAYER_HEIGHT)
+            start_x = self.ts_to_pixel(event.start_ts, pixels_per_second, timeline_rect.left())
+            end_x = self.ts_to_pixel(event.end_ts, pixels_per_second, timeline_rect.left())
 
-                # Add hover tolerance for short events (expand rect by 5 pixels on each side)
-                HOVER_TOLERANCE = 5
-                expanded_rect = event_rect.adjusted(-HOVER_TOLERANCE, -HOVER_TOLERANCE, HOVER_TOLERANCE, HOVER_TOLERANCE)
+            # Safety check for invalid coordinates
+            if not (INT32_MIN <= start_x <= INT32_MAX and INT32_MIN <= end_x <= INT32_MAX):
+                continue
 
-                if expanded_rect.contains(pos):
-                    return event
+            # Check if event is on screen
+            if end_x <= timeline_rect.left() or start_x >= timeline_rect.right():
+                continue
 
-        return None
+            # Check event rect at this layer with hover tolerance
+            y = timeline_rect.top() + layer_idx * LAYER_HEIGHT
+            event_rect = QRect(int(start_x), y, int(end_x - start_x), LAYER_HEIGHT)
+            expanded_rect = event_rect.adjusted(-HOVER_TOLERANCE, -HOVER_TOLERANCE, HOVER_TOLERANCE, HOVER_TOLERANCE)
+
+            if expanded_rect.contains(pos):
+                # Higher layers are drawn on top
+                best_event = event
+                best_layer = layer_idx
+
+        return best_event
 
     def snap_time_to_grid(self, timestamp: datetime) -> datetime:
         """Snap timestamp to grid"""
@@ -0,0 +1,53 @@
+"""
+Atomic file writes for GeoEvent data files
+"""
+
+import os
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'w', **open_kwargs):
+    """
+    Write a file via a temporary sibling that replaces the target only once fully written.
+    If the body raises, the temporary file is removed and the original file is untouched.
+    """
+    temp_path = f"{path}.tmp{os.getpid()}"
+    try:
+        with open(temp_path, mode, **open_kwargs) as f:
+            yield f
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+@contextmanager
+def file_lock(path: str):
+    """
+    Exclusive inter-process lock on a lock file, held while the body runs (blocks until acquired).
+    Uses fcntl on POSIX and msvcrt on Windows; combine with a threading.Lock for threads of one process.
+    """
+    with open(path, 'a+b') as f:
+        if os.name == 'nt':
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # retries for ~10 s, then raises
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
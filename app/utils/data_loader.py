@@ -5,18 +5,25 @@ Handles loading and parsing of all data types for a FileID
 
 import os
 import logging
+import time
 from typing import List, Optional, Dict, Any, Callable, TypeVar
 from datetime import datetime, timezone
 
-from ..models.event_model import Event
+from ..models.event_model import Event, PointEvent, PointEventIndex
 from ..models.gps_model import GPSData
 from ..models.lane_model import LaneManager
 from ..utils.file_parser import parse_driveevt, parse_driveiri, enrich_events_with_gps, save_driveevt
 from ..utils.image_utils import extract_image_metadata, validate_filename
+from ..utils.latency import record_latency
+from ..utils.tracing import trace_span, traced
 
 # Type variable for generic file loading
 T = TypeVar('T')
 
+
+class FileIDLoadCancelled(Exception):
+    """Raised when a staged FileID load is cancelled between stages"""
+
 class DataLoader:
     """
     Loads and parses all data for a FileID folder
@@ -74,10 +81,27 @@ class DataLoader:
                 logging.info(f"{file_type} not found, using empty data: {file_path}")
             return empty_value
     
-    def load_fileid_data(self, fileid_folder) -> Dict[str, Any]:
+    # Load stages in the order they are published; images come first so the
+    # first frame can be shown while GPS is still parsing
+    LOAD_STAGES = ('images', 'gps', 'events', 'lanes')
+
+    @traced('DataLoader.load_fileid_data', 'load')
+    def load_fileid_data(
+        self,
+        fileid_folder,
+        on_stage: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        create_missing: bool = True
+    ) -> Dict[str, Any]:
         """
         Load all data for a FileID folder
         Returns dict with events, gps_data, image_paths, and metadata
+
+        Args:
+            fileid_folder: FileID folder to load
+            on_stage: Optional callback(stage_name, result) called after each stage in LOAD_STAGES
+            is_cancelled: Optional callback checked between stages; raises FileIDLoadCancelled when True
+            create_missing: Create an empty .driveevt / <FileID>_lane_fixes.csv when missing (False for read-only tools)
         """
         logging.info(f"Loading data for FileID: {fileid_folder.fileid} from path: {fileid_folder.path}")
         
@@ -86,89 +110,137 @@ class DataLoader:
             'gps_data': None,
             'image_paths': [],
             'lane_manager': LaneManager(),  # Create new instance for each FileID
-            'metadata': {}
+            'metadata': {},
+            'lane_validation_errors': [],
+            'point_events': PointEventIndex()  # non-span .driveevt rows (warnings panel)
         }
+
+        stage_started = [time.perf_counter()]
+
+        def stage_done(stage: str):
+            now = time.perf_counter()
+            record_latency(f'fileid_load.{stage}', now - stage_started[0])
+            stage_started[0] = now
+            if is_cancelled and is_cancelled():
+                raise FileIDLoadCancelled(fileid_folder.fileid)
+            if on_stage:
+                on_stage(stage, result)
         
         try:
-            # Parse event data
-            logging.debug("Loading event data...")
-            result['events'] = self._load_event_data(fileid_folder)
-            logging.info(f"Loaded {len(result['events'])} events")
-            
-            # Parse GPS data
-            logging.debug("Loading GPS data...")
-            result['gps_data'] = self._load_gps_data(fileid_folder)
-            logging.info(f"Loaded GPS data: {result['gps_data'] is not None}")
-            
-            # Enrich events with GPS data
-            if result['gps_data']:
-                logging.debug("Enriching events with GPS data...")
-                enrich_events_with_gps(result['events'], result['gps_data'])
-                logging.info("Events enriched with GPS data")
-            
+            if is_cancelled and is_cancelled():
+                raise FileIDLoadCancelled(fileid_folder.fileid)
+
             # Load images
             logging.debug("Loading image paths...")
-            result['image_paths'] = self._load_image_paths(fileid_folder)
+            with trace_span('images.list', 'load', fileid=fileid_folder.fileid):
+                result['image_paths'] = self._load_image_paths(fileid_folder)
             logging.info(f"Loaded {len(result['image_paths'])} image paths")
             
             # Extract metadata
             logging.debug("Extracting FileID metadata...")
-            result['metadata'] = self._extract_fileid_metadata(fileid_folder, result['image_paths'])
+            with trace_span('images.metadata', 'load'):
+                result['metadata'] = self._extract_fileid_metadata(fileid_folder, result['image_paths'])
             logging.info("FileID metadata extracted")
+            stage_done('images')
             
-            # Set metadata for validation
-            gps_min_time, gps_max_time = None, None
+            # Parse GPS data
+            logging.debug("Loading GPS data...")
+            with trace_span('gps.parse', 'load'):
+                result['gps_data'] = self._load_gps_data(fileid_folder)
+            logging.info(f"Loaded GPS data: {result['gps_data'] is not None}")
             if result['gps_data'] and result['gps_data'].points:
-                result['gps_data'].sort_by_time()
-                gps_min_time = result['gps_data'].points[0].timestamp
-                gps_max_time = result['gps_data'].points[-1].timestamp
+                with trace_span('gps.sort', 'load', points=len(result['gps_data'].points)):
+                    result['gps_data'].sort_by_time()
+            stage_done('gps')
             
-            self.lane_manager.set_metadata(
-                first_image_timestamp=result['metadata'].get('first_image_timestamp'),
-                last_image_timestamp=result['metadata'].get('last_image_timestamp'),
-                gps_min_timestamp=gps_min_time,
-                gps_max_timestamp=gps_max_time
-            )
+            # Parse event data
+            logging.debug("Loading event data...")
+            point_events = []
+            with trace_span('events.parse', 'load'):
+                events = self._load_event_data(fileid_folder, point_events, create_missing)
+                result['point_events'] = PointEventIndex(point_events)
+            logging.info(f"Loaded {len(events)} events, {len(point_events)} non-span events")
+            
+            # Enrich events with GPS data before publishing them
+            if result['gps_data']:
+                logging.debug("Enriching events with GPS data...")
+                with trace_span('events.enrich', 'load', events=len(events)):
+                    enrich_events_with_gps(events, result['gps_data'])
+                logging.info("Events enriched with GPS data")
+            result['events'] = events
+            stage_done('events')
             
             # Setup lane manager
             logging.debug("Setting up lane manager...")
-            
-            # Reset lane fixes for new FileID (prevent contamination from previous FileID)
-            result['lane_manager'].lane_fixes = []
-            result['lane_manager'].has_changes = False
-            
-            plate = None
-            if result['image_paths']:
-                try:
-                    first_metadata = extract_image_metadata(result['image_paths'][0])
-                    plate = first_metadata.get('plate')
-                except Exception as e:
-                    logging.warning(f"Could not extract plate from first image: {e}")
-            
-            result['lane_manager'].set_fileid_folder(fileid_folder.path, plate)
-            
-            # Set end time for lane extension
-            if result['metadata'].get('last_image_timestamp'):
-                result['lane_manager'].set_end_time(result['metadata']['last_image_timestamp'])
-            
+            with trace_span('lanes.setup', 'load'):
+                result['lane_manager'] = self._create_lane_manager(
+                    fileid_folder, result['metadata'], result['gps_data'], create_missing
+                )
+            with trace_span('lanes.validate', 'load', fixes=len(result['lane_manager'].lane_fixes)):
+                result['lane_validation_errors'] = result['lane_manager'].validate_lane_fixes_time_bounds()
             logging.info("Lane manager setup complete")
+            stage_done('lanes')
             
             logging.info(f"Successfully loaded all data for FileID: {fileid_folder.fileid}")
             
+        except FileIDLoadCancelled:
+            logging.info(f"Loading FileID {fileid_folder.fileid} cancelled")
+            raise
         except Exception as e:
             logging.error(f"Failed to load FileID data for {fileid_folder.fileid}: {str(e)}", exc_info=True)
             raise Exception(f"Failed to load FileID data: {str(e)}")
         
         return result
+
+    def load_lane_manager(self, fileid_folder, create_missing: bool = True) -> LaneManager:
+        """
+        Lane manager of a FileID with its image/GPS validation time bounds, without loading events
+        (survey-wide lane fix checks); built the same way as in load_fileid_data
+        """
+        image_paths = self._load_image_paths(fileid_folder)
+        metadata = self._extract_fileid_metadata(fileid_folder, image_paths)
+        gps_data = self._load_gps_data(fileid_folder)
+        if gps_data and gps_data.points:
+            gps_data.sort_by_time()
+        return self._create_lane_manager(fileid_folder, metadata, gps_data, create_missing)
+
+    def _create_lane_manager(self, fileid_folder, metadata: Dict[str, Any], gps_data: Optional[GPSData],
+                             create_missing: bool = True) -> LaneManager:
+        """Create the lane manager for a FileID with its validation time bounds"""
+        lane_manager = LaneManager()
+        
+        # Set metadata for validation
+        gps_min_time, gps_max_time = None, None
+        if gps_data and gps_data.points:
+            gps_min_time = gps_data.points[0].timestamp
+            gps_max_time = gps_data.points[-1].timestamp
+        
+        lane_manager.set_metadata(
+            first_image_timestamp=metadata.get('first_image_timestamp'),
+            last_image_timestamp=metadata.get('last_image_timestamp'),
+            gps_min_timestamp=gps_min_time,
+            gps_max_timestamp=gps_max_time
+        )
+        
+        # Plate was read from the first image while extracting metadata
+        lane_manager.set_fileid_folder(fileid_folder.path, metadata.get('plate'), create_if_missing=create_missing)
+        lane_manager.has_changes = False
+        
+        # Set end time for lane extension
+        if metadata.get('last_image_timestamp'):
+            lane_manager.set_end_time(metadata['last_image_timestamp'])
+        
+        return lane_manager
     
-    def _load_event_data(self, fileid_folder) -> List[Event]:
-        """Load event data from .driveevt file"""
+    def _load_event_data(self, fileid_folder, point_events: Optional[List[PointEvent]] = None,
+                         create_missing: bool = True) -> List[Event]:
+        """Load event data from .driveevt file (non-span rows are collected into point_events)"""
         driveevt_path = os.path.join(fileid_folder.path, f"{fileid_folder.fileid}.driveevt")
         return self._load_csv_file(
             file_path=driveevt_path,
-            parser_func=parse_driveevt,
+            parser_func=lambda path: parse_driveevt(path, point_events),
             empty_value=[],
-            create_empty_func=self._create_empty_driveevt,
+            create_empty_func=self._create_empty_driveevt if create_missing else None,
             file_type="driveevt file"
         )
     
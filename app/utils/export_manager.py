@@ -5,17 +5,28 @@ Handles CSV export of lane assignments and events
 
 import os
 import csv
-import shutil
 import logging
 import re
-from datetime import datetime
-from typing import List
+from datetime import datetime, timezone
+from typing import List, Optional
 import pandas as pd
 
 from ..models.lane_model import LaneFix
 from ..models.event_model import Event
 from ..security.sanitizer import InputSanitizer
 from ..security.validator import InputValidator
+from .atomic_file import atomic_write
+from .time_axis import datetimes_from_epoch_us
+
+LANE_FIX_TIME_FORMAT = '%d/%m/%y %H:%M:%S.%f'
+EPOCH_UTC = pd.Timestamp(0, tz='UTC')
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Naive datetimes taken as UTC"""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
 
 
 class ExportManager:
@@ -90,19 +101,12 @@ class ExportManager:
         if not self._validate_output_path(output_path):
             return False
         
-        backup_path = None
-        
         try:
             # Log what we're exporting
             # logging.info(f"ExportManager: Exporting {len(sorted_fixes)} lane fixes to {output_path} (include_file_id={include_file_id})")
-            
-            # Create backup if file exists
-            if os.path.exists(output_path):
-                backup_path = output_path + '.backup'
-                shutil.copy2(output_path, backup_path)
-                logging.info(f"Created backup: {backup_path}")
 
-            with open(output_path, 'w', newline='', encoding='utf-8', errors='replace') as f:
+            # Written to a temporary file first; a failed export leaves the existing file intact
+            with atomic_write(output_path, 'w', newline='', encoding='utf-8', errors='replace') as f:
                 writer = csv.writer(f)
 
                 # Write header based on include_file_id flag
@@ -169,33 +173,58 @@ class ExportManager:
                 if skipped > 0:
                     logging.warning(f"Skipped {skipped} invalid lane fixes during export")
 
-            # Delete backup on success
-            if backup_path and os.path.exists(backup_path):
-                os.remove(backup_path)
-                logging.debug(f"Deleted backup: {backup_path}")
-            
             # logging.info(f"Successfully exported {len(sorted_fixes) - skipped} lane fixes")
             return True
 
         except PermissionError as e:
             logging.error(f"Permission denied writing to {output_path}: {e}")
-            if backup_path and os.path.exists(backup_path):
-                shutil.copy2(backup_path, output_path)
-                logging.info("Restored from backup")
             return False
             
         except IOError as e:
             logging.error(f"IO error exporting lane fixes: {e}")
-            if backup_path and os.path.exists(backup_path):
-                shutil.copy2(backup_path, output_path)
-                logging.info("Restored from backup")
             return False
             
         except Exception as e:
             logging.error(f"Unexpected error exporting lane fixes: {e}")
-            if backup_path and os.path.exists(backup_path):
-                shutil.copy2(backup_path, output_path)
-                logging.info("Restored from backup")
+            return False
+
+    def export_merged_lane_fixes(self, lane_fixes: List[LaneFix], output_path: str) -> bool:
+        """
+        Write the survey-level merged lane fix file (laneFixes-<date>.csv in the survey root)
+        Same columns as the per-FileID lane fix files plus RegionID/RoadID/Travel; used by the
+        GUI merge and the headless CLI so both produce identical files.
+        """
+        try:
+            sorted_fixes = sorted(lane_fixes, key=lambda f: f.from_time)
+
+            with atomic_write(output_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['Plate', 'From', 'To', 'Lane', 'Ignore', 'RegionID', 'RoadID', 'Travel'])
+
+                # Times as DD/MM/YY HH:MM:SS.mmm (same as individual files)
+                for fix in sorted_fixes:
+                    from_milliseconds = fix.from_time.microsecond // 1000
+                    from_time_str = fix.from_time.strftime('%d/%m/%y %H:%M:%S') + f'.{from_milliseconds:03d}'
+
+                    to_milliseconds = fix.to_time.microsecond // 1000
+                    to_time_str = fix.to_time.strftime('%d/%m/%y %H:%M:%S') + f'.{to_milliseconds:03d}'
+
+                    writer.writerow([
+                        fix.plate,
+                        from_time_str,
+                        to_time_str,
+                        fix.lane,
+                        '1' if fix.ignore else '',  # Ignore
+                        '',  # RegionID
+                        '',  # RoadID
+                        'N'  # Travel direction
+                    ])
+
+            logging.info(f"Saved {len(sorted_fixes)} merged lane fixes to {output_path}")
+            return True
+
+        except Exception as e:
+            logging.error(f"Failed to save merged lane fixes: {str(e)}")
             return False
 
     def export_events(self, events: List[Event], output_path: str) -> bool:
@@ -302,6 +331,10 @@ class ExportManager:
         """
         Load existing fixes from CSV
         
+        Columns are parsed as a whole (pd.to_datetime with the export format,
+        vectorized lane/ignore normalization); LaneFix objects are only built
+        for the rows that parsed.
+        
         Args:
             existing_path: Path to existing CSV file
             
@@ -309,38 +342,44 @@ class ExportManager:
             List[LaneFix]: List of loaded LaneFix objects
         """
         existing_fixes = []
-        skipped_count = 0
         
         if not os.path.exists(existing_path):
             logging.info(f"No existing file found at {existing_path}")
             return existing_fixes
         
         try:
-            df = pd.read_csv(existing_path)
+            df = pd.read_csv(existing_path, dtype=str, keep_default_na=False)
             logging.info(f"Reading {len(df)} rows from {existing_path}")
-            
-            for idx, row in df.iterrows():
-                try:
-                    fix = LaneFix(
-                        plate=str(row['Plate']),
-                        from_time=datetime.strptime(str(row['From']), '%d/%m/%y %H:%M:%S.%f'),
-                        to_time=datetime.strptime(str(row['To']), '%d/%m/%y %H:%M:%S.%f'),
-                        lane=str(row['Lane']),
-                        file_id=str(row.get('FileID', '')),
-                        ignore=str(row.get('Ignore', '')).strip() in ['1', '1.0']
-                    )
-                    existing_fixes.append(fix)
-                    
-                except KeyError as e:
-                    skipped_count += 1
-                    logging.warning(f"Row {idx}: Missing required field {e}")
-                    
-                except ValueError as e:
-                    skipped_count += 1
-                    logging.warning(f"Row {idx}: Invalid value - {e}")
-            
+
+            missing = [column for column in ('Plate', 'From', 'To', 'Lane') if column not in df.columns]
+            if missing:
+                logging.warning(f"Missing required fields {missing} in {existing_path}")
+                return existing_fixes
+
+            from_us = self._parse_export_times(df['From'])
+            to_us = self._parse_export_times(df['To'])
+            valid = from_us.notna() & to_us.notna()
+
+            skipped_count = int((~valid).sum())
             if skipped_count > 0:
+                for idx in df.index[~valid][:10]:
+                    logging.warning(f"Row {idx}: Invalid time value - From={df.at[idx, 'From']!r}, To={df.at[idx, 'To']!r}")
                 logging.warning(f"Skipped {skipped_count} invalid rows from {existing_path}")
+
+            df = df[valid]
+            # Lanes written by older pandas round-trips may carry a float suffix ('1.0')
+            lanes = df['Lane'].str.strip().str.replace(r'\.0$', '', regex=True)
+            ignores = df['Ignore'].str.strip().isin(['1', '1.0']) if 'Ignore' in df.columns else pd.Series(False, index=df.index)
+            file_ids = df['FileID'] if 'FileID' in df.columns else pd.Series('', index=df.index)
+
+            from_times = datetimes_from_epoch_us(from_us[valid].astype('int64'))
+            to_times = datetimes_from_epoch_us(to_us[valid].astype('int64'))
+            existing_fixes = [
+                LaneFix(plate=plate, from_time=from_time, to_time=to_time, lane=lane, file_id=file_id, ignore=ignore)
+                for plate, from_time, to_time, lane, file_id, ignore in zip(
+                    df['Plate'].tolist(), from_times, to_times, lanes.tolist(), file_ids.tolist(), ignores.tolist()
+                )
+            ]
             
             logging.info(f"Successfully loaded {len(existing_fixes)} fixes from {existing_path}")
                 
@@ -353,26 +392,37 @@ class ExportManager:
             
         return existing_fixes
 
+    @staticmethod
+    def _parse_export_times(column: pd.Series) -> pd.Series:
+        """Parse a DD/MM/YY HH:MM:SS.mmm column to epoch microseconds (NaN where invalid)"""
+        times = pd.to_datetime(column.str.strip(), format=LANE_FIX_TIME_FORMAT, errors='coerce', utc=True)
+        return (times - EPOCH_UTC) // pd.Timedelta(microseconds=1)
+
     def _remove_duplicates(self, fixes: List[LaneFix]) -> List[LaneFix]:
         """
         Remove duplicate lane fixes
         
+        Keys are (plate, from, to, lane, file_id) tuples in a set. Aware
+        datetimes hash by their UTC instant; naive times are taken as UTC so
+        they match the same aware time.
+        
         Args:
             fixes: List of LaneFix objects (may contain duplicates)
             
         Returns:
-            List[LaneFix]: List with duplicates removed
+            List[LaneFix]: List with duplicates removed, first occurrence kept
         """
         seen = set()
         unique = []
 
         for fix in fixes:
-            key = (fix.plate, fix.from_time, fix.to_time, fix.lane, fix.file_id)
+            from_time, to_time = fix.from_time, fix.to_time
+            if (from_time is not None and from_time.tzinfo is None) or (to_time is not None and to_time.tzinfo is None):
+                from_time, to_time = _as_utc(from_time), _as_utc(to_time)
+            key = (fix.plate, from_time, to_time, fix.lane, fix.file_id)
             if key not in seen:
                 seen.add(key)
                 unique.append(fix)
-            else:
-                logging.debug(f"Duplicate found and skipped: {fix.plate} at {fix.from_time}")
 
         duplicates_removed = len(fixes) - len(unique)
         if duplicates_removed > 0:
@@ -1,13 +1,18 @@
 import csv
 import os
-import shutil
 import logging
 from datetime import datetime, timezone
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 import pytz
 
-from ..models.event_model import Event
+from ..models.event_model import Event, PointEvent
 from ..models.gps_model import GPSData, GPSPoint
+from .atomic_file import atomic_write
+
+DRIVEEVT_COLUMNS = [
+    'SessionToken', 'Distance', 'Chainage', 'Time', 'TimeUtc',
+    'Event', 'IsSpanEvent', 'SpanEvent', 'IsSpanStartEvent', 'IsSpanEndEvent'
+]
 
 
 def _validate_file_path(file_path: str, check_write: bool = False) -> bool:
@@ -97,8 +102,12 @@ def _validate_gps_data_integrity(gps_data: GPSData) -> None:
         logging.debug("GPS data integrity check passed")
 
 
-def parse_driveevt(file_path: str) -> List[Event]:
-    """Parse driveevt file with comprehensive error handling"""
+def parse_driveevt(file_path: str, point_events: Optional[List[PointEvent]] = None) -> List[Event]:
+    """
+    Parse driveevt file with comprehensive error handling
+    Span events are paired into Events; when point_events is given, non-span
+    rows with a TimeUtc are appended to it in file order.
+    """
     events = []
 
     if not _validate_file_path(file_path, check_write=False):
@@ -128,6 +137,8 @@ def parse_driveevt(file_path: str) -> List[Event]:
             for row_idx, row in enumerate(reader):
                 try:
                     if row.get('IsSpanEvent', '').lower() != 'true':
+                        if point_events is not None:
+                            _capture_point_event(row, point_events)
                         continue
 
                     span_name = row.get('SpanEvent', '')
@@ -236,6 +247,23 @@ def parse_driveevt(file_path: str) -> List[Event]:
     return events
 
 
+def _capture_point_event(row: dict, point_events: List[PointEvent]):
+    """Record a non-span row (same filter the warnings panel always used: TimeUtc present)"""
+    time_utc = (row.get('TimeUtc') or '').strip()
+    if not time_utc:
+        return
+    try:
+        chainage = float(row.get('Chainage') or 0)
+    except ValueError:
+        chainage = 0.0
+    point_events.append(PointEvent(
+        event_name=(row.get('Event') or '').strip(),
+        time_utc_text=time_utc,
+        timestamp=_parse_timestamp_utc(time_utc, '%m/%d/%Y %H:%M:%S'),
+        chainage=chainage
+    ))
+
+
 def parse_driveiri(file_path: str) -> GPSData:
     """Parse driveiri GPS file with comprehensive error handling"""
     gps_data = GPSData()
@@ -409,7 +437,18 @@ def enrich_events_with_gps(events: List[Event], gps_data: GPSData) -> None:
     # logging.info(f"Enriched {enriched_count}/{len(events)} events with GPS data")
 
 
-def save_driveevt(events: List[Event], file_path: str, fileid: str = "") -> bool:
+def read_non_span_rows(file_path: str) -> List[Dict[str, str]]:
+    """Non-span rows of a .driveevt as written (so a rewrite of its span events can keep them)"""
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        return [row for row in csv.DictReader(f) if (row.get('IsSpanEvent') or '').lower() != 'true']
+
+
+def save_driveevt(events: List[Event], file_path: str, fileid: str = "",
+                  non_span_rows: Optional[List[Dict[str, str]]] = None) -> bool:
+    """
+    Write span events as Start/End rows sorted by time; non_span_rows (from
+    read_non_span_rows) are written back unchanged in time order with them
+    """
     if not events:
         logging.warning("No events to save")
         return False
@@ -417,22 +456,13 @@ def save_driveevt(events: List[Event], file_path: str, fileid: str = "") -> bool
     if not _validate_file_path(file_path, check_write=True):
         return False
 
-    backup_path = None
-
     try:
-        if os.path.exists(file_path):
-            backup_path = file_path + '.backup'
-            shutil.copy2(file_path, backup_path)
-            logging.info(f"Created backup: {backup_path}")
-
         nz_tz = pytz.timezone('Pacific/Auckland')
 
-        with open(file_path, 'w', newline='', encoding='utf-8', errors='replace') as f:
+        # Written to a temporary file first; a failed save leaves the existing file intact
+        with atomic_write(file_path, 'w', newline='', encoding='utf-8', errors='replace') as f:
             writer = csv.writer(f)
-            writer.writerow([
-                'SessionToken', 'Distance', 'Chainage', 'Time', 'TimeUtc',
-                'Event', 'IsSpanEvent', 'SpanEvent', 'IsSpanStartEvent', 'IsSpanEndEvent'
-            ])
+            writer.writerow(DRIVEEVT_COLUMNS)
 
             for event in events:
                 event_file_id = getattr(event, 'file_id', None)
@@ -488,34 +518,29 @@ def save_driveevt(events: List[Event], file_path: str, fileid: str = "") -> bool
                     ]
                 })
 
+            for row in non_span_rows or []:
+                time_text = (row.get('TimeUtc') or '').strip()
+                time_utc = _parse_timestamp_utc(time_text, '%m/%d/%Y %H:%M:%S') if time_text else None
+                event_rows.append({
+                    'time_utc': time_utc or datetime.min.replace(tzinfo=timezone.utc),
+                    'row': [row.get(column) or '' for column in DRIVEEVT_COLUMNS]
+                })
+
             event_rows.sort(key=lambda x: x['time_utc'])
             for event_row in event_rows:
                 writer.writerow(event_row['row'])
 
-        if backup_path and os.path.exists(backup_path):
-            os.remove(backup_path)
-            logging.debug(f"Deleted backup: {backup_path}")
-
         # logging.info(f"Successfully saved {len(events)} events to {file_path}")
         return True
 
     except PermissionError as e:
         logging.error(f"Permission denied writing to {file_path}: {e}")
-        if backup_path and os.path.exists(backup_path):
-            shutil.copy2(backup_path, file_path)
-            logging.info("Restored from backup")
         return False
 
     except IOError as e:
         logging.error(f"IO error saving events to {file_path}: {e}")
-        if backup_path and os.path.exists(backup_path):
-            shutil.copy2(backup_path, file_path)
-            logging.info("Restored from backup")
         return False
 
     except Exception as e:
         logging.error(f"Unexpected error saving events to {file_path}: {e}")
-        if backup_path and os.path.exists(backup_path):
-            shutil.copy2(backup_path, file_path)
-            logging.info("Restored from backup")
         return False
@@ -8,10 +8,13 @@ import re
 import json
 import csv
 import logging
+import time
 from datetime import datetime
 from typing import List, Optional
 from dataclasses import dataclass
 
+from .latency import record_latency
+
 @dataclass
 class FileIDFolder:
     """Represents a FileID folder with metadata"""
@@ -33,10 +36,14 @@ class FileIDManager:
     - Track processing state
     """
 
-    def __init__(self):
+    def __init__(self, persist_state: bool = True, create_missing: bool = True):
         self.fileid_list: List[FileIDFolder] = []
         self.current_index = -1
-        self.state_file = self._get_state_file_path()
+        # Headless tools scan without touching the GUI's remembered FileID
+        self.persist_state = persist_state
+        # ...and, when read-only, without creating missing .driveevt / lane fix files
+        self.create_missing = create_missing
+        self.state_file = self._get_state_file_path() if persist_state else None
 
     def _get_state_file_path(self) -> str:
         """Get path to state file"""
@@ -50,6 +57,7 @@ class FileIDManager:
         Returns sorted list of valid FileID folders
         """
         self.fileid_list = []
+        scan_started = time.perf_counter()
 
         if not os.path.exists(parent_path):
             return self.fileid_list
@@ -85,6 +93,7 @@ class FileIDManager:
         except PermissionError:
             logging.error(f"Permission denied accessing {parent_path}")
 
+        record_latency('fileid_scan', time.perf_counter() - scan_started)
         return self.fileid_list
 
     def _is_valid_fileid(self, filename: str) -> bool:
@@ -115,12 +124,12 @@ class FileIDManager:
             has_lane_fixes = os.path.exists(lane_fix_path)
 
             # If no driveevt, try to create it
-            if not has_driveevt:
+            if not has_driveevt and self.create_missing:
                 if self._create_empty_driveevt(driveevt_path):
                     has_driveevt = True
 
             # If no lane fix file, try to create it
-            if not has_lane_fixes:
+            if not has_lane_fixes and self.create_missing:
                 if self._create_empty_lane_fix_file(lane_fix_path):
                     has_lane_fixes = True
 
@@ -215,6 +224,16 @@ class FileIDManager:
             return self.fileid_list[self.current_index]
         return None
 
+    def get_adjacent_fileids(self) -> List[FileIDFolder]:
+        """Get neighbours of the current FileID, next first (most likely navigation)"""
+        adjacent = []
+        if 0 <= self.current_index < len(self.fileid_list):
+            if self.current_index + 1 < len(self.fileid_list):
+                adjacent.append(self.fileid_list[self.current_index + 1])
+            if self.current_index > 0:
+                adjacent.append(self.fileid_list[self.current_index - 1])
+        return adjacent
+
     def set_current_fileid(self, fileid: str):
         """Set current FileID by name"""
         for i, folder in enumerate(self.fileid_list):
@@ -225,6 +244,8 @@ class FileIDManager:
 
     def _load_state(self):
         """Load processing state from file"""
+        if not self.persist_state:
+            return
         try:
             if os.path.exists(self.state_file):
                 with open(self.state_file, 'r', encoding='utf-8') as f:
@@ -239,6 +260,8 @@ class FileIDManager:
 
     def _save_state(self):
         """Save processing state to file"""
+        if not self.persist_state:
+            return
         try:
             current = self.get_current_fileid()
             state = {
@@ -0,0 +1,303 @@
+"""
+Interval index for GeoEvent timeline
+Sorted interval containers with window/point queries and sweep-line layer assignment
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class IntervalIndex:
+    """
+    Static index over closed intervals [start, end] in numeric time (epoch seconds)
+    RESPONSIBILITIES:
+    - Sort items by start once per rebuild (O(n log n))
+    - Answer "items overlapping a window" and "items under a point" in O(log n + k)
+      using a max-end segment tree over the start-sorted order
+    - Assign non-overlapping display layers with a sweep line (O(k log k))
+    - Aggregate items into per-pixel-column density bins for zoomed-out views
+    """
+
+    def __init__(self, items: Sequence[Any] = (), key: Optional[Callable[[Any], Tuple[float, float]]] = None):
+        self._key = key or (lambda item: (item.start_ts, item.end_ts))
+        self._items: List[Any] = []
+        self._starts: List[float] = []
+        self._ends: List[float] = []
+        self._max_end: List[float] = []  # segment tree, 1-based, size 2 * _size
+        self._size = 0
+        self.build(items)
+
+    def build(self, items: Sequence[Any]):
+        """(Re)build the index from items"""
+        keyed = []
+        for item in items:
+            start, end = self._key(item)
+            if end < start:
+                start, end = end, start
+            keyed.append((start, end, item))
+        keyed.sort(key=lambda entry: (entry[0], entry[1]))
+
+        self._starts = [entry[0] for entry in keyed]
+        self._ends = [entry[1] for entry in keyed]
+        self._items = [entry[2] for entry in keyed]
+
+        size = 1
+        while size < max(1, len(keyed)):
+            size *= 2
+        self._size = size
+        self._max_end = [float('-inf')] * (2 * size)
+        for i, end in enumerate(self._ends):
+            self._max_end[size + i] = end
+        for node in range(size - 1, 0, -1):
+            self._max_end[node] = max(self._max_end[2 * node], self._max_end[2 * node + 1])
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def query_window(self, window_start: float, window_end: float) -> List[Any]:
+        """Items with start <= window_end and end >= window_start, ordered by start"""
+        return [self._items[i] for i in self._query_indices(window_start, window_end)]
+
+    def query_point(self, t: float, tolerance: float = 0.0) -> List[Any]:
+        """Items covering t (widened by tolerance on both sides), ordered by start"""
+        return self.query_window(t - tolerance, t + tolerance)
+
+    def _query_indices(self, window_start: float, window_end: float) -> List[int]:
+        # Only items starting at or before window_end can overlap
+        limit = bisect_right(self._starts, window_end)
+        if limit == 0:
+            return []
+
+        result = []
+        stack = [(1, 0, self._size)]
+        while stack:
+            node, lo, hi = stack.pop()
+            if lo >= limit or self._max_end[node] < window_start:
+                continue
+            if hi - lo == 1:
+                result.append(lo)
+                continue
+            mid = (lo + hi) // 2
+            # Right child first so indices pop in ascending order
+            stack.append((2 * node + 1, mid, hi))
+            stack.append((2 * node, lo, mid))
+        return result
+
+    def assign_layers(self, window_start: float, window_end: float, max_layers: int) -> List[List[Any]]:
+        """
+        Assign items visible in the window to layers so that items in one layer
+        never overlap (touching is allowed). Uses a sweep over start-sorted items
+        with a heap of (layer end time, layer); the lowest free layer is reused.
+        Items that don't fit in max_layers go to layer 0, as before.
+        """
+        max_layers = max(1, max_layers)
+        layers: List[List[Any]] = [[] for _ in range(max_layers)]
+        busy: List[Tuple[float, int]] = []  # (end time, layer)
+        free: List[int] = []  # released layer numbers
+        next_layer = 0
+
+        for i in self._query_indices(window_start, window_end):
+            start, end, item = self._starts[i], self._ends[i], self._items[i]
+
+            while busy and busy[0][0] <= start:
+                _, released = heapq.heappop(busy)
+                heapq.heappush(free, released)
+
+            if free:
+                layer = heapq.heappop(free)
+            elif next_layer < max_layers:
+                layer = next_layer
+                next_layer += 1
+            else:
+                layers[0].append(item)
+                continue
+
+            layers[layer].append(item)
+            heapq.heappush(busy, (end, layer))
+
+        return layers
+
+
+    def mean_visible_span(self, window_start: float, window_end: float) -> Optional[float]:
+        """Mean duration of visible items clipped to the window, or None if nothing is visible"""
+        indices = self._query_indices(window_start, window_end)
+        if not indices:
+            return None
+        total = 0.0
+        for i in indices:
+            total += min(self._ends[i], window_end) - max(self._starts[i], window_start)
+        return total / len(indices)
+
+    def density_bins(self, window_start: float, window_end: float, columns: int,
+                     group: Callable[[Any], str]) -> Dict[str, List[int]]:
+        """
+        Count items covering each of `columns` equal-width columns of the window,
+        per group (e.g. event type). Uses a difference array per group, so the
+        cost is O(k + columns * groups) regardless of how items overlap.
+        """
+        span = window_end - window_start
+        if columns <= 0 or span <= 0:
+            return {}
+        scale = columns / span
+
+        diffs: Dict[str, List[int]] = {}
+        for i in self._query_indices(window_start, window_end):
+            first = int((max(self._starts[i], window_start) - window_start) * scale)
+            last = int((min(self._ends[i], window_end) - window_start) * scale)
+            first = min(max(first, 0), columns - 1)
+            last = min(max(last, first), columns - 1)
+            diff = diffs.get(group(self._items[i]))
+            if diff is None:
+                diff = diffs[group(self._items[i])] = [0] * (columns + 1)
+            diff[first] += 1
+            diff[last + 1] -= 1
+
+        bins = {}
+        for key, diff in diffs.items():
+            running = 0
+            counts = []
+            for delta in diff[:columns]:
+                running += delta
+                counts.append(running)
+            bins[key] = counts
+        return bins
+
+
+class IntervalStore:
+    """
+    Mutable, start-sorted container of (mostly) non-overlapping intervals
+    RESPONSIBILITIES:
+    - Keep items sorted by start with parallel start and running max-end arrays
+    - Answer point, next-boundary and window queries by bisection
+    - Add, splice and replace items, bumping `revision` on every mutation so
+      views can cache derived data per revision instead of re-sorting
+    Touching intervals ([a, b] and [b, c]) are expected; genuinely overlapping
+    input (e.g. a hand-edited CSV) is still answered correctly, only the
+    O(log n) bound degrades to O(log n + overlap depth).
+    """
+
+    def __init__(self, items: Sequence[Any] = (), key: Optional[Callable[[Any], Tuple[float, float]]] = None):
+        self._key = key or (lambda item: (item.start_ts, item.end_ts))
+        self._items: List[Any] = []
+        self._starts: List[float] = []
+        self._max_ends: List[float] = []  # max end over items[0..i]
+        self.revision = 0
+        self.replace(items)
+
+    @property
+    def items(self) -> List[Any]:
+        """The live, start-sorted backing list (do not mutate directly)"""
+        return self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    # ---- mutation -------------------------------------------------------
+
+    def replace(self, items: Sequence[Any]):
+        """Replace all items; the backing list is a new object"""
+        self._items = list(items)
+        self.reindex()
+
+    def clear(self):
+        """Remove all items in place"""
+        self._items.clear()
+        self.reindex()
+
+    def add(self, item: Any):
+        """Insert one item in start order (in place)"""
+        self._items.append(item)
+        self.reindex()
+
+    def splice(self, removed: Sequence[Any], inserted: Sequence[Any]):
+        """Remove `removed` (by identity) and insert `inserted` as one mutation"""
+        removed_ids = {id(item) for item in removed}
+        self._items = [item for item in self._items if id(item) not in removed_ids] + list(inserted)
+        self.reindex()
+
+    def reindex(self):
+        """Re-sort and rebuild the search arrays, e.g. after items were edited in place"""
+        # list.sort is stable and linear on already-sorted input
+        self._items.sort(key=self._start_of)
+        self._starts = []
+        self._max_ends = []
+        running = float('-inf')
+        for item in self._items:
+            start, end = self._bounds(item)
+            running = max(running, end)
+            self._starts.append(start)
+            self._max_ends.append(running)
+        self.revision += 1
+
+    # ---- queries --------------------------------------------------------
+
+    def covering(self, t: float) -> List[Any]:
+        """Items with start <= t <= end, latest start first"""
+        result = []
+        i = bisect_right(self._starts, t) - 1
+        while i >= 0 and self._max_ends[i] >= t:
+            if self._bounds(self._items[i])[1] >= t:
+                result.append(self._items[i])
+            i -= 1
+        return result
+
+    def at(self, t: float) -> Optional[Any]:
+        """The latest-starting item covering t, or None"""
+        i = bisect_right(self._starts, t) - 1
+        while i >= 0 and self._max_ends[i] >= t:
+            if self._bounds(self._items[i])[1] >= t:
+                return self._items[i]
+            i -= 1
+        return None
+
+    def last_starting_before(self, t: float) -> Optional[Any]:
+        """The latest-starting item with start < t, or None"""
+        i = bisect_left(self._starts, t) - 1
+        return self._items[i] if i >= 0 else None
+
+    def first_starting_after(self, t: float) -> Optional[Any]:
+        """The earliest item with start > t (the next boundary), or None"""
+        i = bisect_right(self._starts, t)
+        return self._items[i] if i < len(self._items) else None
+
+    def overlapping(self, window_start: float, window_end: float, strict: bool = False) -> List[Any]:
+        """
+        Items overlapping [window_start, window_end], in start order.
+        strict=True excludes items that only touch the window at an endpoint.
+        """
+        if strict:
+            limit = bisect_left(self._starts, window_end)
+        else:
+            limit = bisect_right(self._starts, window_end)
+        result = []
+        i = limit - 1
+        while i >= 0 and self._max_ends[i] >= window_start:
+            end = self._bounds(self._items[i])[1]
+            if end > window_start or (not strict and end == window_start):
+                result.append(self._items[i])
+            i -= 1
+        result.reverse()
+        return result
+
+    def _bounds(self, item: Any) -> Tuple[float, float]:
+        start, end = self._key(item)
+        # Items with missing times sort first and never match a query
+        if start is None or end is None:
+            return float('-inf'), float('-inf')
+        return start, end
+
+    def _start_of(self, item: Any) -> float:
+        return self._bounds(item)[0]
+
+
+def layer_lookup(layers: List[List[Any]]) -> Dict[int, int]:
+    """Map id(item) -> layer for hit-testing (highest layer wins for overflow items)"""
+    lookup = {}
+    for layer_idx, layer_items in enumerate(layers):
+        for item in layer_items:
+            lookup[id(item)] = max(layer_idx, lookup.get(id(item), layer_idx))
+    return lookup
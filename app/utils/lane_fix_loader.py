@@ -0,0 +1,278 @@
+"""
+Lane fix CSV loader for GeoEvent application
+Batch loading with one-time time format detection and vectorized bounds validation
+"""
+
+import csv
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from app.models.lane_model import LaneFix
+from app.utils.time_axis import datetimes_from_epoch_us, seed_epoch_seconds, to_epoch_seconds
+
+# Time formats found in lane fix files
+FORMAT_DMY = 'dd/mm/yy HH:MM:SS.fff'   # written by ExportManager.export_lane_fixes
+FORMAT_MINSEC = 'MMM:SS.s'             # total minutes:seconds from start of day
+FORMAT_HMS = 'HH:MM:SS.f'              # time of day
+
+BOUNDS_TOLERANCE_SECONDS = 1.0
+FORMAT_SAMPLE_ROWS = 5
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_DMY_SEPARATORS = {2: ord('/'), 5: ord('/'), 8: ord(' '), 11: ord(':'), 14: ord(':')}
+_DMY_DIGITS = [0, 1, 3, 4, 6, 7, 9, 10, 12, 13, 15, 16]
+
+
+@dataclass
+class LaneFixReject:
+    """One lane fix row that was not loaded"""
+    line: int
+    reason: str
+    from_text: str
+    to_text: str
+    lane: str
+
+
+@dataclass
+class LaneFixLoadReport:
+    """Outcome of loading one lane fix file"""
+    path: str
+    time_format: Optional[str] = None
+    total_rows: int = 0
+    loaded: int = 0
+    rejects: List[LaneFixReject] = field(default_factory=list)
+
+    def summary(self) -> str:
+        """One-line summary for logs"""
+        return (f"{self.loaded}/{self.total_rows} lane fixes loaded from {self.path} "
+                f"(format {self.time_format or 'unknown'}, {len(self.rejects)} rejected)")
+
+
+def detect_time_format(samples: List[str]) -> Optional[str]:
+    """Detect the time format of a lane fix file from its first From values"""
+    for text in samples:
+        text = text.strip()
+        if not text:
+            continue
+        if '/' in text and len(text.split()) == 2:
+            return FORMAT_DMY
+        if text.count(':') == 1:
+            return FORMAT_MINSEC
+        return FORMAT_HMS
+    return None
+
+
+# ---- scalar parsers (irregular rows and the legacy formats) ---------------
+
+def _fraction_to_microseconds(digits: str) -> int:
+    return int((digits + '000000')[:6]) if digits else 0
+
+
+def _parse_dmy(text: str, today: date) -> datetime:
+    fmt = '%d/%m/%y %H:%M:%S.%f' if '.' in text else '%d/%m/%y %H:%M:%S'
+    return datetime.strptime(text, fmt).replace(tzinfo=timezone.utc)
+
+
+def _parse_minsec(text: str, today: date) -> datetime:
+    minutes_text, seconds_text = text.split(':')
+    total_minutes = int(minutes_text)
+    seconds_text, _, fraction = seconds_text.partition('.')
+    return datetime(today.year, today.month, today.day, total_minutes // 60, total_minutes % 60,
+                    int(seconds_text), _fraction_to_microseconds(fraction), timezone.utc)
+
+
+def _parse_hms(text: str, today: date) -> datetime:
+    hours_text, minutes_text, seconds_text = text.split(':')
+    seconds_text, _, fraction = seconds_text.partition('.')
+    return datetime(today.year, today.month, today.day, int(hours_text), int(minutes_text),
+                    int(seconds_text), _fraction_to_microseconds(fraction), timezone.utc)
+
+
+_PARSERS = {
+    FORMAT_DMY: _parse_dmy,
+    FORMAT_MINSEC: _parse_minsec,
+    FORMAT_HMS: _parse_hms,
+}
+
+
+def get_time_parser(time_format: str) -> Callable[[str, date], datetime]:
+    """Scalar parser for one format: parser(text, today) -> aware UTC datetime"""
+    return _PARSERS[time_format]
+
+
+# ---- column parsing -------------------------------------------------------
+
+def _parse_dmy_fixed(texts: List[str], seconds: np.ndarray, micros: np.ndarray, ok: np.ndarray):
+    """
+    Vectorized parse of 'dd/mm/yy HH:MM:SS[.fff...]' rows that share one length.
+    The column is viewed as a (rows x chars) byte matrix and the digits are
+    read by position; rows not matching the layout are left for the scalar parser.
+    """
+    if not texts:
+        return
+    length = len(texts[0])
+    if length < 17 or length == 18 or any(len(text) != length for text in texts):
+        return
+    try:
+        raw = "".join(texts).encode('ascii')
+    except UnicodeEncodeError:
+        return
+    chars = np.frombuffer(raw, dtype=np.uint8).reshape(len(texts), length)
+
+    match = np.ones(len(texts), dtype=bool)
+    for position, separator in _DMY_SEPARATORS.items():
+        match &= chars[:, position] == separator
+    fraction_columns = list(range(18, length))
+    if length > 17:
+        match &= chars[:, 17] == ord('.')
+    digits = chars[:, _DMY_DIGITS + fraction_columns].astype(np.int64) - ord('0')
+    match &= ((digits >= 0) & (digits <= 9)).all(axis=1)
+
+    day = digits[:, 0] * 10 + digits[:, 1]
+    month = digits[:, 2] * 10 + digits[:, 3]
+    year = digits[:, 4] * 10 + digits[:, 5]
+    year += np.where(year < 69, 2000, 1900)  # same pivot as strptime %y
+    hour = digits[:, 6] * 10 + digits[:, 7]
+    minute = digits[:, 8] * 10 + digits[:, 9]
+    second = digits[:, 10] * 10 + digits[:, 11]
+    micro = np.zeros(len(texts), dtype=np.int64)
+    for i in range(min(6, len(fraction_columns))):
+        micro += digits[:, 12 + i] * 10 ** (5 - i)
+
+    month_index = (year - 1970) * 12 + np.clip(month, 1, 12) - 1
+    month_start = month_index.astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+    month_days = (month_index + 1).astype('datetime64[M]').astype('datetime64[D]').astype(np.int64) - month_start
+    match &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= month_days)
+    match &= (hour <= 23) & (minute <= 59) & (second <= 59)
+
+    total = (month_start + day - 1) * 86400 + hour * 3600 + minute * 60 + second
+    seconds[match] = total[match]
+    micros[match] = micro[match]
+    ok[match] = True
+
+
+def parse_time_column(texts: List[str], time_format: str, today: date
+                      ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse one From/To column.
+    Returns (epoch seconds int64, microseconds int64, parsed ok bool) arrays.
+    """
+    count = len(texts)
+    seconds = np.zeros(count, dtype=np.int64)
+    micros = np.zeros(count, dtype=np.int64)
+    ok = np.zeros(count, dtype=bool)
+
+    if time_format == FORMAT_DMY:
+        _parse_dmy_fixed(texts, seconds, micros, ok)
+
+    parse = get_time_parser(time_format)
+    for i in np.flatnonzero(~ok):
+        try:
+            value = parse(texts[i], today)
+        except (ValueError, IndexError):
+            continue
+        delta = value - _EPOCH
+        seconds[i] = delta.days * 86400 + delta.seconds
+        micros[i] = delta.microseconds
+        ok[i] = True
+    return seconds, micros, ok
+
+
+def load_lane_fix_csv(path: str, file_id: str, default_plate: str = '',
+                      valid_range: Tuple[Optional[datetime], Optional[datetime]] = (None, None)
+                      ) -> Tuple[List[LaneFix], LaneFixLoadReport]:
+    """
+    Load a lane fix CSV in one pass.
+    The time format is detected once from the first rows, the From/To columns
+    are parsed as whole columns, and all fixes are checked against valid_range
+    (image/GPS bounds, 1 s tolerance) in one vectorized pass.
+    Rows that fail parsing or validation are returned in the report, not raised.
+    """
+    report = LaneFixLoadReport(path=str(path))
+
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return [], report
+        columns = {name.strip(): i for i, name in enumerate(header)}
+        rows, line_numbers = [], []  # file line of each kept row (blank lines are skipped)
+        for row in reader:
+            if row:
+                rows.append(row)
+                line_numbers.append(reader.line_num)
+
+    report.total_rows = len(rows)
+    if 'From' not in columns or 'To' not in columns:
+        report.rejects = [LaneFixReject(line, "missing From/To columns", '', '', '') for line in line_numbers]
+        return [], report
+
+    def column(name: str) -> List[str]:
+        col = columns.get(name)
+        if col is None:
+            return [''] * len(rows)
+        return [row[col].strip() if col < len(row) else '' for row in rows]
+
+    from_texts, to_texts = column('From'), column('To')
+    plates, lanes, ignores = column('Plate'), column('Lane'), column('Ignore')
+
+    report.time_format = detect_time_format(from_texts[:FORMAT_SAMPLE_ROWS])
+    if report.time_format is None:
+        return [], report
+    today = datetime.now(timezone.utc).date()
+
+    from_s, from_us, from_ok = parse_time_column(from_texts, report.time_format, today)
+    to_s, to_us, to_ok = parse_time_column(to_texts, report.time_format, today)
+
+    # Vectorized validation; later rules overwrite earlier ones, most specific last
+    from_ts = from_s + from_us / 1e6
+    to_ts = to_s + to_us / 1e6
+    reasons = np.full(len(rows), '', dtype=object)
+    reasons[from_ts >= to_ts] = "from_time >= to_time"
+    valid_min, valid_max = valid_range
+    if valid_min is not None and valid_max is not None:
+        reasons[to_ts > to_epoch_seconds(valid_max) + BOUNDS_TOLERANCE_SECONDS] = f"to_time after valid max {valid_max}"
+        reasons[from_ts < to_epoch_seconds(valid_min) - BOUNDS_TOLERANCE_SECONDS] = f"from_time before valid min {valid_min}"
+    reasons[~(from_ok & to_ok)] = f"unparseable time ({report.time_format})"
+
+    keep = reasons == ''
+    indices = np.flatnonzero(keep).tolist()
+    from_times = datetimes_from_epoch_us(from_s[keep] * 1000000 + from_us[keep])
+    to_times = datetimes_from_epoch_us(to_s[keep] * 1000000 + to_us[keep])
+    fixes = []
+    for i, from_time, to_time, start_ts, end_ts in zip(indices, from_times, to_times,
+                                                       from_ts[keep].tolist(), to_ts[keep].tolist()):
+        fix = LaneFix(
+            plate=plates[i] or default_plate or '',
+            from_time=from_time,
+            to_time=to_time,
+            lane=lanes[i],
+            file_id=file_id,
+            ignore=ignores[i] == '1'
+        )
+        # The timeline and lane store need epoch seconds; we already have them
+        seed_epoch_seconds(fix, 'from_time', start_ts)
+        seed_epoch_seconds(fix, 'to_time', end_ts)
+        fixes.append(fix)
+
+    report.rejects = [
+        LaneFixReject(line_numbers[i], reasons[i], from_texts[i], to_texts[i], lanes[i])
+        for i in np.flatnonzero(reasons != '')
+    ]
+    report.loaded = len(fixes)
+    return fixes, report
+
+
+def log_load_report(report: LaneFixLoadReport):
+    """Log the report summary and each rejected row"""
+    if report.rejects:
+        logging.warning(report.summary())
+        for reject in report.rejects:
+            logging.warning(f"  line {reject.line}: {reject.reason} "
+                            f"(From={reject.from_text!r}, To={reject.to_text!r}, Lane={reject.lane!r})")
+    else:
+        logging.info(report.summary())
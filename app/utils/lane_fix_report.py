@@ -0,0 +1,263 @@
+"""
+Survey-wide lane fix validation report for GeoEvent application
+Checks each FileID's lane fixes against its image/GPS time bounds and for overlaps,
+gaps and unassigned periods, and writes all findings to one sortable CSV or HTML table.
+"""
+
+import csv
+import html
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from app.models.lane_model import LaneFix
+from app.utils.atomic_file import atomic_write
+from app.utils.data_loader import DataLoader
+from app.utils.fileid_manager import FileIDFolder
+from app.utils.lane_fix_loader import LaneFixLoadReport, get_time_parser
+
+DEFAULT_GAP_TOLERANCE_S = 1.0  # shorter holes between lane fixes are not reported
+OVERLAP_TOLERANCE_S = 0.001  # lane fix files store milliseconds
+
+# Issue kinds; errors break the lane data, warnings need a look
+ERROR_KINDS = ('bounds', 'order', 'parse', 'overlap')
+WARNING_KINDS = ('gap', 'unassigned')
+
+REPORT_COLUMNS = ['FileID', 'Severity', 'Issue', 'Lane', 'Start', 'End', 'Duration_s', 'Line', 'Detail']
+NUMERIC_COLUMNS = ('Duration_s', 'Line')
+
+
+@dataclass
+class LaneIssue:
+    """One problem found in a FileID's lane fixes"""
+    fileid: str
+    kind: str  # see ERROR_KINDS / WARNING_KINDS
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    lane: str = ''
+    line: Optional[int] = None  # lane fix file line of a rejected row
+    detail: str = ''
+
+    @property
+    def severity(self) -> str:
+        return 'error' if self.kind in ERROR_KINDS else 'warning'
+
+    @property
+    def duration_s(self) -> Optional[float]:
+        if self.start is None or self.end is None:
+            return None
+        return (self.end - self.start).total_seconds()
+
+    def to_row(self) -> List[str]:
+        """Report row; times as sortable UTC 'YYYY-MM-DD HH:MM:SS.mmm'"""
+        duration = self.duration_s
+        return [self.fileid, self.severity, self.kind, self.lane, _format_time(self.start), _format_time(self.end),
+                f"{duration:.3f}" if duration is not None else '',
+                str(self.line) if self.line is not None else '', self.detail]
+
+    def to_dict(self) -> Dict:
+        return dict(zip(REPORT_COLUMNS, self.to_row()))
+
+
+def _format_time(value: Optional[datetime]) -> str:
+    if value is None:
+        return ''
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+
+
+def _issue_kind(reason: str) -> str:
+    if reason.startswith('from_time >='):
+        return 'order'
+    if 'valid' in reason:
+        return 'bounds'
+    return 'parse'
+
+
+def rejected_row_issues(fileid: str, report: Optional[LaneFixLoadReport]) -> List[LaneIssue]:
+    """Issues for rows the lane fix loader rejected (out of bounds, reversed or unparseable)"""
+    if not report or not report.rejects:
+        return []
+    parser = get_time_parser(report.time_format) if report.time_format else None
+    today = datetime.now(timezone.utc).date()
+
+    def parse(text: str) -> Optional[datetime]:
+        try:
+            return parser(text, today) if parser and text else None
+        except (ValueError, IndexError):
+            return None
+
+    return [LaneIssue(fileid, _issue_kind(reject.reason), parse(reject.from_text), parse(reject.to_text),
+                      reject.lane, reject.line,
+                      f"{reject.reason} (From={reject.from_text!r}, To={reject.to_text!r})")
+            for reject in report.rejects]
+
+
+def find_lane_issues(fileid: str, lane_fixes: List[LaneFix],
+                     survey_range: Tuple[Optional[datetime], Optional[datetime]] = (None, None),
+                     gap_tolerance_s: float = DEFAULT_GAP_TOLERANCE_S) -> List[LaneIssue]:
+    """
+    Overlaps, gaps and unassigned periods of one FileID's lane fixes.
+    Ignore periods count as coded time for gaps but may overlap lanes. survey_range
+    (first/last image, else GPS) is the period that should be covered end to end.
+    """
+    fixes = sorted(lane_fixes, key=lambda fix: (fix.from_time, fix.to_time))
+    range_start, range_end = survey_range
+    issues = []
+
+    if not fixes:
+        if range_start is not None and range_end is not None:
+            issues.append(LaneIssue(fileid, 'unassigned', range_start, range_end, detail="no lane fixes"))
+        return issues
+
+    # Gaps between consecutive coded periods (any fix, including Ignore)
+    covered_end = fixes[0].to_time
+    for fix in fixes[1:]:
+        if (fix.from_time - covered_end).total_seconds() > gap_tolerance_s:
+            issues.append(LaneIssue(fileid, 'gap', covered_end, fix.from_time, fix.lane,
+                                    detail=f"no lane before {fix.lane}"))
+        covered_end = max(covered_end, fix.to_time)
+
+    # Overlapping lane periods (Ignore excluded)
+    previous = None
+    for fix in fixes:
+        if fix.ignore:
+            continue
+        if previous is not None and (previous.to_time - fix.from_time).total_seconds() > OVERLAP_TOLERANCE_S:
+            issues.append(LaneIssue(fileid, 'overlap', fix.from_time, min(previous.to_time, fix.to_time),
+                                    f"{previous.lane}/{fix.lane}",
+                                    detail=f"{previous.lane} until {_format_time(previous.to_time)}"))
+        if previous is None or fix.to_time > previous.to_time:
+            previous = fix
+
+    # Survey time not covered before the first or after the last lane fix
+    if range_start is not None and (fixes[0].from_time - range_start).total_seconds() > gap_tolerance_s:
+        issues.append(LaneIssue(fileid, 'unassigned', range_start, fixes[0].from_time,
+                                detail="before the first lane fix"))
+    if range_end is not None and (range_end - covered_end).total_seconds() > gap_tolerance_s:
+        issues.append(LaneIssue(fileid, 'unassigned', covered_end, range_end, detail="after the last lane fix"))
+    return issues
+
+
+def check_fileid_lanes(folder: FileIDFolder, gap_tolerance_s: float = DEFAULT_GAP_TOLERANCE_S) -> Dict:
+    """
+    Load one FileID's lane fixes with its time bounds and collect all issues
+    (top level so a process pool can run it; returns the app.cli report shape plus 'issues')
+    """
+    report = {'fileid': folder.fileid, 'errors': [], 'warnings': [], 'counts': {}, 'issues': []}
+    try:
+        # read-only report: never create <FileID>_lane_fixes.csv in the survey
+        lane_manager = DataLoader().load_lane_manager(folder, create_missing=False)
+    except Exception as e:
+        report['errors'].append(f"failed to load lane fixes: {e}")
+        return report
+
+    if lane_manager.first_image_timestamp and lane_manager.last_image_timestamp:
+        survey_range = (lane_manager.first_image_timestamp, lane_manager.last_image_timestamp)
+    else:
+        survey_range = (lane_manager.gps_min_timestamp, lane_manager.gps_max_timestamp)
+
+    issues = rejected_row_issues(folder.fileid, lane_manager.last_load_report)
+    issues.extend(find_lane_issues(folder.fileid, lane_manager.lane_fixes, survey_range, gap_tolerance_s))
+    report['issues'] = issues
+    report['counts']['lane_fixes'] = len(lane_manager.lane_fixes)
+    for issue in issues:
+        report['counts'][issue.kind] = report['counts'].get(issue.kind, 0) + 1
+
+    # One summary line per FileID; the details go to the report file
+    for severity, kinds in (('errors', ERROR_KINDS), ('warnings', WARNING_KINDS)):
+        found = {kind: report['counts'][kind] for kind in kinds if kind in report['counts']}
+        if found:
+            report[severity].append(", ".join(f"{count} {kind}" for kind, count in found.items()))
+    return report
+
+
+def sort_issues(issues: List[LaneIssue]) -> List[LaneIssue]:
+    """FileID, then time (issues without a time last), then kind"""
+    return sorted(issues, key=lambda issue: (issue.fileid, issue.start is None, _format_time(issue.start), issue.kind))
+
+
+def write_report_csv(issues: List[LaneIssue], path: str) -> bool:
+    try:
+        with atomic_write(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(REPORT_COLUMNS)
+            for issue in sort_issues(issues):
+                writer.writerow(issue.to_row())
+        return True
+    except Exception as e:
+        logging.error(f"Failed to write lane fix report {path}: {e}")
+        return False
+
+
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ font-family: Segoe UI, Arial, sans-serif; font-size: 13px; margin: 16px; }}
+table {{ border-collapse: collapse; }}
+th, td {{ border: 1px solid #ccc; padding: 3px 8px; text-align: left; white-space: nowrap; }}
+th {{ background: #eee; cursor: pointer; position: sticky; top: 0; }}
+tr.error td:nth-child(2) {{ color: #b00020; font-weight: bold; }}
+tr.warning td:nth-child(2) {{ color: #a06000; }}
+td.detail {{ white-space: normal; }}
+</style></head>
+<body>
+<h2>{title}</h2>
+<p>{summary}</p>
+<p>Click a column header to sort.</p>
+<table id="issues"><thead><tr>{header}</tr></thead>
+<tbody>
+{rows}
+</tbody></table>
+<script>
+document.querySelectorAll('#issues th').forEach(function (th, column) {{
+  th.addEventListener('click', function () {{
+    var body = document.querySelector('#issues tbody');
+    var ascending = th.dataset.order !== 'asc';
+    th.dataset.order = ascending ? 'asc' : 'desc';
+    var rows = Array.prototype.slice.call(body.rows);
+    var numeric = th.dataset.type === 'number';
+    rows.sort(function (a, b) {{
+      var x = a.cells[column].textContent, y = b.cells[column].textContent;
+      var result = numeric ? (parseFloat(x) || 0) - (parseFloat(y) || 0) : x.localeCompare(y);
+      return ascending ? result : -result;
+    }});
+    rows.forEach(function (row) {{ body.appendChild(row); }});
+  }});
+}});
+</script>
+</body></html>
+"""
+
+
+def write_report_html(issues: List[LaneIssue], path: str, title: str = "Lane fix report") -> bool:
+    """Self-contained HTML table (click a header to sort)"""
+    errors = sum(1 for issue in issues if issue.severity == 'error')
+    fileids = len({issue.fileid for issue in issues})
+    summary = f"{len(issues)} issue(s) in {fileids} FileID(s): {errors} error(s), {len(issues) - errors} warning(s)"
+    header = ''.join(f"<th data-type=\"{'number' if name in NUMERIC_COLUMNS else 'text'}\">{name}</th>"
+                     for name in REPORT_COLUMNS)
+    rows = []
+    for issue in sort_issues(issues):
+        cells = [f"<td>{html.escape(value)}</td>" for value in issue.to_row()]
+        cells[-1] = f"<td class=\"detail\">{html.escape(issue.detail)}</td>"
+        rows.append(f"<tr class=\"{issue.severity}\">{''.join(cells)}</tr>")
+    document = _HTML_TEMPLATE.format(title=html.escape(title), summary=html.escape(summary),
+                                     header=header, rows="\n".join(rows))
+    try:
+        with atomic_write(path, 'w', encoding='utf-8') as f:
+            f.write(document)
+        return True
+    except Exception as e:
+        logging.error(f"Failed to write lane fix report {path}: {e}")
+        return False
+
+
+def write_report(issues: List[LaneIssue], path: str, title: str = "Lane fix report") -> bool:
+    """CSV or HTML by file extension (.html / .htm)"""
+    if os.path.splitext(path)[1].lower() in ('.html', '.htm'):
+        return write_report_html(issues, path, title)
+    return write_report_csv(issues, path)
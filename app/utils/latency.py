@@ -0,0 +1,176 @@
+"""
+Latency histograms for GeoEvent application
+Fixed-memory, HDR-style log-bucketed histograms with percentiles per named operation
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# Values are recorded in whole microseconds. Each power-of-two range is split into
+# 2**SUB_BUCKET_BITS linear sub-buckets, so any recorded value is reported within
+# 1 / 2**SUB_BUCKET_BITS (about 3%) of its true value.
+SUB_BUCKET_BITS = 5
+MAX_VALUE_US = 1 << 36  # ~19 hours; longer values are clamped
+
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_MAX_SHIFT = MAX_VALUE_US.bit_length() - (SUB_BUCKET_BITS + 1)
+BUCKET_COUNT = _SUB_BUCKETS * (_MAX_SHIFT + 2)
+
+
+def _bucket_index(value_us: int) -> int:
+    if value_us < 2 * _SUB_BUCKETS:
+        return value_us
+    shift = value_us.bit_length() - (SUB_BUCKET_BITS + 1)
+    return _SUB_BUCKETS * (shift + 1) + (value_us >> shift) - _SUB_BUCKETS
+
+
+def _bucket_upper_us(index: int) -> int:
+    """Highest value that falls into bucket index"""
+    if index < 2 * _SUB_BUCKETS:
+        return index
+    shift = index // _SUB_BUCKETS - 1
+    sub = index % _SUB_BUCKETS + _SUB_BUCKETS
+    return ((sub + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    Latency histogram for one operation
+    Memory is fixed (BUCKET_COUNT counters) however many values are recorded.
+    Thread-safe: operations are recorded from worker threads as well as the GUI thread.
+    """
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self._lock = threading.Lock()
+        self._counts: List[int] = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_us = 0
+        self.min_us = 0
+        self.max_us = 0
+
+    def record(self, seconds: float):
+        """Record one duration in seconds"""
+        value_us = min(max(int(seconds * 1e6), 0), MAX_VALUE_US - 1)
+        index = _bucket_index(value_us)
+        with self._lock:
+            self._counts[index] += 1
+            if not self.count or value_us < self.min_us:
+                self.min_us = value_us
+            if value_us > self.max_us:
+                self.max_us = value_us
+            self.count += 1
+            self.total_us += value_us
+
+    def merge(self, other: 'LatencyHistogram'):
+        """Add another histogram's recordings to this one"""
+        with other._lock:
+            counts = list(other._counts)
+            count, total, low, high = other.count, other.total_us, other.min_us, other.max_us
+        if not count:
+            return
+        with self._lock:
+            self._counts = [a + b for a, b in zip(self._counts, counts)]
+            self.min_us = low if not self.count else min(self.min_us, low)
+            self.max_us = max(self.max_us, high)
+            self.count += count
+            self.total_us += total
+
+    def reset(self):
+        """Drop all recordings"""
+        with self._lock:
+            self._counts = [0] * BUCKET_COUNT
+            self.count = self.total_us = self.min_us = self.max_us = 0
+
+    def percentile(self, percent: float) -> float:
+        """Value in seconds at or below which percent of recordings fall (0 if empty)"""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, -(-self.count * percent // 100))  # ceil
+            seen = 0
+            for index, bucket_count in enumerate(self._counts):
+                seen += bucket_count
+                if seen >= rank:
+                    value_us = min(_bucket_upper_us(index), self.max_us)
+                    return max(value_us, self.min_us) / 1e6
+            return self.max_us / 1e6
+
+    def mean(self) -> float:
+        """Mean in seconds (0 if empty)"""
+        with self._lock:
+            return self.total_us / self.count / 1e6 if self.count else 0.0
+
+    def summary(self) -> Dict:
+        """count, mean and p50/p95/p99/max in milliseconds"""
+        return {
+            'count': self.count,
+            'mean_ms': round(self.mean() * 1000, 3),
+            'p50_ms': round(self.percentile(50) * 1000, 3),
+            'p95_ms': round(self.percentile(95) * 1000, 3),
+            'p99_ms': round(self.percentile(99) * 1000, 3),
+            'max_ms': round(self.max_us / 1000, 3),
+        }
+
+
+class LatencyRegistry:
+    """Named latency histograms for the running process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        """Histogram for name, created on first use"""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram(name)
+            return histogram
+
+    def record(self, name: str, seconds: float):
+        self.histogram(name).record(seconds)
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return sorted(self._histograms)
+
+    def summaries(self) -> Dict[str, Dict]:
+        """Summary per operation that has recordings"""
+        summaries = {}
+        for name in self.names():
+            histogram = self.histogram(name)
+            if histogram.count:
+                summaries[name] = histogram.summary()
+        return summaries
+
+    def reset(self):
+        with self._lock:
+            histograms = list(self._histograms.values())
+        for histogram in histograms:
+            histogram.reset()
+
+
+_registry = LatencyRegistry()
+
+
+def get_latency_registry() -> LatencyRegistry:
+    """Process-wide latency registry (summarized per session by MetricsTracker)"""
+    return _registry
+
+
+def record_latency(name: str, seconds: float, registry: Optional[LatencyRegistry] = None):
+    """Record a duration for a named operation"""
+    (registry or _registry).record(name, seconds)
+
+
+@contextmanager
+def measure_latency(name: str, registry: Optional[LatencyRegistry] = None) -> Iterator[None]:
+    """Time the enclosed block and record it under name (also when it raises)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        (registry or _registry).record(name, time.perf_counter() - start)
@@ -10,6 +10,7 @@ from pathlib import Path
 import json
 
 from app.utils.resource_path import get_app_base_dir
+from app.utils.latency import get_latency_registry, record_latency
 
 
 @dataclass
@@ -45,6 +46,9 @@ class MetricsSession:
     # Performance metrics
     avg_image_load_time: float = 0.0
     avg_fileid_load_time: float = 0.0
+
+    # Latency summaries per operation: {name: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}}
+    latency: Dict[str, Dict] = field(default_factory=dict)
     
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization"""
@@ -66,7 +70,8 @@ class MetricsSession:
             "autoplay_sessions": self.autoplay_sessions,
             "autoplay_duration": str(self.autoplay_duration),
             "avg_image_load_time": self.avg_image_load_time,
-            "avg_fileid_load_time": self.avg_fileid_load_time
+            "avg_fileid_load_time": self.avg_fileid_load_time,
+            "latency": self.latency
         }
     
     @staticmethod
@@ -103,6 +108,7 @@ class MetricsSession:
         
         session.avg_image_load_time = data.get("avg_image_load_time", 0.0)
         session.avg_fileid_load_time = data.get("avg_fileid_load_time", 0.0)
+        session.latency = data.get("latency", {})
         
         return session
 
@@ -113,7 +119,7 @@ class MetricsTracker:
     
     RESPONSIBILITIES:
     - Track user interactions (navigation, edits, etc.)
-    - Monitor performance metrics (load times)
+    - Monitor performance metrics (latency histograms per operation: p50/p95/p99/max)
     - Persist metrics to disk
     - Generate usage reports
     """
@@ -129,9 +135,8 @@ class MetricsTracker:
         self.current_session: Optional[MetricsSession] = None
         self.sessions: List[MetricsSession] = []
         
-        # Performance tracking
-        self._image_load_times: List[float] = []
-        self._fileid_load_times: List[float] = []
+        # Performance tracking (fixed-memory histograms, shared with worker threads)
+        self.latency = get_latency_registry()
         self._autoplay_start: Optional[datetime] = None
         
         self._load_metrics()
@@ -144,6 +149,7 @@ class MetricsTracker:
             session_id=session_id,
             start_time=datetime.now()
         )
+        self.latency.reset()
         logging.info(f"MetricsTracker: Started session {session_id}")
     
     def end_session(self):
@@ -151,12 +157,10 @@ class MetricsTracker:
         if self.current_session:
             self.current_session.end_time = datetime.now()
             
-            # Calculate averages
-            if self._image_load_times:
-                self.current_session.avg_image_load_time = sum(self._image_load_times) / len(self._image_load_times)
-            
-            if self._fileid_load_times:
-                self.current_session.avg_fileid_load_time = sum(self._fileid_load_times) / len(self._fileid_load_times)
+            # Summarize latencies
+            self.current_session.avg_image_load_time = self.latency.histogram('image_decode').mean()
+            self.current_session.avg_fileid_load_time = self.latency.histogram('fileid_load').mean()
+            self.current_session.latency = self.latency.summaries()
             
             # Add to sessions list
             self.sessions.append(self.current_session)
@@ -229,7 +233,7 @@ class MetricsTracker:
         """
         if self.current_session:
             self.current_session.fileid_loads += 1
-            self._fileid_load_times.append(load_time)
+        record_latency('fileid_load', load_time)
     
     def track_fileid_save(self):
         """Track FileID save operation"""
@@ -260,7 +264,11 @@ class MetricsTracker:
         Args:
             load_time: Load time in seconds
         """
-        self._image_load_times.append(load_time)
+        record_latency('image_decode', load_time)
+
+    def get_latency_summary(self) -> Dict[str, Dict]:
+        """Latency summary per operation for the current session (milliseconds)"""
+        return self.latency.summaries()
     
     # Persistence
     
@@ -0,0 +1,38 @@
+"""
+__slots__ support for dataclasses (Python 3.9 has no dataclass(slots=True))
+"""
+
+from dataclasses import fields
+from typing import Any, Iterator
+
+
+def add_slots(*extra_slots: str):
+    """
+    Class decorator, applied above @dataclass: rebuild the class with __slots__
+    for its fields plus extra_slots (e.g. per-object caches), so instances
+    carry no per-instance __dict__.
+    """
+    def wrap(cls):
+        field_names = tuple(f.name for f in fields(cls))
+        cls_dict = dict(cls.__dict__)
+        cls_dict['__slots__'] = field_names + tuple(extra_slots)
+        for name in field_names:
+            # Field defaults live in the generated __init__; class attributes would shadow the slots
+            cls_dict.pop(name, None)
+        cls_dict.pop('__dict__', None)
+        cls_dict.pop('__weakref__', None)
+        slotted = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+        slotted.__qualname__ = cls.__qualname__
+        return slotted
+    return wrap
+
+
+def instance_values(obj: Any) -> Iterator[Any]:
+    """Attribute values held by an instance, whether it uses __dict__ or __slots__"""
+    attrs = getattr(obj, '__dict__', None)
+    if attrs is not None:
+        yield from attrs.values()
+    for klass in type(obj).__mro__:
+        for name in klass.__dict__.get('__slots__', ()):
+            if hasattr(obj, name):
+                yield getattr(obj, name)
@@ -1,15 +1,14 @@
 """
 Enhanced Image Cache Manager for GeoEvent application
-Implements LRU cache with size limits and memory monitoring
+Implements LRU cache with size limits (memory pressure is handled by the MemoryGovernor)
 """
 
 import os
 import logging
-import psutil
 from collections import OrderedDict
 from typing import Dict, Optional, Tuple
 from PyQt6.QtGui import QPixmap, QImage
-from PyQt6.QtCore import QObject, pyqtSignal, QTimer
+from PyQt6.QtCore import QObject, pyqtSignal
 
 from app.config import get_config
 
@@ -34,13 +33,13 @@ class ImageCacheEntry:
 
 class SmartImageCache(QObject):
     """
-    Smart LRU image cache with size limits and memory monitoring
+    Smart LRU image cache with size limits
+    Registered with the MemoryGovernor, which calls release() under memory pressure
     """
 
     cache_cleared = pyqtSignal(int)  # emitted when cache is cleared (bytes freed)
-    memory_warning = pyqtSignal(int)  # emitted when memory usage is high
 
-    def __init__(self, max_cache_size_mb: int = None, memory_threshold_percent: int = None):
+    def __init__(self, max_cache_size_mb: int = None):
         super().__init__()
         # Load configuration
         config = get_config()
@@ -48,11 +47,8 @@ class SmartImageCache(QObject):
         # Use provided values or defaults from config
         if max_cache_size_mb is None:
             max_cache_size_mb = config.cache.DEFAULT_SIZE_MB
-        if memory_threshold_percent is None:
-            memory_threshold_percent = config.memory.WARNING_THRESHOLD_PERCENT
         
         self.max_cache_size_bytes = max_cache_size_mb * 1024 * 1024
-        self.memory_threshold_percent = memory_threshold_percent
         self.preload_batch_size = config.cache.PRELOAD_BATCH_SIZE
 
         # LRU cache: OrderedDict with key=image_path, value=ImageCacheEntry
@@ -63,11 +59,6 @@ class SmartImageCache(QObject):
         self.hits = 0
         self.misses = 0
 
-        # Memory monitoring timer
-        self.monitor_timer = QTimer()
-        self.monitor_timer.timeout.connect(self._check_memory_usage)
-        self.monitor_timer.start(30000)  # Check every 30 seconds
-
         logging.info(f"SmartImageCache initialized with {max_cache_size_mb}MB limit")
 
     def get(self, image_path: str) -> Optional[QPixmap]:
@@ -174,32 +165,15 @@ class SmartImageCache(QObject):
             
             logging.debug(f"Evicted {os.path.basename(path)} from cache")
 
-    def _check_memory_usage(self):
-        """Check system memory usage and emit warnings"""
-        try:
-            memory = psutil.virtual_memory()
-            usage_percent = memory.percent
-
-            if usage_percent > self.memory_threshold_percent:
-                self.memory_warning.emit(int(usage_percent))
-                # Aggressive cleanup when memory is high
-                self._emergency_cleanup()
-
-        except Exception as e:
-            logging.error(f"Memory check failed: {e}")
-
-    def _emergency_cleanup(self):
-        """Emergency cleanup when memory is critically low"""
-        # Clear 50% of cache by removing oldest entries
-        target_entries = len(self.cache) // 2
+    def release(self, nbytes: int) -> int:
+        """Evict least recently used entries until nbytes are freed (MemoryGovernor callback)"""
         bytes_freed = 0
-
-        for _ in range(target_entries):
-            if not self.cache:
-                break
+        removed = 0
+        while bytes_freed < nbytes and self.cache:
             path, entry = self.cache.popitem(last=False)
             bytes_freed += entry.memory_size
-            
+            removed += 1
+
             # Explicitly delete pixmap to prevent memory leak
             if hasattr(entry.pixmap, 'detach'):
                 entry.pixmap.detach()
@@ -207,7 +181,9 @@ class SmartImageCache(QObject):
             del entry
 
         self.total_memory_used -= bytes_freed
-        logging.warning(f"Emergency cleanup: removed {target_entries} entries, freed {bytes_freed / (1024*1024):.1f}MB")
+        if removed:
+            logging.info(f"Image cache released {removed} entries, freed {bytes_freed / (1024*1024):.1f}MB")
+        return bytes_freed
 
     def _get_current_time(self) -> float:
         """Get current time for cache timing"""
@@ -0,0 +1,75 @@
+"""
+Time axis helpers for GeoEvent timeline
+Float epoch-seconds conversions with per-object caching
+"""
+
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Any, List, Optional
+
+import numpy as np
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def to_epoch_seconds(dt: Optional[datetime]) -> Optional[float]:
+    """Convert a datetime to float epoch seconds; naive values are treated as UTC"""
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH).total_seconds()
+
+
+def from_epoch_seconds(ts: float, tz: Optional[tzinfo] = None) -> datetime:
+    """Convert float epoch seconds back to an aware datetime (UTC unless tz given)"""
+    dt = _EPOCH + timedelta(seconds=ts)
+    if tz is not None and tz is not timezone.utc:
+        dt = dt.astimezone(tz)
+    return dt
+
+
+def datetimes_from_epoch_us(values) -> List[datetime]:
+    """Aware UTC datetimes from int64 epoch microseconds (bulk conversion in numpy)"""
+    naive = np.asarray(values, dtype=np.int64).astype('datetime64[us]').tolist()
+    utc = timezone.utc
+    return [value.replace(tzinfo=utc) for value in naive]
+
+
+def cached_epoch_seconds(obj: Any, attr: str) -> Optional[float]:
+    """
+    Epoch seconds of obj.<attr>, cached on the object as a bare float
+    in its '_epoch_<attr>' slot. Records declare the attribute with
+    @epoch_cached so assigning it (drag edits, lane splits) clears the cache.
+    """
+    cache_name = '_epoch_' + attr
+    ts = getattr(obj, cache_name, None)
+    if ts is None:
+        ts = to_epoch_seconds(getattr(obj, attr))
+        setattr(obj, cache_name, ts)
+    return ts
+
+
+def epoch_cached(*attrs: str):
+    """
+    Class decorator, applied above @add_slots (which must declare the
+    '_epoch_<attr>' slots): assigning one of attrs clears its cached epoch
+    seconds. Reads still go straight to the slot; only assignment runs Python.
+    """
+    def wrap(cls):
+        for attr in attrs:
+            value_slot = cls.__dict__[attr]
+            set_value = value_slot.__set__
+            clear_cache = cls.__dict__['_epoch_' + attr].__set__
+
+            def set_and_invalidate(obj, value, set_value=set_value, clear_cache=clear_cache):
+                set_value(obj, value)
+                clear_cache(obj, None)
+
+            setattr(cls, attr, property(value_slot.__get__, set_and_invalidate))
+        return cls
+    return wrap
+
+
+def seed_epoch_seconds(obj: Any, attr: str, ts: float):
+    """Pre-fill the cached_epoch_seconds cache when the caller already knows the value"""
+    setattr(obj, '_epoch_' + attr, ts)
@@ -0,0 +1,199 @@
+"""
+Span tracing for GeoEvent application
+Thread-aware spans written as Chrome trace-event JSON (open in Perfetto or chrome://tracing)
+
+Enable with the GEOEVENT_TRACE environment variable ("1" for the default
+trace folder, or a file path), or at runtime with start_tracing().
+While disabled, trace_span/traced cost one flag check.
+"""
+
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .atomic_file import atomic_write
+
+TRACE_ENV_VAR = 'GEOEVENT_TRACE'
+MAX_TRACE_EVENTS = 500000  # oldest events are dropped beyond this
+
+
+class Tracer:
+    """
+    Collects trace events in memory
+    RESPONSIBILITIES:
+    - Record complete ("X") spans with the recording thread's id and name
+    - Record async ("b"/"e") spans that begin and end on different threads
+    - Write the buffer as Chrome trace-event JSON
+    """
+
+    def __init__(self, max_events: int = MAX_TRACE_EVENTS):
+        self.enabled = False
+        self.output_path: Optional[str] = None
+        self._events: deque = deque(maxlen=max_events)
+        self._thread_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._origin_ns = time.perf_counter_ns()
+        self._pid = os.getpid()
+
+    def start(self, output_path: Optional[str] = None):
+        """Clear the buffer and start recording"""
+        with self._lock:
+            self._events.clear()
+            self._thread_names.clear()
+            self._origin_ns = time.perf_counter_ns()
+            self.output_path = output_path
+            self.enabled = True
+        logging.info(f"Tracer: Recording spans (output: {output_path or 'default trace folder'})")
+
+    def stop(self) -> Optional[str]:
+        """Stop recording and write the trace; returns the file written (None if nothing was recorded)"""
+        if not self.enabled:
+            return None
+        self.enabled = False
+        return self.write(self.output_path)
+
+    def now_us(self) -> float:
+        return (time.perf_counter_ns() - self._origin_ns) / 1000
+
+    def add(self, event: Dict[str, Any]):
+        thread = threading.current_thread()
+        event['pid'] = self._pid
+        event['tid'] = thread.ident
+        if thread.ident not in self._thread_names:
+            with self._lock:
+                self._thread_names[thread.ident] = _thread_label(thread)
+        self._events.append(event)
+
+    def complete(self, name: str, start_us: float, category: str, args: Optional[Dict]):
+        event = {'name': name, 'cat': category, 'ph': 'X', 'ts': start_us, 'dur': self.now_us() - start_us}
+        if args:
+            event['args'] = args
+        self.add(event)
+
+    def write(self, path: Optional[str] = None) -> Optional[str]:
+        """Write the buffered events as Chrome trace-event JSON"""
+        with self._lock:
+            events = list(self._events)
+            thread_names = dict(self._thread_names)
+        if not events:
+            logging.info("Tracer: No spans recorded; trace not written")
+            return None
+
+        if not path:
+            trace_dir = os.path.join(os.path.expanduser("~/.geoevent"), "traces")
+            path = os.path.join(trace_dir, f"trace-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        metadata = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': tid, 'args': {'name': name}}
+            for tid, name in thread_names.items()
+        ]
+        metadata.append({'name': 'process_name', 'ph': 'M', 'pid': self._pid, 'tid': 0,
+                         'args': {'name': 'GeoEvent'}})
+        try:
+            with atomic_write(path, 'w', encoding='utf-8') as f:
+                json.dump({'traceEvents': metadata + events, 'displayTimeUnit': 'ms'}, f, default=str)
+        except OSError as e:
+            logging.error(f"Tracer: Failed to write trace {path}: {e}")
+            return None
+        logging.info(f"Tracer: Wrote {len(events)} trace events to {path}")
+        return path
+
+
+def _thread_label(thread: threading.Thread) -> str:
+    """Thread name for the trace; QThreads show up as the QThread subclass (SaveService, FileIDLoadWorker...)"""
+    qt_core = sys.modules.get('PyQt6.QtCore')  # never import Qt just for tracing
+    if qt_core is not None and isinstance(thread, threading._DummyThread):
+        return type(qt_core.QThread.currentThread()).__name__
+    return thread.name
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer"""
+    return _tracer
+
+
+def tracing_enabled() -> bool:
+    return _tracer.enabled
+
+
+def start_tracing(output_path: Optional[str] = None):
+    """Start recording spans (output_path None = timestamped file in ~/.geoevent/traces)"""
+    _tracer.start(output_path)
+
+
+def stop_tracing() -> Optional[str]:
+    """Stop recording and write the trace; returns its path"""
+    return _tracer.stop()
+
+
+def start_tracing_from_env() -> bool:
+    """Start tracing if GEOEVENT_TRACE is set ("1"/"true" or an output path)"""
+    value = os.environ.get(TRACE_ENV_VAR, '').strip()
+    if not value or value.lower() in ('0', 'false', 'no', 'off'):
+        return False
+    start_tracing(None if value.lower() in ('1', 'true', 'yes', 'on') else value)
+    return True
+
+
+@contextmanager
+def trace_span(name: str, category: str = 'app', **args) -> Iterator[None]:
+    """Record the enclosed block as a span on the current thread"""
+    if not _tracer.enabled:
+        yield
+        return
+    start_us = _tracer.now_us()
+    try:
+        yield
+    finally:
+        if _tracer.enabled:
+            _tracer.complete(name, start_us, category, args)
+
+
+def traced(name: Optional[str] = None, category: str = 'app') -> Callable:
+    """Decorator: record each call of the function as a span (default name: its qualified name)"""
+    def decorate(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _tracer.enabled:
+                return func(*args, **kwargs)
+            start_us = _tracer.now_us()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if _tracer.enabled:
+                    _tracer.complete(span_name, start_us, category, None)
+        return wrapper
+    return decorate
+
+
+def trace_async_begin(name: str, span_id: Any, category: str = 'app', **args):
+    """Begin a span that may end on another thread (e.g. a whole FileID switch)"""
+    if _tracer.enabled:
+        event = {'name': name, 'cat': category, 'ph': 'b', 'id': str(span_id), 'ts': _tracer.now_us()}
+        if args:
+            event['args'] = args
+        _tracer.add(event)
+
+
+def trace_async_end(name: str, span_id: Any, category: str = 'app', **args):
+    """End a span started with trace_async_begin"""
+    if _tracer.enabled:
+        event = {'name': name, 'cat': category, 'ph': 'e', 'id': str(span_id), 'ts': _tracer.now_us()}
+        if args:
+            event['args'] = args
+        _tracer.add(event)
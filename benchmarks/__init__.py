@@ -0,0 +1,3 @@
+"""
+Benchmark suite for GeoEvent (runs headless: no display or GUI needed)
+"""
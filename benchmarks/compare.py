@@ -0,0 +1,115 @@
+"""
+Compare two benchmark runs and flag regressions
+Exits 1 when any benchmark regressed (or failed), so it can gate executable releases.
+
+Usage:
+    python -m benchmarks.compare                          # previous vs latest run on this machine
+    python -m benchmarks.compare 7a0353e latest --threshold 15
+    python -m benchmarks.compare baseline.json candidate.json
+    python -m benchmarks.compare --list
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.results_store import (DEFAULT_STORE_PATH, Comparison, ResultsStore, compare_results,
+                                      has_regression, run_key)
+from benchmarks.run_benchmarks import SUITE_NAME, machine_fingerprint
+
+STATUS_LABELS = {
+    'ok': 'ok',
+    'regression': 'REGRESSION',
+    'improvement': 'faster',
+    'noise': 'noise',
+    'failed': 'FAILED',
+    'missing': 'missing',
+}
+
+
+def resolve_run(ref: str, store: ResultsStore, fingerprint: Optional[str], suite: str) -> Optional[Dict]:
+    """A results JSON file path, or a store reference ('latest', 'previous', commit prefix)"""
+    if os.path.isfile(ref):
+        with open(ref, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return store.find(ref, fingerprint, suite)
+
+
+def format_comparison(comparisons: List[Comparison], threshold: float) -> str:
+    lines = [f"{'Benchmark':<18} {'Base ms':>10} {'Cand ms':>10} {'Change':>9} {'Noise ms':>9}  Status",
+             "-" * 70]
+    for c in comparisons:
+        base = f"{c.baseline_ms:.2f}" if c.baseline_ms is not None else "-"
+        cand = f"{c.candidate_ms:.2f}" if c.candidate_ms is not None else "-"
+        change = f"{c.change * 100:+.1f}%" if c.change is not None else "-"
+        lines.append(f"{c.name:<18} {base:>10} {cand:>10} {change:>9} {c.noise_ms:>9.2f}  {STATUS_LABELS[c.status]}")
+    regressions = [c.name for c in comparisons if c.status in ('regression', 'failed')]
+    lines.append("")
+    lines.append(f"{len(regressions)} regression(s) past {threshold * 100:.0f}%"
+                 + (f": {', '.join(regressions)}" if regressions else ""))
+    return "\n".join(lines)
+
+
+def _warn_if_incomparable(baseline: Dict, candidate: Dict):
+    base_env, cand_env = baseline.get('environment', {}), candidate.get('environment', {})
+    if base_env.get('fingerprint') != cand_env.get('fingerprint'):
+        print("Warning: runs come from different machines; timings may not be comparable", file=sys.stderr)
+    if baseline.get('spec') != candidate.get('spec'):
+        print("Warning: runs used different survey specs", file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare GeoEvent benchmark runs")
+    parser.add_argument('baseline', nargs='?', default='previous',
+                        help="Results file, commit prefix, 'latest' or 'previous' (default: previous)")
+    parser.add_argument('candidate', nargs='?', default='latest',
+                        help="Results file, commit prefix, 'latest' or 'previous' (default: latest)")
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help=f"Results store (default: {DEFAULT_STORE_PATH})")
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help="Median slowdown in percent that counts as a regression (default: 10)")
+    parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                        help="Ignore slowdowns smaller than this many ms (default: 1)")
+    parser.add_argument('--any-machine', action='store_true',
+                        help="Resolve store references across machines (default: this machine only)")
+    parser.add_argument('--suite', default=SUITE_NAME,
+                        help=f"Suite of the stored runs to compare (default: {SUITE_NAME}; GUI runs: geoevent-gui)")
+    parser.add_argument('--list', action='store_true', help="List stored runs and exit")
+    parser.add_argument('--json', action='store_true', help="Print the comparison as JSON")
+    args = parser.parse_args(argv)
+
+    store = ResultsStore(args.store)
+    fingerprint = None if args.any_machine else machine_fingerprint()
+
+    if args.list:
+        for run in store.runs(fingerprint, args.suite):
+            print(f"{run_key(run):<32} {run.get('created', '')}")
+        return 0
+
+    baseline = resolve_run(args.baseline, store, fingerprint, args.suite)
+    candidate = resolve_run(args.candidate, store, fingerprint, args.suite)
+    for ref, run in ((args.baseline, baseline), (args.candidate, candidate)):
+        if run is None:
+            print(f"No benchmark run found for '{ref}' in {args.store}", file=sys.stderr)
+            return 2
+
+    _warn_if_incomparable(baseline, candidate)
+    threshold = args.threshold / 100
+    comparisons = compare_results(baseline, candidate, threshold, args.min_delta_ms)
+
+    if args.json:
+        print(json.dumps({'baseline': run_key(baseline), 'candidate': run_key(candidate),
+                          'threshold': threshold, 'regression': has_regression(comparisons),
+                          'comparisons': [c.to_dict() for c in comparisons]}, indent=2))
+    else:
+        print(f"Baseline:  {run_key(baseline)}\nCandidate: {run_key(candidate)}\n")
+        print(format_comparison(comparisons, threshold))
+    return 1 if has_regression(comparisons) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
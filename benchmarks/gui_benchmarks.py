@@ -0,0 +1,350 @@
+"""
+Offscreen GUI benchmarks for GeoEvent
+Runs MainWindow under QT_QPA_PLATFORM=offscreen against a synthetic survey, replays
+scripted interactions (next/prev bursts, playback at each speed, marker drags across
+dense event regions, zoom sweeps) and reports frame times and dropped frames per scenario.
+
+Usage:
+    python -m benchmarks.gui_benchmarks
+    python -m benchmarks.gui_benchmarks --events 800 --images 1000 --json gui.json
+    python -m benchmarks.gui_benchmarks --only marker_drag,zoom_sweep --store
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PyQt6.QtCore import QEvent, QPointF, Qt
+from PyQt6.QtGui import QMouseEvent
+from PyQt6.QtWidgets import QApplication
+
+from app.utils.latency import LatencyHistogram, get_latency_registry
+
+from benchmarks.results_store import DEFAULT_STORE_PATH, ResultsStore, iqr
+from benchmarks.run_benchmarks import environment_info
+from benchmarks.survey_generator import SurveySpec, generate_survey
+
+SUITE_NAME = "geoevent-gui"
+FRAME_MS = 1000 / 60  # display refresh budget for pointer and zoom interaction
+KEY_REPEAT_MS = 1000 / 30  # typical held-key auto-repeat rate
+SETTLE_S = 0.3  # idle time between scenarios so deferred work does not leak into the next one
+REPORTED_OPERATIONS = ('timeline_paint', 'image_decode', 'timeline_sync.frame', 'timeline_sync.settle')
+
+
+@dataclass
+class FrameStats:
+    """Frame times of one scenario"""
+    name: str
+    budget_ms: float
+    frame_ms: List[float]
+    dropped: int
+    operations: Dict[str, Dict]
+
+    def to_dict(self) -> Dict:
+        histogram = LatencyHistogram(self.name)
+        for value in self.frame_ms:
+            histogram.record(value / 1000)
+        frames = len(self.frame_ms)
+        return {
+            'name': self.name,
+            'unit': 'frames',
+            'items': frames,
+            'budget_ms': round(self.budget_ms, 3),
+            'runs_ms': [round(value, 3) for value in self.frame_ms],
+            'median_ms': histogram.summary()['p50_ms'],
+            'iqr_ms': round(iqr(self.frame_ms), 3),
+            'frames': histogram.summary(),
+            'dropped_frames': self.dropped,
+            'dropped_pct': round(100 * self.dropped / (frames + self.dropped), 1) if frames else 0.0,
+            'operations': self.operations,
+        }
+
+
+class FrameClock:
+    """
+    Replays scripted steps on a fixed frame schedule
+    RESPONSIBILITIES:
+    - Run each step in its frame slot, processing events (timers, deferred work) while idle
+    - Time each step plus the repaint it triggers
+    - Count frame slots missed because a step (or deferred work before it) overran
+    """
+
+    def __init__(self, app: QApplication, interval_ms: float):
+        self.app = app
+        self.interval = interval_ms / 1000
+
+    def idle(self, seconds: float):
+        """Process events for a while without measuring"""
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            self.app.processEvents()
+            time.sleep(0.001)
+
+    def run(self, name: str, steps: Iterable[Callable[[], None]]) -> FrameStats:
+        frame_ms = []
+        dropped = 0
+        deadline = time.perf_counter()
+        for step in steps:
+            while time.perf_counter() < deadline:
+                self.app.processEvents()
+                time.sleep(0.0005)
+            start = time.perf_counter()
+            step()
+            self.app.processEvents()  # flush the repaint the step scheduled
+            end = time.perf_counter()
+            frame_ms.append((end - start) * 1000)
+
+            # The frame is due one interval after its slot; every whole interval beyond that is a dropped frame
+            missed = max(0, math.ceil((end - deadline) / self.interval) - 1)
+            dropped += missed
+            deadline += (missed + 1) * self.interval
+        return FrameStats(name, self.interval * 1000, frame_ms, dropped, {})
+
+
+# ---- scenarios --------------------------------------------------------------
+
+def _mouse(widget, kind: QEvent.Type, x: float, y: float, button=Qt.MouseButton.LeftButton):
+    buttons = Qt.MouseButton.NoButton if kind == QEvent.Type.MouseButtonRelease else Qt.MouseButton.LeftButton
+    local = QPointF(x, y)
+    event = QMouseEvent(kind, local, QPointF(widget.mapToGlobal(local)), button, buttons,
+                        Qt.KeyboardModifier.NoModifier)
+    QApplication.sendEvent(widget, event)
+
+
+def _reset_view(window, clock: FrameClock, index: int = 0):
+    """Untimed: stop playback, restore zoom and go to image index"""
+    tab = window.photo_tab
+    if tab.is_playing:
+        tab.toggle_playback()
+    tab.timeline.zoom_slider.setValue(100)
+    tab.navigate_to_image(index)
+    clock.idle(SETTLE_S)
+
+
+def scenario_next_burst(window, clock, count):
+    _reset_view(window, clock, 0)
+    return [window.photo_tab.next_image] * count
+
+
+def scenario_prev_burst(window, clock, count):
+    _reset_view(window, clock, len(window.photo_tab.image_paths) - 1)
+    return [window.photo_tab.prev_image] * count
+
+
+def _playback(radio_name: str):
+    def scenario(window, clock, count):
+        tab = window.photo_tab
+        _reset_view(window, clock, 0)
+        getattr(tab, radio_name).click()
+        tab.toggle_playback()
+        tab.playback_timer.stop()  # the frame clock drives the ticks at the selected interval
+        clock.interval = tab.playback_speed / 1000
+        return [tab.next_image] * count
+    return scenario
+
+
+def scenario_marker_drag(window, clock, count):
+    """Drag the position marker across the whole timeline (every event region) and back"""
+    tab = window.photo_tab
+    _reset_view(window, clock, 0)
+    timeline = tab.timeline
+    area = timeline.timeline_area
+    x0 = timeline.time_to_pixel(timeline.current_position, timeline.calculate_pixels_per_second(area.rect()))
+    _mouse(area, QEvent.Type.MouseButtonPress, x0, 10)
+    if not timeline.dragging_marker:
+        logging.warning("GUI benchmark: marker press did not start a drag")
+
+    width = area.width() - 1
+    half = max(count // 2, 1)
+    xs = [width * i / half for i in range(half + 1)] + [width * (half - i) / half for i in range(1, half + 1)]
+    return [(lambda x=x: _mouse(area, QEvent.Type.MouseMove, x, 10)) for x in xs[:count]] + \
+        [lambda: _mouse(area, QEvent.Type.MouseButtonRelease, xs[min(count, len(xs)) - 1], 10)]
+
+
+def scenario_zoom_sweep(window, clock, count):
+    """Zoom from the full range to 50x and back out, one slider step per frame"""
+    _reset_view(window, clock, len(window.photo_tab.image_paths) // 2)
+    slider = window.photo_tab.timeline.zoom_slider
+    half = max(count // 2, 1)
+    values = [int(100 * 50 ** (i / half)) for i in range(1, half + 1)]
+    values += list(reversed(values[:-1])) + [100]
+    return [(lambda v=v: slider.setValue(v)) for v in values[:count]]
+
+
+@dataclass
+class Scenario:
+    name: str
+    build: Callable  # (window, clock, count) -> steps; untimed setup happens here
+    interval_ms: float
+    description: str
+
+
+SCENARIOS = [
+    Scenario('next_burst', scenario_next_burst, KEY_REPEAT_MS, "Hold Next: image + timeline sync per key repeat"),
+    Scenario('prev_burst', scenario_prev_burst, KEY_REPEAT_MS, "Hold Previous from the last image"),
+    Scenario('playback_slow', _playback('slow_radio'), 0, "Slideshow ticks at Slow speed"),
+    Scenario('playback_normal', _playback('normal_radio'), 0, "Slideshow ticks at Normal speed"),
+    Scenario('playback_fast', _playback('fast_radio'), 0, "Slideshow ticks at Fast speed"),
+    Scenario('marker_drag', scenario_marker_drag, FRAME_MS, "Drag the position marker across all events"),
+    Scenario('zoom_sweep', scenario_zoom_sweep, FRAME_MS, "Zoom in to 50x and back out"),
+]
+
+
+# ---- runner -----------------------------------------------------------------
+
+def open_survey(root: str, width: int = 1600, height: int = 1000):
+    """Show a MainWindow with the first FileID of root loaded (waits for the background load)"""
+    from app.main_window import MainWindow
+
+    window = MainWindow()
+    window.resize(width, height)
+    window.show()
+    folders = window.fileid_manager.scan_parent_folder(root)
+    if not folders:
+        raise RuntimeError(f"No FileID folders found in {root}")
+    window.root_folder_path = root
+    window.load_fileid(folders[0])
+
+    app = QApplication.instance()
+    tab = window.photo_tab
+    deadline = time.perf_counter() + 60
+    while not (tab.image_paths and tab.timeline.view_start_time and tab.timeline.events):
+        if time.perf_counter() > deadline:
+            raise RuntimeError("Timed out waiting for the FileID to load")
+        app.processEvents()
+        time.sleep(0.005)
+    return window
+
+
+def close_window(window):
+    """Stop background services without the interactive close-time save dialog"""
+    if window.photo_tab.is_playing:
+        window.photo_tab.toggle_playback()
+    window.save_service.stop()
+    window.autosave_manager.stop()
+    window.memory_manager.stop()
+    window.fileid_preloader.stop()
+    window.photo_tab.stop_loading()
+    window.hide()
+    window.deleteLater()
+    QApplication.instance().processEvents()
+
+
+def run_scenarios(window, count: int = 60, only: Optional[List[str]] = None) -> List[FrameStats]:
+    """Replay the selected scenarios in order against an open window"""
+    app = QApplication.instance()
+    registry = get_latency_registry()
+    results = []
+    for scenario in SCENARIOS:
+        if only and scenario.name not in only:
+            continue
+        clock = FrameClock(app, scenario.interval_ms or FRAME_MS)
+        steps = scenario.build(window, clock, count)
+        registry.reset()
+        stats = clock.run(scenario.name, steps)
+        clock.idle(SETTLE_S)
+        summaries = registry.summaries()
+        stats.operations = {name: summaries[name] for name in REPORTED_OPERATIONS if name in summaries}
+        results.append(stats)
+    _reset_view(window, FrameClock(app, FRAME_MS))
+    return results
+
+
+def format_table(document: Dict) -> str:
+    lines = [f"{'Scenario':<16} {'Frames':>6} {'Budget':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+             f"{'Max ms':>8} {'Dropped':>12}",
+             "-" * 82]
+    for result in document['results']:
+        frames = result['frames']
+        dropped = f"{result['dropped_frames']} ({result['dropped_pct']:.0f}%)"
+        lines.append(f"{result['name']:<16} {result['items']:>6} {result['budget_ms']:>7.1f} {frames['p50_ms']:>8.2f} "
+                     f"{frames['p95_ms']:>8.2f} {frames['p99_ms']:>8.2f} {frames['max_ms']:>8.2f} {dropped:>12}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="GeoEvent offscreen GUI benchmarks")
+    parser.add_argument('--root', help="Survey root (generated here if missing; default: temp dir)")
+    parser.add_argument('--images', type=int, default=600, help="Cam1 images in the FileID")
+    parser.add_argument('--events', type=int, default=400, help="Span events in the FileID")
+    parser.add_argument('--gps-rows', type=int, default=6000)
+    parser.add_argument('--lane-fixes', type=int, default=60)
+    parser.add_argument('--image-size', default="1280x960", help="Generated JPEG size WxH")
+    parser.add_argument('--frames', type=int, default=60, help="Frames per scenario")
+    parser.add_argument('--only', help="Comma-separated scenario names")
+    parser.add_argument('--list', action='store_true', help="List scenarios and exit")
+    parser.add_argument('--json', metavar='PATH', help="Write results JSON to PATH ('-' for stdout)")
+    parser.add_argument('--store', nargs='?', const=DEFAULT_STORE_PATH, metavar='PATH',
+                        help=f"Add results to the results store (default: {DEFAULT_STORE_PATH})")
+    parser.add_argument('--verbose', action='store_true', help="Show application logging")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for scenario in SCENARIOS:
+            print(f"{scenario.name:<16} {scenario.description}")
+        return 0
+
+    only = [name.strip() for name in args.only.split(',')] if args.only else None
+    unknown = set(only or []) - {scenario.name for scenario in SCENARIOS}
+    if unknown:
+        print(f"Unknown scenario(s): {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+    scratch = tempfile.mkdtemp(prefix="geoevent_gui_bench_")
+    # Settings, FileID state and the autosave journal live under ~/.geoevent: keep the user's copy untouched
+    os.environ['HOME'] = os.environ['USERPROFILE'] = os.path.join(scratch, "home")
+
+    width, height = (int(value) for value in args.image_size.lower().split('x'))
+    spec = SurveySpec(fileids=1, gps_rows=args.gps_rows, event_spans=args.events, images=args.images,
+                      lane_fixes=args.lane_fixes, image_size=(width, height))
+    root = args.root or os.path.join(scratch, "survey")
+    if not os.path.isdir(root) or not os.listdir(root):
+        generate_survey(root, spec)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    window = None
+    try:
+        window = open_survey(root)
+        results = run_scenarios(window, args.frames, only)
+    finally:
+        if window is not None:
+            close_window(window)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    document = {
+        'suite': SUITE_NAME,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'environment': dict(environment_info(), qt_platform=app.platformName()),
+        'spec': spec.to_dict(),
+        'results': [stats.to_dict() for stats in results],
+    }
+    if args.json == '-':
+        print(json.dumps(document, indent=2))
+    else:
+        print(format_table(document))
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(document, f, indent=2)
+            print(f"Results written to {args.json}", file=sys.stderr)
+    if args.store:
+        key = ResultsStore(args.store).add(document)
+        print(f"Results stored as {key} in {args.store}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+Benchmark results store and regression comparison
+Runs are kept in one JSON file keyed by git commit and machine fingerprint;
+two runs are compared benchmark by benchmark on median and IQR.
+"""
+
+import json
+import logging
+import os
+import statistics
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.atomic_file import atomic_write
+
+DEFAULT_STORE_PATH = os.path.join(os.path.expanduser("~/.geoevent"), "benchmarks.json")
+STORE_VERSION = 1
+
+
+def quartiles(values: List[float]) -> Tuple[float, float]:
+    """(Q1, Q3); with fewer than 3 values quartiles mean nothing, so (min, max)"""
+    if len(values) < 3:
+        return min(values), max(values)
+    q1, _, q3 = statistics.quantiles(values, n=4, method='inclusive')
+    return q1, q3
+
+
+def iqr(values: List[float]) -> float:
+    """Interquartile range (0 with fewer than 3 values)"""
+    if len(values) < 3:
+        return 0.0
+    q1, q3 = quartiles(values)
+    return q3 - q1
+
+
+def run_key(document: Dict) -> str:
+    """'<commit>@<fingerprint>' for a results document"""
+    environment = document.get('environment', {})
+    return f"{environment.get('commit') or 'unknown'}@{environment.get('fingerprint') or 'unknown'}"
+
+
+class ResultsStore:
+    """
+    JSON file of benchmark results documents
+    RESPONSIBILITIES:
+    - Add runs keyed by suite, commit and machine fingerprint (a rerun replaces the same key)
+    - Resolve 'latest', 'previous' or a commit prefix to a run, optionally per suite and machine
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+
+    def runs(self, fingerprint: Optional[str] = None, suite: Optional[str] = None) -> List[Dict]:
+        """Stored runs, oldest first (only those of suite / from fingerprint if given)"""
+        if not os.path.exists(self.path):
+            return []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                runs = json.load(f).get('runs', [])
+        except (OSError, ValueError) as e:
+            logging.error(f"ResultsStore: Failed to read {self.path}: {e}")
+            return []
+        if fingerprint:
+            runs = [run for run in runs if run.get('environment', {}).get('fingerprint') == fingerprint]
+        if suite:
+            runs = [run for run in runs if run.get('suite') == suite]
+        return runs
+
+    def add(self, document: Dict) -> str:
+        """Store a results document; returns its key"""
+        key = run_key(document)
+        runs = [run for run in self.runs()
+                if run_key(run) != key or run.get('suite') != document.get('suite')]
+        runs.append(document)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with atomic_write(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'version': STORE_VERSION, 'runs': runs}, f, indent=1)
+        return key
+
+    def find(self, ref: str, fingerprint: Optional[str] = None, suite: Optional[str] = None) -> Optional[Dict]:
+        """Run for 'latest', 'previous' or a commit (prefix); the newest match wins"""
+        runs = self.runs(fingerprint, suite)
+        if ref == 'latest':
+            return runs[-1] if runs else None
+        if ref == 'previous':
+            return runs[-2] if len(runs) > 1 else None
+        for run in reversed(runs):
+            commit = run.get('environment', {}).get('commit') or ''
+            if commit.startswith(ref) or run_key(run) == ref:
+                return run
+        return None
+
+
+@dataclass
+class Comparison:
+    """One benchmark in baseline vs candidate"""
+    name: str
+    status: str  # ok, regression, improvement, noise, failed, missing
+    baseline_ms: Optional[float] = None
+    candidate_ms: Optional[float] = None
+    noise_ms: float = 0.0
+    change: Optional[float] = None  # fractional change of the median (+0.3 = 30% slower)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def compare_results(baseline: Dict, candidate: Dict, threshold: float = 0.10,
+                    min_delta_ms: float = 1.0) -> List[Comparison]:
+    """
+    Compare two results documents.
+    A benchmark regresses when its median is more than threshold slower, the interquartile
+    ranges of the two runs do not overlap (candidate Q1 above baseline Q3) and the slowdown
+    exceeds min_delta_ms. Slowdowns past the threshold inside the noise are reported as 'noise'.
+    """
+    baseline_results = {result['name']: result for result in baseline.get('results', [])}
+    comparisons = []
+    for result in candidate.get('results', []):
+        name = result['name']
+        base = baseline_results.pop(name, None)
+        if 'error' in result:
+            comparisons.append(Comparison(name, 'failed'))
+            continue
+        candidate_ms = statistics.median(result['runs_ms'])
+        if base is None or 'error' in base or not base.get('runs_ms'):
+            comparisons.append(Comparison(name, 'missing', candidate_ms=candidate_ms))
+            continue
+
+        baseline_ms = statistics.median(base['runs_ms'])
+        noise_ms = max(iqr(base['runs_ms']), iqr(result['runs_ms']))
+        delta_ms = candidate_ms - baseline_ms
+        change = delta_ms / baseline_ms if baseline_ms > 0 else 0.0
+        base_q1, base_q3 = quartiles(base['runs_ms'])
+        cand_q1, cand_q3 = quartiles(result['runs_ms'])
+        if delta_ms > 0:
+            significant = cand_q1 > base_q3 and delta_ms > min_delta_ms
+        else:
+            significant = cand_q3 < base_q1 and -delta_ms > min_delta_ms
+
+        if change > threshold:
+            status = 'regression' if significant else 'noise'
+        elif change < -threshold and significant:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        comparisons.append(Comparison(name, status, baseline_ms, candidate_ms, noise_ms, change))
+
+    comparisons.extend(Comparison(name, 'missing', baseline_ms=statistics.median(base['runs_ms']))
+                       for name, base in baseline_results.items() if base.get('runs_ms'))
+    return comparisons
+
+
+def has_regression(comparisons: List[Comparison]) -> bool:
+    return any(comparison.status in ('regression', 'failed') for comparison in comparisons)
@@ -0,0 +1,402 @@
+"""
+Headless benchmark suite for GeoEvent
+Times the data pipeline (scan, parse, load, enrichment, lane ops, save, merge)
+on a synthetic survey and emits machine-readable JSON results.
+
+Usage:
+    python -m benchmarks.run_benchmarks                    # default survey, table on stdout
+    python -m benchmarks.run_benchmarks --json results.json
+    python -m benchmarks.run_benchmarks --fileids 20 --gps-rows 20000 --only load_fileid,merge
+    python -m benchmarks.run_benchmarks --store           # keep results for benchmarks.compare
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models.lane_model import LaneManager
+from app.utils.data_loader import DataLoader
+from app.utils.export_manager import ExportManager
+from app.utils.file_parser import enrich_events_with_gps, parse_driveevt, parse_driveiri, save_driveevt
+from app.utils.fileid_manager import FileIDFolder, FileIDManager
+
+from benchmarks.results_store import DEFAULT_STORE_PATH, ResultsStore, iqr
+from benchmarks.survey_generator import SurveySpec, generate_survey
+
+SUITE_NAME = "geoevent-headless"
+
+
+@dataclass
+class BenchmarkContext:
+    """Survey under test plus lazily loaded data shared by benchmarks"""
+    root: str
+    spec: SurveySpec
+    scratch_dir: str
+    _folders: Optional[List[FileIDFolder]] = None
+    _loaded: Optional[List[Dict[str, Any]]] = None
+
+    def new_fileid_manager(self) -> FileIDManager:
+        manager = FileIDManager()
+        # Keep benchmark runs out of the user's navigation state
+        manager.state_file = os.path.join(self.scratch_dir, "fileid_state.json")
+        return manager
+
+    @property
+    def folders(self) -> List[FileIDFolder]:
+        if self._folders is None:
+            self._folders = self.new_fileid_manager().scan_parent_folder(self.root)
+        return self._folders
+
+    @property
+    def loaded(self) -> List[Dict[str, Any]]:
+        """DataLoader results for every FileID (loaded once, treat as read-only)"""
+        if self._loaded is None:
+            self._loaded = [DataLoader().load_fileid_data(folder) for folder in self.folders]
+        return self._loaded
+
+    def file_path(self, folder: FileIDFolder, suffix: str) -> str:
+        return os.path.join(folder.path, f"{folder.fileid}{suffix}")
+
+
+@dataclass
+class Benchmark:
+    """One timed operation: setup (untimed) then run, which returns the number of items processed"""
+    name: str
+    unit: str
+    run: Callable[[BenchmarkContext, Any], int]
+    setup: Optional[Callable[[BenchmarkContext], Any]] = None
+    description: str = ""
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings of one benchmark over all repeats"""
+    name: str
+    unit: str
+    items: int
+    runs_ms: List[float] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        data = {'name': self.name, 'unit': self.unit, 'items': self.items,
+                'runs_ms': [round(value, 3) for value in self.runs_ms]}
+        if self.runs_ms:
+            median = statistics.median(self.runs_ms)
+            data.update({
+                'min_ms': round(min(self.runs_ms), 3),
+                'median_ms': round(median, 3),
+                'iqr_ms': round(iqr(self.runs_ms), 3),
+                'mean_ms': round(statistics.fmean(self.runs_ms), 3),
+                'max_ms': round(max(self.runs_ms), 3),
+                'items_per_sec': round(self.items / (median / 1000), 1) if median > 0 else None,
+            })
+        if self.error:
+            data['error'] = self.error
+        return data
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str, unit: str, setup: Callable = None, description: str = ""):
+    """Register a benchmark function run(ctx, state) -> items"""
+    def register(run):
+        BENCHMARKS.append(Benchmark(name, unit, run, setup, description or (run.__doc__ or "").strip()))
+        return run
+    return register
+
+
+# ---- benchmarks -------------------------------------------------------------
+
+@benchmark('scan_folder', 'fileids')
+def _scan_folder(ctx, state):
+    """FileIDManager.scan_parent_folder over the survey root"""
+    return len(ctx.new_fileid_manager().scan_parent_folder(ctx.root))
+
+
+@benchmark('parse_driveiri', 'rows')
+def _parse_driveiri(ctx, state):
+    """parse_driveiri for every FileID"""
+    return sum(len(parse_driveiri(ctx.file_path(folder, ".driveiri")).points) for folder in ctx.folders)
+
+
+@benchmark('parse_driveevt', 'spans')
+def _parse_driveevt(ctx, state):
+    """parse_driveevt (span pairing) for every FileID"""
+    return sum(len(parse_driveevt(ctx.file_path(folder, ".driveevt"))) for folder in ctx.folders)
+
+
+def _enrich_setup(ctx):
+    return [([copy.copy(event) for event in data['events']], data['gps_data']) for data in ctx.loaded]
+
+
+@benchmark('enrich_events', 'events', setup=_enrich_setup)
+def _enrich_events(ctx, pairs):
+    """enrich_events_with_gps (lat/lon/chainage interpolation) for every FileID"""
+    for events, gps_data in pairs:
+        enrich_events_with_gps(events, gps_data)
+    return sum(len(events) for events, _ in pairs)
+
+
+@benchmark('load_fileid', 'fileids')
+def _load_fileid(ctx, state):
+    """DataLoader.load_fileid_data (all stages) for every FileID"""
+    loader = DataLoader()
+    for folder in ctx.folders:
+        loader.load_fileid_data(folder)
+    return len(ctx.folders)
+
+
+def _lane_setup(ctx):
+    managers = []
+    for data in ctx.loaded:
+        source = data['lane_manager']
+        manager = LaneManager()
+        manager.set_metadata(source.first_image_timestamp, source.last_image_timestamp,
+                             source.gps_min_timestamp, source.gps_max_timestamp)
+        manager.fileid_folder = source.fileid_folder
+        manager.plate = source.plate
+        manager.end_time = source.end_time
+        managers.append((manager, data['metadata'], data['image_paths']))
+    return managers
+
+
+@benchmark('lane_ops', 'operations', setup=_lane_setup)
+def _lane_ops(ctx, managers):
+    """Assign lanes along each FileID, query the lane at every image, validate bounds"""
+    from app.utils.image_utils import extract_timestamp_fast
+    operations = 0
+    lanes = ('1', '2', '3', 'SK')
+    for manager, metadata, image_paths in managers:
+        timestamps = [extract_timestamp_fast(os.path.basename(path)) for path in image_paths]
+        step = max(1, len(timestamps) // max(ctx.spec.lane_fixes, 1))
+        for i, timestamp in enumerate(timestamps[::step]):
+            manager.assign_lane(lanes[i % len(lanes)], timestamp)
+            operations += 1
+        for timestamp in timestamps:
+            manager.get_lane_at_timestamp(timestamp)
+        operations += len(timestamps)
+        manager.validate_lane_fixes_time_bounds()
+        operations += 1
+    return operations
+
+
+@benchmark('save_driveevt', 'events')
+def _save_driveevt(ctx, state):
+    """save_driveevt of every FileID's events (to scratch files)"""
+    count = 0
+    for folder, data in zip(ctx.folders, ctx.loaded):
+        save_driveevt(data['events'], os.path.join(ctx.scratch_dir, f"{folder.fileid}.driveevt"), folder.fileid)
+        count += len(data['events'])
+    return count
+
+
+@benchmark('save_lane_fixes', 'fixes')
+def _save_lane_fixes(ctx, state):
+    """ExportManager.export_lane_fixes of every FileID's lane fixes (to scratch files)"""
+    exporter = ExportManager()
+    count = 0
+    for folder, data in zip(ctx.folders, ctx.loaded):
+        fixes = data['lane_manager'].lane_fixes
+        exporter.export_lane_fixes(fixes, os.path.join(ctx.scratch_dir, f"{folder.fileid}_lane_fixes.csv"),
+                                   include_file_id=False)
+        count += len(fixes)
+    return count
+
+
+@benchmark('merge', 'records')
+def _merge(ctx, state):
+    """Merge all FileIDs: merged .driveevt, merged lane fixes, then merge into an existing lane fix file"""
+    all_events = [event for data in ctx.loaded for event in data['events']]
+    all_fixes = [fix for data in ctx.loaded for fix in data['lane_manager'].lane_fixes]
+    exporter = ExportManager()
+
+    save_driveevt(sorted(all_events, key=lambda e: e.start_time),
+                  os.path.join(ctx.scratch_dir, "merged.driveevt"), "merged")
+    merged_lanes = os.path.join(ctx.scratch_dir, "laneFixes-merged.csv")
+    exporter.export_lane_fixes(all_fixes, merged_lanes, include_file_id=True)
+    exporter.merge_lane_fixes(merged_lanes, all_fixes[: len(all_fixes) // 2],
+                              os.path.join(ctx.scratch_dir, "laneFixes-remerged.csv"))
+    return len(all_events) + len(all_fixes)
+
+
+# ---- runner -----------------------------------------------------------------
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        output = subprocess.run(['git', *args], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() if output.returncode == 0 else None
+
+
+def git_commit() -> Optional[str]:
+    """Short HEAD commit, suffixed with +dirty when tracked files have uncommitted changes"""
+    commit = _git('rev-parse', '--short', 'HEAD')
+    if commit and _git('status', '--porcelain', '--untracked-files=no'):
+        commit += '+dirty'
+    return commit
+
+
+def machine_fingerprint() -> str:
+    """Stable id for the benchmark machine: timings are only comparable between equal fingerprints"""
+    parts = [platform.system(), platform.machine(), platform.processor(), str(os.cpu_count()),
+             '.'.join(platform.python_version_tuple()[:2])]
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:12]
+
+
+def environment_info() -> Dict:
+    """Machine description stored with results"""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'fingerprint': machine_fingerprint(),
+        'commit': git_commit(),
+    }
+
+
+def run_benchmark(item: Benchmark, ctx: BenchmarkContext, repeat: int, warmup: int) -> BenchmarkResult:
+    """Run one benchmark warmup + repeat times; failures are reported in the result, not raised"""
+    result = BenchmarkResult(item.name, item.unit, 0)
+    try:
+        for iteration in range(warmup + repeat):
+            state = item.setup(ctx) if item.setup else None
+            start = time.perf_counter()
+            items = item.run(ctx, state)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if iteration >= warmup:
+                result.runs_ms.append(elapsed_ms)
+                result.items = items
+    except Exception as e:
+        logging.error(f"Benchmark {item.name} failed: {e}", exc_info=True)
+        result.error = str(e)
+    return result
+
+
+def run_suite(root: str, spec: SurveySpec, repeat: int = 5, warmup: int = 1,
+              only: Optional[List[str]] = None, scratch_dir: Optional[str] = None) -> Dict:
+    """Run the selected benchmarks against the survey at root; returns the results document"""
+    owns_scratch = scratch_dir is None
+    scratch_dir = scratch_dir or tempfile.mkdtemp(prefix="geoevent_bench_")
+    ctx = BenchmarkContext(root=root, spec=spec, scratch_dir=scratch_dir)
+    selected = [item for item in BENCHMARKS if not only or item.name in only]
+
+    try:
+        results = [run_benchmark(item, ctx, repeat, warmup) for item in selected]
+    finally:
+        if owns_scratch:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    return {
+        'suite': SUITE_NAME,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment_info(),
+        'spec': spec.to_dict(),
+        'repeat': repeat,
+        'warmup': warmup,
+        'results': [result.to_dict() for result in results],
+    }
+
+
+def format_table(document: Dict) -> str:
+    """Human-readable summary of a results document"""
+    lines = [f"{'Benchmark':<18} {'Items':>9} {'Median ms':>11} {'Min ms':>10} {'Max ms':>10} {'Items/s':>12}",
+             "-" * 75]
+    for result in document['results']:
+        if 'error' in result:
+            lines.append(f"{result['name']:<18} FAILED: {result['error']}")
+            continue
+        lines.append(f"{result['name']:<18} {result['items']:>9} {result['median_ms']:>11.2f} "
+                     f"{result['min_ms']:>10.2f} {result['max_ms']:>10.2f} {result['items_per_sec'] or 0:>12.0f}")
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    defaults = SurveySpec()
+    parser = argparse.ArgumentParser(description="GeoEvent headless benchmark suite")
+    parser.add_argument('--root', help="Survey root to benchmark (generated here if missing; default: temp dir)")
+    parser.add_argument('--fileids', type=int, default=defaults.fileids)
+    parser.add_argument('--gps-rows', type=int, default=defaults.gps_rows, help="GPS rows per FileID")
+    parser.add_argument('--events', type=int, default=defaults.event_spans, help="Span events per FileID")
+    parser.add_argument('--images', type=int, default=defaults.images, help="Cam1 images per FileID")
+    parser.add_argument('--lane-fixes', type=int, default=defaults.lane_fixes, help="Lane fixes per FileID")
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per benchmark (>= 3 for IQR)")
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--only', help="Comma-separated benchmark names")
+    parser.add_argument('--list', action='store_true', help="List benchmarks and exit")
+    parser.add_argument('--json', metavar='PATH', help="Write results JSON to PATH ('-' for stdout)")
+    parser.add_argument('--store', nargs='?', const=DEFAULT_STORE_PATH, metavar='PATH',
+                        help=f"Add results to the results store (default: {DEFAULT_STORE_PATH})")
+    parser.add_argument('--verbose', action='store_true', help="Show application logging")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+
+    if args.list:
+        for item in BENCHMARKS:
+            print(f"{item.name:<18} {item.description}")
+        return 0
+
+    spec = SurveySpec(fileids=args.fileids, gps_rows=args.gps_rows, event_spans=args.events,
+                      images=args.images, lane_fixes=args.lane_fixes, seed=args.seed)
+    only = [name.strip() for name in args.only.split(',')] if args.only else None
+    unknown = set(only or []) - {item.name for item in BENCHMARKS}
+    if unknown:
+        print(f"Unknown benchmark(s): {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+
+    root = args.root
+    temp_root = None
+    if root is None:
+        root = temp_root = tempfile.mkdtemp(prefix="geoevent_survey_")
+    if not os.path.isdir(root) or not os.listdir(root):
+        start = time.perf_counter()
+        generate_survey(root, spec)
+        print(f"Generated survey in {root} ({time.perf_counter() - start:.1f}s)", file=sys.stderr)
+
+    try:
+        document = run_suite(root, spec, repeat=args.repeat, warmup=args.warmup, only=only)
+    finally:
+        if temp_root:
+            shutil.rmtree(temp_root, ignore_errors=True)
+
+    if args.json == '-':
+        print(json.dumps(document, indent=2))
+    else:
+        print(format_table(document))
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(document, f, indent=2)
+            print(f"Results written to {args.json}", file=sys.stderr)
+    if args.store:
+        key = ResultsStore(args.store).add(document)
+        print(f"Results stored as {key} in {args.store}", file=sys.stderr)
+    return 1 if any('error' in result for result in document['results']) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
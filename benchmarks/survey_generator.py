@@ -0,0 +1,163 @@
+"""
+Synthetic survey generator for GeoEvent benchmarks
+Writes survey roots laid out like real ones: FileID folders with .driveiri GPS,
+.driveevt span events, lane fix CSVs and Cam1 folders of correctly named JPEGs
+"""
+
+import io
+import os
+import random
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+from app.models.event_config import MAX_EVENT_LENGTHS
+
+DRIVEEVT_HEADER = ("SessionToken,Distance,Chainage,Time,TimeUtc,Event,IsSpanEvent,"
+                   "SpanEvent,IsSpanStartEvent,IsSpanEndEvent\n")
+DRIVEIRI_HEADER = "Unix,Position (begin) (LAT),Position (begin) (LON),StartChainage [km]\n"
+LANE_FIX_HEADER = "Plate,From,To,Lane,Ignore\n"
+
+LANE_CODES = ('1', '2', '3', 'SK')
+PLATE = "NWZ263"
+PROJECT_ID = "250041"
+
+
+@dataclass
+class SurveySpec:
+    """Size of a synthetic survey (all counts are per FileID)"""
+    fileids: int = 5
+    gps_rows: int = 2000
+    event_spans: int = 50
+    images: int = 200
+    lane_fixes: int = 20
+    image_interval_s: float = 1.0
+    image_size: tuple = (64, 48)
+    speed_mps: float = 15.0
+    seed: int = 0
+    start: datetime = field(default_factory=lambda: datetime(2025, 11, 26, 20, 10, 0, tzinfo=timezone.utc))
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data['start'] = self.start.isoformat()
+        data['image_size'] = list(self.image_size)
+        return data
+
+
+def fileid_name(index: int) -> str:
+    """Valid FileID folder name for index (0D prefix + 16 digits)"""
+    return f"0D2511270910{index:06d}"
+
+
+def _ddmm(value: float, positive: str, negative: str, degree_digits: int) -> str:
+    """Decimal degrees -> DDMM.MMMMMM[N|S] / DDDMM.MMMMMM[E|W] as used in image names"""
+    direction = positive if value >= 0 else negative
+    value = abs(value)
+    degrees = int(value)
+    minutes = (value - degrees) * 60
+    return f"{degrees:0{degree_digits}d}{minutes:09.6f}{direction}"
+
+
+def _image_name(ts: datetime, lat: float, lon: float, fileid: str, index: int, chainage_m: float) -> str:
+    return (f"{PROJECT_ID}-{ts.strftime('%Y-%m-%d-%H-%M-%S')}-{ts.microsecond // 1000:03d}-"
+            f"{_ddmm(lat, 'N', 'S', 2)}-{_ddmm(lon, 'E', 'W', 3)}-156.4---"
+            f"{PLATE}-{fileid}-{2580493456456 + index}-{chainage_m:.1f}-LE-.jpg")
+
+
+def _jpeg_bytes(size: tuple, shade: int) -> bytes:
+    from PIL import Image
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (shade % 256, 80, 120)).save(buffer, format='JPEG', quality=70)
+    return buffer.getvalue()
+
+
+def _format_dmy(ts: datetime) -> str:
+    return ts.strftime('%d/%m/%y %H:%M:%S') + f'.{ts.microsecond // 1000:03d}'
+
+
+def write_fileid(root: str, fileid: str, spec: SurveySpec, start: datetime, rng: random.Random) -> str:
+    """Write one FileID folder; returns its path"""
+    path = os.path.join(root, fileid)
+    cam_folder = os.path.join(path, "Cam1")
+    os.makedirs(cam_folder, exist_ok=True)
+
+    duration = max(spec.images * spec.image_interval_s, 1.0)
+    lat0, lon0 = -37.5 - rng.random(), 175.0 + rng.random()
+    # Straight drive at speed_mps (~111 km per degree), south-east or south-west
+    dlat = spec.speed_mps / 111000.0 * 0.7
+    dlon = spec.speed_mps / 111000.0 * 0.7 * rng.choice((1, -1))
+
+    def position(offset_s: float):
+        return lat0 - dlat * offset_s, lon0 + dlon * offset_s, spec.speed_mps * offset_s
+
+    # GPS track spanning the images
+    gps_step = duration / max(spec.gps_rows - 1, 1)
+    with open(os.path.join(path, f"{fileid}.driveiri"), 'w', encoding='utf-8', newline='') as f:
+        f.write(DRIVEIRI_HEADER)
+        for i in range(spec.gps_rows):
+            offset = i * gps_step
+            lat, lon, chainage = position(offset)
+            unix = (start + timedelta(seconds=offset)).timestamp()
+            f.write(f"{unix:.3f},{lat:.7f},{lon:.7f},{chainage / 1000:.5f}\n")
+
+    # Span events: start/end rows sorted by time, names drawn from the event config
+    names = sorted(MAX_EVENT_LENGTHS)
+    rows = []
+    for _ in range(spec.event_spans):
+        name = rng.choice(names)
+        begin = rng.uniform(0, duration * 0.95)
+        end = min(duration, begin + rng.uniform(2, max(3, duration * 0.05)))
+        rows.append((begin, name, True))
+        rows.append((end, name, False))
+    rows.sort(key=lambda row: row[0])
+    with open(os.path.join(path, f"{fileid}.driveevt"), 'w', encoding='utf-8', newline='') as f:
+        f.write(DRIVEEVT_HEADER)
+        for offset, name, is_start in rows:
+            ts = (start + timedelta(seconds=offset)).strftime('%m/%d/%Y %H:%M:%S')
+            chainage = position(offset)[2]
+            label = f"{name} {'Start' if is_start else 'End'}"
+            f.write(f"{fileid},{chainage:.1f},{chainage:.1f},{ts},{ts},{label},True,{name},"
+                    f"{is_start},{not is_start}\n")
+
+    # Contiguous lane fix periods covering the images
+    if spec.lane_fixes:
+        cuts = sorted(rng.uniform(0, duration) for _ in range(spec.lane_fixes - 1))
+        bounds = [0.0] + cuts + [duration]
+        with open(os.path.join(path, f"{fileid}_lane_fixes.csv"), 'w', encoding='utf-8', newline='') as f:
+            f.write(LANE_FIX_HEADER)
+            for i in range(spec.lane_fixes):
+                from_ts = start + timedelta(seconds=bounds[i])
+                to_ts = start + timedelta(seconds=bounds[i + 1])
+                f.write(f"{PLATE},{_format_dmy(from_ts)},{_format_dmy(to_ts)},{LANE_CODES[i % len(LANE_CODES)]},\n")
+
+    # Cam1 images (one small JPEG payload per FileID, written under every frame name)
+    payload = _jpeg_bytes(spec.image_size, rng.randrange(256))
+    for i in range(spec.images):
+        offset = i * spec.image_interval_s
+        lat, lon, chainage = position(offset)
+        name = _image_name(start + timedelta(seconds=offset), lat, lon, fileid, i, chainage)
+        with open(os.path.join(cam_folder, name), 'wb') as f:
+            f.write(payload)
+
+    return path
+
+
+def generate_survey(root: str, spec: SurveySpec = None) -> List[str]:
+    """
+    Write a synthetic survey root with spec.fileids FileID folders.
+    FileIDs follow each other in time with a one-minute gap. Returns the FileID names.
+    Output is deterministic for a given spec (seeded).
+    """
+    spec = spec or SurveySpec()
+    rng = random.Random(spec.seed)
+    os.makedirs(root, exist_ok=True)
+
+    fileids = []
+    start = spec.start
+    duration = timedelta(seconds=max(spec.images * spec.image_interval_s, 1.0))
+    for index in range(spec.fileids):
+        fileid = fileid_name(index)
+        write_fileid(root, fileid, spec, start, rng)
+        fileids.append(fileid)
+        start += duration + timedelta(minutes=1)
+    return fileids
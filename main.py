@@ -13,6 +13,7 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPalette, QColor, QIcon
 from app.main_window import MainWindow
 from app.logging_config import setup_logging as setup_centralized_logging
+from app.utils.tracing import start_tracing_from_env
 from app.utils.resource_path import get_resource_path, get_app_base_dir
 
 
@@ -54,6 +55,7 @@ def main():
     """Main application entry point"""
     _setup_dpi_awareness()
     setup_logging()
+    start_tracing_from_env()  # GEOEVENT_TRACE=1 or a path: record a Chrome trace of this run
 
     app = QApplication(sys.argv)
     app.setApplicationName("GeoEvent")
@@ -0,0 +1,1572 @@
+"""
+Phase 5 Performance Test Suite
+Tests background loading, caching and other performance work
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.utils.fileid_manager import FileIDFolder
+
+
+def make_fileid_folder(root: str, fileid: str, image_count: int = 3,
+                       start: datetime = datetime(2025, 11, 26, 20, 10, 0, tzinfo=timezone.utc)) -> FileIDFolder:
+    """Create a minimal FileID folder (.driveevt, .driveiri, Cam1 images)"""
+    from PIL import Image
+
+    path = os.path.join(root, fileid)
+    cam_folder = os.path.join(path, "Cam1")
+    os.makedirs(cam_folder, exist_ok=True)
+
+    with open(os.path.join(path, f"{fileid}.driveevt"), 'w', encoding='utf-8') as f:
+        f.write("SessionToken,Distance,Chainage,Time,TimeUtc,Event,IsSpanEvent,SpanEvent,IsSpanStartEvent,IsSpanEndEvent\n")
+        t0 = start.strftime('%m/%d/%Y %H:%M:%S')
+        t1 = (start + timedelta(seconds=image_count)).strftime('%m/%d/%Y %H:%M:%S')
+        f.write(f"T,0,0,{t0},{t0},Bridge Start,True,Bridge,True,False\n")
+        f.write(f"T,10,10,{t1},{t1},Bridge End,True,Bridge,False,True\n")
+
+    with open(os.path.join(path, f"{fileid}.driveiri"), 'w', encoding='utf-8') as f:
+        f.write("Unix,Position (begin) (LAT),Position (begin) (LON),StartChainage [km]\n")
+        for i in range(image_count + 1):
+            unix = (start + timedelta(seconds=i)).timestamp()
+            f.write(f"{unix},{-37.5 - i * 0.0001},{175.1},{i * 0.01}\n")
+
+    for i in range(image_count):
+        ts = start + timedelta(seconds=i)
+        name = (f"250041-{ts.strftime('%Y-%m-%d-%H-%M-%S')}-000-3730.680559S-17510.095384E-156.4---"
+                f"NWZ263-{fileid}-2580493456456-{i}.0-LE-.jpg")
+        Image.new('RGB', (16, 12), (i * 40, 80, 120)).save(os.path.join(cam_folder, name))
+
+    return FileIDFolder(
+        fileid=fileid, path=path, has_driveevt=True, has_driveiri=True,
+        has_lane_fixes=False, image_count=image_count, last_modified=datetime.now()
+    )
+
+
+class TestFileIDPreloader(unittest.TestCase):
+    """Test background preloading of adjacent FileIDs"""
+
+    def setUp(self):
+        from app.core.fileid_preloader import FileIDPreloader
+        self.root = tempfile.mkdtemp()
+        self.folders = [make_fileid_folder(self.root, f"0D251127091019780{i}") for i in range(3)]
+        self.preloader = FileIDPreloader(max_entries=2, warm_image_count=2)
+
+    def tearDown(self):
+        self.preloader.stop()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _wait_for(self, fileid, timeout=10.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if fileid in self.preloader.get_stats()['cached_fileids']:
+                return True
+            time.sleep(0.02)
+        return False
+
+    def test_preload_and_take(self):
+        """Preloaded data matches a synchronous load and is handed over once"""
+        self.preloader.request([self.folders[1]])
+        self.assertTrue(self._wait_for(self.folders[1].fileid))
+
+        data = self.preloader.take(self.folders[1].fileid)
+        self.assertIsNotNone(data)
+        self.assertEqual(len(data['image_paths']), 3)
+        self.assertEqual(len(data['events']), 1)
+        self.assertEqual(len(data['warm_images']), 2)
+        self.assertIsNone(self.preloader.take(self.folders[1].fileid))
+
+    def test_reprioritize_drops_unwanted(self):
+        """Requesting new neighbours cancels queued work for old ones"""
+        self.preloader.request([self.folders[0], self.folders[1]])
+        self.preloader.request([self.folders[2]])
+        self.assertTrue(self._wait_for(self.folders[2].fileid))
+        stats = self.preloader.get_stats()
+        self.assertEqual(stats['pending'], [])
+        self.assertLessEqual(len(stats['cached_fileids']), 2)
+
+    def test_invalidate(self):
+        """Invalidated FileIDs are not served from cache"""
+        self.preloader.request([self.folders[0]])
+        self.assertTrue(self._wait_for(self.folders[0].fileid))
+        self.preloader.invalidate(self.folders[0].fileid)
+        self.assertIsNone(self.preloader.take(self.folders[0].fileid))
+
+
+class TestStagedFileIDLoad(unittest.TestCase):
+    """Test the staged, cancellable FileID load pipeline"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.folder = make_fileid_folder(self.root, "0D2511270910197800")
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_stage_order(self):
+        """Stages are published in LOAD_STAGES order with images first"""
+        from app.utils.data_loader import DataLoader
+        stages = []
+        data = DataLoader().load_fileid_data(
+            self.folder, on_stage=lambda stage, result: stages.append((stage, len(result['image_paths'])))
+        )
+        self.assertEqual([s for s, _ in stages], list(DataLoader.LOAD_STAGES))
+        self.assertEqual(stages[0], ('images', 3))
+        self.assertEqual(len(data['events']), 1)
+        self.assertIsNotNone(data['events'][0].start_lat)  # enriched before publishing
+        self.assertEqual(data['lane_manager'].first_image_timestamp, data['metadata']['first_image_timestamp'])
+
+    def test_cancel_between_stages(self):
+        """Cancellation stops the pipeline at the next stage boundary"""
+        from app.utils.data_loader import DataLoader, FileIDLoadCancelled
+        stages = []
+        with self.assertRaises(FileIDLoadCancelled):
+            DataLoader().load_fileid_data(
+                self.folder,
+                on_stage=lambda stage, result: stages.append(stage),
+                is_cancelled=lambda: len(stages) >= 1
+            )
+        self.assertEqual(stages, ['images'])
+
+    def test_worker_cancelled(self):
+        """A cancelled worker reports cancellation instead of a result"""
+        from app.core.fileid_load_worker import FileIDLoadWorker
+        results = []
+        worker = FileIDLoadWorker(self.folder, generation=7)
+        worker.load_finished.connect(lambda gen, data: results.append(('finished', gen)))
+        worker.load_cancelled.connect(lambda gen: results.append(('cancelled', gen)))
+        worker.cancel()
+        worker.run()  # run synchronously
+        self.assertEqual(results, [('cancelled', 7)])
+
+
+class TestPointEventIndex(unittest.TestCase):
+    """Test capture of non-span .driveevt rows and the warnings view"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.folder = make_fileid_folder(self.root, "0D2511270910197800")
+        with open(os.path.join(self.folder.path, f"{self.folder.fileid}.driveevt"), 'a', encoding='utf-8') as f:
+            f.write("T,5,5,11/26/2025 20:10:01,11/26/2025 20:10:01,Lane 2,False,,False,False\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_non_span_rows_loaded_with_fileid(self):
+        """Non-span rows are indexed at load time and rendered without file access"""
+        from app.utils.data_loader import DataLoader
+        from app.ui.folder_warnings import FolderWarningsView
+        data = DataLoader().load_fileid_data(self.folder)
+        points = data['point_events']
+        self.assertEqual([p.event_name for p in points], ["Lane 2"])
+        t = datetime(2025, 11, 26, 20, 10, 1, tzinfo=timezone.utc).timestamp()
+        self.assertEqual(len(points.in_range(t - 1, t + 1)), 1)
+        self.assertEqual(len(points.in_range(t + 1, t + 2)), 0)
+
+        view = FolderWarningsView()
+        view.reset(data['events'], points)
+        os.remove(os.path.join(self.folder.path, f"{self.folder.fileid}.driveevt"))
+        self.assertIn("Check lane at 11/26/2025 20:10:01", view.render())
+
+    def test_view_updates_incrementally(self):
+        """Edits add and remove only the affected warning lines"""
+        from app.ui.folder_warnings import FolderWarningsView
+        from app.models.event_model import Event
+        t0 = datetime(2025, 11, 26, 20, 0, 0, tzinfo=timezone.utc)
+        event = Event(event_id="E1", event_name="Bridge", start_time=t0, end_time=t0 + timedelta(seconds=5),
+                      start_chainage=0.0, end_chainage=10.0)
+        view = FolderWarningsView()
+        view.reset([event])
+        self.assertEqual(view.render(), "")
+        event.event_name = "Check Lane"
+        view.update_event(event)
+        self.assertIn("Check Lane event detected", view.render())
+        view.remove_event(event)
+        self.assertEqual(view.render(), "")
+
+
+class TestFileIDSessionStore(unittest.TestCase):
+    """Test the LRU-bounded, spill-to-disk per-FileID store"""
+
+    def setUp(self):
+        from app.core.session_store import FileIDSessionStore
+        from app.models.lane_model import LaneFix
+        self.store = FileIDSessionStore("test", max_hot_entries=2)
+        t0 = datetime(2025, 11, 26, 20, 10, 0, tzinfo=timezone.utc)
+        self.fixes = {
+            f"F{i}": [LaneFix(plate="NWZ263", from_time=t0, to_time=t0 + timedelta(seconds=i + 1),
+                              lane="1", file_id=f"F{i}")]
+            for i in range(4)
+        }
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_spill_and_reload(self):
+        """Entries beyond the hot limit spill to disk and reload unchanged"""
+        for key, value in self.fixes.items():
+            self.store[key] = value
+
+        stats = self.store.get_stats()
+        self.assertEqual(stats['hot_entries'], 2)
+        self.assertEqual(stats['spilled_entries'], 2)
+        self.assertEqual(len(self.store), 4)
+        self.assertIn("F0", self.store)
+
+        self.assertEqual(self.store["F0"], self.fixes["F0"])
+        self.assertEqual(self.store.reload_count, 1)
+        self.assertEqual(self.store.get_stats()['hot_entries'], 2)
+
+    def test_pinned_entry_not_spilled(self):
+        """The pinned FileID stays in memory as the same object"""
+        self.store["F0"] = self.fixes["F0"]
+        self.store.pin("F0")
+        for key in ("F1", "F2", "F3"):
+            self.store[key] = self.fixes[key]
+        self.assertIs(self.store["F0"], self.fixes["F0"])
+        self.assertEqual(self.store.reload_count, 0)
+
+    def test_memory_accounting(self):
+        """Hot entries report a size and spill_all releases it"""
+        self.store["F0"] = self.fixes["F0"]
+        self.assertGreater(self.store.get_entry_sizes()["F0"], 0)
+        released = self.store.spill_all()
+        self.assertGreater(released, 0)
+        self.assertEqual(self.store.get_memory_usage(), 0)
+        self.assertEqual(self.store.get("F0"), self.fixes["F0"])
+
+    def test_reassigning_same_list_defers_measuring(self):
+        """Re-assigning the pinned list on every edit does not walk it; the next read re-measures"""
+        from unittest import mock
+        from app.core import session_store
+        from app.models.lane_model import LaneFix
+
+        fixes = self.fixes["F0"]
+        self.store["F0"] = fixes
+        self.store.pin("F0")
+        before = self.store.get_memory_usage()
+
+        fixes.extend(LaneFix("NWZ263", f.from_time, f.to_time, "2", "F0") for f in self.fixes["F1"] * 50)
+        with mock.patch.object(session_store, 'estimate_object_size', side_effect=AssertionError):
+            for _ in range(3):
+                self.store["F0"] = fixes
+        self.assertGreater(self.store.get_memory_usage(), before)
+
+    def test_spill_folders_live_under_the_session_and_stale_ones_are_swept(self):
+        """Spills go to this session's folder; folders of sessions no longer running are removed"""
+        from app.core.session_store import session_spill_dir, sweep_stale_spill_dirs
+
+        self.store["F0"] = self.fixes["F0"]
+        self.store.spill_all()
+        spill_dir = self.store._spill_dir
+        self.assertEqual(os.path.dirname(spill_dir), session_spill_dir())
+
+        root = tempfile.mkdtemp()
+        try:
+            live = session_spill_dir(root)
+            crashed = os.path.join(root, f"session-{os.getpid()}-1")  # same pid, other start time
+            for folder in (live, crashed, os.path.join(root, "unrelated")):
+                os.makedirs(os.path.join(folder, "events_x"))
+            self.assertEqual(sweep_stale_spill_dirs(root), 1)
+            self.assertEqual(sorted(os.listdir(root)), sorted([os.path.basename(live), "unrelated"]))
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+        self.store.close()
+        self.assertFalse(os.path.exists(spill_dir))
+
+
+class TestIntervalIndex(unittest.TestCase):
+    """Test the timeline interval index and sweep-line layer assignment"""
+
+    def setUp(self):
+        import random
+        from app.models.event_model import Event
+        rng = random.Random(42)
+        t0 = datetime(2025, 11, 26, 20, 0, 0, tzinfo=timezone.utc)
+        self.events = []
+        for i in range(300):
+            start = t0 + timedelta(seconds=rng.uniform(0, 3600))
+            end = start + timedelta(seconds=rng.uniform(0, 120))
+            self.events.append(Event(event_id=f"E{i}", event_name="Bridge", start_time=start,
+                                     end_time=end, start_chainage=0.0, end_chainage=1.0))
+        self.t0 = t0.timestamp()
+
+    def test_window_query_matches_linear_scan(self):
+        """Window and point queries return exactly the overlapping events"""
+        from app.utils.interval_index import IntervalIndex
+        index = IntervalIndex(self.events)
+        for lo, hi in [(0, 60), (500, 520), (1800, 3600), (3650, 4000), (-100, -1)]:
+            ws, we = self.t0 + lo, self.t0 + hi
+            expected = {e.event_id for e in self.events
+                        if e.start_time.timestamp() <= we and e.end_time.timestamp() >= ws}
+            self.assertEqual({e.event_id for e in index.query_window(ws, we)}, expected)
+        point = {e.event_id for e in index.query_point(self.t0 + 1000)}
+        self.assertEqual(point, {e.event_id for e in self.events
+                                 if e.start_time.timestamp() <= self.t0 + 1000 <= e.end_time.timestamp()})
+
+    def test_layers_do_not_overlap(self):
+        """Each layer holds non-overlapping events and every visible event is placed"""
+        from app.utils.interval_index import IntervalIndex
+        index = IntervalIndex(self.events)
+        layers = index.assign_layers(self.t0, self.t0 + 3600, max_layers=50)
+        placed = [e for layer in layers for e in layer]
+        self.assertEqual(len(placed), len(index.query_window(self.t0, self.t0 + 3600)))
+        for layer in layers:
+            ordered = sorted(layer, key=lambda e: e.start_time)
+            for a, b in zip(ordered, ordered[1:]):
+                self.assertLessEqual(a.end_time, b.start_time)
+
+    def test_density_bins_match_coverage(self):
+        """Per-column counts equal the number of events covering each column"""
+        from app.utils.interval_index import IntervalIndex
+        index = IntervalIndex(self.events)
+        ws, we, columns = self.t0, self.t0 + 3600, 120
+        bins = index.density_bins(ws, we, columns, lambda e: e.event_name)
+        self.assertEqual(list(bins), ["Bridge"])
+        width = (we - ws) / columns
+        for col in (0, 17, 60, 119):
+            covering = [e for e in self.events
+                        if int((max(e.start_ts, ws) - ws) / width) <= col <= int((min(e.end_ts, we) - ws) / width)]
+            self.assertEqual(bins["Bridge"][col], len(covering))
+
+
+class TestTimelineStaticLayers(unittest.TestCase):
+    """Test retained-mode caching of the static timeline layers"""
+
+    @classmethod
+    def setUpClass(cls):
+        from PyQt6.QtWidgets import QApplication
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        from app.ui.timeline_widget import TimelineWidget
+        from app.models.event_model import Event
+        self.t0 = datetime(2025, 11, 26, 20, 0, 0, tzinfo=timezone.utc)
+        self.timeline = TimelineWidget()
+        self.timeline.resize(800, 300)
+        self.timeline.set_image_time_range(self.t0, self.t0 + timedelta(minutes=10))
+        self.timeline.set_events([
+            Event(event_id="E1", event_name="Bridge", start_time=self.t0 + timedelta(seconds=30),
+                  end_time=self.t0 + timedelta(seconds=90), start_chainage=0.0, end_chainage=1.0)
+        ])
+        self.area = self.timeline.timeline_area
+        self.area.resize(800, 240)
+
+    def _render(self):
+        self.area.grab()
+        return self.area.static_render_count
+
+    def test_marker_moves_reuse_cache(self):
+        """Moving the marker within the view only repaints the overlay"""
+        first = self._render()
+        for seconds in (60, 120, 180):
+            self.timeline.current_position = self.t0 + timedelta(seconds=seconds)
+            self.assertEqual(self._render(), first)
+
+    def test_marker_events_come_from_the_index(self):
+        """The marker popup lookup queries the interval index, rebuilt after event edits"""
+        from unittest import mock
+        self.timeline.current_position = self.t0 + timedelta(seconds=60)
+        self.assertEqual([e.event_id for e in self.timeline.get_events_at_marker_time()], ["E1"])
+
+        event = self.timeline.events[0]
+        event.end_time = self.t0 + timedelta(seconds=45)
+        self.timeline.invalidate_cache()
+        with mock.patch.object(type(event), 'start_time', new_callable=mock.PropertyMock,
+                               side_effect=AssertionError("datetime scan")):
+            self.assertEqual(self.timeline.get_events_at_marker_time(), [])
+
+    def test_invalidation_triggers(self):
+        """Data edits, view changes and resizes re-render the static layers"""
+        count = self._render()
+        self.timeline.invalidate_cache()
+        self.assertEqual(self._render(), count + 1)
+        self.timeline.view_end_time = self.timeline.view_end_time - timedelta(minutes=1)
+        self.assertEqual(self._render(), count + 2)
+        self.area.resize(600, 240)
+        self.assertEqual(self._render(), count + 3)
+
+
+    def test_lod_switches_with_zoom(self):
+        """Dense zoomed-out views paint density bins; zooming in restores rectangles"""
+        from PyQt6.QtCore import QPoint
+        from app.models.event_model import Event
+        events = [Event(event_id=f"D{i}", event_name="Speed Hump" if i % 2 else "Bridge",
+                        start_time=self.t0 + timedelta(seconds=i * 0.3),
+                        end_time=self.t0 + timedelta(seconds=i * 0.3 + 0.5),
+                        start_chainage=0.0, end_chainage=1.0) for i in range(2000)]
+        self.timeline.set_events(events, update_view_range=False)
+        self._render()
+        self.assertTrue(self.timeline.lod_active)
+        self.assertEqual(set(self.timeline.lod_bins), {"Bridge", "Speed Hump"})
+        self.assertIsNone(self.timeline.get_event_at_position(QPoint(100, 50), self.area.rect(), 1.0))
+
+        self.timeline.view_start_time = self.t0
+        self.timeline.view_end_time = self.t0 + timedelta(seconds=20)
+        self._render()
+        self.assertFalse(self.timeline.lod_active)
+
+
+class TestNumericTimeAxis(unittest.TestCase):
+    """Test the float epoch-seconds timeline axis"""
+
+    def test_cached_epoch_follows_reassignment(self):
+        """Cached numeric times refresh when the datetime attribute is replaced"""
+        from app.models.event_model import Event
+        t0 = datetime(2025, 11, 26, 20, 0, 0, tzinfo=timezone.utc)
+        event = Event(event_id="E1", event_name="Bridge", start_time=t0, end_time=t0 + timedelta(seconds=5),
+                      start_chainage=0.0, end_chainage=1.0)
+        self.assertEqual(event.start_ts, t0.timestamp())
+        event.start_time = t0 + timedelta(seconds=2)
+        self.assertEqual(event.start_ts, t0.timestamp() + 2)
+        # Naive datetimes are read as UTC
+        event.end_time = datetime(2025, 11, 26, 20, 0, 10)
+        self.assertEqual(event.end_ts, t0.timestamp() + 10)
+
+    def test_image_time_range_does_not_rewrite_data(self):
+        """Setting the view range reads event times without touching them"""
+        from PyQt6.QtWidgets import QApplication
+        from app.ui.timeline_widget import TimelineWidget
+        from app.models.event_model import Event
+        app = QApplication.instance() or QApplication([])
+        t0 = datetime(2025, 11, 26, 20, 0, 0, tzinfo=timezone.utc)
+        timeline = TimelineWidget()
+        naive_end = datetime(2025, 11, 26, 20, 20, 0)
+        event = Event(event_id="E1", event_name="Bridge", start_time=t0, end_time=t0 + timedelta(seconds=5),
+                      start_chainage=0.0, end_chainage=1.0)
+        timeline.events = [event]
+        event.end_time = naive_end
+        timeline.set_image_time_range(t0, t0 + timedelta(minutes=10))
+
+        self.assertIs(event.end_time, naive_end)
+        self.assertEqual(timeline.view_end_ts, naive_end.replace(tzinfo=timezone.utc).timestamp() + 30)
+        x = timeline.time_to_pixel(t0 + timedelta(minutes=5), 2.0)
+        self.assertEqual(timeline.pixel_to_time(x, 2.0), t0 + timedelta(minutes=5))
+
+
+class TestFramePacedDispatcher(unittest.TestCase):
+    """Test coalesced, latest-wins dispatch of drag intents"""
+
+    @classmethod
+    def setUpClass(cls):
+        from PyQt6.QtWidgets import QApplication
+        cls.app = QApplication.instance() or QApplication([])
+
+    def _pump(self, seconds):
+        deadline = time.time() + seconds
+        while time.time() < deadline:
+            self.app.processEvents()
+            time.sleep(0.001)
+
+    def test_burst_is_coalesced(self):
+        """A burst of intents yields few frames and one settle with the latest value"""
+        from app.core.frame_dispatcher import FramePacedDispatcher
+        frames, settles = [], []
+        dispatcher = FramePacedDispatcher(on_frame=frames.append, on_settle=settles.append,
+                                          frame_ms=16, settle_ms=50)
+        for i in range(200):
+            dispatcher.submit(i)
+            if i % 20 == 0:
+                self._pump(0.02)
+        self._pump(0.2)
+
+        self.assertEqual(settles, [199])
+        self.assertLess(len(frames), 50)
+        self.assertEqual(dispatcher.get_stats()['submitted'], 200)
+
+    def test_flush_runs_latest_immediately(self):
+        """flush() dispatches the pending intent without waiting for timers"""
+        from app.core.frame_dispatcher import FramePacedDispatcher
+        frames, settles = [], []
+        dispatcher = FramePacedDispatcher(on_frame=frames.append, on_settle=settles.append)
+        dispatcher.submit("a")
+        dispatcher.submit("b")
+        dispatcher.flush()
+        self.assertEqual(frames, ["b"])
+        self.assertEqual(settles, ["b"])
+        self.assertFalse(dispatcher.is_settling())
+
+
+class TestLaneIntervalStore(unittest.TestCase):
+    """Test the sorted lane-fix store behind LaneManager"""
+
+    def setUp(self):
+        from app.models.lane_model import LaneManager
+        self.t0 = datetime(2025, 11, 26, 20, 0, 0, tzinfo=timezone.utc)
+        self.manager = LaneManager()
+        self.manager.plate = "NWZ263"
+        self.manager.fileid_folder = Path("0D2511260000")
+        self.manager.end_time = self.t0 + timedelta(minutes=10)
+
+    def _at(self, seconds):
+        return self.t0 + timedelta(seconds=seconds)
+
+    def test_queries_match_linear_scan(self):
+        """Point, next-boundary and overlap queries agree with a brute-force scan"""
+        from app.models.lane_model import LaneFix
+        fixes = [LaneFix(plate="P", from_time=self._at(i * 10), to_time=self._at(i * 10 + 10),
+                         lane=str(i % 4 + 1), file_id="F") for i in range(60)]
+        self.manager.lane_fixes = list(reversed(fixes))
+        self.assertEqual(self.manager.get_lane_fixes(), fixes)
+
+        for seconds in (0, 5, 10, 299.5, 600, 601, -1):
+            t = self._at(seconds)
+            covering = [f for f in fixes if f.from_time <= t <= f.to_time]
+            expected = max(covering, key=lambda f: f.from_time).lane if covering else None
+            self.assertEqual(self.manager.get_lane_at_timestamp(t), expected)
+            self.assertEqual(self.manager.check_overlap(t), bool(covering))
+            later = [f.from_time for f in fixes if f.from_time > t]
+            self.assertEqual(self.manager.get_next_lane_change_time(t), min(later) if later else None)
+
+        window = self.manager.get_lane_fixes_in_range(self._at(95).timestamp(), self._at(130).timestamp())
+        self.assertEqual(window, fixes[9:14])
+
+    def test_edits_bump_revision_and_stay_sorted(self):
+        """Assignments, range changes and in-place edits all change the revision"""
+        revisions = [self.manager.revision]
+        self.assertTrue(self.manager.assign_lane('2', self._at(300)))
+        revisions.append(self.manager.revision)
+        self.assertTrue(self.manager.assign_lane('1', self._at(0)))
+        revisions.append(self.manager.revision)
+        self.assertEqual([f.lane for f in self.manager.lane_fixes], ['1', '2'])
+        self.assertEqual(self.manager.lane_fixes[0].to_time, self._at(300))
+
+        self.assertTrue(self.manager.apply_lane_change_range('3', self._at(100), self._at(200)))
+        revisions.append(self.manager.revision)
+        self.assertEqual([(f.lane, f.from_time) for f in self.manager.lane_fixes],
+                         [('1', self._at(0)), ('3', self._at(100)), ('1', self._at(200)), ('2', self._at(300))])
+
+        self.manager.lane_fixes[1].lane = '4'
+        self.manager.reindex()
+        revisions.append(self.manager.revision)
+        self.assertEqual(self.manager.get_lane_at_timestamp(self._at(150)), '4')
+        self.assertEqual(len(set(revisions)), len(revisions))
+
+    def test_timeline_caches_by_lane_revision(self):
+        """Lane edits invalidate the timeline's static layers without fingerprinting"""
+        from PyQt6.QtWidgets import QApplication
+        from app.ui.timeline_widget import TimelineWidget
+        QApplication.instance() or QApplication([])
+        timeline = TimelineWidget()
+        timeline.set_image_time_range(self.t0, self.manager.end_time)
+        timeline.set_lane_manager(self.manager)
+        area = timeline.timeline_area
+        area.resize(800, 240)
+        area.grab()
+        count = area.static_render_count
+        area.grab()
+        self.assertEqual(area.static_render_count, count)
+        self.manager.assign_lane('1', self._at(60))
+        area.grab()
+        self.assertEqual(area.static_render_count, count + 1)
+
+
+class TestLaneFixLoader(unittest.TestCase):
+    """Test the batch lane fix CSV loader"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "0D2511260000_lane_fixes.csv")
+        self.t0 = datetime(2025, 11, 26, 20, 0, 0, tzinfo=timezone.utc)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _fmt(self, dt):
+        return dt.strftime('%d/%m/%y %H:%M:%S') + f'.{dt.microsecond // 1000:03d}'
+
+    def test_loads_and_reports_rejects(self):
+        """Valid rows load; unparseable and out-of-bounds rows land in the report"""
+        from app.utils.lane_fix_loader import load_lane_fix_csv, FORMAT_DMY
+        rows = ["Plate,From,To,Lane,Ignore"]
+        for i in range(1000):
+            start = self.t0 + timedelta(seconds=i, milliseconds=250)
+            rows.append(f"NWZ263,{self._fmt(start)},{self._fmt(start + timedelta(seconds=1))},{i % 4 + 1},0")
+        rows.append("NWZ263,not a time,26/11/25 20:00:01.000,1,0")
+        rows.append(f"NWZ263,{self._fmt(self.t0 - timedelta(hours=1))},{self._fmt(self.t0)},2,0")
+        rows.append(f"NWZ263,{self._fmt(self.t0 + timedelta(seconds=5))},{self._fmt(self.t0 + timedelta(seconds=4))},3,1")
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(rows) + "\n")
+
+        fixes, report = load_lane_fix_csv(self.path, "0D2511260000",
+                                          valid_range=(self.t0, self.t0 + timedelta(seconds=1001)))
+        self.assertEqual(report.time_format, FORMAT_DMY)
+        self.assertEqual((report.total_rows, report.loaded, len(fixes)), (1003, 1000, 1000))
+        self.assertEqual([r.line for r in report.rejects], [1002, 1003, 1004])
+        self.assertEqual(fixes[10].from_time, self.t0 + timedelta(seconds=10, milliseconds=250))
+        self.assertEqual(fixes[10].lane, '3')
+
+    def test_reject_lines_count_blank_lines(self):
+        """Reject line numbers are file lines, also after a blank line"""
+        from app.utils.lane_fix_loader import load_lane_fix_csv
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("Plate,From,To,Lane,Ignore\n"
+                    "P,26/11/25 20:00:00.000,26/11/25 20:00:05.000,1,0\n"
+                    "\n"
+                    "P,26/11/25 20:00:09.000,26/11/25 20:00:06.000,2,0\n")
+        fixes, report = load_lane_fix_csv(self.path, "F")
+        self.assertEqual(len(fixes), 1)
+        self.assertEqual([r.line for r in report.rejects], [4])
+
+    def test_time_of_day_format(self):
+        """Files written as time of day parse with today's date"""
+        from app.utils.lane_fix_loader import load_lane_fix_csv, FORMAT_HMS
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("Plate,From,To,Lane,Ignore\nP,20:10:00.5,20:11:00.0,SK1,1\n")
+        fixes, report = load_lane_fix_csv(self.path, "F")
+        self.assertEqual(report.time_format, FORMAT_HMS)
+        self.assertEqual((fixes[0].from_time.hour, fixes[0].from_time.microsecond), (20, 500000))
+        self.assertTrue(fixes[0].ignore)
+
+
+class TestLaneFixMerge(unittest.TestCase):
+    """Test the vectorized ExportManager merge path"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.t0 = datetime(2025, 11, 26, 20, 0, 0, tzinfo=timezone.utc)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _fixes(self, count, file_id="F1"):
+        from app.models.lane_model import LaneFix
+        return [LaneFix(plate="NWZ263", from_time=self.t0 + timedelta(seconds=i, milliseconds=125),
+                        to_time=self.t0 + timedelta(seconds=i + 1, milliseconds=125),
+                        lane=str(i % 4 + 1), file_id=file_id, ignore=(i % 5 == 0)) for i in range(count)]
+
+    def test_load_round_trips_export(self):
+        """Exported fixes load back with the same times, lanes and ignore flags"""
+        from app.utils.export_manager import ExportManager
+        manager = ExportManager()
+        path = os.path.join(self.temp_dir, "merged.csv")
+        fixes = self._fixes(500)
+        self.assertTrue(manager.export_lane_fixes(fixes, path))
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write("NWZ263,garbage,26/11/25 20:00:01.000,1,,F1,,,N\n")
+
+        loaded = manager._load_existing_fixes(path)
+        self.assertEqual(len(loaded), 500)
+        self.assertEqual([(f.from_time, f.to_time, f.lane, f.ignore, f.file_id) for f in loaded],
+                         [(f.from_time, f.to_time, f.lane, f.ignore, f.file_id) for f in fixes])
+
+    def test_merge_deduplicates_existing_and_new(self):
+        """Fixes already in the merged file are not written twice"""
+        from app.utils.export_manager import ExportManager
+        manager = ExportManager()
+        path = os.path.join(self.temp_dir, "merged.csv")
+        self.assertTrue(manager.export_lane_fixes(self._fixes(300), path))
+        new_fixes = self._fixes(350) + self._fixes(10, file_id="F2")
+        self.assertTrue(manager.merge_lane_fixes(path, new_fixes, path))
+        self.assertEqual(len(manager._load_existing_fixes(path)), 360)
+
+    def test_remove_duplicates_matches_naive_and_aware_times(self):
+        """Dedup keys on the datetimes themselves and leaves the epoch cache cold"""
+        from app.models.lane_model import LaneFix
+        from app.utils.export_manager import ExportManager
+        fixes = self._fixes(3)
+        naive = LaneFix(plate=fixes[0].plate, from_time=fixes[0].from_time.replace(tzinfo=None),
+                        to_time=fixes[0].to_time.replace(tzinfo=None), lane=fixes[0].lane, file_id=fixes[0].file_id)
+        unique = ExportManager()._remove_duplicates(fixes + [naive])
+        self.assertEqual(unique, fixes)
+        self.assertIsNone(getattr(fixes[0], '_epoch_from_time', None))
+
+
+class TestSaveService(unittest.TestCase):
+    """Test the write-behind save queue"""
+
+    @classmethod
+    def setUpClass(cls):
+        from PyQt6.QtWidgets import QApplication
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.written = []
+        self.services = []
+
+    def tearDown(self):
+        for service in self.services:
+            service.stop()
+
+    def _service(self, writer=None, **kwargs):
+        from app.core.save_service import SaveService
+        service = SaveService(writer or self._record, **kwargs)
+        self.services.append(service)
+        return service
+
+    def _record(self, job):
+        self.written.append((job.fileid, len(job.events), job.save_events, job.save_lanes))
+        return True
+
+    def test_bursts_coalesce_per_fileid(self):
+        """Rapid snapshots of one FileID produce one write with the latest data and merged flags"""
+        from app.core.save_service import SaveJob
+        service = self._service(debounce_ms=50)
+        service.submit(SaveJob("A", None, events=[1], save_events=True))
+        for n in range(2, 20):
+            service.submit(SaveJob("A", None, events=list(range(n)), save_lanes=True))
+        service.submit(SaveJob("B", None, events=[1, 2], save_lanes=True))
+        self.assertEqual(service.queue_depth(), 2)
+        self.assertTrue(service.flush(5))
+        self.assertEqual(sorted(self.written), [("A", 19, True, True), ("B", 2, False, True)])
+        stats = service.get_stats()
+        self.assertEqual((stats['queue_depth'], stats['completed'], stats['coalesced']), (0, 2, 18))
+        self.assertGreater(stats['latency_max_ms'], 0)
+
+    def test_locked_file_is_retried(self):
+        """Transient share errors are retried with backoff; other failures are not"""
+        from app.core.save_service import SaveJob, TransientSaveError
+        attempts = []
+
+        def flaky(job):
+            attempts.append(job.fileid)
+            if job.fileid == "locked" and len(attempts) < 3:
+                raise TransientSaveError(13, "File is locked")
+            return job.fileid != "broken"
+
+        service = self._service(flaky, debounce_ms=0, max_attempts=4, retry_base_delay_ms=10)
+        service.submit(SaveJob("locked", None), immediate=True)
+        self.assertTrue(service.flush(5))
+        service.submit(SaveJob("broken", None), immediate=True)
+        self.assertTrue(service.flush(5))
+        self.assertEqual(attempts, ["locked", "locked", "locked", "broken"])
+        stats = service.get_stats()
+        self.assertEqual((stats['completed'], stats['failed'], stats['retries']), (1, 1, 2))
+
+
+class TestBackupStore(unittest.TestCase):
+    """Test the content-addressed backup store"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.data_path = os.path.join(self.temp_dir, "0D2511270910197800", "0D2511270910197800.driveevt")
+        os.makedirs(os.path.dirname(self.data_path))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _store(self, **kwargs):
+        from app.core.backup_store import BackupStore
+        return BackupStore(os.path.join(self.temp_dir, "backups"), **kwargs)
+
+    def _write(self, text):
+        with open(self.data_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def test_identical_content_is_stored_once(self):
+        """Unchanged saves add no version; reverting to old content reuses its object"""
+        store = self._store()
+        for text in ["a" * 1000, "a" * 1000, "b" * 1000, "a" * 1000]:
+            self._write(text)
+            store.backup_file(self.data_path)
+        stats = store.get_stats()
+        self.assertEqual((stats['versions'], stats['objects']), (3, 2))
+        self.assertEqual((stats['skipped_identical'], stats['deduplicated']), (1, 1))
+        self.assertLess(stats['stored_bytes'], stats['original_bytes'])
+
+    def test_retention_and_restore(self):
+        """Only the newest versions are kept; any kept version restores byte-for-byte"""
+        store = self._store(keep_versions=3)
+        digests = []
+        for i in range(5):
+            self._write(f"version {i}")
+            digests.append(store.backup_file(self.data_path))
+        versions = store.list_versions(self.data_path)
+        self.assertEqual([v.digest for v in versions], digests[:1:-1])
+        self.assertEqual(store.get_stats()['objects'], 3)
+
+        self._write("edited")
+        self.assertTrue(store.restore(self.data_path, digests[2]))
+        with open(self.data_path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), "version 2")
+        # The content replaced by the restore was backed up first
+        self.assertEqual(store.read_version(store.list_versions(self.data_path)[0].digest), b"edited")
+
+        # The index survives a restart
+        self.assertEqual(len(self._store(keep_versions=3).list_versions(self.data_path)), 3)
+
+    def test_instances_sharing_a_folder_keep_each_others_versions(self):
+        """Two stores on one folder (GUI and CLI processes) neither drop nor collect each other's backups"""
+        other_path = os.path.join(self.temp_dir, "survey2", "0D2511270910197800", "0D2511270910197800.driveevt")
+        os.makedirs(os.path.dirname(other_path))
+        store_a, store_b = self._store(keep_versions=1), self._store(keep_versions=1)
+
+        self._write("survey 1")
+        digest_a = store_a.backup_file(self.data_path)
+        with open(other_path, 'w', encoding='utf-8') as f:
+            f.write("survey 2")
+        digest_b = store_b.backup_file(other_path)
+        self._write("survey 1 edited")
+        store_a.backup_file(self.data_path)  # retention drops digest_a and collects garbage
+
+        # Same '<FileID>/<file>' in two surveys stays two files
+        self.assertEqual([v.digest for v in store_a.list_versions(other_path)], [digest_b])
+        self.assertEqual(store_b.read_version(digest_b), b"survey 2")
+        self.assertIsNone(store_b.read_version(digest_a))
+        self.assertEqual(len(store_b.list_versions(self.data_path)), 1)
+
+
+class TestAutoSaveJournal(unittest.TestCase):
+    """Test the incremental autosave journal"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "autosave.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _manager(self, **kwargs):
+        from app.core.autosave_manager import AutoSaveManager
+        manager = AutoSaveManager(**kwargs)
+        manager.set_save_path(self.path)
+        return manager
+
+    def _records(self, count, lane="1"):
+        return [{'id': i, 'lane': lane if i == 0 else "2"} for i in range(count)]
+
+    def test_deltas_scale_with_edits_and_replay(self):
+        """A one-record edit appends a small entry; replay rebuilds the latest data"""
+        manager = self._manager()
+        manager.update_data("F1", {'lane_fixes': self._records(2000), 'plate': "NWZ263"})
+        manager.schedule_save()
+        first_entry = manager.bytes_written
+
+        manager.update_data("F1", {'lane_fixes': self._records(2000, lane="4"), 'plate': "NWZ263"})
+        manager.schedule_save()
+        self.assertLess(manager.bytes_written - first_entry, first_entry / 100)
+        manager.update_data("F1", {'lane_fixes': self._records(2000, lane="4"), 'plate': "NWZ263"})
+        manager.schedule_save()
+        self.assertEqual(manager.entries_written, 2)  # unchanged data writes nothing
+
+        manager.update_data("F2", {'lane_fixes': self._records(3)})
+        manager.schedule_save()
+        manager.mark_saved("F2")
+        manager.schedule_save()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"key": "F1", "rev": 9, "add"')  # torn write from a crash
+
+        recovered = self._manager().replay()
+        self.assertEqual(list(recovered), ["F1"])
+        self.assertEqual(recovered["F1"]['revision'], 2)
+        self.assertEqual(sorted(recovered["F1"]['data']['lane_fixes'], key=lambda r: r['id']),
+                         self._records(2000, lane="4"))
+        self.assertEqual(recovered["F1"]['data']['plate'], "NWZ263")
+
+    def test_mark_saved_keeps_edits_journaled_after_the_snapshot(self):
+        """A save only clears the journal if no edits were journaled after its snapshot"""
+        manager = self._manager()
+        manager.update_data("F1", {'lane_fixes': self._records(3)})
+        manager.schedule_save()
+        snapshot_revision = manager.revision("F1")
+        manager.update_data("F1", {'lane_fixes': self._records(3, lane="4")})  # edited while saving
+        manager.schedule_save()
+
+        manager.mark_saved("F1", snapshot_revision)
+        manager.schedule_save()
+        recovered = self._manager().replay()["F1"]['data']['lane_fixes']
+        self.assertEqual(sorted(recovered, key=lambda r: r['id']), self._records(3, lane="4"))
+
+        manager.mark_saved("F1", manager.revision("F1"))
+        manager.schedule_save()
+        self.assertEqual(self._manager().replay(), {})
+
+    def test_compaction_keeps_state(self):
+        """Past the size threshold the journal is rewritten as one snapshot per key"""
+        manager = self._manager(compact_bytes=5000)
+        for n in range(1, 60):
+            manager.update_data("F1", {'lane_fixes': self._records(n * 10)})
+            manager.schedule_save()
+        self.assertGreater(manager.compactions, 0)
+        self.assertLess(manager.compactions, 10)  # not on every write once the snapshot alone exceeds 5000
+        size = os.path.getsize(self.path)
+        manager.compact()
+        self.assertLess(size, 2 * os.path.getsize(self.path) + 5000)
+
+        replayed = self._manager()
+        recovered = replayed.replay()
+        self.assertEqual(len(recovered["F1"]['data']['lane_fixes']), 590)
+        # Deltas after a replay continue from the recovered state and revision
+        replayed.update_data("F1", {'lane_fixes': self._records(591)})
+        replayed.schedule_save()
+        self.assertEqual(replayed.revision("F1"), 60)
+        self.assertEqual(len(self._manager().replay()["F1"]['data']['lane_fixes']), 591)
+
+    def test_sessions_keep_separate_journals_and_adopt_crashed_ones(self):
+        """Replay ignores journals of running sessions and takes over those of crashed sessions"""
+        from app.core.autosave_manager import AutoSaveManager, journal_key, session_journal_path
+        live, crashed = AutoSaveManager(), AutoSaveManager()
+        live.set_save_path(session_journal_path(self.temp_dir))
+        crashed.set_save_path(os.path.join(self.temp_dir, f"session-{os.getpid()}-1.jsonl"))
+        key = journal_key(os.path.join(self.temp_dir, "survey", "F1"))
+        live.update_data(key, {'lane_fixes': self._records(2)})
+        live.schedule_save()
+        crashed.update_data(key, {'lane_fixes': self._records(3)})
+        crashed.schedule_save()
+
+        manager = self._manager()
+        recovered = manager.replay()
+        self.assertEqual(len(recovered[key]['data']['lane_fixes']), 3)
+        self.assertFalse(os.path.exists(crashed.save_path))
+        self.assertTrue(os.path.exists(live.save_path))
+        self.assertEqual(len(self._manager().replay()[key]['data']['lane_fixes']), 3)  # adopted into this journal
+
+        manager.mark_saved(key)
+        manager.stop()
+        self.assertFalse(os.path.exists(self.path))  # nothing left for a later session to adopt
+
+
+class TestMemoryGovernor(unittest.TestCase):
+    """Test budget enforcement and priority-ordered eviction"""
+
+    def _component(self, governor, name, size, priority, budget=0, log=None):
+        state = {'size': size}
+
+        def release(nbytes):
+            freed = min(nbytes, state['size'])
+            state['size'] -= freed
+            if log is not None:
+                log.append((name, freed))
+            return freed
+
+        governor.register(name, lambda: state['size'], release, priority=priority, budget_bytes=budget)
+        return state
+
+    def test_component_budget(self):
+        """A component over its own budget is trimmed back to it, others are untouched"""
+        from app.core.memory_governor import MemoryGovernor
+        governor = MemoryGovernor(process_budget_mb=0)
+        images = self._component(governor, "images", 300, priority=20, budget=200)
+        events = self._component(governor, "events", 500, priority=30)
+        self.assertEqual(governor.enforce(rss=10 ** 9, system_percent=10), 100)
+        self.assertEqual((images['size'], events['size']), (200, 500))
+
+    def test_pressure_released_in_priority_order(self):
+        """Over the process budget, cheaper components are released before costlier ones"""
+        from app.core.memory_governor import MemoryGovernor, MB
+        governor = MemoryGovernor(process_budget_mb=100)
+        log = []
+        self._component(governor, "gps", 50 * MB, priority=40, log=log)
+        self._component(governor, "preload", 30 * MB, priority=10, log=log)
+        self._component(governor, "images", 40 * MB, priority=20, log=log)
+        released = governor.enforce(rss=160 * MB, system_percent=10)
+        self.assertEqual(released, 60 * MB)
+        self.assertEqual(log, [("preload", 30 * MB), ("images", 30 * MB)])
+        self.assertEqual(governor.usage_by_component(), {"preload": 0, "images": 10 * MB, "gps": 50 * MB})
+
+        # System pressure above the critical threshold sheds a share of what is tracked
+        log.clear()
+        governor.enforce(rss=50 * MB, system_percent=99)
+        self.assertEqual(log, [("images", 10 * MB), ("gps", 20 * MB)])
+
+    def test_pressure_release_cooldown_and_accounting_only_components(self):
+        """RSS lagging behind a release does not trigger another until the cooldown passes or pressure rises"""
+        from app.core.memory_governor import MemoryGovernor, MB
+        governor = MemoryGovernor(process_budget_mb=100)
+        log = []
+        self._component(governor, "images", 200 * MB, priority=20, log=log)
+        governor.register("gps_indexes", lambda: 80 * MB, None, priority=5)
+
+        self.assertEqual(governor.enforce(rss=150 * MB, system_percent=10, now=0.0), 50 * MB)
+        self.assertEqual(governor.enforce(rss=150 * MB, system_percent=10, now=5.0), 0)
+        self.assertEqual(governor.enforce(rss=150 * MB, system_percent=75, now=10.0), 50 * MB)  # escalated
+        cooldown = governor.release_cooldown_sec
+        self.assertEqual(governor.enforce(rss=150 * MB, system_percent=75, now=10.0 + cooldown / 2), 0)
+        self.assertEqual(governor.enforce(rss=150 * MB, system_percent=10, now=10.0 + cooldown), 50 * MB)
+        self.assertEqual([name for name, _ in log], ["images"] * 3)
+        self.assertEqual(governor.usage_by_component()["gps_indexes"], 80 * MB)
+
+    def test_session_store_release_keeps_pinned(self):
+        """The session store spills cold FileIDs for the governor but never the pinned one"""
+        from app.core.session_store import FileIDSessionStore
+        store = FileIDSessionStore("test", max_hot_entries=10)
+        try:
+            for i in range(3):
+                store[f"F{i}"] = list(range(1000))
+            store.pin("F0")
+            self.assertGreater(store.release(1), 0)
+            self.assertEqual(store.get_stats()['spilled_entries'], 1)
+            store.release(10 ** 9)
+            self.assertEqual(list(store.get_entry_sizes()), ["F0"])
+            self.assertEqual(store["F2"], list(range(1000)))
+        finally:
+            store.close()
+
+
+class TestCompactRecords(unittest.TestCase):
+    """Test slotted records, column tables and their use in the session store"""
+
+    def setUp(self):
+        from app.models.event_model import Event
+        from app.models.lane_model import LaneFix
+        t0 = datetime(2025, 11, 26, 20, 10, 0, 123456, tzinfo=timezone.utc)
+        self.events = [
+            Event(event_id=f"e{i}", event_name=("Bridge", "Speed Hump")[i % 2],
+                  start_time=t0 + timedelta(seconds=i), end_time=t0 + timedelta(seconds=i + 5),
+                  start_chainage=i * 10.0, end_chainage=i * 10.0 + 50.0,
+                  start_lat=-36.8 + i * 1e-4 if i % 3 else None, start_lon=174.7,
+                  file_id="0D2510020721457700", layer=i % 4)
+            for i in range(2000)
+        ]
+        self.fixes = [
+            LaneFix(plate="NWZ263", from_time=t0 + timedelta(seconds=i),
+                    to_time=t0 + timedelta(seconds=i + 1), lane=("1", "2", "SK-R1")[i % 3],
+                    file_id="0D2510020721457700", ignore=i % 7 == 0)
+            for i in range(2000)
+        ]
+
+    @staticmethod
+    def _bytes_per_record(build, count):
+        import gc
+        import tracemalloc
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        held = build()
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del held
+        return (after - before) / count
+
+    def test_memory_per_record(self):
+        """Slotted records are smaller than dict-backed ones; tables are far smaller still"""
+        from dataclasses import fields, make_dataclass
+        from app.models.lane_model import LaneFix
+        from app.models.record_tables import LaneFixTable
+
+        legacy_class = make_dataclass("LegacyLaneFix", [(f.name, object) for f in fields(LaneFix)])
+        values = [{f.name: getattr(fix, f.name) for f in fields(LaneFix)} for fix in self.fixes]
+        count = len(values)
+
+        legacy = self._bytes_per_record(lambda: [legacy_class(**v) for v in values], count)
+        slotted = self._bytes_per_record(lambda: [LaneFix(**v) for v in values], count)
+        cached = self._bytes_per_record(lambda: [fix for fix in (LaneFix(**v) for v in values)
+                                                 if fix.from_ts and fix.to_ts], count)
+        table = self._bytes_per_record(lambda: LaneFixTable(self.fixes), count)
+        print(f"\nLaneFix bytes/record: dict-backed {legacy:.0f}, slotted {slotted:.0f}, "
+              f"slotted with epoch cache {cached:.0f}, table {table:.0f}")
+
+        self.assertFalse(hasattr(self.fixes[0], '__dict__'))
+        self.assertLess(slotted, legacy)
+        self.assertLessEqual(cached - slotted, 2 * sys.getsizeof(0.0) + 8)  # two bare floats
+        self.assertLess(table * 2, slotted)
+
+    def test_epoch_cache_follows_assignment(self):
+        """Assigning a time clears its cached epoch seconds; the cache holds only a float"""
+        fix = self.fixes[0]
+        start = fix.from_ts
+        self.assertIsInstance(fix._epoch_from_time, float)
+        fix.from_time = fix.from_time + timedelta(seconds=2)
+        self.assertIsNone(fix._epoch_from_time)
+        self.assertAlmostEqual(fix.from_ts - start, 2.0)
+
+        event = self.events[0]
+        end = event.end_ts
+        event.end_time = event.end_time - timedelta(seconds=1)
+        self.assertAlmostEqual(end - event.end_ts, 1.0)
+
+    def test_round_trip_and_row_proxies(self):
+        """Tables rebuild equal records; row proxies read and write the columns"""
+        from app.models.record_tables import EventTable, LaneFixTable
+        events = EventTable.from_records(self.events)
+        fixes = LaneFixTable.from_records(self.fixes)
+        self.assertEqual(events.to_records(), self.events)
+        self.assertEqual(fixes.to_records(), self.fixes)
+        self.assertEqual(len(events), len(self.events))
+
+        row = events[3]
+        self.assertEqual(row.start_time, self.events[3].start_time)
+        self.assertIsNone(events[0].start_lat)
+        self.assertAlmostEqual(row.start_ts, self.events[3].start_time.timestamp())
+        self.assertEqual(row.duration_seconds, self.events[3].duration_seconds)
+
+        row.event_name = "Roundabout"
+        row.start_lat = None
+        self.assertEqual(events.to_records()[3].event_name, "Roundabout")
+        self.assertIsNone(events.to_records()[3].start_lat)
+
+        fixes[-1].lane = "3"
+        self.assertEqual(fixes.to_records()[-1].lane, "3")
+        self.assertEqual(fixes[-1].from_time, self.fixes[-1].from_time)
+
+    def test_session_store_compacts_unpinned(self):
+        """Switching FileID compacts the previous one; access brings back equal records"""
+        from app.core.session_store import FileIDSessionStore
+        store = FileIDSessionStore("test", max_hot_entries=10)
+        try:
+            store["F0"] = self.fixes
+            store.pin("F0")
+            before = store.get_memory_usage()
+            store["F1"] = self.fixes[:10]
+            store.pin("F1")
+            self.assertEqual(store.get_stats()['compacted_entries'], 1)
+            self.assertLess(store.get_memory_usage() * 3, before)
+
+            restored = store["F0"]
+            self.assertEqual(restored, self.fixes)
+            self.assertIsNot(restored, self.fixes)
+
+            self.assertGreater(store.release(1), 0)
+            self.assertEqual(store.get_stats()['spilled_entries'], 0)
+            store.spill_all()
+            self.assertEqual(store["F0"], self.fixes)
+        finally:
+            store.close()
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Test fixed-memory latency histograms and per-session summaries"""
+
+    def test_percentiles_within_bucket_precision(self):
+        """Percentiles match exact order statistics within the bucket resolution"""
+        import random
+        from app.utils.latency import LatencyHistogram, BUCKET_COUNT
+        rng = random.Random(7)
+        values = [rng.lognormvariate(-4, 1.2) for _ in range(20000)]
+        histogram = LatencyHistogram("decode")
+        for value in values:
+            histogram.record(value)
+
+        ordered = sorted(values)
+        for percent in (50, 95, 99):
+            exact = ordered[int(len(ordered) * percent / 100) - 1]
+            self.assertAlmostEqual(histogram.percentile(percent), exact, delta=exact * 0.04 + 2e-6)
+        self.assertAlmostEqual(histogram.percentile(100), max(values), delta=1e-6)
+        self.assertEqual(histogram.count, len(values))
+        self.assertEqual(len(histogram._counts), BUCKET_COUNT)
+
+        other = LatencyHistogram()
+        other.record(30.0)
+        histogram.merge(other)
+        self.assertEqual(histogram.summary()['max_ms'], 30000.0)
+
+    def test_registry_summaries(self):
+        """Named operations get their own histograms; summaries report p50/p95/p99/max in ms"""
+        from app.utils.latency import LatencyRegistry, measure_latency, record_latency
+        registry = LatencyRegistry()
+        for ms in range(1, 101):
+            record_latency('timeline_paint', ms / 1000, registry=registry)
+        with self.assertRaises(ValueError):
+            with measure_latency('merge', registry=registry):
+                raise ValueError()
+
+        summaries = registry.summaries()
+        self.assertEqual(sorted(summaries), ['merge', 'timeline_paint'])
+        paint = summaries['timeline_paint']
+        self.assertEqual(paint['count'], 100)
+        self.assertAlmostEqual(paint['p50_ms'], 50, delta=2)
+        self.assertAlmostEqual(paint['p99_ms'], 99, delta=3)
+        self.assertEqual(paint['max_ms'], 100.0)
+
+        registry.reset()
+        self.assertEqual(registry.summaries(), {})
+
+
+class TestTracing(unittest.TestCase):
+    """Test span recording and Chrome trace-event output"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        from app.utils.tracing import get_tracer
+        get_tracer().enabled = False
+        shutil.rmtree(self.temp_dir)
+
+    def test_disabled_records_nothing(self):
+        """Spans cost nothing and leave no events while tracing is off"""
+        from app.utils.tracing import get_tracer, trace_span, traced
+
+        @traced()
+        def work():
+            return 42
+
+        with trace_span('idle'):
+            self.assertEqual(work(), 42)
+        self.assertEqual(len(get_tracer()._events), 0)
+
+    def test_thread_aware_trace_file(self):
+        """Spans from several threads are written as Chrome trace events"""
+        import json
+        import threading
+        from app.utils.tracing import (start_tracing, stop_tracing, trace_span, traced,
+                                       trace_async_begin, trace_async_end)
+
+        @traced('decorated', 'test')
+        def work():
+            with trace_span('inner', 'test', n=1):
+                time.sleep(0.001)
+
+        path = os.path.join(self.temp_dir, "trace.json")
+        start_tracing(path)
+        trace_async_begin('FileID switch', 1, fileid='F0')
+        worker = threading.Thread(target=work, name="LoadWorker")
+        worker.start()
+        worker.join()
+        work()
+        trace_async_end('FileID switch', 1)
+        self.assertEqual(stop_tracing(), path)
+
+        with open(path, encoding='utf-8') as f:
+            events = json.load(f)['traceEvents']
+        spans = [e for e in events if e['ph'] == 'X']
+        self.assertEqual(sorted(e['name'] for e in spans), ['decorated', 'decorated', 'inner', 'inner'])
+        self.assertEqual(len({e['tid'] for e in spans}), 2)
+        inner = next(e for e in spans if e['name'] == 'inner')
+        self.assertEqual(inner['args'], {'n': 1})
+        self.assertGreaterEqual(inner['dur'], 1000)
+        self.assertEqual([e['ph'] for e in events if e['name'] == 'FileID switch'], ['b', 'e'])
+        thread_names = {e['args']['name'] for e in events if e['name'] == 'thread_name'}
+        self.assertIn("LoadWorker", thread_names)
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    """Synthetic survey generator and headless benchmark runner"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_generated_survey_loads_and_suite_runs(self):
+        from app.utils.data_loader import DataLoader
+        from benchmarks.run_benchmarks import BENCHMARKS, BenchmarkContext, run_suite
+        from benchmarks.survey_generator import SurveySpec, generate_survey
+
+        spec = SurveySpec(fileids=2, gps_rows=100, event_spans=5, images=10, lane_fixes=3)
+        fileids = generate_survey(self.temp_dir, spec)
+        self.assertEqual(len(fileids), 2)
+
+        folders = BenchmarkContext(self.temp_dir, spec, self.temp_dir).folders
+        self.assertEqual([folder.fileid for folder in folders], fileids)
+        data = DataLoader().load_fileid_data(folders[0])
+        self.assertEqual(len(data['image_paths']), 10)
+        self.assertEqual(len(data['gps_data'].points), 100)
+        self.assertEqual(len(data['events']), 5)
+        self.assertEqual(len(data['lane_manager'].lane_fixes), 3)
+        self.assertEqual(data['lane_validation_errors'], [])
+
+        document = run_suite(self.temp_dir, spec, repeat=1, warmup=0)
+        results = {result['name']: result for result in document['results']}
+        self.assertEqual(set(results), {item.name for item in BENCHMARKS})
+        for result in results.values():
+            self.assertNotIn('error', result)
+            self.assertEqual(len(result['runs_ms']), 1)
+        self.assertEqual(results['scan_folder']['items'], 2)
+        self.assertEqual(results['parse_driveevt']['items'], 10)
+        self.assertEqual(document['spec']['fileids'], 2)
+
+
+class TestBenchmarkComparison(unittest.TestCase):
+    """Benchmark results store and regression detection"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def _document(commit, runs):
+        return {'environment': {'commit': commit, 'fingerprint': 'm1'},
+                'results': [{'name': name, 'runs_ms': values} for name, values in runs.items()]}
+
+    def test_store_keys_runs_by_commit_and_machine(self):
+        from benchmarks.results_store import ResultsStore
+
+        store = ResultsStore(os.path.join(self.temp_dir, "store.json"))
+        self.assertEqual(store.add(self._document('aaa111', {'load': [10]})), 'aaa111@m1')
+        store.add(self._document('bbb222', {'load': [11]}))
+        store.add(self._document('aaa111', {'load': [12]}))  # rerun replaces
+
+        self.assertEqual(len(store.runs()), 2)
+        self.assertEqual(store.find('latest')['results'][0]['runs_ms'], [12])
+        self.assertEqual(store.find('previous')['environment']['commit'], 'bbb222')
+        self.assertEqual(store.find('bbb')['environment']['commit'], 'bbb222')
+        self.assertIsNone(store.find('latest', fingerprint='other-machine'))
+
+    def test_regression_needs_threshold_and_separation_from_noise(self):
+        from benchmarks.results_store import compare_results, has_regression
+
+        baseline = self._document('a', {'load': [100, 101, 102, 103, 104], 'noisy': [100, 60, 140, 80, 120],
+                                        'scan': [50, 50, 51, 51, 52]})
+        candidate = self._document('b', {'load': [130, 131, 132, 133, 134], 'noisy': [130, 90, 170, 60, 150],
+                                         'scan': [30, 30, 31, 31, 32]})
+        statuses = {c.name: c.status for c in compare_results(baseline, candidate, threshold=0.10)}
+        self.assertEqual(statuses, {'load': 'regression', 'noisy': 'noise', 'scan': 'improvement'})
+        self.assertTrue(has_regression(compare_results(baseline, candidate, threshold=0.10)))
+        self.assertFalse(has_regression(compare_results(baseline, candidate, threshold=0.50)))
+
+        candidate['results'][0] = {'name': 'load', 'runs_ms': [], 'error': 'boom'}
+        self.assertEqual(compare_results(baseline, candidate)[0].status, 'failed')
+
+
+class TestGuiFrameClock(unittest.TestCase):
+    """Frame pacing and dropped-frame counting of the GUI benchmark harness"""
+
+    def test_overrunning_steps_count_dropped_frames(self):
+        from PyQt6.QtWidgets import QApplication
+        from benchmarks.gui_benchmarks import FrameClock
+
+        app = QApplication.instance() or QApplication([])
+        clock = FrameClock(app, interval_ms=20)
+        stats = clock.run('steps', [lambda: time.sleep(0.001)] * 3 + [lambda: time.sleep(0.07)])
+
+        self.assertEqual(len(stats.frame_ms), 4)
+        self.assertGreaterEqual(stats.frame_ms[-1], 70)
+        self.assertEqual(stats.dropped, 3)  # a 70 ms frame in a 20 ms budget misses three slots
+        result = stats.to_dict()
+        self.assertEqual(result['dropped_frames'], 3)
+        self.assertEqual(result['frames']['count'], 4)
+
+
+class TestLoggingPipeline(unittest.TestCase):
+    """Background log writer and hot-path rate limiting"""
+
+    def test_rate_limiter_throttles_each_hot_call_site(self):
+        import logging
+        from app.logging_config import HotPathRateLimiter
+
+        limiter = HotPathRateLimiter({'hot'}, rate_per_sec=1.0, burst=3)
+
+        def record(created, level=logging.INFO, path='/app/hot.py', lineno=10):
+            r = logging.LogRecord('root', level, path, lineno, "image %d", (7,), None)
+            r.created = created
+            return r
+
+        self.assertEqual([limiter.filter(record(i * 0.01)) for i in range(10)], [True] * 3 + [False] * 7)
+        self.assertTrue(limiter.filter(record(0.2, level=logging.WARNING)))
+        self.assertTrue(limiter.filter(record(0.2, path='/app/cold.py')))
+        self.assertTrue(limiter.filter(record(0.2, lineno=11)))  # another call site has its own budget
+
+        resumed = record(2.0)
+        self.assertTrue(limiter.filter(resumed))
+        self.assertEqual(resumed.getMessage(), "image 7 [7 similar messages suppressed]")
+        self.assertEqual(limiter.suppressed, 7)
+
+    def test_rate_limiter_shared_by_handlers_decides_each_record_once(self):
+        import io
+        import logging
+        from app.logging_config import HotPathRateLimiter
+
+        limiter = HotPathRateLimiter({'hot'}, rate_per_sec=1.0, burst=2)
+        streams = [io.StringIO(), io.StringIO()]
+        handlers = [logging.StreamHandler(stream) for stream in streams]
+        for handler in handlers:
+            handler.addFilter(limiter)
+
+        def emit(created):
+            r = logging.LogRecord('root', logging.INFO, '/app/hot.py', 10, "image %d", (7,), None)
+            r.created = created
+            for handler in handlers:
+                handler.handle(r)
+
+        for i in range(5):
+            emit(i * 0.01)
+        emit(3.0)
+        for stream in streams:
+            self.assertEqual(stream.getvalue().splitlines(),
+                             ["image 7", "image 7", "image 7 [3 similar messages suppressed]"])
+        self.assertEqual(limiter.suppressed, 3)
+
+    def test_records_are_formatted_and_written_on_the_writer_thread(self):
+        import logging
+        import threading
+        from app.logging_config import DeferredQueueHandler, setup_logging, shutdown_logging
+
+        root = logging.getLogger()
+        saved_handlers, saved_level = root.handlers[:], root.level
+        temp_dir = tempfile.mkdtemp()
+        formatted_on = []
+
+        class Probe:
+            def __str__(self):
+                formatted_on.append(threading.get_ident())
+                return "probe"
+
+        try:
+            setup_logging(log_dir=temp_dir, level=logging.DEBUG, console_level=logging.CRITICAL, async_writer=True)
+            self.assertIsInstance(root.handlers[0], DeferredQueueHandler)
+            logging.info("value %s", Probe())
+            shutdown_logging()
+        finally:
+            shutdown_logging()
+            root.handlers[:] = saved_handlers
+            root.setLevel(saved_level)
+
+        self.assertTrue(formatted_on)
+        self.assertNotIn(threading.get_ident(), formatted_on)
+        with open(os.path.join(temp_dir, 'geoevent.log'), encoding='utf-8') as f:
+            self.assertIn("value probe", f.read())
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestHeadlessCli(unittest.TestCase):
+    """Batch scan / validate / merge over a survey root without the GUI"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_cli_does_not_import_qt(self):
+        import subprocess
+        code = "import sys, app.cli; print(any(m.startswith('PyQt') for m in sys.modules))"
+        output = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), 'False')
+
+    def test_validate_and_merge_survey(self):
+        import contextlib
+        import io
+        from app.cli import main, merged_lane_fixes_file
+        from benchmarks.survey_generator import SurveySpec, generate_survey
+
+        spec = SurveySpec(fileids=3, gps_rows=100, event_spans=5, images=10, lane_fixes=3)
+        fileids = generate_survey(self.temp_dir, spec)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(main(['validate', self.temp_dir, '--jobs', '2']), 0)
+            self.assertEqual(main(['merge', self.temp_dir, '--jobs', '2']), 0)
+
+        with open(os.path.join(self.temp_dir, 'merged.driveevt'), encoding='utf-8') as f:
+            self.assertEqual(len(f.read().splitlines()), 1 + 3 * 5 * 2)  # header + start/end rows
+        with open(os.path.join(self.temp_dir, merged_lane_fixes_file()), encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[0], 'Plate,From,To,Lane,Ignore,RegionID,RoadID,Travel')
+        self.assertEqual(len(lines), 1 + 3 * 3)
+
+        os.remove(os.path.join(self.temp_dir, fileids[1], f"{fileids[1]}.driveiri"))
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(main(['validate', self.temp_dir, '--jobs', '1']), 1)
+        self.assertIn(f"ERROR {fileids[1]}: missing .driveiri", output.getvalue())
+
+    def test_read_only_commands_do_not_create_files(self):
+        import contextlib
+        import io
+        from app.cli import main
+        from benchmarks.survey_generator import SurveySpec, generate_survey
+
+        fileid = generate_survey(self.temp_dir, SurveySpec(fileids=1, gps_rows=50, event_spans=2, images=5, lane_fixes=2))[0]
+        missing = [os.path.join(self.temp_dir, fileid, name) for name in (f"{fileid}.driveevt", f"{fileid}_lane_fixes.csv")]
+        for path in missing:
+            os.remove(path)
+        output_dir = os.path.join(self.temp_dir, 'out')
+        with contextlib.redirect_stdout(io.StringIO()):
+            for args in (['scan'], ['validate'], ['enrich'], ['export', '--output', output_dir]):
+                main([args[0], self.temp_dir, '--jobs', '1'] + args[1:])
+                self.assertEqual([path for path in missing if os.path.exists(path)], [], args[0])
+
+    def test_enrich_write_keeps_non_span_rows(self):
+        import contextlib
+        import io
+        from app.cli import main
+        from benchmarks.survey_generator import SurveySpec, generate_survey
+
+        spec = SurveySpec(fileids=1, gps_rows=100, event_spans=3, images=10, lane_fixes=2)
+        fileid = generate_survey(self.temp_dir, spec)[0]
+        driveevt_path = os.path.join(self.temp_dir, fileid, f"{fileid}.driveevt")
+        with open(driveevt_path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        time_utc = lines[1].split(',')[4]
+        check_row = f"tok,12.5,0.0125,{time_utc},{time_utc},Check Lane,false,,false,false"
+        with open(driveevt_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines + [check_row]) + "\n")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(main(['enrich', self.temp_dir, '--write', '--jobs', '1']), 0)
+
+        with open(driveevt_path, encoding='utf-8') as f:
+            rewritten = f.read().splitlines()
+        self.assertIn(check_row, rewritten)
+        self.assertEqual(len(rewritten), len(lines) + 1)
+
+
+class TestLaneFixReport(unittest.TestCase):
+    """Survey-wide lane fix checks and the sortable report"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_find_overlaps_gaps_and_unassigned_time(self):
+        from app.models.lane_model import LaneFix
+        from app.utils.lane_fix_report import find_lane_issues
+
+        t0 = datetime(2025, 11, 26, 20, 10, 0, tzinfo=timezone.utc)
+
+        def fix(start, end, lane, ignore=False):
+            return LaneFix('P', t0 + timedelta(seconds=start), t0 + timedelta(seconds=end), lane, 'F', ignore)
+
+        fixes = [fix(5, 20, '1'), fix(18, 30, '2'), fix(25, 28, '-1', ignore=True), fix(40, 50, '3'), fix(50, 55, '4')]
+        issues = find_lane_issues('F', fixes, (t0, t0 + timedelta(seconds=60)))
+        found = [(issue.kind, issue.duration_s) for issue in issues]
+        self.assertEqual(found, [('gap', 10.0), ('overlap', 2.0), ('unassigned', 5.0), ('unassigned', 5.0)])
+        self.assertEqual(issues[1].lane, '1/2')
+        self.assertEqual(issues[1].severity, 'error')
+
+        self.assertEqual(find_lane_issues('F', [], (t0, t0 + timedelta(seconds=60)))[0].duration_s, 60.0)
+
+    def test_cli_writes_survey_report(self):
+        import contextlib
+        import csv
+        import io
+        from app.cli import main
+        from benchmarks.survey_generator import SurveySpec, generate_survey
+
+        spec = SurveySpec(fileids=3, gps_rows=100, event_spans=5, images=10, lane_fixes=3)
+        fileids = generate_survey(self.temp_dir, spec)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(main(['lanes', self.temp_dir, '--jobs', '2']), 0)
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, 'lane_fix_report.html')))
+
+        # A row far outside the survey time and one overlapping the first fix
+        lane_path = os.path.join(self.temp_dir, fileids[2], f"{fileids[2]}_lane_fixes.csv")
+        with open(lane_path, encoding='utf-8') as f:
+            first = f.read().splitlines()[1].split(',')
+        with open(lane_path, 'a', encoding='utf-8') as f:
+            f.write("P,01/01/20 00:00:00.000,01/01/20 00:00:05.000,1,\n")
+            f.write(f"P,{first[1]},{first[2]},4,\n")
+
+        report_path = os.path.join(self.temp_dir, 'report.csv')
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(main(['lanes', self.temp_dir, '--jobs', '2', '--report', report_path]), 1)
+        with open(report_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(sorted(row['Issue'] for row in rows), ['bounds', 'overlap'])
+        self.assertEqual({row['FileID'] for row in rows}, {fileids[2]})
+        self.assertEqual([row['Line'] for row in rows if row['Issue'] == 'bounds'], ['5'])
+
+    def test_report_does_not_create_lane_fix_files(self):
+        from app.cli import scan_survey
+        from app.utils.lane_fix_report import check_fileid_lanes
+        from benchmarks.survey_generator import SurveySpec, generate_survey
+
+        fileids = generate_survey(self.temp_dir, SurveySpec(fileids=2, gps_rows=50, event_spans=2, images=5, lane_fixes=2))
+        folder = scan_survey(self.temp_dir)[0]
+        lane_path = os.path.join(folder.path, f"{fileids[0]}_lane_fixes.csv")
+        os.remove(lane_path)
+        report = check_fileid_lanes(folder)
+        self.assertFalse(os.path.exists(lane_path))
+        self.assertEqual(report['errors'], [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)